@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""领域 / HN 分类吞吐基准测试 - 遍历整个存档
+
+对存档中的每一条排名 (及 HN 快照中的每个故事) 分别用旧的逐关键词子串扫描与
+预编译正则分类器计时，并统计两者结论不同的比例 (主要来自单词边界的修正)。
+'cached' 模拟一次运行中同一仓库被多处重复分类的情形。
+
+    python benchmarks/bench_classify.py --dir bench-archives
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.dashboard import DOMAIN_MAPPING, classify_domain
+from src.history import iter_ranking_history
+from src.hn_history import get_hn_archive_dir
+from src.hn_scraper import HN_CATEGORY_KEYWORDS, classify_hn_category
+from src.synthetic import FIXTURES_DIR
+
+# 每个仓库在一次运行中被分类的次数 (treemap、feed、数据脚本、深度分析)
+CALLS_PER_REPO = 4
+
+# 'cached' 按批重复调用，模拟一次运行内的重复 (批大小小于缓存容量)
+CACHED_BATCH = 1000
+
+
+def legacy_classify_domain(repo_name: str, description: str, language: str) -> str:
+    """改动前的实现：逐个关键词子串匹配"""
+    text = f"{repo_name} {description}".lower()
+    for domain, config in DOMAIN_MAPPING.items():
+        if domain == 'Other':
+            continue
+        for keyword in config['keywords']:
+            if keyword in text:
+                return domain
+    for domain, config in DOMAIN_MAPPING.items():
+        if domain == 'Other':
+            continue
+        if language in config['languages']:
+            return domain
+    return 'Other'
+
+
+def legacy_classify_hn_category(title: str, url: str) -> str:
+    """改动前的实现 ('go' 原写作 'go ' 以避免命中 'google')"""
+    title_lower = title.lower()
+    for category, keywords in HN_CATEGORY_KEYWORDS:
+        if any((kw + ' ' if kw == 'go' else kw) in title_lower for kw in keywords):
+            return category
+    if url and 'github.com' in url.lower():
+        return 'Tools'
+    return 'Other'
+
+
+def time_calls(func, rows: list[tuple]) -> tuple[float, list]:
+    """返回 (总耗时秒, 结果列表)"""
+    started = time.perf_counter()
+    results = [func(*row) for row in rows]
+    return time.perf_counter() - started, results
+
+
+def time_cached(func, rows: list[tuple]) -> float:
+    """按批调用 CALLS_PER_REPO 次的总耗时 (秒)"""
+    func.cache_clear()
+    started = time.perf_counter()
+    for i in range(0, len(rows), CACHED_BATCH):
+        batch = rows[i:i + CACHED_BATCH]
+        for _ in range(CALLS_PER_REPO):
+            for row in batch:
+                func(*row)
+    return time.perf_counter() - started
+
+
+def report(label: str, rows: list[tuple], legacy, compiled) -> None:
+    if not rows:
+        print(f'\n{label}: 无数据')
+        return
+    legacy_s, legacy_out = time_calls(legacy, rows)
+    compiled_s, compiled_out = time_calls(compiled.__wrapped__, rows)
+    cached_s = time_cached(compiled, rows)
+    legacy_total = legacy_s * CALLS_PER_REPO
+    changed = sum(1 for a, b in zip(legacy_out, compiled_out) if a != b)
+
+    print(f'\n{label}: {len(rows):,} 条')
+    for name, seconds, calls in (('legacy', legacy_s, len(rows)), ('compiled', compiled_s, len(rows)),
+                                 (f'cached x{CALLS_PER_REPO}', cached_s, len(rows) * CALLS_PER_REPO)):
+        print(f'  {name:<12} {seconds * 1000:9.1f} ms  {calls / seconds:12,.0f} 次/秒')
+    print(f'  每次运行 x{CALLS_PER_REPO}: {legacy_total * 1000:.1f} ms -> {cached_s * 1000:.1f} ms '
+          f'({legacy_total / cached_s:.1f}x)，{changed} 条结论不同 ({changed / len(rows):.1%})')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='分类吞吐基准测试')
+    parser.add_argument('--dir', default=str(Path(__file__).parent.parent / 'archives'), help='存档目录')
+    args = parser.parse_args(argv)
+
+    repos = [(name, description or '', language or '') for _, name, description, language in
+             iter_ranking_history(args.dir, fields=('name', 'description', 'language'), flat=True)]
+    report('classify_domain', repos, legacy_classify_domain, classify_domain)
+
+    stories = [(title, url or '') for _, title, url in
+               iter_ranking_history(str(get_hn_archive_dir(args.dir)), fields=('title', 'url'), flat=True)
+               if title]
+    if not stories:
+        # 合成存档的 HN 数据位于 fixtures/hn
+        for path in sorted((Path(args.dir) / FIXTURES_DIR / 'hn').glob('*.json')):
+            stories += [(s['title'], s['url']) for s in json.loads(path.read_text(encoding='utf-8'))['stories']]
+    report('classify_hn_category', stories, legacy_classify_hn_category, classify_hn_category)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
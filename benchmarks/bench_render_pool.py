@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""并行渲染基准测试 - 模拟回填多天页面
+
+在合成存档上为每一天构建渲染上下文，用不同进程数渲染全部任务 (Markdown、各语言
+仪表板、深度分析页面)，报告吞吐并校验各进程数的输出逐字节一致。
+
+    python benchmarks/bench_render_pool.py --days 90 --workers 1,2,4,8
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai_summary import AISummary
+from src.analyzer import analyze_repos
+from src.history import RankingEntry, calculate_rank_changes, iter_ranking_history
+from src.render_context import build_render_context
+from src.render_pool import plan_jobs, run_jobs
+from src.scraper import parse_trending_html
+from src.synthetic import FIXTURES_DIR, SyntheticConfig, generate_archive, trending_html
+
+
+def build_contexts(base_dir: str, days: int, size: int, seed: int) -> list:
+    """生成合成存档并为每一天构建渲染上下文"""
+    config = SyntheticConfig(start=date(2026, 1, 1), days=days + 1, repos_per_day=size, seed=seed, summaries=True)
+    generate_archive(base_dir, config, workers=1)
+    summaries = json.loads((Path(base_dir) / FIXTURES_DIR / 'ai_summaries.json').read_text(encoding='utf-8'))
+    ai_summaries = {name: AISummary(**data) for name, data in summaries.items()}
+
+    def entries(rankings):
+        return [RankingEntry(**{key: e.get(key) for key in ('name', 'rank', 'stars', 'stars_today',
+                                                               'language', 'description')})
+                for e in rankings]
+
+    contexts = []
+    previous = None
+    for date_str, rankings in iter_ranking_history(base_dir):
+        current = entries(rankings)
+        if previous is not None:
+            analyses = analyze_repos(parse_trending_html(trending_html(rankings)), fetch_details=False)
+            contexts.append(build_render_context(analyses, calculate_rank_changes(current, previous),
+                                                 datetime.strptime(date_str, '%Y-%m-%d'), ai_summaries))
+        previous = current
+    return contexts
+
+
+def tree_digest(root: Path) -> str:
+    """目录下所有文件 (路径 + 内容) 的摘要"""
+    digest = hashlib.sha256()
+    for path in sorted(p for p in root.rglob('*') if p.is_file()):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run(days: int = 60, size: int = 25, workers=(1, 2, 4), seed: int = 42) -> dict:
+    """按不同进程数渲染，返回各进程数的耗时与吞吐"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            contexts = build_contexts(str(Path(tmp) / 'archive'), days, size, seed)
+        for count in workers:
+            out = Path(tmp) / f'out-{count}'
+            tasks = [(context, job) for i, context in enumerate(contexts)
+                     for job in plan_jobs(context, str(out), latest=i == len(contexts) - 1)]
+            started = time.perf_counter()
+            rendered = run_jobs(tasks, workers=count)
+            seconds = time.perf_counter() - started
+            results[count] = {
+                'jobs': len(rendered),
+                'seconds': seconds,
+                'pages_per_sec': len(rendered) / seconds,
+                'digest': tree_digest(out),
+            }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='并行渲染基准测试')
+    parser.add_argument('--days', type=int, default=60, help='回填天数')
+    parser.add_argument('--size', type=int, default=25, help='每日项目数')
+    parser.add_argument('--workers', default=f'1,2,{os.cpu_count() or 1}', help='逗号分隔的进程数')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    workers = sorted({int(w) for w in args.workers.split(',') if w})
+    print(f'⏱️ 回填 {args.days} 天 × {args.size} 个项目，进程数 {workers} (CPU {os.cpu_count()})')
+    results = run(args.days, args.size, workers, args.seed)
+
+    serial = results[workers[0]]['seconds']
+    for count, r in results.items():
+        print(f'  {count:>2} 进程: {r["jobs"]} 个页面 {r["seconds"]:7.2f} s  '
+              f'{r["pages_per_sec"]:8.1f} 页/秒  加速 {serial / r["seconds"]:.2f}x')
+    digests = {r['digest'] for r in results.values()}
+    print('✅ 各进程数输出一致' if len(digests) == 1 else '❌ 输出与进程数有关')
+    return 0 if len(digests) == 1 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""评分基准测试 - 逐个 calculate_score 与批量 score_batch 对比"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzer import calculate_score
+from src.scoring import ScoreColumns, _numpy, score_batch
+from src.scraper import Contributor, TrendingRepo
+
+
+def make_rows(n: int, seed: int = 42) -> tuple[list, list, ScoreColumns]:
+    """生成 n 行合成数据 (对象形式与列形式各一份)"""
+    rng = random.Random(seed)
+    repos, details = [], []
+    for i in range(n):
+        repos.append(TrendingRepo(
+            name=f'owner/repo{i}',
+            url='',
+            description='d' * rng.randint(0, 120),
+            language=None,
+            stars=f'{int(rng.paretovariate(0.8) * 50):,}',
+            stars_today=f'{int(rng.paretovariate(1.0) * 5):,}',
+            forks=f'{rng.randint(0, 5000):,}',
+            contributors=[Contributor('u', '')] * rng.randint(0, 5),
+        ))
+        details.append({'topics': ['t'] * rng.randint(0, 5), 'license': rng.choice([None, 'MIT'])})
+
+    columns = ScoreColumns(
+        stars_today=[int(r.stars_today.replace(',', '')) for r in repos],
+        stars=[int(r.stars.replace(',', '')) for r in repos],
+        forks=[int(r.forks.replace(',', '')) for r in repos],
+        contributors=[len(r.contributors) for r in repos],
+        long_description=[len(r.description) > 50 for r in repos],
+        topic_counts=[len(d['topics']) for d in details],
+        has_license=[bool(d['license']) for d in details],
+    )
+    return repos, details, columns
+
+
+def timed(func, repeat: int) -> float:
+    """返回最快一次的耗时 (秒)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量评分基准测试')
+    parser.add_argument('-n', type=int, default=200000, help='行数')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数')
+    args = parser.parse_args()
+
+    repos, details, columns = make_rows(args.n)
+
+    scalar = timed(lambda: [calculate_score(r, d) for r, d in zip(repos, details)], args.repeat)
+    python_batch = timed(lambda: score_batch(columns, use_numpy=False), args.repeat)
+    print(f'{args.n} rows')
+    print(f'  calculate_score loop : {scalar * 1000:9.1f} ms')
+    print(f'  score_batch (python) : {python_batch * 1000:9.1f} ms  ({scalar / python_batch:.1f}x)')
+
+    if _numpy() is not None:
+        numpy_batch = timed(lambda: score_batch(columns, use_numpy=True), args.repeat)
+        print(f'  score_batch (numpy)  : {numpy_batch * 1000:9.1f} ms  ({scalar / numpy_batch:.1f}x)')
+
+    # 校验结果一致
+    expected = [calculate_score(r, d)[0] for r, d in zip(repos, details)]
+    assert list(map(int, score_batch(columns).score)) == expected, '批量评分与 calculate_score 不一致'
+    print('  ✅ 结果与 calculate_score 一致')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""CLI 启动耗时基准测试 - 全量导入 vs 按子命令导入
+
+每次测量都在新的解释器进程中进行 (避免模块缓存)，记录导入 main 以及
+某个子命令实际需要的模块所花的时间，并列出加载了哪些重型依赖。
+EAGER 为拆分前 main.py 顶层导入的全部模块，作为对照。
+
+    python benchmarks/bench_startup.py --repeat 10
+    python -X importtime main.py --help     # 查看逐模块明细
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 拆分前 main.py 的顶层导入
+EAGER = (
+    'src.scraper', 'src.analyzer', 'src.scoring', 'src.momentum', 'src.rank_diff', 'src.generator',
+    'src.history', 'src.dashboard', 'src.ai_summary', 'src.rss', 'src.search_index', 'src.timeline',
+    'src.deep_dive', 'src.hn_scraper', 'src.hn_dashboard', 'src.profiling',
+)
+
+# 子命令 -> 执行时导入的模块 (main 本身总会导入)
+COMMANDS = {
+    'help': (),
+    'scrape': ('src.scraper', 'src.run_cache'),
+    'analyze': ('src.analyzer', 'src.scoring', 'src.momentum', 'src.rank_diff', 'src.history',
+                'src.timeline', 'src.run_cache'),
+    'summarize': ('src.ai_summary', 'src.search_index', 'src.run_cache'),
+    'render': ('src.dashboard', 'src.deep_dive', 'src.generator', 'src.run_cache'),
+    'rss': ('src.rss', 'src.run_cache'),
+    'hn': ('src.hn_refresh',),
+}
+
+# 关注的第三方重型依赖
+HEAVY_MODULES = ('requests', 'bs4', 'numpy')
+
+PROBE = '''
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+if {eager!r}:
+    for name in {modules!r}:
+        importlib.import_module(name)
+    import main
+else:
+    import main
+    for name in {modules!r}:
+        importlib.import_module(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{'ms': elapsed * 1000, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def probe(modules, eager: bool = False) -> dict:
+    """在新进程中导入 main 与给定模块，返回 {ms, heavy}"""
+    code = PROBE.format(root=str(ROOT), modules=tuple(modules), eager=eager, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True,
+                            cwd=ROOT).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(modules, repeat: int, eager: bool = False) -> dict:
+    """重复测量，返回最佳 / 中位耗时"""
+    samples = [probe(modules, eager) for _ in range(repeat)]
+    timings = [s['ms'] for s in samples]
+    return {
+        'best_ms': round(min(timings), 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'heavy': samples[0]['heavy'],
+    }
+
+
+def run(repeat: int = 5) -> dict:
+    """测量全量导入与各子命令的导入耗时"""
+    results = {'eager': measure(EAGER, repeat, eager=True)}
+    for command, modules in COMMANDS.items():
+        results[command] = measure(modules, repeat)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='CLI 启动耗时基准测试')
+    parser.add_argument('--repeat', type=int, default=5, help='每项测量的进程数')
+    parser.add_argument('--output', help='结果 JSON 输出路径')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    eager_ms = results['eager']['median_ms']
+    print(f'{"command":<12} {"best":>9} {"median":>9} {"vs eager":>9}  heavy modules')
+    for name, row in results.items():
+        ratio = f'{row["median_ms"] / eager_ms:.0%}' if name != 'eager' else '-'
+        print(f'{name:<12} {row["best_ms"]:>7.1f}ms {row["median_ms"]:>7.1f}ms {ratio:>9}  '
+              f'{", ".join(row["heavy"]) or "-"}')
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f'💾 结果已保存: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Squarified Treemap 布局基准测试 - 10k 合成项目"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.treemap import squarify
+
+
+def make_values(n: int, seed: int = 42) -> list[int]:
+    """生成长尾分布的 starsToday (少数爆款 + 大量小增长)"""
+    rng = random.Random(seed)
+    return [int(rng.paretovariate(1.2) * 20) for _ in range(n)]
+
+
+def run(n: int = 10000, repeat: int = 5, seed: int = 42) -> dict:
+    """执行布局并统计耗时与布局质量"""
+    values = make_values(n, seed)
+    timings = []
+    rects = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rects = squarify(values, 0, 0, 4000, 3000)
+        timings.append(time.perf_counter() - started)
+
+    aspects = [r.aspect for r in rects if r.area > 0]
+    total_area = sum(r.area for r in rects)
+    return {
+        'items': n,
+        'best_ms': min(timings) * 1000,
+        'median_ms': statistics.median(timings) * 1000,
+        'mean_aspect': statistics.mean(aspects),
+        'max_aspect': max(aspects),
+        'area_error': abs(total_area - 4000 * 3000) / (4000 * 3000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Squarified Treemap 布局基准测试')
+    parser.add_argument('-n', type=int, default=10000, help='项目数量')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = parser.parse_args()
+
+    for n in sorted({args.n // 100, args.n // 10, args.n}):
+        result = run(max(n, 1), args.repeat)
+        print(f"{result['items']:>7} items | best {result['best_ms']:8.2f} ms | median {result['median_ms']:8.2f} ms"
+              f" | mean aspect {result['mean_aspect']:.2f} | area error {result['area_error']:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""流水线基准测试 - 在合成存档上逐阶段计时，并与基线对比
+
+每个输入规模生成一份合成存档 (每日 N 个项目、N 条 HN 故事)，取最后两天
+作为“今天/昨天”，对每日流程的各阶段分别计时。结果保存为 JSON；提供基线时
+逐项对比，耗时超过基线 (1 + 阈值) 倍的阶段标记为回退，并以退出码 1 结束。
+
+    python benchmarks/run.py --sizes 25,100,500 --output bench.json
+    python benchmarks/run.py --save-baseline          # 写入 benchmarks/baseline.json
+    python benchmarks/run.py --threshold 0.2          # 与基线对比
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ai_summary import AISummary
+from src.cross_links import build_trending_index, match_stories
+from src.analyzer import analyze_repos
+from src.dashboard import generate_dashboard_html, generate_dashboards
+from src.deep_dive import generate_deep_dive_pages
+from src.generator import generate_markdown_with_changes
+from src.history import RankingEntry, calculate_rank_changes, iter_ranking_history
+from src.hn_dashboard import generate_hn_dashboard_html
+from src.hn_scraper import HNStory
+from src.i18n import available_locales
+from src.render_context import build_render_context
+from src.rss import generate_rss, update_feeds
+from src.scraper import parse_trending_html
+from src.synthetic import FIXTURES_DIR, SyntheticConfig, generate_archive, trending_html
+
+DEFAULT_SIZES = (25, 100, 500)
+DEFAULT_DAYS = 30
+DEFAULT_THRESHOLD = 0.2
+# 差值小于此值 (毫秒) 的视为噪声，不判定回退
+MIN_DELTA_MS = 0.5
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+STAGES = (
+    'scrape_parse', 'analyze', 'rank_changes', 'markdown', 'dashboard_zh', 'dashboard_en',
+    'dashboard_zh_en', 'dashboard_all_locales', 'deep_dive', 'deep_dive_incremental', 'rss', 'feeds', 'hn_dashboard',
+    'cross_links',
+)
+
+
+def load_inputs(base_dir: str, size: int, days: int, seed: int) -> dict:
+    """生成合成存档并准备各阶段的输入"""
+    start = date(2026, 1, 1)
+    config = SyntheticConfig(start=start, days=days, repos_per_day=size, seed=seed,
+                             summaries=True, hn=True, hn_per_day=size)
+    generate_archive(base_dir, config, workers=1)
+
+    history = list(iter_ranking_history(base_dir))
+    (yesterday_date, yesterday), (today_date, today) = history[-2:]
+
+    def entries(rankings):
+        return [RankingEntry(**{key: e.get(key) for key in ('name', 'rank', 'stars', 'stars_today',
+                                                               'language', 'description')})
+                for e in rankings]
+
+    fixtures = Path(base_dir) / FIXTURES_DIR
+    summaries = json.loads((fixtures / 'ai_summaries.json').read_text(encoding='utf-8'))
+    stories = json.loads((fixtures / 'hn' / f'{today_date}.json').read_text(encoding='utf-8'))['stories']
+    all_stories = [HNStory(**story) for path in sorted((fixtures / 'hn').glob('*.json'))
+                   for story in json.loads(path.read_text(encoding='utf-8'))['stories']]
+
+    html = trending_html(today)
+    repos = parse_trending_html(html)
+    analyses = analyze_repos(repos, fetch_details=False)
+    current, previous = entries(today), entries(yesterday)
+    return {
+        'date': datetime.strptime(today_date, '%Y-%m-%d'),
+        'html': html,
+        'repos': repos,
+        'analyses': analyses,
+        'current': current,
+        'previous': previous,
+        'rank_changes': calculate_rank_changes(current, previous),
+        'ai_summaries': {name: AISummary(**data) for name, data in summaries.items()},
+        'stories': [HNStory(**story) for story in stories],
+        'all_stories': all_stories,
+        'base_dir': base_dir,
+        'out_dir': str(Path(base_dir) / 'out'),
+    }
+
+
+def render_dashboards(inputs: dict, langs) -> dict[str, str]:
+    """共享渲染上下文生成多种语言的仪表板"""
+    context = build_render_context(inputs['analyses'], inputs['rank_changes'], inputs['date'],
+                                   inputs['ai_summaries'])
+    return generate_dashboards(context, langs)
+
+
+def update_rolling_feeds(inputs: dict) -> list[str]:
+    """并入当天条目并写出全部订阅源 (RSS、Atom、各语言与各领域)"""
+    context = build_render_context(inputs['analyses'], inputs['rank_changes'], inputs['date'])
+    return update_feeds(context, inputs['out_dir'])
+
+
+def stage_functions(inputs: dict) -> dict:
+    """阶段名 -> 无参可调用对象"""
+    day = inputs['date']
+    return {
+        'scrape_parse': lambda: parse_trending_html(inputs['html']),
+        'analyze': lambda: analyze_repos(inputs['repos'], fetch_details=False),
+        'rank_changes': lambda: calculate_rank_changes(inputs['current'], inputs['previous']),
+        'markdown': lambda: generate_markdown_with_changes(inputs['analyses'], inputs['rank_changes'], day),
+        'dashboard_zh': lambda: generate_dashboard_html(inputs['analyses'], inputs['rank_changes'], day,
+                                                        lang='zh', ai_summaries=inputs['ai_summaries']),
+        'dashboard_en': lambda: generate_dashboard_html(inputs['analyses'], inputs['rank_changes'], day,
+                                                        lang='en', ai_summaries=inputs['ai_summaries']),
+        # 与每日流程相同：构建一次渲染上下文，中英文共用
+        'dashboard_zh_en': lambda: render_dashboards(inputs, ('zh', 'en')),
+        # 全部已有消息目录的语言 (增加的只是文案替换)
+        'dashboard_all_locales': lambda: render_dashboards(inputs, available_locales()),
+        # 全量: 每次写到新目录；增量: 清单已是最新，只比较指纹
+        'deep_dive': lambda: generate_deep_dive_pages(inputs['analyses'], inputs['rank_changes'],
+                                                      inputs['ai_summaries'], base_dir=tempfile.mkdtemp(
+                                                          dir=inputs['base_dir']), date=day),
+        'deep_dive_incremental': lambda: generate_deep_dive_pages(inputs['analyses'], inputs['rank_changes'],
+                                                                  inputs['ai_summaries'],
+                                                                  base_dir=inputs['out_dir'], date=day),
+        'rss': lambda: generate_rss(inputs['analyses'], day),
+        'feeds': lambda: update_rolling_feeds(inputs),
+        'hn_dashboard': lambda: generate_hn_dashboard_html(inputs['stories'], date=day.strftime('%Y-%m-%d')),
+        # 全部 HN 历史 × 全部 Trending 历史
+        'cross_links': lambda: match_stories(inputs['all_stories'],
+                                             build_trending_index(inputs['base_dir'], day, lookback_days=None)),
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    """多次执行并统计耗时 (毫秒)；阶段自身的进度输出被丢弃"""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'best_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'runs': repeat,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, stages=STAGES, repeat: int = 5, days: int = DEFAULT_DAYS, seed: int = 42) -> dict:
+    """
+    执行基准测试
+
+    Returns:
+        {'meta': {...}, 'results': {'阶段@规模': {'best_ms', 'median_ms', 'runs'}}}
+    """
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix='trending-bench-') as base_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                inputs = load_inputs(base_dir, size, days, seed)
+            functions = stage_functions(inputs)
+            for stage in stages:
+                key = f'{stage}@{size}'
+                results[key] = measure(functions[stage], repeat)
+                print(f'  {key:<22} {results[key]["best_ms"]:10.2f} ms (median {results[key]["median_ms"]:.2f})')
+
+    return {
+        'meta': {
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'days': days,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    与基线对比 (按最快一次耗时)
+
+    Returns:
+        每个共同阶段的对比结果，regression 为 True 表示慢于基线 (1 + threshold) 倍且差值超过 MIN_DELTA_MS
+    """
+    rows = []
+    for key, result in current['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if not base or not base.get('best_ms'):
+            continue
+        ratio = result['best_ms'] / base['best_ms']
+        rows.append({
+            'stage': key,
+            'baseline_ms': base['best_ms'],
+            'current_ms': result['best_ms'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + threshold and result['best_ms'] - base['best_ms'] > MIN_DELTA_MS,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='流水线各阶段基准测试')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='每日项目数，逗号分隔')
+    parser.add_argument('--stages', default=','.join(STAGES), help='要运行的阶段，逗号分隔')
+    parser.add_argument('--repeat', type=int, default=5, help='每个阶段重复次数')
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help='合成存档天数')
+    parser.add_argument('--seed', type=int, default=42, help='合成数据种子')
+    parser.add_argument('--output', help='结果 JSON 输出路径')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help='基线 JSON 路径')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='回退阈值 (0.2 = 慢 20%%)')
+    args = parser.parse_args(argv)
+
+    stages = [s for s in args.stages.split(',') if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f'❌ 未知阶段: {", ".join(sorted(unknown))} (可选: {", ".join(STAGES)})')
+        return 2
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    print(f'⏱️ 基准测试: 规模 {sizes}，{len(stages)} 个阶段，每项 {args.repeat} 次')
+    report = run(sizes, stages, args.repeat, args.days, args.seed)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f'💾 结果已保存: {args.output}')
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f'📌 基线已保存: {args.baseline}')
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print('ℹ️ 未找到基线，跳过对比 (使用 --save-baseline 创建)')
+        return 0
+
+    rows = compare(report, json.loads(baseline_path.read_text(encoding='utf-8')), args.threshold)
+    regressions = [row for row in rows if row['regression']]
+    print(f'\n📊 与基线对比 (阈值 +{args.threshold:.0%}):')
+    for row in rows:
+        flag = '🔴' if row['regression'] else '🟢'
+        print(f'  {flag} {row["stage"]:<22} {row["baseline_ms"]:10.2f} -> {row["current_ms"]:10.2f} ms '
+              f'({row["ratio"]:.2f}x)')
+
+    if regressions:
+        print(f'❌ {len(regressions)} 个阶段性能回退')
+        return 1
+    print('✅ 无性能回退')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
-"""生成最近7天的模拟历史数据，用于演示排名变化功能"""
+"""生成模拟历史数据
 
+默认生成最近7天的演示数据 (用于演示排名变化功能)；
+--synthetic 模式生成可复现的大规模合成存档，用于性能测试:
+
+    python generate_history.py --synthetic --years 3 --repos-per-day 25 --seed 42 --output bench-archives
+"""
+
+import argparse
 import sys
 import random
-from datetime import datetime, timedelta
+from datetime import date as date_cls, datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.history import RankingEntry, save_ranking_history
-from src.dashboard import generate_dashboard_html, save_dashboard
+from src.dashboard import INDEX_ROOT, generate_dashboard_html
 from src.analyzer import RepoAnalysis
 from src.scraper import TrendingRepo
 
@@ -128,12 +135,19 @@ def create_mock_analysis(entry: RankingEntry) -> RepoAnalysis:
     )
 
 
-def main():
+def generate_demo():
+    """生成最近7天的演示数据与页面"""
     base_dir = Path(__file__).parent / 'archives'
     today = datetime.now()
 
     print("🗓️ 生成最近7天的历史数据...\n")
 
+    # 排名索引随每天生成增量追加，无需逐天重新读取昨天的文件
+    from src.rank_diff import build_rank_index, diff_rankings
+
+    rank_index = build_rank_index(str(base_dir), today - timedelta(days=6))
+    latest = None
+
     # 生成过去7天的数据
     for day_offset in range(7):
         date = today - timedelta(days=6 - day_offset)
@@ -148,11 +162,9 @@ def main():
         history_path = save_ranking_history(entries, str(base_dir), date)
         print(f"   ✅ JSON: {history_path}")
 
-        # 加载昨天数据计算变化
-        from src.history import load_yesterday_rankings, calculate_rank_changes
-
-        yesterday_entries = load_yesterday_rankings(str(base_dir), date)
-        rank_changes = calculate_rank_changes(entries, yesterday_entries)
+        # 与前一个有数据的日期对比
+        rank_changes = diff_rankings(entries, rank_index, today=date)
+        rank_index.add_day(date_str, entries)
 
         # 统计
         new_count = sum(1 for c in rank_changes if c.is_new)
@@ -164,6 +176,7 @@ def main():
         # 生成 HTML 仪表板
         analyses = [create_mock_analysis(e) for e in entries]
         html_content = generate_dashboard_html(analyses, rank_changes, date)
+        latest = (analyses, rank_changes, date)
 
         # 保存 HTML
         dir_path = base_dir / date.strftime('%Y') / date.strftime('%m')
@@ -175,14 +188,11 @@ def main():
 
         print()
 
-    # 复制最新的到 index.html
-    latest_html = base_dir / today.strftime('%Y') / today.strftime('%m') / f'{today.strftime("%Y-%m-%d")}.html'
-    if latest_html.exists():
+    # 最新一天的首页 (站内链接相对站点根目录，不能直接复制日期页面)
+    if latest is not None:
         index_path = base_dir / 'index.html'
-        with open(latest_html, 'r', encoding='utf-8') as f:
-            content = f.read()
         with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write(generate_dashboard_html(*latest, root=INDEX_ROOT))
         print(f"✅ index.html 已更新")
 
     print("\n" + "=" * 50)
@@ -193,5 +203,46 @@ def main():
     print("=" * 50)
 
 
+def generate_synthetic(args):
+    """生成大规模合成存档"""
+    from src.synthetic import SyntheticConfig, generate_archive
+
+    days = args.days or int(args.years * 365)
+    start = date_cls.fromisoformat(args.start) if args.start else date_cls.today() - timedelta(days=days - 1)
+    config = SyntheticConfig(
+        start=start, days=days, repos_per_day=args.repos_per_day, seed=args.seed,
+        summaries=args.summaries, hn=args.hn,
+    )
+
+    print(f"🧪 生成合成存档: {start} 起 {days} 天 × {args.repos_per_day} 个项目 (seed={args.seed}) -> {args.output}")
+    stats = generate_archive(args.output, config, workers=args.workers)
+    print(f"✅ {stats['days']} 天 / {stats['rows']} 行 / {stats['repos']} 个仓库，耗时 {stats['elapsed_s']}s")
+
+    if args.snapshots:
+        from src.snapshot import build_snapshots
+        print(f"📦 已写入 {len(build_snapshots(args.output))} 个月度快照")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='生成模拟历史数据')
+    parser.add_argument('--synthetic', action='store_true', help='生成大规模合成存档 (默认生成最近7天演示数据)')
+    parser.add_argument('--output', default='bench-archives', help='合成存档输出目录')
+    parser.add_argument('--years', type=float, default=1.0, help='合成年数')
+    parser.add_argument('--days', type=int, help='合成天数 (优先于 --years)')
+    parser.add_argument('--start', help='起始日期 YYYY-MM-DD，默认使结束日期为今天')
+    parser.add_argument('--repos-per-day', type=int, default=25, help='每日榜单项目数')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子 (相同参数输出逐字节一致)')
+    parser.add_argument('--workers', type=int, default=0, help='并行进程数，0 表示按 CPU 数')
+    parser.add_argument('--summaries', action='store_true', help='同时生成 AI 总结 fixture')
+    parser.add_argument('--hn', action='store_true', help='同时生成 HN 故事 fixture')
+    parser.add_argument('--snapshots', action='store_true', help='生成后构建月度二进制快照')
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        generate_synthetic(args)
+    else:
+        generate_demo()
+
+
 if __name__ == '__main__':
     main()
@@ -1,56 +1,92 @@
 #!/usr/bin/env python3
-"""GitHub Trending 每日推送 - 主入口"""
+"""GitHub Trending 每日推送 - 主入口
 
+无子命令时执行完整的每日流程；各步骤也可以作为子命令单独运行
+(scrape / analyze / summarize / render / rss / hn / rebuild)，中间结果经
+.cache/runs/ 传递。模块在用到时才导入，小任务 (如只刷新 HN) 启动更快。
+"""
+
+import argparse
+import contextlib
 import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.scraper import scrape_trending
-from src.analyzer import analyze_repos
-from src.generator import generate_markdown, save_report
-from src.history import (
-    RankingEntry, save_ranking_history, load_yesterday_rankings,
-    calculate_rank_changes, format_rank_change
-)
-from src.dashboard import generate_dashboard_html, save_dashboard
-from src.ai_summary import batch_generate_summaries
-from src.rss import generate_rss, save_rss
-from src.deep_dive import generate_deep_dive_pages
-from src.hn_scraper import fetch_top_stories, batch_translate_titles
-from src.hn_dashboard import generate_hn_dashboard_html, save_hn_dashboard
-
-
-def main():
-    """主函数"""
-    print('🚀 开始获取 GitHub Trending 数据...')
+# 只导入轻量模块；抓取、评分与渲染模块在各步骤中按需导入
+from src.profiling import DEFAULT_TOP_N, NULL_PROFILER, StageProfiler
+from src.rank_diff import DEFAULT_BEST_WINDOW, DIFF_MODES, DIFF_PREVIOUS
+
+ARCHIVES_DIR = Path(__file__).parent / 'archives'
+
+
+@dataclass
+class DailyRun:
+    """一次每日流程在各步骤之间共享的状态"""
+    today: datetime
+    base_dir: Path = ARCHIVES_DIR
+    repos: list = field(default_factory=list)
+    analyses: list = field(default_factory=list)
+    rank_changes: list = field(default_factory=list)
+    ai_summaries: dict = field(default_factory=dict)
+
+    @property
+    def cache(self):
+        from src.run_cache import RunCache
+        return RunCache(self.today)
+
+    @property
+    def new_count(self) -> int:
+        return sum(1 for c in self.rank_changes if c.is_new)
 
-    # 1. 爬取 Trending 数据
+
+def step_scrape(run: DailyRun, profiler: StageProfiler = NULL_PROFILER) -> bool:
+    """1. 爬取 Trending 数据，返回是否获取到项目"""
+    from src.scraper import scrape_trending
+
+    profiler.begin('scrape')
+    print('🚀 开始获取 GitHub Trending 数据...')
     try:
-        repos = scrape_trending()
-        print(f'✅ 成功获取 {len(repos)} 个热门项目')
+        run.repos = scrape_trending()
+        print(f'✅ 成功获取 {len(run.repos)} 个热门项目')
     except Exception as e:
         print(f'❌ 爬取失败: {e}')
         sys.exit(1)
 
-    if not repos:
+    if not run.repos:
         print('⚠️ 未获取到任何项目，退出')
-        sys.exit(0)
+        return False
+    run.cache.save_repos(run.repos)
+    return True
+
+
+def step_analyze(run: DailyRun, model, rank_diff_mode: str = DIFF_PREVIOUS,
+                 rank_window: int = DEFAULT_BEST_WINDOW, profiler: StageProfiler = NULL_PROFILER):
+    """2-5. 分析项目、计算排名变化、保存排名历史并更新时间线"""
+    from src.analyzer import analyze_repos
+    from src.history import RankingEntry, save_ranking_history
+    from src.momentum import build_momentum_index
+    from src.rank_diff import DEFAULT_LOOKBACK_DAYS, DIFF_FIRST_SEEN, build_rank_index, diff_rankings
+    from src.timeline import save_timelines
+
+    today, base_dir = run.today, run.base_dir
 
     # 2. 分析项目
+    profiler.begin('analyze')
     print('📊 正在分析项目...')
-    analyses = analyze_repos(repos, fetch_details=False)
-    print(f'✅ 分析完成，最高评分: {analyses[0].score}/10')
-
-    today = datetime.now()
-    base_dir = Path(__file__).parent / 'archives'
+    momentum_index = build_momentum_index(str(base_dir), today)
+    print(f'📈 动量索引: 近 {momentum_index.days_loaded} 天 / {len(momentum_index)} 个仓库')
+    run.analyses = analyze_repos(run.repos, fetch_details=False, model=model, momentum_index=momentum_index)
+    print(f'✅ 分析完成 (评分模型: {model.name})，最高评分: {run.analyses[0].score}/10')
 
     # 3. 创建排名条目
+    profiler.begin('rank_diff')
     print('📈 正在计算排名变化...')
     current_entries = []
-    for i, analysis in enumerate(analyses, 1):
+    for i, analysis in enumerate(run.analyses, 1):
         current_entries.append(RankingEntry(
             name=analysis.repo.name,
             rank=i,
@@ -60,22 +96,35 @@ def main():
             description=analysis.repo.description
         ))
 
-    # 4. 加载昨天数据并计算变化
-    yesterday_entries = load_yesterday_rankings(str(base_dir), today)
-    rank_changes = calculate_rank_changes(current_entries, yesterday_entries)
+    # 4. 与历史排名对比 (昨天缺失时使用最近一个有数据的日期)
+    lookback = None if rank_diff_mode == DIFF_FIRST_SEEN else max(DEFAULT_LOOKBACK_DAYS, rank_window)
+    rank_index = build_rank_index(str(base_dir), today, lookback)
+    run.rank_changes = diff_rankings(current_entries, rank_index, rank_diff_mode, today, rank_window)
 
     # 统计新上榜项目
-    new_count = sum(1 for c in rank_changes if c.is_new)
-    if yesterday_entries:
-        print(f'✅ 对比昨日数据完成: {new_count} 个新上榜项目')
+    if rank_index.last_date:
+        print(f'✅ 对比 {rank_index.last_date} 数据完成 ({rank_diff_mode}): {run.new_count} 个新上榜项目')
     else:
-        print('ℹ️ 未找到昨日数据，所有项目标记为新上榜')
+        print('ℹ️ 未找到历史数据，所有项目标记为新上榜')
 
     # 5. 保存今日排名历史
+    profiler.begin('history')
     history_path = save_ranking_history(current_entries, str(base_dir), today)
     print(f'✅ 排名数据已保存: {history_path}')
+    run.cache.save_analysis(run.analyses, run.rank_changes)
+
+    # 5.1 增量更新仓库时间线
+    profiler.begin('timeline')
+    save_timelines(str(base_dir))
+
+
+def step_summarize(run: DailyRun, profiler: StageProfiler = NULL_PROFILER):
+    """6. 生成 AI 智能总结并更新全站搜索索引"""
+    from src.ai_summary import batch_generate_summaries
+    from src.search_index import save_search_index
 
     # 6. 生成 AI 智能总结 (为 Top 10 项目生成)
+    profiler.begin('ai_summary')
     print('🤖 正在生成 AI 智能总结...')
     repos_for_ai = [
         {
@@ -86,70 +135,192 @@ def main():
             'stars_today': a.repo.stars_today,
             'topics': a.topics
         }
-        for a in analyses[:10]
+        for a in run.analyses[:10]
     ]
-    ai_summaries = batch_generate_summaries(repos_for_ai, max_count=10)
-    print(f'✅ AI 总结生成完成: {len(ai_summaries)} 个项目')
-
-    # 7. 生成 Markdown 报告 (带排名变化)
-    print('📝 正在生成 Markdown 报告...')
-    markdown_content = generate_markdown_with_changes(analyses, rank_changes, today)
-    md_path = save_report(markdown_content, base_dir=str(base_dir), date=today)
-    print(f'✅ Markdown 报告已保存: {md_path}')
-
-    # 8. 生成 HTML 仪表板 (中文版)
-    print('🎨 正在生成 HTML 仪表板...')
-    html_content_zh = generate_dashboard_html(analyses, rank_changes, today, lang='zh', ai_summaries=ai_summaries)
-    html_path_zh = save_dashboard(html_content_zh, str(base_dir), today, lang='zh')
-    print(f'✅ 中文版仪表板已保存: {html_path_zh}')
-
-    # 9. 生成 HTML 仪表板 (英文版)
-    html_content_en = generate_dashboard_html(analyses, rank_changes, today, lang='en', ai_summaries=ai_summaries)
-    html_path_en = save_dashboard(html_content_en, str(base_dir), today, lang='en')
-    print(f'✅ 英文版仪表板已保存: {html_path_en}')
-
-    # 10. 生成深度分析页面 (为新上榜项目)
-    print('📝 正在生成深度分析页面...')
-    deep_dive_files = generate_deep_dive_pages(
-        analyses, rank_changes, ai_summaries,
-        base_dir=str(base_dir), date=today, lang='zh'
-    )
-    if deep_dive_files:
-        print(f'✅ 深度分析页面已生成: {len(deep_dive_files)} 个')
+    run.ai_summaries = batch_generate_summaries(repos_for_ai, max_count=10)
+    print(f'✅ AI 总结生成完成: {len(run.ai_summaries)} 个项目')
+    run.cache.save_summaries(run.ai_summaries)
+
+    # 6.1 更新全站搜索索引 (覆盖全部历史，topics / AI 总结随当日数据合并)
+    profiler.begin('search_index')
+    print('🔎 正在构建搜索索引...')
+    search_extras = {
+        a.repo.name: {
+            'topics': a.topics,
+            'summary': run.ai_summaries[a.repo.name].summary if a.repo.name in run.ai_summaries else '',
+        }
+        for a in run.analyses
+    }
+    save_search_index(str(run.base_dir), search_extras)
+
+
+def build_run_context(run: DailyRun):
+    """构建某天的渲染上下文 (含近两天的 HN 讨论与时间线历史)"""
+    from src.cross_links import load_hn_discussions
+    from src.render_context import build_render_context
+    from src.timeline import load_timeline_summaries
+
+    names = [a.repo.name for a in run.analyses]
+    hn_links = load_hn_discussions(str(run.base_dir), names, run.today)
+    if hn_links:
+        print(f'🔗 {run.today.strftime("%Y-%m-%d")}: {len(hn_links)} 个项目在 HN 上有讨论')
+    history = load_timeline_summaries(str(run.base_dir), names)
+    return build_render_context(run.analyses, run.rank_changes, run.today, run.ai_summaries, hn_links,
+                                history=history)
+
+
+# 渲染任务类型 -> 输出说明
+RENDER_LABELS = {'markdown': 'Markdown 报告', 'dashboard': '仪表板', 'deep_dive': '深度分析页面', 'rss': 'RSS Feed'}
+LOCALE_LABELS = {'zh': '中文版', 'en': '英文版', 'ja': '日文版', 'ko': '韩文版'}
+
+
+def render_runs(runs: list[DailyRun], profiler: StageProfiler = NULL_PROFILER, workers: int = 0,
+                rss: bool = False) -> list:
+    """
+    渲染若干天的页面 (所有任务在同一个进程池中执行，最后一天写 index.html 与 RSS；
+    深度分析页面只重新生成输入变化的，完成后更新清单与索引页)
+
+    Args:
+        runs: 按日期升序的 DailyRun
+        profiler: 分阶段剖析器
+        workers: 渲染进程数，0 表示自动
+        rss: 是否生成 RSS
+
+    Returns:
+        RenderResult 列表
+    """
+    from src.deep_dive import DeepDiveManifest
+    from src.render_pool import plan_jobs, resolve_workers, run_jobs
+
+    profiler.begin('render_context')
+    tasks = []
+    manifests = {}
+    for i, run in enumerate(runs):
+        context = build_run_context(run)
+        latest = i == len(runs) - 1
+        base_dir = str(run.base_dir)
+        if base_dir not in manifests:
+            manifests[base_dir] = DeepDiveManifest.load(base_dir)
+        tasks += [(context, job) for job in plan_jobs(context, base_dir, rss=rss, latest=latest,
+                                                      deep_dives=manifests[base_dir])]
+
+    profiler.begin('render')
+    print(f'🎨 正在渲染 {len(runs)} 天的页面: {len(tasks)} 个任务，{resolve_workers(workers, len(tasks))} 个进程...')
+    results = run_jobs(tasks, workers)
+    for manifest in manifests.values():
+        manifest.save()
+
+    if len(runs) == 1:
+        deep_dives = 0
+        for result in results:
+            if result.job.kind == 'deep_dive':
+                deep_dives += 1
+                continue
+            label = RENDER_LABELS[result.job.kind]
+            for lang, paths in result.job.outputs:
+                prefix = LOCALE_LABELS.get(lang, lang) if result.job.kind == 'dashboard' else ''
+                print(f'✅ {prefix}{label}已保存: {paths[0]}')
+        total = sum(len(manifest.pages) for manifest in manifests.values())
+        if deep_dives:
+            print(f'✅ 深度分析页面已更新: {deep_dives} 个 (共 {total} 个)')
+        else:
+            print(f'ℹ️ 深度分析页面均无变化 (共 {total} 个)')
     else:
-        print('ℹ️ 无新上榜项目，未生成深度分析页面')
+        counts = {}
+        for result in results:
+            counts[result.job.kind] = counts.get(result.job.kind, 0) + len(result.job.outputs)
+        print('✅ ' + '，'.join(f'{RENDER_LABELS[kind]} {count} 个' for kind, count in counts.items()))
+    return results
+
+
+def step_render(run: DailyRun, profiler: StageProfiler = NULL_PROFILER, workers: int = 0, rss: bool = False):
+    """7-10. 生成 Markdown 报告、各语言仪表板与深度分析页面 (rss=True 时同时生成 RSS)"""
+    render_runs([run], profiler, workers, rss)
 
-    # 11. 生成 RSS Feed
+
+def step_rss(run: DailyRun, profiler: StageProfiler = NULL_PROFILER):
+    """11. 生成 RSS / Atom Feed (并入最近几天的条目)"""
+    from src.render_context import build_render_context
+    from src.rss import update_feeds
+
+    profiler.begin('rss')
     print('📡 正在生成 RSS Feed...')
-    rss_content = generate_rss(analyses, today)
-    rss_path = save_rss(rss_content, str(base_dir))
-    print(f'✅ RSS Feed 已保存: {rss_path}')
+    context = build_render_context(run.analyses, run.rank_changes, run.today)
+    paths = update_feeds(context, str(run.base_dir))
+    print(f'✅ RSS Feed 已保存: {paths[0]} 等 {len(paths)} 个订阅源')
 
-    # 12. 获取 Hacker News 数据并生成页面
-    print('📰 正在获取 Hacker News 数据...')
-    try:
-        hn_stories = fetch_top_stories(limit=30)
-        print(f'✅ 获取 {len(hn_stories)} 条 HN Stories')
 
-        # 翻译标题为中文
-        print('🌐 正在翻译 HN 标题为中文...')
-        hn_stories = batch_translate_titles(hn_stories)
+def step_hn(run: DailyRun, profiler: StageProfiler = NULL_PROFILER, limit: int = 30,
+            translate: bool = True, archive: bool = True) -> int:
+    """12. 增量刷新 Hacker News 页面，返回退出码"""
+    from src.hn_refresh import RefreshLocked, refresh_hn
 
-        # 生成 HN 页面
-        hn_html = generate_hn_dashboard_html(hn_stories, date=today.strftime('%Y-%m-%d'), lang='zh')
-        hn_path = save_hn_dashboard(hn_html, str(base_dir))
-        print(f'✅ HN 页面已保存: {hn_path}')
+    profiler.begin('hn')
+    print('📰 正在刷新 Hacker News 数据...')
+    try:
+        result = refresh_hn(str(run.base_dir), limit=limit, translate=translate, archive=archive)
+    except RefreshLocked as e:
+        print(f'⏭️ 跳过: {e}')
+        return 0
     except Exception as e:
         print(f'⚠️ HN 数据获取失败: {e}')
+        return 1
+
+    if not result.stories:
+        print('⚠️ 未获取到 HN Stories')
+        return 1
+    print(f'✅ 获取 {len(result.stories)} 条 HN Stories '
+          f'(请求 {result.fetched} 条，复用缓存 {result.reused} 条，新翻译 {result.translated} 条，'
+          f'关联 Trending 仓库 {result.cross_links} 条)')
+    print(f'✅ HN 页面已保存: {result.path}' if result.written else 'ℹ️ HN 页面无变化')
+    if result.archive_path:
+        print(f'🗂️ HN 快照已存档: {result.archive_path}，更新 {len(result.best_of_pages)} 个 Best of 页面')
+    return 0
+
+
+def load_model(scoring_model: str = None):
+    """加载评分模型，未知模型时退出"""
+    from src.scoring import get_model
+
+    try:
+        return get_model(scoring_model)
+    except KeyError as e:
+        print(f'❌ {e.args[0]}')
+        sys.exit(1)
+
+
+def main(scoring_model: str = None, rank_diff_mode: str = DIFF_PREVIOUS,
+         rank_window: int = DEFAULT_BEST_WINDOW, profiler: StageProfiler = NULL_PROFILER):
+    """
+    主函数 (完整的每日流程)
+
+    Args:
+        scoring_model: 评分模型名，默认读取 TRENDING_SCORING_MODEL 或配置中的 default
+        rank_diff_mode: 排名对比模式 (previous / best / first_seen)
+        rank_window: best 模式的窗口天数
+        profiler: 分阶段剖析器，默认不剖析
+    """
+    from src.history import format_rank_change
+
+    model = load_model(scoring_model)
+    run = DailyRun(today=datetime.now())
+
+    if not step_scrape(run, profiler):
+        sys.exit(0)
+    step_analyze(run, model, rank_diff_mode, rank_window, profiler)
+    step_summarize(run, profiler)
+    step_render(run, profiler, rss=True)
+    step_hn(run, profiler)
 
     # 13. 输出摘要
+    profiler.finish()
     print('\n' + '=' * 50)
-    print(f'📅 日期: {today.strftime("%Y-%m-%d")}')
-    print(f'📊 收录项目: {len(repos)} 个')
-    print(f'🆕 新上榜: {new_count} 个')
+    print(f'📅 日期: {run.today.strftime("%Y-%m-%d")}')
+    print(f'📊 收录项目: {len(run.repos)} 个')
+    print(f'🆕 新上榜: {run.new_count} 个')
     print('\n🏆 Top 5 推荐:')
-    for i, analysis in enumerate(analyses[:5], 1):
-        change = next((c for c in rank_changes if c.name == analysis.repo.name), None)
+    for i, analysis in enumerate(run.analyses[:5], 1):
+        change = next((c for c in run.rank_changes if c.name == analysis.repo.name), None)
         change_str = format_rank_change(change) if change else ''
         print(f'  {i}. {analysis.repo.name} (⭐ {analysis.score}/10) {change_str}')
     print('=' * 50)
@@ -157,126 +328,245 @@ def main():
     return 0
 
 
-def generate_markdown_with_changes(analyses, rank_changes, date):
-    """生成带排名变化的 Markdown 报告"""
-    from src.generator import format_stars, score_to_stars, get_target_audience
-
-    date_str = date.strftime('%Y-%m-%d')
-
-    # 创建 name -> RankChange 映射
-    change_map = {c.name: c for c in rank_changes}
-
-    # 按评分排序
-    sorted_analyses = sorted(analyses, key=lambda x: x.score, reverse=True)
-
-    # 统计语言分布
-    lang_count = {}
-    for a in analyses:
-        lang = a.repo.language or 'Other'
-        lang_count[lang] = lang_count.get(lang, 0) + 1
-
-    top_langs = sorted(lang_count.items(), key=lambda x: x[1], reverse=True)[:5]
-    lang_summary = ' | '.join(f'{lang}: {count}' for lang, count in top_langs)
+def parse_args(argv=None):
+    """解析命令行参数 (无子命令时执行每日流程)"""
+    parser = argparse.ArgumentParser(description='GitHub Trending 每日推送')
+    parser.add_argument('--scoring-model', help='评分模型 (见 config/scoring_models.json)')
+    parser.add_argument('--rank-diff', choices=DIFF_MODES, default=DIFF_PREVIOUS,
+                        help='排名对比模式: 最近可用日 / 近 N 天最佳 / 首次上榜')
+    parser.add_argument('--rank-window', type=int, default=DEFAULT_BEST_WINDOW, help='best 模式的窗口天数')
+    fixture_group = parser.add_mutually_exclusive_group()
+    fixture_group.add_argument('--record', metavar='PATH', help='把本次运行的全部 HTTP 请求录制到 fixture 文件')
+    fixture_group.add_argument('--replay', metavar='PATH', help='从 fixture 文件回放 HTTP 响应 (不访问网络)')
+    parser.add_argument('--replay-latency', type=float, default=0, metavar='MS', help='回放时每个响应注入的延迟 (毫秒)')
+    parser.add_argument('--replay-jitter', type=float, default=0, metavar='MS', help='回放延迟的随机抖动上限 (毫秒)')
+    parser.add_argument('--replay-recorded-latency', action='store_true', help='回放时使用录制时的真实耗时')
+    parser.add_argument('--profile', action='store_true', help='用 cProfile 剖析每个阶段')
+    parser.add_argument('--trace-memory', action='store_true', help='用 tracemalloc 统计每个阶段的内存分配')
+    parser.add_argument('--profile-dir', help='剖析报告目录，默认 profiles/<时间戳>')
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP_N, help='每个阶段显示的热点函数数')
+    subparsers = parser.add_subparsers(dest='command')
+
+    # 每日流程的单个步骤 (中间结果经 .cache/runs/<日期>/ 传递)
+    subparsers.add_parser('scrape', help='只抓取 Trending 并写入运行缓存')
+    step_parsers = {}
+    for name, help_text in (('analyze', '分析缓存中的抓取结果并更新排名历史'),
+                            ('summarize', '为缓存中的分析结果生成 AI 总结与搜索索引'),
+                            ('render', '从运行缓存生成 Markdown 报告、仪表板与深度分析页面'),
+                            ('rss', '从运行缓存生成 RSS Feed')):
+        step_parsers[name] = subparsers.add_parser(name, help=help_text)
+        step_parsers[name].add_argument('--date', help='运行缓存日期 YYYY-MM-DD，默认今天')
+    step_parsers['render'].add_argument('--since', help='回填: 渲染从该日期到 --date 的所有运行缓存')
+    step_parsers['render'].add_argument('--workers', type=int, default=0,
+                                        help='渲染进程数，默认自动 (任务较少时串行，否则使用全部核)')
+    hn_parser = subparsers.add_parser('hn', help='增量刷新 Hacker News 页面 (可独立高频运行)')
+    hn_parser.add_argument('--limit', type=int, default=30, help='故事数量')
+    hn_parser.add_argument('--no-translate', action='store_true', help='不翻译标题')
+    hn_parser.add_argument('--no-archive', action='store_true', help='不记录历史快照、不更新 Best of 页面')
+    rebuild_parser = subparsers.add_parser('rebuild', help='全量重建时间线、搜索索引、月度快照与 HN Best of 页面，并重新渲染')
+    rebuild_parser.add_argument('--date', help='重新渲染的运行缓存日期 YYYY-MM-DD，默认今天')
+
+    serve_parser = subparsers.add_parser('serve', help='启动本地静态预览服务器')
+    serve_parser.add_argument('--dir', default=str(ARCHIVES_DIR), help='站点根目录')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    serve_parser.add_argument('--port', type=int, default=8000, help='监听端口')
+    serve_parser.add_argument('--precompress', action='store_true', help='启动前生成 .gz 预压缩文件')
+
+    timeline_parser = subparsers.add_parser('timeline', help='生成仓库时间线 (默认增量)')
+    timeline_parser.add_argument('--dir', default=str(ARCHIVES_DIR), help='存档目录')
+    timeline_parser.add_argument('--full', action='store_true', help='全量重建')
+
+    snapshot_parser = subparsers.add_parser('snapshot', help='从每日 JSON 重建月度二进制快照')
+    snapshot_parser.add_argument('--dir', default=str(ARCHIVES_DIR), help='存档目录')
+
+    compact_parser = subparsers.add_parser('compact', help='压缩已结束月份的存档')
+    compact_parser.add_argument('--dir', default=str(ARCHIVES_DIR), help='存档目录')
+    compact_parser.add_argument('--html', action='store_true', help='同时打包每日 HTML 页面')
+
+    rescore_parser = subparsers.add_parser('rescore', help='用评分模型批量重算历史排名')
+    rescore_parser.add_argument('--dir', default=str(ARCHIVES_DIR), help='存档目录')
+    rescore_parser.add_argument('--models', help='逗号分隔的模型名，默认全部')
+    rescore_parser.add_argument('--start', help='起始日期 YYYY-MM-DD')
+    rescore_parser.add_argument('--end', help='结束日期 YYYY-MM-DD')
+    rescore_parser.add_argument('--top', type=int, default=10, help='每日保留前 N 名')
+    rescore_parser.add_argument('--output', help='报告输出路径 (JSON)')
+
+    return parser.parse_args(argv)
+
+
+def load_cached_run(date: str = None, summaries: bool = False) -> DailyRun:
+    """
+    从运行缓存恢复某天的分析结果
+
+    Args:
+        date: 日期 YYYY-MM-DD，默认今天
+        summaries: 是否同时读取 AI 总结
+
+    Returns:
+        DailyRun，缓存不存在时退出
+    """
+    run = DailyRun(today=datetime.strptime(date, '%Y-%m-%d') if date else datetime.now())
+    cached = run.cache.load_analysis()
+    if cached is None:
+        print(f'❌ 未找到 {run.today.strftime("%Y-%m-%d")} 的分析缓存，请先运行 scrape 与 analyze')
+        sys.exit(1)
+    run.analyses, run.rank_changes = cached
+    run.repos = [a.repo for a in run.analyses]
+    if summaries:
+        run.ai_summaries = run.cache.load_summaries()
+    return run
+
+
+def run_step(args, profiler: StageProfiler = NULL_PROFILER) -> int:
+    """执行单个步骤子命令"""
+    command = args.command
+
+    if command == 'scrape':
+        run = DailyRun(today=datetime.now())
+        return 0 if step_scrape(run, profiler) else 1
+
+    if command == 'analyze':
+        model = load_model(args.scoring_model)
+        run = DailyRun(today=datetime.strptime(args.date, '%Y-%m-%d') if args.date else datetime.now())
+        run.repos = run.cache.load_repos()
+        if not run.repos:
+            print(f'❌ 未找到 {run.today.strftime("%Y-%m-%d")} 的抓取缓存，请先运行 scrape')
+            return 1
+        step_analyze(run, model, args.rank_diff, args.rank_window, profiler)
+        return 0
+
+    if command == 'summarize':
+        step_summarize(load_cached_run(args.date), profiler)
+        return 0
+
+    if command == 'render':
+        if args.since:
+            return backfill(args.since, args.date, args.workers, profiler)
+        step_render(load_cached_run(args.date, summaries=True), profiler, args.workers)
+        return 0
+
+    if command == 'rss':
+        step_rss(load_cached_run(args.date), profiler)
+        return 0
+
+    if command == 'hn':
+        return step_hn(DailyRun(today=datetime.now()), profiler, args.limit, not args.no_translate,
+                       not args.no_archive)
+
+    raise ValueError(f'未知步骤: {command}')
+
+
+def backfill(since: str, until: str = None, workers: int = 0, profiler: StageProfiler = NULL_PROFILER) -> int:
+    """从运行缓存批量重新渲染一段日期的页面"""
+    from src.run_cache import cached_dates
+
+    until = until or datetime.now().strftime('%Y-%m-%d')
+    dates = cached_dates(since, until)
+    if not dates:
+        print(f'❌ {since} ~ {until} 没有运行缓存')
+        return 1
+    runs = [load_cached_run(date, summaries=True) for date in dates]
+    render_runs(runs, profiler, workers)
+    return 0
 
-    # 统计新上榜
-    new_count = sum(1 for c in rank_changes if c.is_new)
 
-    lines = [
-        f'# GitHub Trending 每日精选 ({date_str})',
-        '',
-        f'> 🔥 今日共收录 **{len(analyses)}** 个热门项目 | 🆕 新上榜 **{new_count}** 个',
-        f'>',
-        f'> 📊 语言分布: {lang_summary}',
-        '',
-        '---',
-        '',
-    ]
+def rebuild(date: str = None, profiler: StageProfiler = NULL_PROFILER) -> int:
+    """全量重建派生数据 (时间线、搜索索引、月度快照、HN Best of 页面)，有运行缓存时重新渲染页面"""
+    from src.hn_history import update_best_of_pages
+    from src.search_index import save_search_index
+    from src.snapshot import build_snapshots
+    from src.timeline import save_timelines
+
+    base_dir = str(ARCHIVES_DIR)
+    profiler.begin('timeline')
+    save_timelines(base_dir, full=True)
+    profiler.begin('search_index')
+    save_search_index(base_dir)
+    profiler.begin('snapshot')
+    written = build_snapshots(base_dir)
+    print(f'✅ 已生成 {len(written)} 个月度快照')
+    profiler.begin('hn_best_of')
+    pages = update_best_of_pages(base_dir, full=True)
+    print(f'✅ 已生成 {len(pages)} 个 HN Best of 页面')
+
+    run = DailyRun(today=datetime.strptime(date, '%Y-%m-%d') if date else datetime.now())
+    if run.cache.load_analysis() is None:
+        print(f'ℹ️ 无 {run.today.strftime("%Y-%m-%d")} 的运行缓存，跳过页面渲染')
+        return 0
+    run = load_cached_run(date, summaries=True)
+    step_render(run, profiler, rss=True)
+    return 0
 
-    # 新上榜项目 Banner
-    new_projects = [(a, change_map.get(a.repo.name)) for a in sorted_analyses
-                    if change_map.get(a.repo.name) and change_map.get(a.repo.name).is_new]
-
-    if new_projects:
-        lines.extend([
-            '## 🆕 今日新上榜',
-            '',
-        ])
-        for analysis, change in new_projects[:5]:
-            repo = analysis.repo
-            desc = repo.description[:60] + '...' if len(repo.description) > 60 else repo.description
-            lines.append(f'- **[{repo.name}]({repo.url})** - {desc} ⭐ {format_stars(repo.stars)} (+{repo.stars_today})')
-        lines.extend(['', '---', ''])
-
-    # Top 3 推荐
-    lines.extend([
-        '## 🏆 今日重点推荐',
-        '',
-    ])
-
-    medals = ['🥇', '🥈', '🥉']
-    for i, analysis in enumerate(sorted_analyses[:3]):
-        repo = analysis.repo
-        change = change_map.get(repo.name)
-        change_str = format_rank_change(change) if change else ''
 
-        # 格式化语言
-        if analysis.language_stats:
-            lang_parts = [f'{lang} {pct:.0f}%' for lang, pct in list(analysis.language_stats.items())[:3]]
-            lang_display = ', '.join(lang_parts)
-        elif repo.language:
-            lang_display = f'{repo.language} 100%'
+def cli(argv=None):
+    """命令行入口"""
+    args = parse_args(argv)
+
+    if args.command == 'serve':
+        from src.server import serve
+        serve(args.dir, args.host, args.port, precompress=args.precompress)
+        return 0
+
+    if args.command == 'timeline':
+        from src.timeline import save_timelines
+        save_timelines(args.dir, full=args.full)
+        return 0
+
+    if args.command == 'snapshot':
+        from src.snapshot import build_snapshots
+        written = build_snapshots(args.dir)
+        print(f'✅ 已生成 {len(written)} 个月度快照')
+        return 0
+
+    if args.command == 'compact':
+        from src.compaction import compact_archives
+        from src.hn_history import get_hn_archive_dir
+        results = compact_archives(args.dir, html_pages=args.html)
+        # HN 快照存档使用相同的目录结构
+        results += compact_archives(str(get_hn_archive_dir(args.dir)))
+        print(f'✅ 已检查 {len(results)} 个月份')
+        return 0
+
+    if args.command == 'rescore':
+        from src.rescore import print_rescore_summary, rescore_history, save_rescore_report
+        model_names = [m.strip() for m in args.models.split(',') if m.strip()] if args.models else None
+        try:
+            report = rescore_history(args.dir, model_names, args.start, args.end, top_n=args.top)
+        except KeyError as e:
+            print(f'❌ {e.args[0]}')
+            return 1
+        print_rescore_summary(report)
+        if args.output:
+            print(f'💾 报告已保存: {save_rescore_report(report, args.output)}')
+        return 0
+
+    profiler = NULL_PROFILER
+    if args.profile or args.trace_memory:
+        profiler = StageProfiler(args.profile_dir, args.profile, args.trace_memory, args.profile_top)
+
+    context = contextlib.nullcontext()
+    if args.record or args.replay:
+        from src.http_fixtures import record_http, replay_http
+        if args.record:
+            context = record_http(args.record)
+        elif not Path(args.replay).is_file():
+            print(f'❌ fixture 文件不存在: {args.replay}')
+            return 1
         else:
-            lang_display = '未知'
-
-        star_display = score_to_stars(analysis.score)
-        audience = get_target_audience(analysis)
-
-        lines.extend([
-            f'### {medals[i]} [{repo.name}]({repo.url})',
-            f'> {analysis.readme_summary}' if analysis.readme_summary else '',
-            '',
-            '| 指标 | 数值 |',
-            '|------|------|',
-            f'| ⭐ Star | {format_stars(repo.stars)} |',
-            f'| 📈 今日新增 | +{repo.stars_today} |',
-            f'| 📊 排名变化 | {change_str} |',
-            f'| 🔧 主要语言 | {lang_display} |',
-            f'| 📊 推荐指数 | {star_display} ({analysis.score}/10) |',
-            '',
-            f'**核心功能**: {analysis.readme_summary[:100]}' if analysis.readme_summary else '',
-            f'**技术栈**: {", ".join(analysis.tech_stack) if analysis.tech_stack else lang_display}',
-            f'**适合人群**: {audience}',
-            '',
-            '---',
-            '',
-        ])
-
-    # 完整列表
-    lines.extend([
-        '## 📋 完整列表',
-        '',
-        '| # | 项目 | 语言 | Star | 今日 | 变化 | 评分 |',
-        '|---|------|------|------|------|------|------|',
-    ])
-
-    for i, analysis in enumerate(sorted_analyses, 1):
-        repo = analysis.repo
-        change = change_map.get(repo.name)
-        change_str = format_rank_change(change) if change else '-'
-        lang = repo.language or '未知'
-        lines.append(f'| {i} | [{repo.name}]({repo.url}) | {lang} | {format_stars(repo.stars)} | +{repo.stars_today} | {change_str} | {analysis.score}/10 |')
-
-    lines.extend([
-        '',
-        '---',
-        '',
-        f'📅 更新时间: {date.strftime("%Y-%m-%d %H:%M:%S")}',
-        '',
-        '> 本报告由 [GitHub Trending Daily](https://github.com) 自动生成',
-    ])
-
-    return '\n'.join(line for line in lines if line is not None)
+            context = replay_http(args.replay, args.replay_latency, args.replay_jitter,
+                                  args.replay_recorded_latency)
+
+    try:
+        with context:
+            if args.command == 'rebuild':
+                return rebuild(args.date, profiler)
+            if args.command:
+                return run_step(args, profiler)
+            return main(args.scoring_model, args.rank_diff, args.rank_window, profiler)
+    finally:
+        # 提前退出时也写入已完成阶段的报告
+        profiler.finish()
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(cli())
@@ -2,7 +2,6 @@
 
 import os
 import re
-import requests
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -46,6 +45,8 @@ def fetch_readme(repo_name: str, max_length: int = 16000) -> Optional[str]:
     Returns:
         README 内容文本，失败返回 None
     """
+    import requests  # 按需导入，渲染命令只需要 AISummary
+
     # 尝试常见的 README 文件名
     readme_files = ['README.md', 'readme.md', 'README', 'readme', 'README.rst']
 
@@ -112,6 +113,8 @@ def generate_summary(repo_name: str, description: str, language: str,
     Returns:
         AISummary 对象，失败返回 None
     """
+    import requests
+
     if not description:
         description = "无描述"
 
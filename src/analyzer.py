@@ -1,10 +1,10 @@
 """项目分析模块"""
 
-import requests
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from typing import Optional
 from .scraper import TrendingRepo
+from .momentum import Momentum, MomentumIndex
+from .scoring import ScoringModel, parse_int, score_repos
 
 
 @dataclass
@@ -18,6 +18,10 @@ class RepoAnalysis:
     tech_stack: list[str]
     score: int  # 推荐评分 1-10
     score_details: dict[str, int]  # 各维度评分
+    star_velocity: float = 0.0  # 近几日平均每日新增 Star
+    star_acceleration: float = 0.0  # 每日新增 Star 的变化斜率
+    days_on_list: int = 1  # 近几日上榜天数 (含当天)
+    rank_trend: float = 0.0  # 排名每日上升名次
 
 
 def fetch_repo_details(repo_url: str, headers: dict) -> dict:
@@ -31,6 +35,10 @@ def fetch_repo_details(repo_url: str, headers: dict) -> dict:
     Returns:
         包含语言统计、topics、license 等信息的字典
     """
+    # 按需导入：只渲染页面的命令不加载网络与 HTML 解析库
+    import requests
+    from bs4 import BeautifulSoup
+
     result = {
         'language_stats': {},
         'topics': [],
@@ -87,116 +95,26 @@ def fetch_repo_details(repo_url: str, headers: dict) -> dict:
     return result
 
 
-def calculate_score(repo: TrendingRepo, details: dict) -> tuple[int, dict[str, int]]:
+def calculate_score(repo: TrendingRepo, details: dict,
+                    model: Optional[ScoringModel] = None) -> tuple[int, dict[str, int]]:
     """
     计算推荐评分
 
-    评分维度:
+    评分维度 (阈值与权重见 config/scoring_models.json):
     - star_growth: Star 增长速度 (今日新增)
     - popularity: 项目热度 (总 Star 数)
     - documentation: 文档完整度 (基于 topics 和描述)
     - community: 社区参与度 (贡献者数、forks)
 
+    Args:
+        repo: TrendingRepo 对象
+        details: 详情字典 (topics / license)
+        model: 评分模型，默认为当前选中的模型
+
     Returns:
         (总分, 各维度评分字典)
     """
-    scores = {}
-
-    # Star 增长速度 (1-10)
-    try:
-        stars_today = int(repo.stars_today.replace(',', '').replace(',', ''))
-    except (ValueError, AttributeError):
-        stars_today = 0
-
-    if stars_today >= 500:
-        scores['star_growth'] = 10
-    elif stars_today >= 300:
-        scores['star_growth'] = 9
-    elif stars_today >= 200:
-        scores['star_growth'] = 8
-    elif stars_today >= 100:
-        scores['star_growth'] = 7
-    elif stars_today >= 50:
-        scores['star_growth'] = 6
-    elif stars_today >= 30:
-        scores['star_growth'] = 5
-    elif stars_today >= 20:
-        scores['star_growth'] = 4
-    elif stars_today >= 10:
-        scores['star_growth'] = 3
-    else:
-        scores['star_growth'] = 2
-
-    # 项目热度 (1-10)
-    try:
-        total_stars = int(repo.stars.replace(',', '').replace(',', '').replace('k', '000'))
-    except (ValueError, AttributeError):
-        total_stars = 0
-
-    if total_stars >= 50000:
-        scores['popularity'] = 10
-    elif total_stars >= 20000:
-        scores['popularity'] = 9
-    elif total_stars >= 10000:
-        scores['popularity'] = 8
-    elif total_stars >= 5000:
-        scores['popularity'] = 7
-    elif total_stars >= 2000:
-        scores['popularity'] = 6
-    elif total_stars >= 1000:
-        scores['popularity'] = 5
-    elif total_stars >= 500:
-        scores['popularity'] = 4
-    elif total_stars >= 100:
-        scores['popularity'] = 3
-    else:
-        scores['popularity'] = 2
-
-    # 文档完整度 (1-10)
-    doc_score = 5  # 基础分
-    if repo.description and len(repo.description) > 50:
-        doc_score += 1
-    if details.get('topics') and len(details['topics']) >= 3:
-        doc_score += 2
-    if details.get('license'):
-        doc_score += 1
-    scores['documentation'] = min(doc_score, 10)
-
-    # 社区参与度 (1-10)
-    try:
-        forks = int(repo.forks.replace(',', '').replace(',', ''))
-    except (ValueError, AttributeError):
-        forks = 0
-
-    contrib_count = len(repo.contributors)
-
-    community_score = 4  # 基础分
-    if forks >= 1000:
-        community_score += 3
-    elif forks >= 500:
-        community_score += 2
-    elif forks >= 100:
-        community_score += 1
-
-    if contrib_count >= 5:
-        community_score += 2
-    elif contrib_count >= 3:
-        community_score += 1
-
-    scores['community'] = min(community_score, 10)
-
-    # 计算总分 (加权平均)
-    weights = {
-        'star_growth': 0.35,
-        'popularity': 0.25,
-        'documentation': 0.20,
-        'community': 0.20
-    }
-
-    total = sum(scores[k] * weights[k] for k in scores)
-    final_score = round(total)
-
-    return final_score, scores
+    return score_repos([repo], [details], model)[0]
 
 
 def identify_tech_stack(repo: TrendingRepo, details: dict) -> list[str]:
@@ -238,16 +156,16 @@ def identify_tech_stack(repo: TrendingRepo, details: dict) -> list[str]:
     return tech_stack[:6]  # 最多返回6个
 
 
-def analyze_repo(repo: TrendingRepo, fetch_details: bool = True) -> RepoAnalysis:
+def collect_details(repo: TrendingRepo, fetch_details: bool = True) -> dict:
     """
-    分析单个仓库
+    获取仓库详情 (语言统计、topics、license)
 
     Args:
         repo: TrendingRepo 对象
         fetch_details: 是否获取详情页信息
 
     Returns:
-        RepoAnalysis 分析结果
+        详情字典
     """
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
@@ -263,7 +181,12 @@ def analyze_repo(repo: TrendingRepo, fetch_details: bool = True) -> RepoAnalysis
     if not details['language_stats'] and repo.language:
         details['language_stats'] = {repo.language: 100.0}
 
-    score, score_details = calculate_score(repo, details)
+    return details
+
+
+def build_analysis(repo: TrendingRepo, details: dict, score: int, score_details: dict[str, int],
+                   momentum: Optional[Momentum] = None) -> RepoAnalysis:
+    """由详情、评分与动量指标组装 RepoAnalysis"""
     tech_stack = identify_tech_stack(repo, details)
 
     # 生成简短摘要
@@ -277,25 +200,55 @@ def analyze_repo(repo: TrendingRepo, fetch_details: bool = True) -> RepoAnalysis
         readme_summary=readme_summary,
         tech_stack=tech_stack,
         score=score,
-        score_details=score_details
+        score_details=score_details,
+        **(vars(momentum) if momentum else {})
     )
 
 
-def analyze_repos(repos: list[TrendingRepo], fetch_details: bool = False) -> list[RepoAnalysis]:
+def analyze_repo(repo: TrendingRepo, fetch_details: bool = True,
+                 model: Optional[ScoringModel] = None) -> RepoAnalysis:
     """
-    批量分析仓库
+    分析单个仓库
+
+    Args:
+        repo: TrendingRepo 对象
+        fetch_details: 是否获取详情页信息
+        model: 评分模型，默认为当前选中的模型
+
+    Returns:
+        RepoAnalysis 分析结果
+    """
+    details = collect_details(repo, fetch_details)
+    score, score_details = calculate_score(repo, details, model)
+    return build_analysis(repo, details, score, score_details)
+
+
+def analyze_repos(repos: list[TrendingRepo], fetch_details: bool = False,
+                  model: Optional[ScoringModel] = None,
+                  momentum_index: Optional[MomentumIndex] = None) -> list[RepoAnalysis]:
+    """
+    批量分析仓库 (评分一次性批量计算，结果与 calculate_score 一致)
 
     Args:
         repos: TrendingRepo 列表
         fetch_details: 是否获取详情页（注意：开启会增加请求数量）
+        model: 评分模型，默认为当前选中的模型
+        momentum_index: 近几日历史索引，提供时计算动量指标并作为评分输入
 
     Returns:
         RepoAnalysis 列表
     """
-    analyses = []
-    for repo in repos:
-        analysis = analyze_repo(repo, fetch_details=fetch_details)
-        analyses.append(analysis)
+    details_list = [collect_details(repo, fetch_details) for repo in repos]
+
+    momenta = None
+    if momentum_index is not None:
+        momenta = [momentum_index.lookup(repo.name, parse_int(repo.stars_today)) for repo in repos]
+    scores = score_repos(repos, details_list, model, momenta)
+
+    analyses = [
+        build_analysis(repo, details, score, score_details, momenta[i] if momenta else None)
+        for i, (repo, details, (score, score_details)) in enumerate(zip(repos, details_list, scores))
+    ]
 
     # 按评分排序
     analyses.sort(key=lambda x: x.score, reverse=True)
@@ -0,0 +1,99 @@
+"""关键词分类器 - 单个预编译正则，按类别优先级返回
+
+所有类别的关键词按公共前缀合并为一个正则 (前缀树展开，避免逐个尝试候选)，
+对文本扫描一次：命中优先级最高的类别时立即返回，否则取全部命中中优先级最高者。
+
+单词边界只看字母 (数字、连字符、下划线、斜杠都算边界，llama3 / gpt-4o 仍能命中)：
+- 关键词必须出现在单词开头
+- 不超过 SHORT_KEYWORD_LEN 个字符的关键词必须是完整单词 (可带复数 s)，
+  避免 'ai' 命中 'mail'、'cli' 命中 'client'
+- 更长的关键词匹配单词开头 ('agent' 命中 'agents' / 'agentic')
+"""
+
+import re
+from typing import Iterable, Optional, Sequence
+
+# 不超过此长度的关键词要求完整单词
+SHORT_KEYWORD_LEN = 3
+
+# 关键词左边界: 前一个字符不是字母
+LEFT_BOUNDARY = r'(?<![a-z])'
+
+
+def normalize_keyword(keyword: str) -> str:
+    """关键词规范化: 小写、空白折叠为单个空格"""
+    return ' '.join(keyword.lower().split())
+
+
+def _keyword_tail(keyword: str) -> str:
+    """关键词结尾的正则 (短关键词要求完整单词)"""
+    if len(keyword) <= SHORT_KEYWORD_LEN and keyword[-1:].isalpha():
+        return r's?(?![a-z])'
+    return ''
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    把关键词按公共前缀展开为正则 (不含左边界)
+
+    较长的分支排在前面，关键词本身结束的分支最后尝试，保证匹配最长的关键词。
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = keyword
+
+    def emit(node: dict) -> str:
+        branches = [(r'\s+' if ch == ' ' else re.escape(ch)) + emit(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if '' in node:
+            branches.append(_keyword_tail(node['']))
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return emit(trie) if trie else ''
+
+
+class KeywordClassifier:
+    """
+    按优先级的关键词分类器
+
+    Args:
+        rules: [(类别, 关键词列表)]，靠前的类别优先
+    """
+
+    def __init__(self, rules: Sequence[tuple[str, Iterable[str]]]):
+        self.categories = [category for category, _ in rules]
+        # 关键词 -> 优先级 (重复关键词归属靠前的类别)
+        self.priorities: dict[str, int] = {}
+        for priority, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                keyword = normalize_keyword(keyword)
+                if keyword:
+                    self.priorities.setdefault(keyword, priority)
+        body = trie_pattern(self.priorities)
+        self.pattern = re.compile(LEFT_BOUNDARY + body) if body else None
+
+    def _priority(self, matched: str) -> int:
+        keyword = normalize_keyword(matched)
+        priority = self.priorities.get(keyword)
+        if priority is None:
+            # 短关键词的复数形式
+            priority = self.priorities[keyword[:-1]]
+        return priority
+
+    def classify(self, text: str) -> Optional[str]:
+        """返回命中的最高优先级类别，未命中返回 None"""
+        if self.pattern is None or not text:
+            return None
+        best = None
+        for match in self.pattern.finditer(text.lower()):
+            priority = self._priority(match.group())
+            if priority == 0:
+                return self.categories[0]
+            if best is None or priority < best:
+                best = priority
+        return self.categories[best] if best is not None else None
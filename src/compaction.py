@@ -0,0 +1,309 @@
+"""存档压缩任务 - 把已结束月份的每日文件合并为压缩归档
+
+- 每日排名 JSON 合并为 YYYY-MM.rollup (见 rollup.py)，校验后删除原文件
+- 可选: 每日 HTML 页面打包为 YYYY-MM.html.bundle (逐页 gzip 拼接)，
+  原页面替换为跳转到月度索引页的小文件，索引页按需 Range 读取并解压
+"""
+
+import gzip
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .fileio import atomic_write_bytes, atomic_write_text
+from .history import HISTORY_FILE_PATTERN
+from .rollup import open_rollup, write_rollup
+
+BUNDLE_SUFFIX = '.html.bundle'
+MANIFEST_SUFFIX = '.bundle.json'
+
+# 每日页面: YYYY-MM-DD.html / YYYY-MM-DD_en.html
+PAGE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})(_[a-z]{2})?\.html$')
+
+# 跳转页标记 (已打包的页面)
+STUB_MARKER = '<!-- archived-in-bundle -->'
+
+
+@dataclass
+class CompactionResult:
+    """单个月份的压缩结果"""
+    month: str
+    days: int = 0
+    json_removed: int = 0
+    json_bytes: int = 0
+    rollup_bytes: int = 0
+    pages: int = 0
+    html_bytes: int = 0
+    bundle_bytes: int = 0
+    written: list[str] = field(default_factory=list)
+
+
+def finished_months(base_dir: str = 'archives', today: Optional[datetime] = None) -> list[tuple[int, int]]:
+    """早于当前月份的全部存档月份 (升序)"""
+    today = today or datetime.now()
+    base_path = Path(base_dir)
+    if not base_path.exists():
+        return []
+
+    months = []
+    for year_dir in sorted(p for p in base_path.iterdir() if p.is_dir() and p.name.isdigit()):
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+            key = (int(year_dir.name), int(month_dir.name))
+            if key < (today.year, today.month):
+                months.append(key)
+    return months
+
+
+def rollup_month(base_dir: str, year: int, month: int, result: CompactionResult) -> None:
+    """合并每日 JSON 到月度归档 (已有归档时合并，同一天以 JSON 为准)"""
+    month_dir = Path(base_dir) / f'{year:04d}' / f'{month:02d}'
+    files = {
+        int(HISTORY_FILE_PATTERN.match(p.name).group(3)): p
+        for p in month_dir.iterdir() if HISTORY_FILE_PATTERN.match(p.name)
+    }
+    if not files:
+        return
+
+    days: dict[int, bytes] = {}
+    rollup = open_rollup(base_dir, year, month)
+    if rollup is not None:
+        with rollup:
+            days.update(rollup.read_all())
+
+    for day, path in files.items():
+        data = path.read_bytes()
+        try:
+            json.loads(data)
+        except ValueError:
+            # 损坏的文件保留原样，不并入归档
+            continue
+        days[day] = data
+        result.json_bytes += len(data)
+
+    path = write_rollup(base_dir, year, month, days)
+    result.written.append(path)
+    result.days = len(days)
+    result.rollup_bytes = Path(path).stat().st_size
+
+    for day, file_path in files.items():
+        if days.get(day) == file_path.read_bytes():
+            file_path.unlink()
+            result.json_removed += 1
+
+
+def read_manifest(month_dir: Path, year: int, month: int) -> dict:
+    """读取页面包清单 {页面名: [偏移, 压缩长度, 原始长度]}"""
+    path = month_dir / f'{year:04d}-{month:02d}{MANIFEST_SUFFIX}'
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def generate_stub_html(name: str) -> str:
+    """已打包页面的跳转页"""
+    target = f'index.html#{html.escape(name)}'
+    return (f'<!DOCTYPE html>{STUB_MARKER}<meta charset="utf-8">'
+            f'<meta http-equiv="refresh" content="0; url={target}">'
+            f'<link rel="canonical" href="{target}"><a href="{target}">{html.escape(name)}</a>\n')
+
+
+def bundle_month_pages(base_dir: str, year: int, month: int, result: CompactionResult) -> None:
+    """把某月的每日 HTML 打包并写入索引页"""
+    month_dir = Path(base_dir) / f'{year:04d}' / f'{month:02d}'
+    bundle_path = month_dir / f'{year:04d}-{month:02d}{BUNDLE_SUFFIX}'
+    manifest = read_manifest(month_dir, year, month)
+
+    # 已打包的页面
+    members: dict[str, bytes] = {}
+    if bundle_path.exists() and manifest:
+        data = bundle_path.read_bytes()
+        for name, (offset, length, _) in manifest.items():
+            members[name] = data[offset:offset + length]
+
+    pages = {}
+    for path in sorted(month_dir.iterdir()):
+        if not PAGE_PATTERN.match(path.name):
+            continue
+        content = path.read_bytes()
+        if STUB_MARKER.encode() in content[:200]:
+            continue
+        pages[path.name] = content
+        # mtime=0 使输出可复现
+        members[path.name] = gzip.compress(content, compresslevel=9, mtime=0)
+        result.html_bytes += len(content)
+
+    if not pages:
+        return
+
+    # 拼接 gzip 成员并生成清单
+    manifest = {}
+    chunks = []
+    offset = 0
+    for name in sorted(members):
+        member = members[name]
+        raw_size = len(pages[name]) if name in pages else len(gzip.decompress(member))
+        manifest[name] = [offset, len(member), raw_size]
+        chunks.append(member)
+        offset += len(member)
+
+    # 写入前校验新打包的页面可以还原
+    for name, content in pages.items():
+        if gzip.decompress(members[name]) != content:
+            raise ValueError(f'页面打包校验失败: {name}')
+
+    atomic_write_bytes(bundle_path, b''.join(chunks))
+    manifest_path = month_dir / f'{year:04d}-{month:02d}{MANIFEST_SUFFIX}'
+    atomic_write_text(manifest_path, json.dumps(manifest, separators=(',', ':')))
+    atomic_write_text(month_dir / 'index.html', generate_month_index_html(year, month, manifest))
+    result.written += [str(bundle_path), str(manifest_path), str(month_dir / 'index.html')]
+
+    for name in pages:
+        atomic_write_text(month_dir / name, generate_stub_html(name))
+        # 删除已过期的预压缩变体
+        for suffix in ('.gz', '.br'):
+            (month_dir / (name + suffix)).unlink(missing_ok=True)
+
+    result.pages = len(pages)
+    result.bundle_bytes = bundle_path.stat().st_size
+
+
+def compact_month(base_dir: str, year: int, month: int, html_pages: bool = False) -> CompactionResult:
+    """
+    压缩单个月份
+
+    Args:
+        base_dir: 存档目录
+        year, month: 年月
+        html_pages: 是否同时打包每日 HTML 页面
+
+    Returns:
+        CompactionResult
+    """
+    result = CompactionResult(month=f'{year:04d}-{month:02d}')
+    rollup_month(base_dir, year, month, result)
+    if html_pages:
+        bundle_month_pages(base_dir, year, month, result)
+    return result
+
+
+def compact_archives(base_dir: str = 'archives', html_pages: bool = False,
+                     today: Optional[datetime] = None) -> list[CompactionResult]:
+    """
+    压缩全部已结束的月份 (当前月份不动)
+
+    Returns:
+        各月份的压缩结果
+    """
+    results = []
+    for year, month in finished_months(base_dir, today):
+        result = compact_month(base_dir, year, month, html_pages)
+        results.append(result)
+
+        parts = []
+        if result.json_removed:
+            parts.append(f'{result.json_removed} 个 JSON ({result.json_bytes / 1024:.1f}KB -> '
+                         f'{result.rollup_bytes / 1024:.1f}KB)')
+        if result.pages:
+            parts.append(f'{result.pages} 个页面 ({result.html_bytes / 1024:.1f}KB -> '
+                         f'{result.bundle_bytes / 1024:.1f}KB)')
+        if parts:
+            print(f'🗜️ {result.month}: ' + '，'.join(parts))
+    return results
+
+
+def generate_month_index_html(year: int, month: int, manifest: dict) -> str:
+    """
+    生成月度索引页
+
+    点击日期后按清单用 Range 请求读取页面包中对应的 gzip 成员，
+    在浏览器中解压 (DecompressionStream) 并替换当前文档。索引页与原页面
+    位于同一目录，因此页面中的相对链接保持有效。
+    """
+    days: dict[str, dict[str, str]] = {}
+    for name in manifest:
+        match = PAGE_PATTERN.match(name)
+        if match:
+            date_str = f'{match.group(1)}-{match.group(2)}-{match.group(3)}'
+            lang = (match.group(4) or '_zh')[1:]
+            days.setdefault(date_str, {})[lang] = name
+
+    rows = []
+    for date_str in sorted(days, reverse=True):
+        links = ' '.join(
+            f'<a href="#{html.escape(name)}" class="text-[#00E5FF] hover:underline">{lang.upper()}</a>'
+            for lang, name in sorted(days[date_str].items(), key=lambda item: item[0] != 'zh')
+        )
+        rows.append(f'<li class="flex items-center justify-between border-b border-[#30363D] py-2">'
+                    f'<span class="font-mono text-white">{date_str}</span><span class="flex gap-3">{links}</span></li>')
+
+    bundle_name = f'{year:04d}-{month:02d}{BUNDLE_SUFFIX}'
+    manifest_json = json.dumps(manifest, separators=(',', ':'))
+
+    return f'''<!DOCTYPE html>
+<html lang="zh-CN" class="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>GitHub Trending - {year:04d}-{month:02d}</title>
+    <link rel="icon" href="https://github.githubassets.com/favicons/favicon.svg" type="image/svg+xml">
+    <script src="https://cdn.tailwindcss.com"></script>
+    <style>
+        body {{ background-color: #0D1117; color: #C9D1D9; font-family: Inter, sans-serif; }}
+    </style>
+</head>
+<body class="min-h-screen">
+    <header class="border-b border-[#30363D] px-6 py-4 flex items-center justify-between">
+        <h1 class="text-xl font-bold text-white">Trending <span class="text-[#00E5FF]">{year:04d}-{month:02d}</span></h1>
+        <a href="../../index.html" class="text-sm text-[#8B949E] hover:text-white">← Trending</a>
+    </header>
+    <main class="max-w-xl mx-auto p-6">
+        <p id="status" class="text-sm text-[#8B949E] mb-4"></p>
+        <ul>
+            {''.join(rows)}
+        </ul>
+    </main>
+    <script>
+    (function() {{
+        var manifest = {manifest_json};
+
+        function fetchMember(entry) {{
+            var start = entry[0], end = entry[0] + entry[1] - 1;
+            return fetch('{bundle_name}', {{ headers: {{ Range: 'bytes=' + start + '-' + end }} }})
+                .then(function(res) {{
+                    if (!res.ok) throw new Error(res.status);
+                    return res.arrayBuffer().then(function(buf) {{
+                        // 服务器不支持 Range 时返回整个文件
+                        return res.status === 206 ? buf : buf.slice(start, end + 1);
+                    }});
+                }});
+        }}
+
+        function openPage(name) {{
+            var entry = manifest[name];
+            if (!entry) return;
+            document.getElementById('status').textContent = 'Loading ' + name + '…';
+            fetchMember(entry).then(function(buf) {{
+                var stream = new Blob([buf]).stream().pipeThrough(new DecompressionStream('gzip'));
+                return new Response(stream).text();
+            }}).then(function(text) {{
+                document.open();
+                document.write(text);
+                document.close();
+            }}).catch(function(err) {{
+                document.getElementById('status').textContent = 'Failed to load ' + name + ': ' + err;
+            }});
+        }}
+
+        window.addEventListener('hashchange', function() {{ openPage(decodeURIComponent(location.hash.slice(1))); }});
+        if (location.hash) openPage(decodeURIComponent(location.hash.slice(1)));
+    }})();
+    </script>
+</body>
+</html>
+'''
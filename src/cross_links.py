@@ -0,0 +1,169 @@
+"""HN 故事与 GitHub Trending 仓库的交叉关联
+
+把 HN 故事链接规范化为 owner/repo，再在 Trending 仓库的哈希索引中查找。
+构建索引与匹配都是一次线性扫描，总耗时 O(故事数 + 仓库数)，
+扩展到完整的 HN 历史 (hn_history.load_tracks) 时同样适用。
+
+- GitHub 仪表板：上榜仓库显示对应的 HN 讨论 (分数、评论数)
+- HN 页面：链接到近期上榜仓库的故事显示 Trending 标记
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Mapping, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from .history import iter_ranking_history
+from .hn_scraper import HNStory
+
+# Trending 索引默认回看的天数 (None 表示全部历史)
+DEFAULT_LOOKBACK_DAYS = 30
+
+GITHUB_HOSTS = frozenset({'github.com', 'www.github.com'})
+
+# github.com 下不是仓库的一级路径
+RESERVED_OWNERS = frozenset({
+    'about', 'apps', 'blog', 'collections', 'customer-stories', 'enterprise', 'events', 'explore',
+    'features', 'issues', 'login', 'marketplace', 'new', 'notifications', 'orgs', 'pricing', 'pulls',
+    'readme', 'search', 'security', 'settings', 'site', 'sponsors', 'topics', 'trending',
+})
+
+V = TypeVar('V')
+
+
+@dataclass
+class TrendingRef:
+    """仓库在 Trending 历史中的记录"""
+    name: str
+    last_seen: str  # 最近上榜日期
+    best_rank: int
+    days: int  # 上榜天数
+
+
+@dataclass
+class HNDiscussion:
+    """某个仓库的一条 HN 讨论"""
+    story_id: int
+    title: str
+    score: int
+    comments: int
+    hn_url: str
+
+
+def normalize_repo_url(url: str) -> Optional[str]:
+    """
+    把 GitHub 链接规范化为小写的 owner/repo
+
+    支持 http/https、www、.git 后缀、子路径 (/tree/main、/issues/1)、查询串与锚点。
+
+    Returns:
+        owner/repo，不是仓库链接时返回 None
+    """
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    if (parts.hostname or '') not in GITHUB_HOSTS:
+        return None
+
+    segments = [s for s in parts.path.split('/') if s]
+    if len(segments) < 2 or segments[0].lower() in RESERVED_OWNERS:
+        return None
+    owner, repo = segments[0], segments[1]
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    if not repo:
+        return None
+    return f'{owner}/{repo}'.lower()
+
+
+def index_repos(names: Iterable[str]) -> dict[str, str]:
+    """仓库名哈希索引: 小写 owner/repo -> 原始名称"""
+    return {name.lower(): name for name in names}
+
+
+def build_trending_index(base_dir: str = 'archives', today: Optional[datetime] = None,
+                         lookback_days: Optional[int] = DEFAULT_LOOKBACK_DAYS) -> dict[str, TrendingRef]:
+    """
+    从 Trending 排名历史构建索引
+
+    Args:
+        base_dir: 存档目录
+        today: 截止日期，默认今天
+        lookback_days: 回看天数，None 表示全部历史
+
+    Returns:
+        小写 owner/repo -> TrendingRef
+    """
+    today = today or datetime.now()
+    start = (today - timedelta(days=lookback_days)).strftime('%Y-%m-%d') if lookback_days is not None else None
+    index: dict[str, TrendingRef] = {}
+    for date_str, name, rank in iter_ranking_history(base_dir, start, today.strftime('%Y-%m-%d'),
+                                                     fields=('name', 'rank'), flat=True):
+        key = name.lower()
+        ref = index.get(key)
+        if ref is None:
+            index[key] = TrendingRef(name=name, last_seen=date_str, best_rank=rank, days=1)
+        else:
+            ref.last_seen = date_str
+            ref.best_rank = min(ref.best_rank, rank)
+            ref.days += 1
+    return index
+
+
+def match_stories(stories: Iterable[HNStory], index: Mapping[str, V]) -> list[tuple[HNStory, V]]:
+    """
+    匹配链接到索引中仓库的故事 (保持故事顺序)
+
+    Returns:
+        [(故事, 索引值)]
+    """
+    matches = []
+    for story in stories:
+        key = normalize_repo_url(story.url)
+        if key is not None and key in index:
+            matches.append((story, index[key]))
+    return matches
+
+
+def discussions_by_repo(stories: Iterable[HNStory], repo_names: Iterable[str]) -> dict[str, list[HNDiscussion]]:
+    """
+    按仓库归集 HN 讨论 (同一故事只计一次，按分数降序)
+
+    Args:
+        stories: HN 故事 (当前榜单或历史轨迹转换而来)
+        repo_names: 仓库名
+
+    Returns:
+        仓库名 -> HN 讨论列表，只包含有讨论的仓库
+    """
+    result: dict[str, dict[int, HNDiscussion]] = {}
+    for story, name in match_stories(stories, index_repos(repo_names)):
+        result.setdefault(name, {})[story.id] = HNDiscussion(
+            story_id=story.id, title=story.title, score=story.score, comments=story.comments, hn_url=story.hn_url,
+        )
+    return {name: sorted(found.values(), key=lambda d: (-d.score, d.story_id)) for name, found in result.items()}
+
+
+def load_hn_discussions(base_dir: str, repo_names: Iterable[str], today: Optional[datetime] = None,
+                        days: int = 2) -> dict[str, list[HNDiscussion]]:
+    """
+    从 HN 历史存档中查找仓库的讨论
+
+    Args:
+        base_dir: 站点目录
+        repo_names: 仓库名
+        today: 截止日期，默认今天
+        days: 回看天数 (含当天)
+
+    Returns:
+        仓库名 -> HN 讨论列表
+    """
+    from .hn_history import load_tracks
+
+    today = today or datetime.now()
+    start = today - timedelta(days=days - 1)
+    tracks = load_tracks(base_dir, start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d'))
+    return discussions_by_repo((t.to_story() for t in tracks.values()), repo_names)
@@ -2,9 +2,25 @@
 
 import json
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Sequence
 from .analyzer import RepoAnalysis
+from .classifier import KeywordClassifier
 from .history import RankChange, format_rank_change
+from .i18n import configured_locales, html_lang, texts
+from .render_context import RenderContext, build_render_context
+from .search_index import generate_history_search_html
+from .treemap import Rect, layout_treemap, size_class
+
+# 日期仪表板 (YYYY/MM/YYYY-MM-DD.html) 到站点根目录的相对路径；站点根目录的 index.html 为 ''
+DASHBOARD_ROOT = '../../'
+INDEX_ROOT = ''
+
+# Treemap 容器宽高比 (单列约 4:3) 与每列最多展示的项目数
+TREEMAP_ASPECT = (4.0, 3.0)
+TREEMAP_MAX_ITEMS = 12
 
 # 领域分类映射 (顺序重要：先检查具体关键词，再检查通用语言)
 DOMAIN_MAPPING = {
@@ -33,6 +49,16 @@ DOMAIN_MAPPING = {
     }
 }
 
+# 关键词分类器 (按 DOMAIN_MAPPING 顺序) 与语言 -> 领域 (先出现的领域优先)
+_DOMAIN_CLASSIFIER = KeywordClassifier([(d, c['keywords']) for d, c in DOMAIN_MAPPING.items() if d != 'Other'])
+_DOMAIN_BY_LANGUAGE = {}
+for _domain, _config in DOMAIN_MAPPING.items():
+    for _language in _config['languages']:
+        _DOMAIN_BY_LANGUAGE.setdefault(_language, _domain)
+
+# 分类结果缓存 (同一仓库在 treemap、feed、数据脚本与深度分析中会重复分类)
+CLASSIFY_CACHE_SIZE = 4096
+
 # 语言颜色映射
 LANG_COLORS = {
     'Python': '#3572A5',
@@ -57,28 +83,17 @@ LANG_COLORS = {
 }
 
 
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
 def classify_domain(repo_name: str, description: str, language: str) -> str:
     """
     基于仓库名、描述、语言分类到领域
-    """
-    text = f"{repo_name} {description}".lower()
 
-    # 首先检查关键词
-    for domain, config in DOMAIN_MAPPING.items():
-        if domain == 'Other':
-            continue
-        for keyword in config['keywords']:
-            if keyword in text:
-                return domain
-
-    # 然后检查语言
-    for domain, config in DOMAIN_MAPPING.items():
-        if domain == 'Other':
-            continue
-        if language in config['languages']:
-            return domain
-
-    return 'Other'
+    先按关键词 (单词边界匹配，见 classifier.py)，再按语言
+    """
+    domain = _DOMAIN_CLASSIFIER.classify(f"{repo_name} {description}")
+    if domain is not None:
+        return domain
+    return _DOMAIN_BY_LANGUAGE.get(language, 'Other')
 
 
 def get_lang_color(lang: str) -> str:
@@ -97,31 +112,9 @@ def format_stars_display(stars_str: str) -> str:
         return stars_str
 
 
-def generate_sidebar_html(lang: str = 'zh') -> str:
-    """生成左侧边栏 HTML"""
-    texts = {
-        'zh': {
-            'feeds': '分类',
-            'all': '全部热门',
-            'ai_ml': 'AI & ML',
-            'frontend': '前端开发',
-            'system': '系统底层',
-            'insights': '洞察',
-            'rising': '上升最快',
-            'new_today': '今日新上榜',
-        },
-        'en': {
-            'feeds': 'Feeds',
-            'all': 'All Trending',
-            'ai_ml': 'AI & ML',
-            'frontend': 'Frontend',
-            'system': 'System',
-            'insights': 'Insights',
-            'rising': 'Rising Stars',
-            'new_today': 'New Today',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+def generate_sidebar_html(lang: str = 'zh', root: str = DASHBOARD_ROOT) -> str:
+    """生成左侧边栏 HTML (root 为页面到站点根目录的相对路径)"""
+    t = texts('sidebar', lang)
 
     return f'''
     <aside class="w-64 h-full flex flex-col glass-panel border-r border-synapse-border shrink-0 z-20">
@@ -176,9 +169,9 @@ def generate_sidebar_html(lang: str = 'zh') -> str:
                 <p class="text-xs font-bold text-text-muted uppercase tracking-wider mb-2 px-2">
                     <span class="text-glow-amber">Y</span> Hacker News
                 </p>
-                <a href="../../hn.html" class="nav-item flex items-center gap-3 px-3 py-2.5 rounded-lg text-text-muted hover:text-white hover:bg-synapse-border/30 transition-colors border-l-2 border-transparent hover:border-glow-amber/50 ml-1">
+                <a href="{root}hn.html" class="nav-item flex items-center gap-3 px-3 py-2.5 rounded-lg text-text-muted hover:text-white hover:bg-synapse-border/30 transition-colors border-l-2 border-transparent hover:border-glow-amber/50 ml-1">
                     <span class="material-symbols-outlined text-glow-amber">local_fire_department</span>
-                    <span class="text-sm font-medium">{'Top Stories' if lang == 'en' else 'Top Stories'}</span>
+                    <span class="text-sm font-medium">{t['top_stories']}</span>
                 </a>
             </div>
         </div>
@@ -187,7 +180,7 @@ def generate_sidebar_html(lang: str = 'zh') -> str:
         <div class="p-4 border-t border-synapse-border">
             <div class="flex items-center gap-2 text-xs text-text-muted">
                 <span class="w-2 h-2 rounded-full bg-muted-mint pulse-dot"></span>
-                <span class="font-mono">{'数据已同步' if lang == 'zh' else 'Data Synced'}</span>
+                <span class="font-mono">{t['synced']}</span>
             </div>
         </div>
     </aside>
@@ -196,27 +189,7 @@ def generate_sidebar_html(lang: str = 'zh') -> str:
 
 def generate_detail_panel_html(lang: str = 'zh') -> str:
     """生成右侧详情面板 HTML (静态模板，由 JS 动态填充)"""
-    texts = {
-        'zh': {
-            'rank': '排名',
-            'view_repo': '查看仓库',
-            'why_trending': '为什么在热榜',
-            'star_growth': 'Star 增长',
-            'ai_summary': 'AI 总结',
-            'maintainer': '维护者',
-            'select_hint': '点击左侧项目查看详情',
-        },
-        'en': {
-            'rank': 'Rank',
-            'view_repo': 'View Repository',
-            'why_trending': 'Why it\'s trending',
-            'star_growth': 'Star Growth',
-            'ai_summary': 'AI Summary',
-            'maintainer': 'Maintained by',
-            'select_hint': 'Select a project to view details',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+    t = texts('detail_panel', lang)
 
     return f'''
     <aside id="detail-panel" class="w-[400px] h-full flex flex-col glass-panel border-l border-synapse-border shrink-0 z-20 overflow-y-auto hidden xl:flex">
@@ -306,8 +279,8 @@ def generate_detail_panel_html(lang: str = 'zh') -> str:
 
 
 def generate_feed_item_html(analysis: RepoAnalysis, rank: int, rank_change: RankChange = None,
-                            domain: str = 'Other', ai_summary=None) -> str:
-    """生成单个 Feed 项目 HTML"""
+                            domain: str = 'Other', ai_summary=None, hn_discussions: list = None) -> str:
+    """生成单个 Feed 项目 HTML (hn_discussions: 该仓库的 HN 讨论，按分数降序)"""
     repo = analysis.repo
     is_new = rank_change.is_new if rank_change else False
     change_text = format_rank_change(rank_change) if rank_change else "-"
@@ -335,6 +308,16 @@ def generate_feed_item_html(analysis: RepoAnalysis, rank: int, rank_change: Rank
     # NEW 徽章
     new_badge = '''<span class="px-2 py-0.5 rounded text-[10px] font-bold bg-glow-amber/10 text-glow-amber border border-glow-amber/30 shadow-neon-amber animate-pulse">NEW</span>''' if is_new else ''
 
+    # HN 讨论徽章 (链接到分数最高的一条)
+    hn_badge = ''
+    if hn_discussions:
+        top = hn_discussions[0]
+        hn_badge = f'''<a href="{top.hn_url}" target="_blank" onclick="event.stopPropagation()" title="Hacker News ({len(hn_discussions)})"
+            class="flex items-center gap-1 px-1.5 py-0.5 rounded text-[10px] font-bold bg-glow-amber/10 text-glow-amber border border-glow-amber/30 hover:bg-glow-amber/20">
+            <span>Y</span><span>{top.score}</span>
+            <span class="material-symbols-outlined text-[10px]">chat_bubble</span><span>{top.comments}</span>
+        </a>'''
+
     # 选中样式 (第一个默认选中)
     selected_class = 'border-electric-cyan/30 bg-synapse-card/80 shadow-[0_0_15px_-3px_rgba(0,229,255,0.1)]' if rank == 1 else 'border-synapse-border bg-synapse-card/40 hover:bg-synapse-card hover:border-text-muted/30'
 
@@ -376,6 +359,7 @@ def generate_feed_item_html(analysis: RepoAnalysis, rank: int, rank_change: Rank
                     <span>+{repo.stars_today}</span>
                 </div>
                 <span class="px-1.5 py-0.5 rounded text-[10px] text-text-muted bg-synapse-border/50">{domain}</span>
+                {hn_badge}
             </div>
         </div>
 
@@ -399,17 +383,13 @@ def calculate_momentum(stars_today: int, max_stars: int) -> str:
     return 'low'
 
 
-def generate_treemap_item_html(repo: dict, size: str, rank: int, is_new: bool, momentum: str) -> str:
-    """生成单个 Treemap 项目 HTML"""
-    # 尺寸映射到 CSS grid
-    size_classes = {
-        'huge': 'col-span-8 row-span-5',
-        'large': 'col-span-6 row-span-4',
-        'medium': 'col-span-4 row-span-3',
-        'small': 'col-span-3 row-span-2',
-        'tiny': 'col-span-2 row-span-2'
-    }
+def generate_treemap_item_html(repo: dict, size: str, rank: int, is_new: bool, momentum: str,
+                               rect: Rect) -> str:
+    """
+    生成单个 Treemap 项目 HTML
 
+    按 rect (百分比坐标) 绝对定位，size 只决定显示的内容多少
+    """
     # 动量颜色
     momentum_bg = {
         'high': 'bg-electric-cyan/30 border-electric-cyan/50',
@@ -435,7 +415,8 @@ def generate_treemap_item_html(repo: dict, size: str, rank: int, is_new: bool, m
     stars_today = repo.get('starsToday', 0)
     growth_badge = f'<span class="text-[10px] font-mono text-muted-mint bg-muted-mint/10 px-1.5 py-0.5 rounded">+{stars_today}</span>' if stars_today > 0 else ''
 
-    size_class = size_classes.get(size, 'col-span-3 row-span-2')
+    position_style = (f'style="left: calc({rect.x:.3f}% + 2px); top: calc({rect.y:.3f}% + 2px); '
+                      f'width: calc({rect.w:.3f}% - 4px); height: calc({rect.h:.3f}% - 4px);"')
     bg_class = momentum_bg.get(momentum, momentum_bg['low'])
 
     # 大尺寸显示更多内容
@@ -467,15 +448,32 @@ def generate_treemap_item_html(repo: dict, size: str, rank: int, is_new: bool, m
         '''
 
     return f'''
-        <div class="treemap-item {size_class} {bg_class} {glow_class} border relative rounded overflow-hidden cursor-pointer hover:border-white/50 transition-all"
+        <div class="treemap-item {bg_class} {glow_class} border absolute rounded overflow-hidden cursor-pointer hover:border-white/50 transition-all"
+             {position_style}
              onclick="window.open('{repo.get('url', '#')}', '_blank')">
             {content}
         </div>
     '''
 
 
-def generate_domain_column_html(domain: str, repos: list, max_stars: int, lang: str = 'zh') -> str:
-    """生成单个领域列的 HTML"""
+def place_treemap_items(repos: list) -> list[tuple[dict, str, Rect]]:
+    """
+    单个领域列的 squarified 布局，面积与 starsToday 成正比
+
+    Returns:
+        [(项目, 尺寸等级, 百分比坐标)]
+    """
+    width, height = TREEMAP_ASPECT
+    placed = layout_treemap(repos[:TREEMAP_MAX_ITEMS], lambda r: r.get('starsToday', 0),
+                            width, height, min_share=0.01)
+    return [(repo, size_class(rect, width, height),
+             Rect(rect.index, rect.x / width * 100, rect.y / height * 100, rect.w / width * 100, rect.h / height * 100))
+            for repo, rect in placed]
+
+
+def generate_domain_column_html(domain: str, repos: list, max_stars: int, lang: str = 'zh',
+                                placed: list = None) -> str:
+    """生成单个领域列的 HTML (placed 为 place_treemap_items 的结果，缺省时现场布局)"""
     domain_colors = {
         'AI & ML': 'bg-purple-500',
         'Frontend': 'bg-blue-500',
@@ -483,48 +481,18 @@ def generate_domain_column_html(domain: str, repos: list, max_stars: int, lang:
         'Other': 'bg-gray-500'
     }
 
-    domain_names = {
-        'zh': {
-            'AI & ML': 'AI & 机器学习',
-            'Frontend': '前端 & Web',
-            'System': '系统 & 基础设施',
-            'Other': '其他'
-        },
-        'en': {
-            'AI & ML': 'AI & Machine Learning',
-            'Frontend': 'Frontend & Web',
-            'System': 'System & Infrastructure',
-            'Other': 'Other'
-        }
-    }
-
     color_class = domain_colors.get(domain, 'bg-gray-500')
-    display_name = domain_names.get(lang, domain_names['en']).get(domain, domain)
-
-    # 生成 treemap 项目
-    items_html = []
+    display_name = texts('domains', lang).get(domain, domain)
 
-    # 根据项目数量动态选择尺寸，避免少量项目时差距过大
-    repo_count = len(repos[:8])
-    if repo_count == 1:
-        sizes = ['huge']
-    elif repo_count == 2:
-        sizes = ['huge', 'large']
-    elif repo_count == 3:
-        sizes = ['large', 'large', 'medium']
-    elif repo_count == 4:
-        sizes = ['large', 'medium', 'medium', 'medium']
-    elif repo_count == 5:
-        sizes = ['large', 'medium', 'medium', 'small', 'small']
-    else:
-        sizes = ['huge', 'large', 'medium', 'medium', 'small', 'small', 'tiny', 'tiny']
+    if placed is None:
+        placed = place_treemap_items(repos)
 
-    for i, repo in enumerate(repos[:8]):
-        size = sizes[i] if i < len(sizes) else 'tiny'
+    items_html = []
+    for i, (repo, size, percent_rect) in enumerate(placed):
         momentum = calculate_momentum(repo.get('starsToday', 0), max_stars)
         is_new = repo.get('isNew', False)
         rank = repo.get('rank', i + 1)
-        items_html.append(generate_treemap_item_html(repo, size, rank, is_new, momentum))
+        items_html.append(generate_treemap_item_html(repo, size, rank, is_new, momentum, percent_rect))
 
     return f'''
         <div class="flex flex-col h-full gap-2">
@@ -536,7 +504,7 @@ def generate_domain_column_html(domain: str, repos: list, max_stars: int, lang:
                 <span class="text-xs text-text-muted">{len(repos)} Repos</span>
             </div>
             <div class="flex-1 relative bg-synapse-card/30 rounded-xl overflow-hidden p-1 border border-synapse-border min-h-[280px]">
-                <div class="treemap-grid">
+                <div class="treemap-canvas">
                     {''.join(items_html)}
                 </div>
             </div>
@@ -544,77 +512,58 @@ def generate_domain_column_html(domain: str, repos: list, max_stars: int, lang:
     '''
 
 
-def generate_treemap_section(analyses: list[RepoAnalysis], lang: str = 'zh',
-                             rank_changes: list = None) -> str:
-    """生成 Tech Pulse Treemap - 3 列布局"""
-    if not analyses:
-        return ''
-
-    if rank_changes is None:
-        rank_changes = []
-
-    # 创建 name -> RankChange 映射
-    change_map = {c.name: c for c in rank_changes}
+def treemap_domain_data(context: RenderContext) -> tuple[dict, dict, int]:
+    """
+    Treemap 数据: 按领域分组的项目、各领域布局与最大今日 Star
 
-    # 按领域分组并收集数据
+    Returns:
+        (领域 -> 项目列表, 领域 -> place_treemap_items 结果, max_stars)
+    """
     domain_data = {'AI & ML': [], 'Frontend': [], 'System': [], 'Other': []}
-    max_stars = 0
-
-    for i, analysis in enumerate(analyses[:25], 1):
-        repo = analysis.repo
-        domain = classify_domain(repo.name, repo.description, repo.language or '')
+    for view in context.top:
+        domain_data[view.domain].append(MappingProxyType({
+            'name': view.short_name,
+            'fullName': view.name,
+            'stars': view.stars,
+            'starsToday': view.stars_today_count,
+            'language': view.language or 'Unknown',
+            'url': view.url,
+            'rank': view.rank,
+            'isNew': view.is_new,
+            'change': view.change,
+        }))
+    max_stars = max([0] + [view.stars_today_count for view in context.top])
+    placed = {domain: place_treemap_items(repos) for domain, repos in domain_data.items()}
+    return domain_data, placed, max_stars
 
-        try:
-            stars_today = int(str(repo.stars_today).replace(',', ''))
-        except (ValueError, TypeError):
-            stars_today = 0
 
-        max_stars = max(max_stars, stars_today)
-
-        change = change_map.get(repo.name)
+def generate_treemap_section(analyses: list[RepoAnalysis], lang: str = 'zh',
+                             rank_changes: list = None, context: RenderContext = None) -> str:
+    """生成 Tech Pulse Treemap - 3 列布局 (context 为共享的渲染上下文，缺省时现场构建)"""
+    if context is None:
+        if not analyses:
+            return ''
+        context = build_render_context(analyses, rank_changes or [])
+    if not context.top:
+        return ''
 
-        domain_data[domain].append({
-            'name': repo.name.split('/')[-1],
-            'fullName': repo.name,
-            'stars': repo.stars,
-            'starsToday': stars_today,
-            'language': repo.language or 'Unknown',
-            'url': repo.url,
-            'rank': i,
-            'isNew': change.is_new if change else False,
-            'change': change.change if change and change.change else 0
-        })
+    # 分组与布局与语言无关，各语言共用
+    domain_data, placed_by_domain, max_stars = context.memo('treemap', lambda: treemap_domain_data(context))
 
     # 文本
-    texts = {
-        'zh': {
-            'title': 'Tech Pulse Treemap',
-            'subtitle': '实时 GitHub 市场情绪。面积 = 增长，颜色 = 动量。',
-            'intensity': '强度',
-            'low': '低动量',
-            'high': '高动量',
-            'new_repo': '新项目 (发光边框)'
-        },
-        'en': {
-            'title': 'Tech Pulse Treemap',
-            'subtitle': 'Real-time GitHub market sentiment. Area = Growth, Color = Momentum.',
-            'intensity': 'Intensity Key',
-            'low': 'Low Momentum',
-            'high': 'High Momentum',
-            'new_repo': 'New Repo (Outer Glow)'
-        }
-    }
-    t = texts.get(lang, texts['en'])
+    t = texts('treemap', lang)
 
     # 生成每个领域的列 (只显示有数据的领域，最多3列)
     columns_html = []
     for domain in ['AI & ML', 'Frontend', 'System']:
         if domain_data[domain]:
-            columns_html.append(generate_domain_column_html(domain, domain_data[domain], max_stars, lang))
+            columns_html.append(generate_domain_column_html(domain, domain_data[domain], max_stars, lang,
+                                                            placed_by_domain[domain]))
 
     # 如果少于3列，添加 Other
     if len(columns_html) < 3 and domain_data['Other']:
-        columns_html.append(generate_domain_column_html('Other', domain_data['Other'], max_stars, lang))
+        columns_html.append(generate_domain_column_html('Other', domain_data['Other'], max_stars, lang,
+                                                        placed_by_domain['Other']))
 
     # 收集所有语言用于筛选按钮
     all_languages = set()
@@ -622,7 +571,8 @@ def generate_treemap_section(analyses: list[RepoAnalysis], lang: str = 'zh',
         for repo in repos:
             if repo['language'] != 'Unknown':
                 all_languages.add(repo['language'])
-    top_languages = sorted(all_languages, key=lambda x: sum(1 for repos in domain_data.values() for r in repos if r['language'] == x), reverse=True)[:3]
+    # 数量相同时按名称排序 (集合遍历顺序随进程的哈希种子变化)
+    top_languages = sorted(all_languages, key=lambda x: (-sum(1 for repos in domain_data.values() for r in repos if r['language'] == x), x))[:3]
 
     lang_buttons = ''.join([
         f'<button class="treemap-lang-filter flex items-center gap-2 px-3 py-1.5 rounded-lg bg-synapse-card hover:bg-synapse-border text-text-muted hover:text-white border border-synapse-border transition-colors text-sm font-medium" data-lang="{l}">{l}</button>'
@@ -677,12 +627,11 @@ def generate_treemap_section(analyses: list[RepoAnalysis], lang: str = 'zh',
     </section>
 
     <style>
-        .treemap-grid {{
-            display: grid;
-            grid-template-columns: repeat(12, 1fr);
-            grid-template-rows: repeat(8, 1fr);
-            gap: 4px;
-            height: 100%;
+        .treemap-canvas {{
+            position: relative;
+            width: 100%;
+            aspect-ratio: {TREEMAP_ASPECT[0]:g} / {TREEMAP_ASPECT[1]:g};
+            min-height: 270px;
         }}
 
         .treemap-item {{
@@ -732,36 +681,36 @@ def generate_treemap_section(analyses: list[RepoAnalysis], lang: str = 'zh',
     '''
 
 
-def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
-    """生成顶部统计条"""
-    if not analyses:
-        return ''
-
-    total_stars = 0
-    new_count = 0
+def stats_bar_values(views) -> tuple[int, float, int, str]:
+    """统计条数值: (今日 Star 总数, 平均评分, 项目数, 热门语言)"""
     lang_count = {}
-
-    for a in analyses:
-        try:
-            total_stars += int(str(a.repo.stars_today).replace(',', ''))
-        except:
-            pass
-        prog_lang = a.repo.language or 'Other'
+    for view in views:
+        prog_lang = view.language or 'Other'
         lang_count[prog_lang] = lang_count.get(prog_lang, 0) + 1
 
+    total_stars = sum(view.stars_today_count for view in views)
     top_lang = max(lang_count.items(), key=lambda x: x[1])[0] if lang_count else 'Unknown'
-    avg_score = round(sum(a.score for a in analyses) / len(analyses), 1) if analyses else 0
+    avg_score = round(sum(view.score for view in views) / len(views), 1) if views else 0
+    return total_stars, avg_score, len(views), top_lang
+
+
+def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh', context: RenderContext = None) -> str:
+    """生成顶部统计条 (context 为共享的渲染上下文，统计 context.top)"""
+    if context is None:
+        if not analyses:
+            return ''
+        context = build_render_context(analyses, [], top_n=len(analyses))
+    if not context.top:
+        return ''
+
+    total_stars, avg_score, project_count, top_lang = context.memo('stats_bar', lambda: stats_bar_values(context.top))
 
     def fmt(n):
         if n >= 1000:
             return f'{n/1000:.1f}k'
         return str(n)
 
-    texts = {
-        'zh': ['今日 Star', '平均评分', '热门项目', '热门语言'],
-        'en': ['Stars Today', 'Avg Score', 'Projects', 'Top Lang']
-    }
-    t = texts.get(lang, texts['zh'])
+    t = texts('stats_bar', lang)
 
     return f'''
     <div class="grid grid-cols-2 md:grid-cols-4 gap-3 mb-6">
@@ -770,7 +719,7 @@ def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-muted-mint">star</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[0]}</p>
+                <p class="text-xs text-text-muted">{t['stars_today']}</p>
                 <p class="text-xl font-bold text-white">{fmt(total_stars)}</p>
             </div>
         </div>
@@ -779,7 +728,7 @@ def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-electric-cyan">analytics</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[1]}</p>
+                <p class="text-xs text-text-muted">{t['avg_score']}</p>
                 <p class="text-xl font-bold text-white">{avg_score}<span class="text-sm text-text-muted">/10</span></p>
             </div>
         </div>
@@ -788,8 +737,8 @@ def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-glow-amber">folder</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[2]}</p>
-                <p class="text-xl font-bold text-white">{len(analyses)}</p>
+                <p class="text-xs text-text-muted">{t['projects']}</p>
+                <p class="text-xl font-bold text-white">{project_count}</p>
             </div>
         </div>
         <div class="glass-card rounded-xl p-4 flex items-center gap-3">
@@ -797,7 +746,7 @@ def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-purple-400">code</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[3]}</p>
+                <p class="text-xs text-text-muted">{t['top_lang']}</p>
                 <p class="text-xl font-bold text-white">{top_lang}</p>
             </div>
         </div>
@@ -805,50 +754,54 @@ def generate_stats_bar(analyses: list[RepoAnalysis], lang: str = 'zh') -> str:
     '''
 
 
-def generate_repo_data_script(analyses: list[RepoAnalysis], rank_changes: list[RankChange],
-                               ai_summaries: dict = None) -> str:
-    """生成 JavaScript 数据对象供详情面板使用"""
-    if ai_summaries is None:
-        ai_summaries = {}
-
-    change_map = {c.name: c for c in rank_changes}
-
+def repo_data_json(views) -> str:
+    """详情面板数据 (JSON 字符串)"""
     repo_data = {}
-    for i, analysis in enumerate(analyses, 1):
-        repo = analysis.repo
-        change = change_map.get(repo.name)
-        ai = ai_summaries.get(repo.name)
-
-        owner = repo.name.split('/')[0] if '/' in repo.name else repo.name
-        short_name = repo.name.split('/')[-1] if '/' in repo.name else repo.name
+    for view in views:
+        ai = view.ai_summary
 
         # 安全处理描述文本
-        desc = repo.description.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ').replace('\r', '')
+        desc = view.description.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ').replace('\r', '')
 
-        repo_data[repo.name] = {
-            'rank': i,
-            'name': short_name,
-            'fullName': repo.name,
-            'owner': owner,
+        repo_data[view.name] = {
+            'rank': view.rank,
+            'name': view.short_name,
+            'fullName': view.name,
+            'owner': view.owner,
             'description': desc,
-            'url': repo.url,
-            'stars': repo.stars,
-            'starsToday': repo.stars_today,
-            'language': repo.language or 'Unknown',
-            'langColor': get_lang_color(repo.language or 'Unknown'),
-            'score': analysis.score,
-            'domain': classify_domain(repo.name, repo.description, repo.language or ''),
-            'isNew': change.is_new if change else False,
-            'change': change.change if change and change.change else 0,
-            'avatar': f'https://github.com/{owner}.png?size=80',
+            'url': view.url,
+            'stars': view.stars,
+            'starsToday': view.stars_today,
+            'language': view.language or 'Unknown',
+            'langColor': view.lang_color,
+            'score': view.score,
+            'domain': view.domain,
+            'isNew': view.is_new,
+            'change': view.change,
+            'avatar': view.avatar,
             'aiSummary': ai.summary if ai else None,
             'aiHighlights': ai.highlights if ai else [],
             'aiUseCases': ai.use_cases if ai else None,
+            'hnDiscussions': [
+                {'title': d.title, 'score': d.score, 'comments': d.comments, 'url': d.hn_url}
+                for d in view.hn_discussions
+            ],
         }
+    return json.dumps(repo_data, ensure_ascii=False)
+
+
+def generate_repo_data_script(analyses: list[RepoAnalysis], rank_changes: list[RankChange],
+                               ai_summaries: dict = None, hn_links: dict = None,
+                               context: RenderContext = None) -> str:
+    """生成 JavaScript 数据对象供详情面板使用 (context 为共享的渲染上下文，包含 context.top)"""
+    if context is None:
+        # 独立调用时按评分排序，展示全部传入的项目
+        context = build_render_context(analyses, rank_changes, ai_summaries=ai_summaries, hn_links=hn_links,
+                                       top_n=len(analyses))
 
     return f'''
     <script>
-    window.REPO_DATA = {json.dumps(repo_data, ensure_ascii=False)};
+    window.REPO_DATA = {context.memo('repo_data', lambda: repo_data_json(context.top))};
     </script>
     '''
 
@@ -857,49 +810,39 @@ def generate_dashboard_html(analyses: list[RepoAnalysis],
                             rank_changes: list[RankChange],
                             date: datetime = None,
                             lang: str = 'zh',
-                            ai_summaries: dict = None) -> str:
+                            ai_summaries: dict = None,
+                            hn_links: dict = None,
+                            context: RenderContext = None,
+                            root: str = DASHBOARD_ROOT) -> str:
     """
     生成完整的 Synapse 风格 HTML 仪表板
-    """
-    if date is None:
-        date = datetime.now()
 
-    if ai_summaries is None:
-        ai_summaries = {}
+    hn_links 为仓库名 -> HN 讨论列表 (见 cross_links.py)，有讨论的仓库显示 HN 徽章。
+    context 为 build_render_context 构建的共享上下文 (此时忽略前几个数据参数)，
+    多种语言传入同一个 context 时，与语言无关的部分只计算一次 (见 generate_dashboards)。
+    root 为页面到站点根目录的相对路径：YYYY/MM/ 下的日期页面为 '../../'，站点根目录的
+    index.html 为 ''，站内链接 (HN 页面、历史搜索索引) 据此生成。
+    """
+    if context is None:
+        context = build_render_context(analyses, rank_changes, date, ai_summaries, hn_links)
+    date = context.date
 
     date_str = date.strftime('%Y-%m-%d')
-    html_lang = 'zh-CN' if lang == 'zh' else 'en'
-
-    # 创建 name -> RankChange 映射
-    change_map = {c.name: c for c in rank_changes}
-
-    # 按评分排序取前25
-    sorted_analyses = sorted(analyses, key=lambda x: x.score, reverse=True)[:25]
-
-    # 生成 Feed 列表
-    feed_items = []
-    for i, analysis in enumerate(sorted_analyses, 1):
-        change = change_map.get(analysis.repo.name)
-        domain = classify_domain(analysis.repo.name, analysis.repo.description, analysis.repo.language or '')
-        ai_summary = ai_summaries.get(analysis.repo.name)
-        feed_items.append(generate_feed_item_html(analysis, i, change, domain, ai_summary))
-
-    texts = {
-        'zh': {
-            'title': 'GitHub Trending - Synapse',
-            'search_placeholder': '搜索项目...',
-            'all_projects': '全部项目',
-        },
-        'en': {
-            'title': 'GitHub Trending - Synapse',
-            'search_placeholder': 'Search projects...',
-            'all_projects': 'All Projects',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+
+    # 按评分排序的前 25 个项目
+    top_repos = context.top
+
+    # 生成 Feed 列表 (与语言无关)
+    feed_html = context.memo('feed_items', lambda: ''.join(
+        generate_feed_item_html(view.analysis, view.rank, view.rank_change, view.domain, view.ai_summary,
+                                list(view.hn_discussions))
+        for view in top_repos
+    ))
+
+    t = texts('dashboard', lang)
 
     return f'''<!DOCTYPE html>
-<html lang="{html_lang}" class="dark">
+<html lang="{html_lang(lang)}" class="dark">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
@@ -1012,7 +955,7 @@ def generate_dashboard_html(analyses: list[RepoAnalysis],
 </head>
 <body class="h-screen w-full flex overflow-hidden font-display selection:bg-electric-cyan selection:text-black">
 
-    {generate_sidebar_html(lang)}
+    {generate_sidebar_html(lang, root)}
 
     <!-- Main Content Area -->
     <main class="flex-1 flex flex-col h-full overflow-hidden bg-synapse-bg relative">
@@ -1035,25 +978,27 @@ def generate_dashboard_html(analyses: list[RepoAnalysis],
 
         <!-- Feed List -->
         <div class="flex-1 overflow-y-auto p-4 md:p-6">
-            {generate_stats_bar(sorted_analyses, lang)}
+            {generate_stats_bar(None, lang, context)}
 
-            {generate_treemap_section(sorted_analyses, lang, rank_changes)}
+            {generate_treemap_section(None, lang, context=context)}
 
             <div class="flex items-center gap-3 mb-4">
                 <span class="material-symbols-outlined text-electric-cyan">apps</span>
                 <h2 class="text-lg font-bold text-white">{t['all_projects']}</h2>
-                <span class="px-2 py-0.5 rounded text-[10px] font-mono bg-synapse-border text-text-muted">TOP {len(sorted_analyses)}</span>
+                <span class="px-2 py-0.5 rounded text-[10px] font-mono bg-synapse-border text-text-muted">TOP {len(top_repos)}</span>
             </div>
 
             <div id="feed-list" class="space-y-3">
-                {''.join(feed_items)}
+                {feed_html}
             </div>
+
+            {generate_history_search_html(lang, f'{root}search/')}
         </div>
     </main>
 
     {generate_detail_panel_html(lang)}
 
-    {generate_repo_data_script(sorted_analyses, rank_changes, ai_summaries)}
+    {generate_repo_data_script(None, None, context=context)}
 
     <script>
     // 当前选中的 repo
@@ -1190,6 +1135,11 @@ def generate_dashboard_html(analyses: list[RepoAnalysis],
             var repoId = item.dataset.repoId.toLowerCase();
             item.style.display = repoId.includes(query) ? '' : 'none';
         }});
+
+        // 同时检索全部历史 (按需加载分片索引)
+        if (window.searchHistory) {{
+            window.searchHistory(query);
+        }}
     }}
 
     // 侧边栏导航点击
@@ -1222,28 +1172,50 @@ def generate_dashboard_html(analyses: list[RepoAnalysis],
 '''
 
 
-def save_dashboard(html_content: str, base_dir: str = 'archives', date: datetime = None, lang: str = 'zh') -> str:
+def generate_dashboards(context: RenderContext, langs: Sequence[str] = None) -> dict[str, str]:
+    """
+    一次生成多种语言的仪表板
+
+    视图模型、Feed 列表、Treemap 布局等只在第一种语言时计算，其余语言只做文案替换。
+
+    Args:
+        context: 渲染上下文
+        langs: 语言列表，默认为 configured_locales()
+
+    Returns:
+        语言 -> HTML
+    """
+    return {lang: generate_dashboard_html(None, None, lang=lang, context=context)
+            for lang in (langs or configured_locales())}
+
+
+def dashboard_path(base_dir: str, date: datetime, lang: str = 'zh') -> Path:
+    """仪表板路径: YYYY/MM/YYYY-MM-DD[_lang].html"""
+    suffix = '' if lang == 'zh' else f'_{lang}'
+    return Path(base_dir) / date.strftime('%Y') / date.strftime('%m') / f'{date.strftime("%Y-%m-%d")}{suffix}.html'
+
+
+def save_dashboard(html_content: str, base_dir: str = 'archives', date: datetime = None, lang: str = 'zh',
+                   index_content: str = None) -> str:
     """
     保存 HTML 仪表板
+
+    index_content 为以 root=INDEX_ROOT 渲染的首页，传入时写入 index.html
+    (日期页面的站内链接是相对 YYYY/MM/ 的，不能原样复制到站点根目录)
     """
     if date is None:
         date = datetime.now()
 
     # 创建目录结构
-    dir_path = Path(base_dir) / date.strftime('%Y') / date.strftime('%m')
-    dir_path.mkdir(parents=True, exist_ok=True)
-
-    # 文件名
-    suffix = '' if lang == 'zh' else f'_{lang}'
-    file_path = dir_path / f'{date.strftime("%Y-%m-%d")}{suffix}.html'
+    file_path = dashboard_path(base_dir, date, lang)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
-    # 中文版同时保存到 index.html
-    if lang == 'zh':
+    if index_content is not None:
         index_path = Path(base_dir) / 'index.html'
         with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(index_content)
 
     return str(file_path)
@@ -1,30 +1,51 @@
-"""深度分析页面生成器 - 为新上榜项目生成独立的分析页面"""
+"""深度分析页面生成器 - 为每个上榜项目生成独立的分析页面
 
+页面路径为 deep-dive/<owner>/<repo>.html。页面内容只由 DeepDiveData 决定 (Star 数等
+按展示精度取值，排名与单日新增取历史最好值)，其指纹记录在 deep-dive/manifest.json，
+每天只重新生成指纹变化的页面，并更新索引页 deep-dive/index.html。
+"""
+
+import hashlib
+import html as html_lib
 import json
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional
+from .ai_summary import AISummary
 from .analyzer import RepoAnalysis
+from .fileio import atomic_write_text, write_if_changed
 from .history import RankChange
-from .dashboard import classify_domain, get_lang_color, format_stars_display, LANG_COLORS
+from .i18n import html_lang, texts
+from .dashboard import get_lang_color, format_stars_display, LANG_COLORS
+from .render_context import RenderContext, RepoView, build_render_context
+
+# 深度分析目录 (相对站点根目录) 与清单文件
+DEEP_DIVE_DIR = 'deep-dive'
+MANIFEST_NAME = 'manifest.json'
+
+# 页面模板版本，修改模板后递增以重新生成全部页面
+DEEP_DIVE_FORMAT = 1
 
 
 @dataclass
 class DeepDiveData:
-    """深度分析页面所需数据"""
+    """深度分析页面所需数据 (页面内容只由这些字段决定)"""
     repo_name: str
     owner: str
     short_name: str
     description: str
     url: str
     language: str
-    stars: str
-    stars_today: str
+    stars: str  # 展示精度 (1.2k)，小幅增长不触发重新生成
     forks: str
     domain: str
-    rank: int
     score: int
+    # 历史
+    best_rank: int
+    first_seen: str
+    peak_stars_today: str
+    is_new: bool = False
     # AI 生成的内容
     ai_summary: Optional[str] = None
     ai_highlights: Optional[list] = None
@@ -34,14 +55,16 @@ class DeepDiveData:
     license: Optional[str] = None
 
 
-def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str = 'zh') -> str:
+def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str = 'zh',
+                            root: str = '../../') -> str:
     """
     生成深度分析页面 HTML
 
     Args:
         data: DeepDiveData 对象
-        date: 日期
+        date: 日期 (页面最后更新日期)
         lang: 语言
+        root: 页面到站点根目录的相对前缀
 
     Returns:
         完整的 HTML 字符串
@@ -50,51 +73,14 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
         date = datetime.now()
 
     date_str = date.strftime('%Y-%m-%d')
-    html_lang = 'zh-CN' if lang == 'zh' else 'en'
     lang_color = get_lang_color(data.language)
 
     # 文本
-    texts = {
-        'zh': {
-            'title': f'{data.short_name} - 深度分析',
-            'back': '返回热榜',
-            'view_repo': '查看仓库',
-            'tech_analysis': '技术解析',
-            'ai_generated': 'AI 生成',
-            'core_capabilities': '核心能力',
-            'why_matters': '为什么值得关注',
-            'actionable_idea': '创意建议',
-            'start_project': '开始探索',
-            'related': '相关推荐',
-            'rank': '排名',
-            'stars': 'Star 数',
-            'today': '今日新增',
-            'language': '语言',
-            'domain': '领域',
-            'score': '评分',
-            'footer': '数据来源: GitHub Trending',
-        },
-        'en': {
-            'title': f'{data.short_name} - Deep Dive',
-            'back': 'Back to Trending',
-            'view_repo': 'View Repository',
-            'tech_analysis': 'Technical Analysis',
-            'ai_generated': 'AI Generated',
-            'core_capabilities': 'Core Capabilities',
-            'why_matters': 'Why It Matters',
-            'actionable_idea': 'Actionable Idea',
-            'start_project': 'Start Exploring',
-            'related': 'Related Projects',
-            'rank': 'Rank',
-            'stars': 'Stars',
-            'today': 'Today',
-            'language': 'Language',
-            'domain': 'Domain',
-            'score': 'Score',
-            'footer': 'Data Source: GitHub Trending',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+    t = texts('deep_dive', lang)
+
+    new_badge = ''
+    if data.is_new:
+        new_badge = '<span class="bg-glow-amber/10 text-glow-amber border border-glow-amber/20 text-xs font-bold px-2 py-0.5 rounded uppercase tracking-wider animate-pulse shadow-neon-amber">NEW</span>'
 
     # AI 内容
     ai_summary_html = ''
@@ -108,7 +94,7 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
 
         use_cases_html = ''
         if data.ai_use_cases:
-            use_cases_html = f'<p class="text-sm text-slate-400 mt-4 pt-4 border-t border-white/5"><strong class="text-white">{"适用场景" if lang == "zh" else "Use Cases"}:</strong> {data.ai_use_cases}</p>'
+            use_cases_html = f'<p class="text-sm text-slate-400 mt-4 pt-4 border-t border-white/5"><strong class="text-white">{t["use_cases"]}:</strong> {data.ai_use_cases}</p>'
 
         ai_summary_html = f'''
         <div class="rounded-xl border border-synapse-border bg-synapse-card overflow-hidden">
@@ -134,11 +120,11 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
         topics_html = f'<div class="flex flex-wrap gap-2 mt-4">{tags}</div>'
 
     return f'''<!DOCTYPE html>
-<html lang="{html_lang}" class="dark">
+<html lang="{html_lang(lang)}" class="dark">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{t['title']} - {date_str}</title>
+    <title>{t['title'].format(name=data.short_name)} - {date_str}</title>
     <link rel="icon" href="https://github.githubassets.com/favicons/favicon.svg" type="image/svg+xml">
 
     <!-- Fonts -->
@@ -217,14 +203,14 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
     <header class="sticky top-0 z-50 w-full border-b border-synapse-border bg-synapse-bg/90 backdrop-blur-md">
         <div class="max-w-6xl mx-auto px-6 h-16 flex items-center justify-between">
             <div class="flex items-center gap-6">
-                <a href="../index.html" class="flex items-center gap-3 text-white group">
+                <a href="{root}index.html" class="flex items-center gap-3 text-white group">
                     <div class="w-8 h-8 rounded-lg bg-gradient-to-br from-electric-cyan to-blue-600 flex items-center justify-center shadow-neon-cyan">
                         <span class="material-symbols-outlined text-black font-bold" style="font-size: 20px;">trending_up</span>
                     </div>
                     <span class="font-bold text-lg">GitHub<span class="text-electric-cyan">Trending</span></span>
                 </a>
             </div>
-            <a href="../index.html" class="flex items-center gap-2 text-text-muted hover:text-white transition-colors text-sm">
+            <a href="{root}index.html" class="flex items-center gap-2 text-text-muted hover:text-white transition-colors text-sm">
                 <span class="material-symbols-outlined text-lg">arrow_back</span>
                 {t['back']}
             </a>
@@ -235,7 +221,9 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
     <main class="max-w-6xl mx-auto px-6 py-8">
         <!-- Breadcrumb -->
         <div class="flex items-center gap-2 mb-8 text-sm text-text-muted">
-            <a href="../index.html" class="hover:text-electric-cyan transition-colors">Trending</a>
+            <a href="{root}index.html" class="hover:text-electric-cyan transition-colors">Trending</a>
+            <span class="material-symbols-outlined text-base">chevron_right</span>
+            <a href="{root}{DEEP_DIVE_DIR}/index.html" class="hover:text-electric-cyan transition-colors">{t['all_pages']}</a>
             <span class="material-symbols-outlined text-base">chevron_right</span>
             <span class="text-white">{data.short_name}</span>
         </div>
@@ -251,7 +239,7 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
                             <div class="flex flex-col gap-2">
                                 <div class="flex items-center gap-3">
                                     <h1 class="text-4xl md:text-5xl font-black text-white tracking-tight">{data.short_name}</h1>
-                                    <span class="bg-glow-amber/10 text-glow-amber border border-glow-amber/20 text-xs font-bold px-2 py-0.5 rounded uppercase tracking-wider animate-pulse shadow-neon-amber">NEW</span>
+                                    {new_badge}
                                 </div>
                                 <p class="text-text-muted text-lg max-w-2xl">{data.description}</p>
                             </div>
@@ -268,11 +256,11 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
                             </div>
                             <div class="flex items-center gap-1.5">
                                 <span class="material-symbols-outlined text-lg">star</span>
-                                <span class="text-white font-medium">{format_stars_display(data.stars)}</span>
+                                <span class="text-white font-medium">{data.stars}</span>
                             </div>
                             <div class="flex items-center gap-1.5">
                                 <span class="material-symbols-outlined text-lg text-muted-mint">add</span>
-                                <span class="text-muted-mint font-medium">+{data.stars_today}</span>
+                                <span class="text-muted-mint font-medium">+{data.peak_stars_today}</span>
                             </div>
                             <div class="flex items-center gap-1.5">
                                 <span class="material-symbols-outlined text-lg">account_tree</span>
@@ -289,8 +277,8 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
                 <!-- Stats Grid -->
                 <div class="grid grid-cols-2 md:grid-cols-3 gap-4">
                     <div class="glass-card rounded-xl p-4">
-                        <p class="text-xs text-text-muted mb-1">{t['rank']}</p>
-                        <p class="text-2xl font-bold text-electric-cyan">#{data.rank}</p>
+                        <p class="text-xs text-text-muted mb-1">{t['best_rank']}</p>
+                        <p class="text-2xl font-bold text-electric-cyan">#{data.best_rank}</p>
                     </div>
                     <div class="glass-card rounded-xl p-4">
                         <p class="text-xs text-text-muted mb-1">{t['score']}</p>
@@ -350,8 +338,12 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
                         <span class="text-white font-medium">{data.stars}</span>
                     </div>
                     <div class="flex justify-between items-center text-sm">
-                        <span class="text-text-muted">{t['today']}</span>
-                        <span class="text-muted-mint font-medium">+{data.stars_today}</span>
+                        <span class="text-text-muted">{t['peak_today']}</span>
+                        <span class="text-muted-mint font-medium">+{data.peak_stars_today}</span>
+                    </div>
+                    <div class="flex justify-between items-center text-sm">
+                        <span class="text-text-muted">{t['first_seen']}</span>
+                        <span class="text-white font-mono text-xs">{data.first_seen}</span>
                     </div>
                     {f'<div class="flex justify-between items-center text-sm"><span class="text-text-muted">License</span><span class="text-white font-mono text-xs bg-synapse-border px-2 py-1 rounded">{data.license}</span></div>' if data.license else ''}
                 </div>
@@ -370,14 +362,199 @@ def generate_deep_dive_html(data: DeepDiveData, date: datetime = None, lang: str
 '''
 
 
+def deep_dive_data(view: RepoView) -> DeepDiveData:
+    """由仓库视图构建深度分析页面数据"""
+    analysis = view.analysis
+    ai = view.ai_summary
+    return DeepDiveData(
+        repo_name=view.name,
+        owner=view.owner,
+        short_name=view.short_name,
+        description=view.description,
+        url=view.url,
+        language=view.language or 'Unknown',
+        stars=view.stars_display,
+        forks=format_stars_display(view.forks),
+        domain=view.domain,
+        score=view.score,
+        best_rank=view.best_rank or view.rank,
+        first_seen=view.first_seen,
+        peak_stars_today=format_stars_display(str(max(view.peak_stars_today, view.stars_today_count))),
+        is_new=view.is_new,
+        ai_summary=ai.summary if ai else None,
+        ai_highlights=ai.highlights if ai else None,
+        ai_use_cases=ai.use_cases if ai else None,
+        topics=analysis.topics if hasattr(analysis, 'topics') else None,
+        license=analysis.license if hasattr(analysis, 'license') else None,
+    )
+
+
+def deep_dive_fingerprint(data: DeepDiveData, lang: str = 'zh') -> str:
+    """页面输入的指纹 (模板版本 + 语言 + 页面数据)"""
+    # vars 而非 asdict: 字段都是可 JSON 序列化的值，无需深拷贝
+    payload = json.dumps([DEEP_DIVE_FORMAT, lang, vars(data)], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def deep_dive_href(repo_name: str) -> str:
+    """页面相对 deep-dive/ 的路径: <owner>/<repo>.html (小写，不同 owner 的同名仓库不会互相覆盖)"""
+    owner, _, repo = repo_name.lower().replace(' ', '-').partition('/')
+    return f'{owner}/{repo or owner}.html'
+
+
+def deep_dive_path(base_dir: str, repo_name: str) -> Path:
+    """深度分析页面路径: deep-dive/<owner>/<repo>.html"""
+    return Path(base_dir) / DEEP_DIVE_DIR / deep_dive_href(repo_name)
+
+
+def deep_dive_targets(context: RenderContext) -> list[RepoView]:
+    """需要深度分析页面的仓库 (当天全部上榜项目)"""
+    return list(context.repos)
+
+
+class DeepDiveManifest:
+    """
+    深度分析页面清单 (deep-dive/manifest.json)
+
+    记录每个页面的输入指纹、索引页所需的信息与最近一次的 AI 总结。plan 只返回指纹变化
+    或页面缺失的仓库，页面写完后调用 save 写回清单并更新索引页。AI 总结只为当天前 10 名
+    生成，跌出前 10 的仓库沿用清单中的总结，页面不会因此丢失 AI 内容。
+
+    Args:
+        base_dir: 站点目录
+        pages: 仓库名 -> 条目 (hash、updated 及索引字段)
+    """
+
+    def __init__(self, base_dir: str, pages: dict = None):
+        self.base_dir = base_dir
+        self.pages = pages if pages is not None else {}
+
+    @property
+    def path(self) -> Path:
+        return Path(self.base_dir) / DEEP_DIVE_DIR / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, base_dir: str) -> 'DeepDiveManifest':
+        """读取清单，不存在、损坏或模板版本不同时返回空清单 (全部重新生成)"""
+        manifest = cls(base_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return manifest
+        if isinstance(data, dict) and data.get('format') == DEEP_DIVE_FORMAT:
+            manifest.pages = data.get('pages', {})
+        return manifest
+
+    def last_summary(self, repo_name: str) -> Optional[AISummary]:
+        """清单中记录的最近一次 AI 总结"""
+        ai = self.pages.get(repo_name, {}).get('ai')
+        if not ai:
+            return None
+        summary, highlights, use_cases = ai
+        return AISummary(repo_name, summary, list(highlights), use_cases)
+
+    def plan(self, context: RenderContext, lang: str = 'zh') -> list[RepoView]:
+        """
+        比较指纹，返回需要重新生成页面的仓库 (同时更新内存中的条目)；当天没有 AI 总结的
+        仓库以清单中的总结替换 ai_summary 后返回
+
+        回填多天时按日期顺序调用，同一仓库以最后一天的数据为准；早于页面更新日期的回填
+        不会覆盖由更新数据生成的页面。
+        """
+        date_str = context.date.strftime('%Y-%m-%d')
+        changed = []
+        for view in deep_dive_targets(context):
+            entry = self.pages.get(view.name)
+            if entry and entry['updated'] > date_str:
+                continue
+            if view.ai_summary is None:
+                ai = self.last_summary(view.name)
+                if ai is not None:
+                    view = replace(view, ai_summary=ai)
+            ai_row = [view.ai_summary.summary, view.ai_summary.highlights, view.ai_summary.use_cases] \
+                if view.ai_summary else None
+            data = deep_dive_data(view)
+            fingerprint = deep_dive_fingerprint(data, lang)
+            if entry and entry['hash'] == fingerprint and deep_dive_path(self.base_dir, view.name).exists():
+                if ai_row:
+                    entry['ai'] = ai_row
+                continue
+            self.pages[view.name] = {
+                'hash': fingerprint,
+                'updated': date_str,
+                'description': data.description,
+                'language': data.language,
+                'domain': data.domain,
+                'stars': data.stars,
+                'best_rank': data.best_rank,
+            }
+            if ai_row:
+                self.pages[view.name]['ai'] = ai_row
+            changed.append(view)
+        return changed
+
+    def save(self) -> None:
+        """写回清单与索引页 (内容不变时不写)"""
+        data = {'format': DEEP_DIVE_FORMAT, 'pages': dict(sorted(self.pages.items()))}
+        write_if_changed(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        write_if_changed(self.path.parent / 'index.html', generate_deep_dive_index_html(self.pages))
+
+
+def generate_deep_dive_index_html(pages: dict) -> str:
+    """生成深度分析索引页 (deep-dive/index.html)，最近更新在前"""
+    entries = sorted(pages.items(), key=lambda item: item[0])
+    entries.sort(key=lambda item: item[1]['updated'], reverse=True)
+    rows = ''.join(
+        f'<tr class="border-b border-[#30363D]">'
+        f'<td class="py-2 pr-4"><a href="{html_lib.escape(deep_dive_href(name))}" '
+        f'class="font-mono text-white hover:text-[#00F0FF]">{html_lib.escape(name)}</a>'
+        f'<p class="text-xs text-[#8B949E] truncate max-w-md">{html_lib.escape(entry.get("description") or "")}</p></td>'
+        f'<td class="py-2 pr-4 text-sm">{html_lib.escape(entry.get("language") or "")}</td>'
+        f'<td class="py-2 pr-4 text-sm font-mono">{html_lib.escape(entry.get("stars") or "")}</td>'
+        f'<td class="py-2 pr-4 text-sm font-mono">#{entry.get("best_rank")}</td>'
+        f'<td class="py-2 text-sm font-mono text-[#8B949E]">{entry["updated"]}</td></tr>'
+        for name, entry in entries
+    )
+
+    return f'''<!DOCTYPE html>
+<html lang="zh-CN" class="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>深度分析 / Deep Dives</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <style>
+        body {{ background-color: #0D1117; color: #C9D1D9; font-family: Inter, sans-serif; }}
+    </style>
+</head>
+<body class="min-h-screen">
+    <header class="border-b border-[#30363D] px-6 py-4 flex items-center justify-between">
+        <h1 class="text-xl font-bold text-white">深度分析 / Deep Dives <span class="text-sm font-mono text-[#8B949E]">{len(entries)}</span></h1>
+        <a href="../index.html" class="text-sm text-[#8B949E] hover:text-white">← Trending</a>
+    </header>
+    <main class="max-w-5xl mx-auto p-6">
+        <table class="w-full text-left">
+            <thead class="text-xs text-[#8B949E] uppercase">
+                <tr><th class="pb-2">项目 / Repo</th><th class="pb-2">语言</th><th class="pb-2">Star</th><th class="pb-2">最高排名</th><th class="pb-2">更新</th></tr>
+            </thead>
+            <tbody>{rows}</tbody>
+        </table>
+    </main>
+</body>
+</html>
+'''
+
+
 def generate_deep_dive_pages(analyses: list[RepoAnalysis],
                              rank_changes: list[RankChange],
                              ai_summaries: dict = None,
                              base_dir: str = 'archives',
                              date: datetime = None,
-                             lang: str = 'zh') -> list[str]:
+                             lang: str = 'zh',
+                             context: RenderContext = None) -> list[str]:
     """
-    为新上榜项目生成深度分析页面
+    为上榜项目生成深度分析页面 (只重新生成输入变化的页面)
 
     Args:
         analyses: 分析结果列表
@@ -386,69 +563,22 @@ def generate_deep_dive_pages(analyses: list[RepoAnalysis],
         base_dir: 输出目录
         date: 日期
         lang: 语言
+        context: 共享的渲染上下文 (见 render_context.py)，传入时忽略前三个参数与 date
 
     Returns:
-        生成的文件路径列表
+        本次生成的文件路径列表
     """
-    if date is None:
-        date = datetime.now()
-
-    if ai_summaries is None:
-        ai_summaries = {}
-
-    # 创建 deep-dive 目录
-    deep_dive_dir = Path(base_dir) / 'deep-dive'
-    deep_dive_dir.mkdir(parents=True, exist_ok=True)
-
-    # 找出新上榜项目
-    change_map = {c.name: c for c in rank_changes}
-    sorted_analyses = sorted(analyses, key=lambda x: x.score, reverse=True)[:25]
+    if context is None:
+        context = build_render_context(analyses, rank_changes, date, ai_summaries)
 
+    manifest = DeepDiveManifest.load(base_dir)
     generated_files = []
 
-    for i, analysis in enumerate(sorted_analyses, 1):
-        repo = analysis.repo
-        change = change_map.get(repo.name)
-
-        # 只为新项目生成
-        if not (change and change.is_new):
-            continue
-
-        owner = repo.name.split('/')[0] if '/' in repo.name else repo.name
-        short_name = repo.name.split('/')[-1] if '/' in repo.name else repo.name
-
-        ai = ai_summaries.get(repo.name)
-
-        data = DeepDiveData(
-            repo_name=repo.name,
-            owner=owner,
-            short_name=short_name,
-            description=repo.description,
-            url=repo.url,
-            language=repo.language or 'Unknown',
-            stars=repo.stars,
-            stars_today=repo.stars_today,
-            forks=repo.forks,
-            domain=classify_domain(repo.name, repo.description, repo.language or ''),
-            rank=i,
-            score=analysis.score,
-            ai_summary=ai.summary if ai else None,
-            ai_highlights=ai.highlights if ai else None,
-            ai_use_cases=ai.use_cases if ai else None,
-            topics=analysis.topics if hasattr(analysis, 'topics') else None,
-            license=analysis.license if hasattr(analysis, 'license') else None,
-        )
-
-        html = generate_deep_dive_html(data, date, lang)
-
-        # 使用安全的文件名
-        safe_name = short_name.lower().replace(' ', '-').replace('/', '-')
-        file_path = deep_dive_dir / f'{safe_name}.html'
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-
+    for view in manifest.plan(context, lang):
+        file_path = deep_dive_path(base_dir, view.name)
+        atomic_write_text(file_path, generate_deep_dive_html(deep_dive_data(view), context.date, lang))
         generated_files.append(str(file_path))
         print(f'  Generated deep dive: {file_path}')
 
+    manifest.save()
     return generated_files
@@ -0,0 +1,82 @@
+"""文件写入工具 - 原子写入，避免读者看到写了一半的文件"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+@contextmanager
+def atomic_open(path, mode: str = 'wb', encoding: Optional[str] = None):
+    """
+    打开同目录下的临时文件写入，正常退出时 os.replace 到目标路径，异常时删除临时文件
+
+    Args:
+        path: 目标文件路径
+        mode: 'wb' 或 'w'
+        encoding: 文本模式的编码
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        # mkstemp 默认 0600，改为常规文件权限
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path, data: bytes) -> str:
+    """
+    原子写入二进制内容 (先写临时文件，再 os.replace)
+
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+
+    Returns:
+        写入的文件路径
+    """
+    with atomic_open(path) as f:
+        f.write(data)
+    return str(path)
+
+
+def atomic_write_chunks(path, chunks: Iterable[str], encoding: str = 'utf-8') -> str:
+    """流式原子写入文本 (逐块写入临时文件，不在内存中拼接完整内容)"""
+    with atomic_open(path, 'w', encoding=encoding) as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return str(path)
+
+
+def atomic_write_text(path, content: str, encoding: str = 'utf-8') -> str:
+    """原子写入文本内容"""
+    return atomic_write_bytes(path, content.encode(encoding))
+
+
+def write_if_changed(path, content: str, encoding: str = 'utf-8') -> bool:
+    """
+    内容有变化时才原子写入 (减少无意义的文件改动)
+
+    Returns:
+        是否发生了写入
+    """
+    path = Path(path)
+    data = content.encode(encoding)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
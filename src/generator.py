@@ -194,6 +194,127 @@ def generate_markdown(analyses: list[RepoAnalysis], date: datetime = None) -> st
     return '\n'.join(lines)
 
 
+def generate_markdown_with_changes(analyses, rank_changes, date, context=None):
+    """生成带排名变化的 Markdown 报告 (context 为共享的渲染上下文，传入时忽略前三个参数)"""
+    from .render_context import build_render_context
+
+    if context is None:
+        context = build_render_context(analyses, rank_changes, date)
+    date = context.date
+    date_str = date.strftime('%Y-%m-%d')
+
+    # 按评分排序
+    views = context.repos
+
+    # 统计语言分布
+    lang_count = {}
+    for view in views:
+        lang = view.language or 'Other'
+        lang_count[lang] = lang_count.get(lang, 0) + 1
+
+    top_langs = sorted(lang_count.items(), key=lambda x: x[1], reverse=True)[:5]
+    lang_summary = ' | '.join(f'{lang}: {count}' for lang, count in top_langs)
+
+    # 统计新上榜
+    new_count = sum(1 for c in context.change_map.values() if c.is_new)
+
+    lines = [
+        f'# GitHub Trending 每日精选 ({date_str})',
+        '',
+        f'> 🔥 今日共收录 **{len(views)}** 个热门项目 | 🆕 新上榜 **{new_count}** 个',
+        f'>',
+        f'> 📊 语言分布: {lang_summary}',
+        '',
+        '---',
+        '',
+    ]
+
+    # 新上榜项目 Banner
+    new_projects = context.new_repos
+
+    if new_projects:
+        lines.extend([
+            '## 🆕 今日新上榜',
+            '',
+        ])
+        for view in new_projects[:5]:
+            repo = view.analysis.repo
+            desc = repo.description[:60] + '...' if len(repo.description) > 60 else repo.description
+            lines.append(f'- **[{repo.name}]({repo.url})** - {desc} ⭐ {format_stars(repo.stars)} (+{repo.stars_today})')
+        lines.extend(['', '---', ''])
+
+    # Top 3 推荐
+    lines.extend([
+        '## 🏆 今日重点推荐',
+        '',
+    ])
+
+    medals = ['🥇', '🥈', '🥉']
+    for i, view in enumerate(views[:3]):
+        analysis, repo = view.analysis, view.analysis.repo
+        change_str = view.change_text if view.rank_change else ''
+
+        # 格式化语言
+        if analysis.language_stats:
+            lang_parts = [f'{lang} {pct:.0f}%' for lang, pct in list(analysis.language_stats.items())[:3]]
+            lang_display = ', '.join(lang_parts)
+        elif repo.language:
+            lang_display = f'{repo.language} 100%'
+        else:
+            lang_display = '未知'
+
+        star_display = score_to_stars(analysis.score)
+        audience = get_target_audience(analysis)
+
+        lines.extend([
+            f'### {medals[i]} [{repo.name}]({repo.url})',
+            f'> {analysis.readme_summary}' if analysis.readme_summary else '',
+            '',
+            '| 指标 | 数值 |',
+            '|------|------|',
+            f'| ⭐ Star | {format_stars(repo.stars)} |',
+            f'| 📈 今日新增 | +{repo.stars_today} |',
+            f'| 📊 排名变化 | {change_str} |',
+            f'| 🔧 主要语言 | {lang_display} |',
+            f'| 📊 推荐指数 | {star_display} ({analysis.score}/10) |',
+            '',
+            f'**核心功能**: {analysis.readme_summary[:100]}' if analysis.readme_summary else '',
+            f'**技术栈**: {", ".join(analysis.tech_stack) if analysis.tech_stack else lang_display}',
+            f'**适合人群**: {audience}',
+            '',
+            '---',
+            '',
+        ])
+
+    # 完整列表
+    lines.extend([
+        '## 📋 完整列表',
+        '',
+        '| # | 项目 | 语言 | Star | 今日 | 变化 | 评分 |',
+        '|---|------|------|------|------|------|------|',
+    ])
+
+    for view in views:
+        lang = view.language or '未知'
+        lines.append(f'| {view.rank} | [{view.name}]({view.url}) | {lang} | {format_stars(view.stars)} | +{view.stars_today} | {view.change_text} | {view.score}/10 |')
+
+    lines.extend([
+        '',
+        '---',
+        '',
+        f'📅 更新时间: {date.strftime("%Y-%m-%d %H:%M:%S")}',
+        '',
+        '> 本报告由 [GitHub Trending Daily](https://github.com) 自动生成',
+    ])
+
+    return '\n'.join(line for line in lines if line is not None)
+
+
+def report_path(base_dir: str, date: datetime) -> Path:
+    """Markdown 报告路径: YYYY/MM/YYYY-MM-DD.md"""
+    return Path(base_dir) / date.strftime('%Y') / date.strftime('%m') / f'{date.strftime("%Y-%m-%d")}.md'
+
+
 def save_report(content: str, base_dir: str = 'archives', date: datetime = None) -> str:
     """
     保存报告到文件
@@ -209,12 +330,9 @@ def save_report(content: str, base_dir: str = 'archives', date: datetime = None)
     if date is None:
         date = datetime.now()
 
-    # 创建目录结构: archives/2026/01/
-    dir_path = Path(base_dir) / date.strftime('%Y') / date.strftime('%m')
-    dir_path.mkdir(parents=True, exist_ok=True)
-
-    # 文件名: 2026-01-30.md
-    file_path = dir_path / f'{date.strftime("%Y-%m-%d")}.md'
+    # 目录结构: archives/2026/01/2026-01-30.md
+    file_path = report_path(base_dir, date)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
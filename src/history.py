@@ -1,10 +1,22 @@
 """历史数据管理模块 - 用于追踪排名变化"""
 
 import json
-from datetime import datetime, timedelta
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date as date_cls, datetime, timedelta
+from functools import partial
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from typing import Iterator, Optional, Sequence, Union
+
+from .rollup import RollupError, open_rollup
+
+# 每日排名文件名: YYYY-MM-DD.json
+HISTORY_FILE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})\.json$')
+
+# 流式读取时默认预读的文件数
+DEFAULT_PREFETCH = 4
 
 
 @dataclass
@@ -26,6 +38,8 @@ class RankChange:
     previous_rank: Optional[int]
     change: Optional[int]  # 正数表示上升，负数表示下降
     is_new: bool  # 是否是新上榜项目
+    reference_date: Optional[str] = None  # 对比所用的日期
+    first_seen: Optional[str] = None  # 首次上榜日期
 
 
 def get_history_file_path(base_dir: str, date: datetime) -> Path:
@@ -35,15 +49,203 @@ def get_history_file_path(base_dir: str, date: datetime) -> Path:
     return dir_path / f'{date.strftime("%Y-%m-%d")}.json'
 
 
+def parse_count(text) -> int:
+    """
+    解析 Star/Fork 计数文本，如 '47,068' -> 47068，无法解析返回 0
+    """
+    try:
+        return int(str(text).replace(',', ''))
+    except (ValueError, TypeError):
+        return 0
+
+
+def iter_history_files(base_dir: str = 'archives') -> Iterator[tuple[str, Path]]:
+    """
+    按日期顺序遍历所有每日排名文件
+
+    Args:
+        base_dir: 存档基础目录
+
+    Yields:
+        (日期字符串 YYYY-MM-DD, 文件路径)
+    """
+    base_path = Path(base_dir)
+    if not base_path.exists():
+        return
+
+    for year_dir in sorted(p for p in base_path.iterdir() if p.is_dir() and p.name.isdigit()):
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+            for file_path in sorted(month_dir.iterdir()):
+                if HISTORY_FILE_PATTERN.match(file_path.name):
+                    yield file_path.stem, file_path
+
+
+def _date_key(value: Union[str, date_cls, None]) -> Optional[str]:
+    """日期参数统一为 YYYY-MM-DD 字符串"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime('%Y-%m-%d')
+
+
+def _read_rankings(file_path: Path, fields: Optional[Sequence[str]] = None) -> Optional[list]:
+    """
+    读取一天的排名 (在预读线程中执行)
+
+    Returns:
+        排名字典列表 (指定 fields 时只保留这些字段)，文件损坏返回 None
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            rankings = json.load(f).get('rankings', [])
+    except (json.JSONDecodeError, OSError, AttributeError):
+        return None
+
+    if fields is None:
+        return rankings
+    return [{key: entry.get(key) for key in fields} for entry in rankings]
+
+
+def _iter_sources(base_dir: str, binary: bool):
+    """
+    按日期顺序产出 (日期, 读取函数, 是否在当前线程读取, 需关闭的归档对象)
+
+    每个月的数据来源优先级: 月度快照 (binary=True 时) > 每日 JSON > 月度归档 (rollup)。
+    读取函数接受 fields 参数并返回排名列表。
+    """
+    base_path = Path(base_dir)
+    if not base_path.exists():
+        return
+
+    if binary:
+        from .snapshot import MonthSnapshot, SnapshotError, get_snapshot_path
+
+    for year_dir in sorted(p for p in base_path.iterdir() if p.is_dir() and p.name.isdigit()):
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+            year, month = int(year_dir.name), int(month_dir.name)
+            sources = {}
+            handles = []
+
+            rollup = open_rollup(base_dir, year, month)
+            if rollup is not None:
+                handles.append(rollup)
+                for date_str in rollup.dates():
+                    sources[date_str] = (partial(rollup.rankings, date_str), False)
+
+            for file_path in month_dir.iterdir():
+                if HISTORY_FILE_PATTERN.match(file_path.name):
+                    sources[file_path.stem] = (partial(_read_rankings, file_path), False)
+
+            snapshot_path = get_snapshot_path(base_dir, year, month) if binary else None
+            if snapshot_path is not None and snapshot_path.exists():
+                try:
+                    snapshot = MonthSnapshot(snapshot_path)
+                except (SnapshotError, OSError):
+                    snapshot = None
+                if snapshot is not None:
+                    handles.append(snapshot)
+                    for date_str in snapshot.dates():
+                        # 快照按 mmap 直接解码，比线程调度更快
+                        sources[date_str] = (partial(snapshot.rankings, date_str), True)
+
+            if not sources:
+                for handle in handles:
+                    handle.close()
+                continue
+
+            for i, date_str in enumerate(sorted(sources)):
+                load, inline = sources[date_str]
+                yield date_str, load, inline, handles if i == 0 else ()
+
+
+def iter_ranking_history(base_dir: str = 'archives',
+                         start: Union[str, date_cls, None] = None,
+                         end: Union[str, date_cls, None] = None,
+                         fields: Optional[Sequence[str]] = None,
+                         flat: bool = False,
+                         prefetch: int = DEFAULT_PREFETCH,
+                         binary: bool = False) -> Iterator[tuple]:
+    """
+    按日期顺序流式读取排名历史
+
+    文件由后台线程提前读取并解析，最多同时持有 prefetch + 1 天的数据，
+    内存占用与扫描的天数无关。损坏的文件直接跳过。
+
+    Args:
+        base_dir: 存档基础目录
+        start, end: 日期范围 (含两端)，为空不限
+        fields: 只保留的字段 (如 ('name', 'rank'))，为空保留全部
+        flat: 为 True 时逐条产出 (date, 字段值...) 元组，
+              字段顺序同 fields (为空时为 RankingEntry 的全部字段)
+        prefetch: 预读文件数，0 表示在当前线程同步读取
+        binary: 优先读取月度二进制快照 (见 snapshot.py)；
+                已压缩归档的月份总是从 rollup 读取 (见 rollup.py)
+
+    Yields:
+        flat=False: (日期字符串, 排名字典列表)
+        flat=True: (日期字符串, 值1, 值2, ...)
+    """
+    start, end = _date_key(start), _date_key(end)
+    if flat and fields is None:
+        fields = tuple(f.name for f in dataclass_fields(RankingEntry))
+
+    handles = []
+
+    def sources():
+        for date_str, load, inline, opened in _iter_sources(base_dir, binary):
+            handles.extend(opened)
+            if (not start or date_str >= start) and (not end or date_str <= end):
+                yield date_str, load, inline
+
+    def emit(date_str: str, rankings: Optional[list]):
+        if rankings is None:
+            return
+        if not flat:
+            yield date_str, rankings
+            return
+        for entry in rankings:
+            yield (date_str, *(entry[key] for key in fields))
+
+    executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix='history') if prefetch > 0 else None
+    pending = deque()
+    try:
+        if executor is None:
+            for date_str, load, _ in sources():
+                yield from emit(date_str, load(fields))
+            return
+
+        for date_str, load, inline in sources():
+            if inline:
+                future = Future()
+                future.set_result(load(fields))
+            else:
+                future = executor.submit(load, fields)
+            pending.append((date_str, future))
+            if len(pending) > prefetch:
+                ready_date, future = pending.popleft()
+                yield from emit(ready_date, future.result())
+        while pending:
+            ready_date, future = pending.popleft()
+            yield from emit(ready_date, future.result())
+    finally:
+        # 提前结束迭代时取消尚未开始的读取
+        for _, future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for handle in handles:
+            handle.close()
+
+
 def save_ranking_history(entries: list[RankingEntry], base_dir: str = 'archives',
-                         date: datetime = None) -> str:
+                         date: datetime = None, write_snapshot: bool = True) -> str:
     """
-    保存当日排名数据
+    保存当日排名数据 (JSON，并同步更新所在月份的二进制快照)
 
     Args:
         entries: 排名条目列表
         base_dir: 存档基础目录
         date: 日期，默认为今天
+        write_snapshot: 是否同时更新月度快照
 
     Returns:
         保存的文件路径
@@ -63,6 +265,10 @@ def save_ranking_history(entries: list[RankingEntry], base_dir: str = 'archives'
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+    if write_snapshot:
+        from .snapshot import update_month_snapshot
+        update_month_snapshot(base_dir, data['date'], data['rankings'])
+
     return str(file_path)
 
 
@@ -75,22 +281,30 @@ def load_ranking_history(base_dir: str = 'archives', date: datetime = None) -> O
         date: 日期，默认为今天
 
     Returns:
-        排名条目列表，如果文件不存在返回 None
+        排名条目列表，如果文件 (及月度归档中) 不存在返回 None
     """
     if date is None:
         date = datetime.now()
 
     file_path = get_history_file_path(base_dir, date)
 
-    if not file_path.exists():
-        return None
-
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if file_path.exists():
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            # 已压缩的月份从归档读取
+            rollup = open_rollup(base_dir, date.year, date.month)
+            if rollup is None:
+                return None
+            with rollup:
+                raw = rollup.read_bytes(date.strftime('%Y-%m-%d'))
+            if raw is None:
+                return None
+            data = json.loads(raw)
 
         return [RankingEntry(**entry) for entry in data.get('rankings', [])]
-    except (json.JSONDecodeError, KeyError, TypeError):
+    except (json.JSONDecodeError, KeyError, TypeError, RollupError):
         return None
 
 
@@ -4,44 +4,19 @@ Hacker News 仪表板生成器 - Synapse 风格
 
 from datetime import datetime
 from pathlib import Path
+from .fileio import atomic_write_text
 from .hn_scraper import HNStory, classify_hn_category
+from .i18n import texts
 
 
-def generate_hn_sidebar_html(lang: str = 'zh', active_page: str = 'hn') -> str:
-    """生成左侧边栏 HTML (带 HN 导航)"""
-    texts = {
-        'zh': {
-            'feeds': 'GitHub',
-            'all': '全部热门',
-            'ai_ml': 'AI & ML',
-            'frontend': '前端开发',
-            'system': '系统底层',
-            'hn_section': 'Hacker News',
-            'hn_top': 'Top Stories',
-            'hn_best': 'Best Stories',
-            'insights': '洞察',
-            'rising': '上升最快',
-            'new_today': '今日新上榜',
-        },
-        'en': {
-            'feeds': 'GitHub',
-            'all': 'All Trending',
-            'ai_ml': 'AI & ML',
-            'frontend': 'Frontend',
-            'system': 'System',
-            'hn_section': 'Hacker News',
-            'hn_top': 'Top Stories',
-            'hn_best': 'Best Stories',
-            'insights': 'Insights',
-            'rising': 'Rising Stars',
-            'new_today': 'New Today',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+def generate_hn_sidebar_html(lang: str = 'zh', active_page: str = 'hn', root: str = '') -> str:
+    """生成左侧边栏 HTML (带 HN 导航)，root 为页面到站点根目录的相对前缀"""
+    t = texts('hn_sidebar', lang)
 
     # 根据 active_page 设置高亮
     github_active = 'nav-item-active' if active_page == 'github' else 'nav-item text-text-muted hover:text-white hover:bg-synapse-border/30'
     hn_active = 'nav-item-active' if active_page == 'hn' else 'nav-item text-text-muted hover:text-white hover:bg-synapse-border/30'
+    best_active = 'nav-item-active' if active_page == 'hn_best' else 'nav-item text-text-muted hover:text-white hover:bg-synapse-border/30'
 
     return f'''
     <aside class="w-64 h-full flex flex-col glass-panel border-r border-synapse-border shrink-0 z-20">
@@ -63,7 +38,7 @@ def generate_hn_sidebar_html(lang: str = 'zh', active_page: str = 'hn') -> str:
             <!-- GitHub Section -->
             <div class="px-4 mb-2">
                 <p class="text-xs font-bold text-text-muted uppercase tracking-wider mb-2 px-2">{t['feeds']}</p>
-                <a href="index.html" class="{github_active} flex items-center gap-3 px-3 py-2.5 rounded-lg transition-colors group" id="github-link">
+                <a href="{root}index.html" class="{github_active} flex items-center gap-3 px-3 py-2.5 rounded-lg transition-colors group" id="github-link">
                     <span class="material-symbols-outlined">grid_view</span>
                     <span class="text-sm font-medium">{t['all']}</span>
                 </a>
@@ -74,10 +49,14 @@ def generate_hn_sidebar_html(lang: str = 'zh', active_page: str = 'hn') -> str:
                 <p class="text-xs font-bold text-text-muted uppercase tracking-wider mb-2 px-2">
                     <span class="text-glow-amber">Y</span> {t['hn_section']}
                 </p>
-                <a href="hn.html" class="{hn_active} flex items-center gap-3 px-3 py-2.5 rounded-lg transition-colors group">
+                <a href="{root}hn.html" class="{hn_active} flex items-center gap-3 px-3 py-2.5 rounded-lg transition-colors group">
                     <span class="material-symbols-outlined text-glow-amber">local_fire_department</span>
                     <span class="text-sm font-medium">{t['hn_top']}</span>
                 </a>
+                <a href="{root}hn/index.html" class="{best_active} flex items-center gap-3 px-3 py-2.5 rounded-lg transition-colors group">
+                    <span class="material-symbols-outlined text-glow-amber">history</span>
+                    <span class="text-sm font-medium">{t['hn_best']}</span>
+                </a>
             </div>
         </div>
 
@@ -85,7 +64,7 @@ def generate_hn_sidebar_html(lang: str = 'zh', active_page: str = 'hn') -> str:
         <div class="p-4 border-t border-synapse-border">
             <div class="flex items-center gap-2 text-xs text-text-muted">
                 <span class="w-2 h-2 rounded-full bg-glow-amber pulse-dot"></span>
-                <span class="font-mono">{'HN 数据已同步' if lang == 'zh' else 'HN Data Synced'}</span>
+                <span class="font-mono">{t['synced']}</span>
             </div>
         </div>
     </aside>
@@ -113,11 +92,7 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
             return f'{n/1000:.1f}k'
         return str(n)
 
-    texts = {
-        'zh': ['总 Stories', '平均分数', '总评论', '热门分类'],
-        'en': ['Total Stories', 'Avg Score', 'Total Comments', 'Top Category']
-    }
-    t = texts.get(lang, texts['zh'])
+    t = texts('hn_stats_bar', lang)
 
     return f'''
     <div class="grid grid-cols-2 md:grid-cols-4 gap-3 mb-6">
@@ -126,7 +101,7 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-glow-amber">article</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[0]}</p>
+                <p class="text-xs text-text-muted">{t['total_stories']}</p>
                 <p class="text-xl font-bold text-white">{len(stories)}</p>
             </div>
         </div>
@@ -135,7 +110,7 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-electric-cyan">arrow_upward</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[1]}</p>
+                <p class="text-xs text-text-muted">{t['avg_score']}</p>
                 <p class="text-xl font-bold text-white">{avg_score}</p>
             </div>
         </div>
@@ -144,7 +119,7 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-muted-mint">chat</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[2]}</p>
+                <p class="text-xs text-text-muted">{t['total_comments']}</p>
                 <p class="text-xl font-bold text-white">{fmt(total_comments)}</p>
             </div>
         </div>
@@ -153,7 +128,7 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
                 <span class="material-symbols-outlined text-purple-400">category</span>
             </div>
             <div>
-                <p class="text-xs text-text-muted">{t[3]}</p>
+                <p class="text-xs text-text-muted">{t['top_category']}</p>
                 <p class="text-xl font-bold text-white">{top_category}</p>
             </div>
         </div>
@@ -161,8 +136,14 @@ def generate_hn_stats_bar(stories: list[HNStory], lang: str = 'zh') -> str:
     '''
 
 
-def generate_hn_story_html(story: HNStory, rank: int, lang: str = 'zh') -> str:
-    """生成单个 HN Story 卡片"""
+def generate_hn_story_html(story: HNStory, rank: int, lang: str = 'zh', note: str = '', trending=None) -> str:
+    """
+    生成单个 HN Story 卡片
+
+    Args:
+        note: 附加在元信息行末尾的说明 (如历史轨迹)
+        trending: 故事链接的仓库在 Trending 中的记录 (cross_links.TrendingRef)
+    """
     category = classify_hn_category(story.title, story.url)
 
     # 分类颜色
@@ -192,6 +173,13 @@ def generate_hn_story_html(story: HNStory, rank: int, lang: str = 'zh') -> str:
 
     url_to_open = story.url if story.url else story.hn_url
 
+    # Trending 仓库标记
+    trending_html = ''
+    if trending is not None:
+        label = texts('hn_dashboard', lang)['trending_peak'].format(rank=trending.best_rank)
+        trending_html = (f'<span class="px-1.5 py-0.5 rounded bg-electric-cyan/10 text-electric-cyan font-mono" '
+                         f'title="{trending.name} · {trending.last_seen}">{label}</span>')
+
     # 使用中文标题（如果有），否则使用原标题
     display_title = story.title_zh if story.title_zh and lang == 'zh' else story.title
     # 如果有中文翻译，显示原标题作为副标题
@@ -228,6 +216,8 @@ def generate_hn_story_html(story: HNStory, rank: int, lang: str = 'zh') -> str:
                 {f'<span class="text-text-muted/60">{domain}</span>' if domain else ''}
                 <a href="{story.hn_url}" class="text-electric-cyan hover:underline"
                    onclick="event.stopPropagation()" target="_blank">discuss</a>
+                {f'<span class="text-muted-mint font-mono">{note}</span>' if note else ''}
+                {trending_html}
             </div>
         </div>
 
@@ -242,11 +232,14 @@ def generate_hn_story_html(story: HNStory, rank: int, lang: str = 'zh') -> str:
     '''
 
 
-def generate_hn_stories_list(stories: list[HNStory], lang: str = 'zh') -> str:
-    """生成 Stories 列表"""
+def generate_hn_stories_list(stories: list[HNStory], lang: str = 'zh', notes: dict[int, str] = None,
+                             trending: dict = None) -> str:
+    """生成 Stories 列表 (notes: 故事 ID -> 附加说明，trending: 故事 ID -> TrendingRef)"""
+    notes = notes or {}
+    trending = trending or {}
     items = []
     for i, story in enumerate(stories, 1):
-        items.append(generate_hn_story_html(story, i, lang))
+        items.append(generate_hn_story_html(story, i, lang, notes.get(story.id, ''), trending.get(story.id)))
 
     return f'''
     <div class="space-y-3">
@@ -255,30 +248,32 @@ def generate_hn_stories_list(stories: list[HNStory], lang: str = 'zh') -> str:
     '''
 
 
-def generate_hn_dashboard_html(stories: list[HNStory], date: str = None, lang: str = 'zh') -> str:
-    """生成 HN 仪表板完整 HTML"""
+def generate_hn_dashboard_html(stories: list[HNStory], date: str = None, lang: str = 'zh',
+                               heading: dict = None, notes: dict[int, str] = None,
+                               root: str = '', active_page: str = 'hn', trending: dict = None) -> str:
+    """
+    生成 HN 仪表板完整 HTML
+
+    Args:
+        stories: 故事列表
+        date: 顶栏显示的日期
+        lang: 语言
+        heading: 覆盖默认的 {'title', 'subtitle'} (如 Best of 页面)
+        notes: 故事 ID -> 附加说明
+        root: 页面到站点根目录的相对前缀 (子目录中的页面使用)
+        active_page: 侧边栏高亮项
+        trending: 故事 ID -> 链接仓库的 Trending 记录
+    """
     if date is None:
         date = datetime.now().strftime('%Y-%m-%d')
 
     date_str = date
 
-    texts = {
-        'zh': {
-            'title': 'Hacker News Top Stories',
-            'subtitle': '来自 Y Combinator 的实时技术脉搏',
-            'search_placeholder': '搜索 Stories...',
-        },
-        'en': {
-            'title': 'Hacker News Top Stories',
-            'subtitle': 'Real-time tech pulse from Y Combinator',
-            'search_placeholder': 'Search stories...',
-        }
-    }
-    t = texts.get(lang, texts['zh'])
+    t = {**texts('hn_dashboard', lang), **(heading or {})}
 
     stats_bar = generate_hn_stats_bar(stories, lang)
-    stories_list = generate_hn_stories_list(stories, lang)
-    sidebar = generate_hn_sidebar_html(lang, active_page='hn')
+    stories_list = generate_hn_stories_list(stories, lang, notes, trending)
+    sidebar = generate_hn_sidebar_html(lang, active_page=active_page, root=root)
 
     return f'''<!DOCTYPE html>
 <html lang="{lang}" class="dark">
@@ -444,7 +439,4 @@ def generate_hn_dashboard_html(stories: list[HNStory], date: str = None, lang: s
 
 def save_hn_dashboard(html: str, output_dir: str = 'archives') -> str:
     """保存 HN 仪表板 HTML"""
-    output_path = Path(output_dir) / 'hn.html'
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html, encoding='utf-8')
-    return str(output_path)
+    return atomic_write_text(Path(output_dir) / 'hn.html', html)
@@ -0,0 +1,306 @@
+"""Hacker News 历史存档 - 每次刷新的排名快照与故事轨迹
+
+快照与 GitHub 排名使用同一套存档结构 (archives/hn/YYYY/MM/YYYY-MM-DD.json，
+已结束的月份由 compact 合并为 rollup)，因此可以用 iter_ranking_history 流式读取。
+每日文件的 rankings 中每行是某次快照里的一个故事:
+
+    {"ts": 1700000000, "id": 123, "rank": 1, "score": 250, "comments": 80}
+
+故事在当天第一次出现 (或标题等信息变化) 时，该行额外带上 META_FIELDS。
+
+由快照计算每个故事的分数速度与在首页停留的时长，并生成每日 / 每周的
+Best of 页面 (archives/hn/YYYY/MM/YYYY-MM-DD.html、archives/hn/weekly/YYYY-Www.html)。
+只有快照比页面新的日期 (及其所在周) 才会重新生成。
+"""
+
+import html
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date as date_cls, datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
+
+from .fileio import atomic_write_text, write_if_changed
+from .history import get_history_file_path, iter_history_files, iter_ranking_history
+from .hn_dashboard import generate_hn_dashboard_html
+from .hn_scraper import HNStory
+from .i18n import texts
+
+HN_ARCHIVE_DIR = 'hn'
+WEEKLY_DIR = 'weekly'
+
+# 故事首次出现时随快照行保存的字段
+META_FIELDS = ('title', 'title_zh', 'url', 'author', 'time')
+
+# 相邻两次快照的间隔上限 (秒)，刷新任务停摆期间不计入在榜时长
+MAX_GAP_SECONDS = 60 * 60
+# 最后一次快照按此间隔计入在榜时长 (与定时刷新周期一致)
+DEFAULT_INTERVAL_SECONDS = 15 * 60
+
+BEST_OF_LIMIT = 30
+
+
+def get_hn_archive_dir(base_dir: str = 'archives') -> Path:
+    """HN 存档目录"""
+    return Path(base_dir) / HN_ARCHIVE_DIR
+
+
+def record_snapshot(base_dir: str, stories: list[HNStory], ts: Optional[float] = None) -> str:
+    """
+    追加一次 HN 排名快照到当天的存档文件
+
+    Args:
+        base_dir: 站点目录 (存档位于其下的 hn/)
+        stories: 当前榜单 (按排名)
+        ts: 快照时间戳，默认当前时间
+
+    Returns:
+        每日存档文件路径
+    """
+    ts = int(ts if ts is not None else time.time())
+    moment = datetime.fromtimestamp(ts)
+    file_path = get_history_file_path(str(get_hn_archive_dir(base_dir)), moment)
+
+    try:
+        data = json.loads(file_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get('rankings'), list):
+        data = {'rankings': []}
+
+    rows = data['rankings']
+    known = {}
+    for row in rows:
+        if 'title' in row:
+            known[row['id']] = tuple(row.get(key) for key in META_FIELDS)
+
+    for rank, story in enumerate(stories, 1):
+        row = {'ts': ts, 'id': story.id, 'rank': rank, 'score': story.score, 'comments': story.comments}
+        meta = (story.title, story.title_zh, story.url, story.author, story.time)
+        if known.get(story.id) != meta:
+            row.update(zip(META_FIELDS, meta))
+            known[story.id] = meta
+        rows.append(row)
+
+    data.update({
+        'date': moment.strftime('%Y-%m-%d'),
+        'updated_at': moment.strftime('%Y-%m-%d %H:%M:%S'),
+        'snapshots': data.get('snapshots', 0) + 1,
+        'count': len(rows),
+        'rankings': rows,
+    })
+    return atomic_write_text(file_path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+
+@dataclass
+class StoryTrack:
+    """某个故事在一段时间内的排名轨迹"""
+    id: int
+    title: str = ''
+    title_zh: str = ''
+    url: str = ''
+    author: str = ''
+    time: int = 0
+    points: list[tuple[int, int, int, int]] = field(default_factory=list)  # (ts, rank, score, comments)
+    front_page_seconds: int = 0  # 在首页停留的时长
+
+    @property
+    def first_seen(self) -> int:
+        return self.points[0][0]
+
+    @property
+    def last_seen(self) -> int:
+        return self.points[-1][0]
+
+    @property
+    def best_rank(self) -> int:
+        return min(p[1] for p in self.points)
+
+    @property
+    def peak_score(self) -> int:
+        return max(p[2] for p in self.points)
+
+    @property
+    def comments(self) -> int:
+        return self.points[-1][3]
+
+    @property
+    def score_velocity(self) -> float:
+        """首末两次快照之间平均每小时增加的分数"""
+        hours = (self.last_seen - self.first_seen) / 3600
+        if hours <= 0:
+            return 0.0
+        return round((self.points[-1][2] - self.points[0][2]) / hours, 1)
+
+    def to_story(self) -> HNStory:
+        """转换为 HNStory (分数取峰值，评论数取最新)"""
+        return HNStory(
+            id=self.id, title=self.title, url=self.url, score=self.peak_score, author=self.author,
+            time=self.time, comments=self.comments,
+            hn_url=f'https://news.ycombinator.com/item?id={self.id}', title_zh=self.title_zh,
+        )
+
+
+def load_tracks(base_dir: str = 'archives',
+                start: Union[str, date_cls, None] = None,
+                end: Union[str, date_cls, None] = None) -> dict[int, StoryTrack]:
+    """
+    读取一段时间内全部故事的轨迹
+
+    Args:
+        base_dir: 站点目录
+        start, end: 日期范围 (含两端)，为空不限
+
+    Returns:
+        故事 ID -> StoryTrack
+    """
+    tracks: dict[int, StoryTrack] = {}
+    timestamps = set()
+    for _, rows in iter_ranking_history(str(get_hn_archive_dir(base_dir)), start, end):
+        for row in rows:
+            track = tracks.get(row['id'])
+            if track is None:
+                track = tracks[row['id']] = StoryTrack(id=row['id'])
+            if 'title' in row:
+                for key in META_FIELDS:
+                    setattr(track, key, row.get(key) or getattr(track, key))
+            track.points.append((row['ts'], row['rank'], row['score'], row['comments']))
+            timestamps.add(row['ts'])
+
+    # 每次出现计到下一次快照为止
+    ordered = sorted(timestamps)
+    next_ts = dict(zip(ordered, ordered[1:]))
+    for track in tracks.values():
+        track.points.sort()
+        track.front_page_seconds = sum(
+            min(next_ts.get(ts, ts + DEFAULT_INTERVAL_SECONDS) - ts, MAX_GAP_SECONDS)
+            for ts, *_ in track.points
+        )
+    return tracks
+
+
+def best_of(tracks: dict[int, StoryTrack], limit: int = BEST_OF_LIMIT) -> list[StoryTrack]:
+    """按峰值分数排序 (其次在榜时长)"""
+    ranked = sorted(tracks.values(), key=lambda t: (-t.peak_score, -t.front_page_seconds, t.id))
+    return ranked[:limit]
+
+
+def daily_page_path(base_dir: str, day: date_cls) -> Path:
+    """每日 Best of 页面路径"""
+    return get_hn_archive_dir(base_dir) / f'{day:%Y}' / f'{day:%m}' / f'{day:%Y-%m-%d}.html'
+
+
+def weekly_page_path(base_dir: str, day: date_cls) -> Path:
+    """day 所在 ISO 周的 Best of 页面路径"""
+    year, week, _ = day.isocalendar()
+    return get_hn_archive_dir(base_dir) / WEEKLY_DIR / f'{year}-W{week:02d}.html'
+
+
+def _track_note(track: StoryTrack, lang: str) -> str:
+    hours = track.front_page_seconds / 3600
+    return texts('best_of', lang)['track_note'].format(velocity=f'{track.score_velocity:g}', hours=f'{hours:.1f}',
+                                                       rank=track.best_rank)
+
+
+def generate_best_of_html(tracks: list[StoryTrack], label: str, period: str, root: str,
+                          lang: str = 'zh') -> str:
+    """
+    生成 Best of 页面
+
+    Args:
+        tracks: 已排序的故事轨迹
+        label: 日期或周标签 (顶栏显示)
+        period: 'day' 或 'week'
+        root: 页面到站点根目录的相对前缀
+        lang: 语言
+    """
+    t = texts('best_of', lang)
+    heading = {'title': t[f'{period}_title'].format(label=label), 'subtitle': t[f'{period}_subtitle']}
+    notes = {t.id: _track_note(t, lang) for t in tracks}
+    return generate_hn_dashboard_html([t.to_story() for t in tracks], date=label, lang=lang, heading=heading,
+                                      notes=notes, root=root, active_page='hn_best')
+
+
+def generate_best_of_index_html(days: list[str], weeks: list[str]) -> str:
+    """生成 Best of 索引页 (archives/hn/index.html)"""
+    def column(title: str, items: list[tuple[str, str]]) -> str:
+        rows = ''.join(
+            f'<li class="border-b border-[#30363D] py-2"><a href="{html.escape(href)}" '
+            f'class="font-mono text-white hover:text-[#FFAB00]">{html.escape(text)}</a></li>'
+            for text, href in items
+        )
+        return f'<section><h2 class="text-sm font-bold text-[#8B949E] uppercase mb-2">{title}</h2><ul>{rows}</ul></section>'
+
+    day_items = [(d, f'{d[:4]}/{d[5:7]}/{d}.html') for d in sorted(days, reverse=True)]
+    week_items = [(w, f'{WEEKLY_DIR}/{w}.html') for w in sorted(weeks, reverse=True)]
+
+    return f'''<!DOCTYPE html>
+<html lang="zh-CN" class="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Hacker News - Best of</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <style>
+        body {{ background-color: #0D1117; color: #C9D1D9; font-family: Inter, sans-serif; }}
+    </style>
+</head>
+<body class="min-h-screen">
+    <header class="border-b border-[#30363D] px-6 py-4 flex items-center justify-between">
+        <h1 class="text-xl font-bold text-white"><span class="text-[#FFAB00]">Y</span> Best of Hacker News</h1>
+        <a href="../hn.html" class="text-sm text-[#8B949E] hover:text-white">← Top Stories</a>
+    </header>
+    <main class="max-w-3xl mx-auto p-6 grid grid-cols-1 md:grid-cols-2 gap-8">
+        {column('每周 / Weekly', week_items)}
+        {column('每日 / Daily', day_items)}
+    </main>
+</body>
+</html>
+'''
+
+
+def update_best_of_pages(base_dir: str = 'archives', full: bool = False, lang: str = 'zh') -> list[str]:
+    """
+    生成有更新的每日 / 每周 Best of 页面与索引页
+
+    Args:
+        base_dir: 站点目录
+        full: 为 True 时重建全部日期 (含已压缩为 rollup 的月份)
+        lang: 语言
+
+    Returns:
+        写入的页面路径
+    """
+    hn_dir = get_hn_archive_dir(base_dir)
+    if full:
+        dates = {date_str for date_str, _ in iter_ranking_history(str(hn_dir), fields=('id',), prefetch=0)}
+    else:
+        dates = set()
+        for date_str, file_path in iter_history_files(str(hn_dir)):
+            day = date_cls.fromisoformat(date_str)
+            page = daily_page_path(base_dir, day)
+            if not page.exists() or page.stat().st_mtime < file_path.stat().st_mtime:
+                dates.add(date_str)
+
+    written = []
+    days = sorted(date_cls.fromisoformat(d) for d in dates)
+    for day in days:
+        tracks = best_of(load_tracks(base_dir, day, day))
+        if tracks:
+            page = daily_page_path(base_dir, day)
+            written.append(atomic_write_text(page, generate_best_of_html(tracks, f'{day}', 'day', '../../../', lang)))
+
+    for monday in sorted({day - timedelta(days=day.weekday()) for day in days}):
+        tracks = best_of(load_tracks(base_dir, monday, monday + timedelta(days=6)))
+        if tracks:
+            page = weekly_page_path(base_dir, monday)
+            written.append(atomic_write_text(page, generate_best_of_html(tracks, page.stem, 'week', '../../', lang)))
+
+    if written or full:
+        day_pages = [p.stem for p in hn_dir.glob('[0-9]*/[0-9]*/*.html')]
+        week_pages = [p.stem for p in (hn_dir / WEEKLY_DIR).glob('*.html')]
+        index_path = hn_dir / 'index.html'
+        if write_if_changed(index_path, generate_best_of_index_html(day_pages, week_pages)):
+            written.append(str(index_path))
+    return written
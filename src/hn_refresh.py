@@ -0,0 +1,238 @@
+"""Hacker News 独立刷新 - 与 GitHub 每日流程解耦的高频更新
+
+每次刷新只请求必要的条目：
+- 不在缓存中的新故事
+- HN updates 接口报告有变化的故事
+- 缓存超过 ITEM_TTL_SECONDS 的故事 (分数、评论数)
+
+标题翻译按原标题缓存，只有新标题才调用翻译接口。hn.html 内容有变化时才
+原子写入；刷新期间持有锁文件，重叠运行 (例如上一次尚未结束的定时任务)
+会直接跳过。状态保存在 .cache/hn/state.json。
+
+每次刷新的榜单同时追加到 HN 历史存档，并更新有变化的 Best of 页面 (见 hn_history.py)；
+链接到近期 Trending 仓库的故事在页面上带有 Trending 标记 (见 cross_links.py)。
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .cross_links import build_trending_index, match_stories
+from .fileio import atomic_write_text, write_if_changed
+from .hn_dashboard import generate_hn_dashboard_html
+from .hn_history import record_snapshot, update_best_of_pages
+from .hn_scraper import (
+    HNStory, batch_translate_titles, fetch_story_detail, fetch_story_ids, fetch_updated_ids,
+)
+
+HN_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'hn'
+STATE_FILE = 'state.json'
+LOCK_FILE = 'refresh.lock'
+
+DEFAULT_LIMIT = 30
+# 缓存条目超过此时间 (秒) 后重新获取
+ITEM_TTL_SECONDS = 30 * 60
+# 锁文件超过此时间 (秒) 视为上次运行异常退出遗留
+LOCK_STALE_SECONDS = 15 * 60
+# 翻译缓存保留的标题数
+MAX_TRANSLATIONS = 2000
+FETCH_WORKERS = 10
+
+
+class RefreshLocked(RuntimeError):
+    """另一个刷新正在进行"""
+
+
+@contextmanager
+def refresh_lock(path, stale_seconds: float = LOCK_STALE_SECONDS) -> Iterator[None]:
+    """
+    独占锁文件 (O_EXCL 创建)，已被持有时抛出 RefreshLocked
+
+    Args:
+        path: 锁文件路径
+        stale_seconds: 超过此时间的锁文件视为遗留，直接接管
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for attempt in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                age = time.time() - path.stat().st_mtime
+            except FileNotFoundError:
+                continue  # 对方刚释放
+            if attempt or age < stale_seconds:
+                raise RefreshLocked(f'HN 刷新正在进行 (锁文件 {path}，已持有 {age:.0f}s)')
+            print(f'⚠️ 移除遗留的锁文件 ({age:.0f}s): {path}')
+            path.unlink(missing_ok=True)
+    else:
+        raise RefreshLocked(f'无法获取锁文件: {path}')
+
+    try:
+        os.write(fd, f'{os.getpid()}\n'.encode('ascii'))
+        os.close(fd)
+        yield
+    finally:
+        path.unlink(missing_ok=True)
+
+
+@dataclass
+class HNState:
+    """刷新状态：条目缓存与标题翻译缓存"""
+    items: dict[int, dict] = field(default_factory=dict)  # id -> HNStory 字段 + fetched_at
+    translations: dict[str, str] = field(default_factory=dict)  # 原标题 -> 中文标题
+
+    @classmethod
+    def load(cls, path) -> 'HNState':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        return cls({int(k): v for k, v in data.get('items', {}).items()}, data.get('translations', {}))
+
+    def save(self, path) -> str:
+        data = {'items': {str(k): v for k, v in self.items.items()}, 'translations': self.translations}
+        return atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=1))
+
+    def story(self, story_id: int) -> HNStory:
+        data = {k: v for k, v in self.items[story_id].items() if k != 'fetched_at'}
+        story = HNStory(**data)
+        story.title_zh = self.translations.get(story.title, '')
+        return story
+
+    def prune(self, keep_ids) -> None:
+        """只保留当前榜单中的条目，翻译缓存按插入顺序截断"""
+        keep = set(keep_ids)
+        self.items = {k: v for k, v in self.items.items() if k in keep}
+        if len(self.translations) > MAX_TRANSLATIONS:
+            self.translations = dict(list(self.translations.items())[-MAX_TRANSLATIONS:])
+
+
+@dataclass
+class RefreshResult:
+    """一次刷新的结果"""
+    stories: list[HNStory]
+    path: str
+    written: bool  # hn.html 是否有变化
+    fetched: int = 0  # 本次请求的条目数
+    reused: int = 0  # 直接使用缓存的条目数
+    translated: int = 0  # 本次新翻译的标题数
+    cross_links: int = 0  # 链接到近期 Trending 仓库的故事数
+    archive_path: Optional[str] = None  # 快照写入的每日存档
+    best_of_pages: list[str] = field(default_factory=list)  # 重新生成的 Best of 页面
+
+
+def stale_ids(story_ids: list[int], state: HNState, updated: Optional[set[int]],
+              now: float, ttl: float = ITEM_TTL_SECONDS) -> list[int]:
+    """
+    需要重新获取的条目 (保持榜单顺序)
+
+    Args:
+        story_ids: 当前榜单
+        state: 刷新状态
+        updated: HN updates 接口返回的变化条目，None 表示未知
+        now: 当前时间戳
+        ttl: 缓存有效期 (秒)
+    """
+    result = []
+    for story_id in story_ids:
+        cached = state.items.get(story_id)
+        if cached is None or now - cached.get('fetched_at', 0) >= ttl or (updated and story_id in updated):
+            result.append(story_id)
+    return result
+
+
+def fetch_items(story_ids: list[int], workers: int = FETCH_WORKERS) -> dict[int, HNStory]:
+    """并行获取条目详情，忽略失败与非故事条目"""
+    if not story_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(story_ids))) as executor:
+        stories = executor.map(fetch_story_detail, story_ids)
+        return {sid: story for sid, story in zip(story_ids, stories) if story}
+
+
+def translate_new_titles(stories: list[HNStory], translations: dict[str, str]) -> int:
+    """
+    为未翻译过的标题调用翻译接口并写入缓存
+
+    Returns:
+        新翻译的标题数 (翻译失败回退为原文的不缓存，下次重试)
+    """
+    missing = [s for s in stories if s.title not in translations]
+    if not missing:
+        return 0
+    batch_translate_titles(missing)
+    count = 0
+    for story in missing:
+        if story.title_zh and story.title_zh != story.title:
+            translations[story.title] = story.title_zh
+            count += 1
+    return count
+
+
+def refresh_hn(output_dir: str = 'archives', limit: int = DEFAULT_LIMIT, translate: bool = True,
+               cache_dir=HN_CACHE_DIR, ttl: float = ITEM_TTL_SECONDS, archive: bool = True) -> RefreshResult:
+    """
+    增量刷新 HN 页面
+
+    Args:
+        output_dir: 站点目录 (写入 hn.html)
+        limit: 故事数量
+        translate: 是否翻译标题
+        cache_dir: 状态与锁文件目录
+        ttl: 条目缓存有效期 (秒)
+        archive: 是否记录历史快照并更新 Best of 页面
+
+    Returns:
+        RefreshResult，未获取到榜单时 stories 为空且不写页面
+
+    Raises:
+        RefreshLocked: 另一个刷新正在进行
+    """
+    cache_dir = Path(cache_dir)
+    output_path = Path(output_dir) / 'hn.html'
+    with refresh_lock(cache_dir / LOCK_FILE):
+        state = HNState.load(cache_dir / STATE_FILE)
+        story_ids = fetch_story_ids('top')[:limit]
+        if not story_ids:
+            return RefreshResult(stories=[], path=str(output_path), written=False)
+
+        # 冷启动时全部需要获取，无需查询 updates
+        updated = fetch_updated_ids() if state.items else None
+        now = time.time()
+        todo = stale_ids(story_ids, state, updated, now, ttl)
+        fetched = fetch_items(todo)
+        for story_id, story in fetched.items():
+            data = asdict(story)
+            data.pop('title_zh')
+            state.items[story_id] = {**data, 'fetched_at': now}
+
+        # 获取失败的条目沿用旧缓存
+        stories = [state.story(sid) for sid in story_ids if sid in state.items]
+        translated = 0
+        if translate:
+            translated = translate_new_titles(stories, state.translations)
+
+        trending = {story.id: ref for story, ref in match_stories(stories, build_trending_index(output_dir))}
+        html = generate_hn_dashboard_html(stories, date=datetime.now().strftime('%Y-%m-%d'), lang='zh',
+                                          trending=trending)
+        written = write_if_changed(output_path, html)
+        state.prune(story_ids)
+        state.save(cache_dir / STATE_FILE)
+
+        result = RefreshResult(stories=stories, path=str(output_path), written=written,
+                               fetched=len(todo), reused=len(story_ids) - len(todo), translated=translated,
+                               cross_links=len(trending))
+        if archive:
+            result.archive_path = record_snapshot(output_dir, stories, now)
+            result.best_of_pages = update_best_of_pages(output_dir)
+    return result
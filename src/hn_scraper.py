@@ -7,6 +7,9 @@ Hacker News 数据抓取器
 import requests
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+from .classifier import KeywordClassifier
 
 
 @dataclass
@@ -67,6 +70,22 @@ def fetch_story_ids(story_type: str = 'top') -> list[int]:
         return []
 
 
+def fetch_updated_ids() -> set[int] | None:
+    """
+    获取最近有变化的条目 ID (HN updates 接口)
+
+    Returns:
+        条目 ID 集合，失败返回 None
+    """
+    try:
+        response = requests.get(f"{HN_API_BASE}/updates.json", timeout=10)
+        response.raise_for_status()
+        return set((response.json() or {}).get('items', []))
+    except Exception as e:
+        print(f"获取 HN updates 失败: {e}")
+        return None
+
+
 def fetch_story_detail(story_id: int) -> HNStory | None:
     """
     获取单个故事详情
@@ -164,6 +183,25 @@ def _fetch_stories(story_type: str, limit: int) -> list[HNStory]:
     return stories
 
 
+# HN 分类关键词 (顺序即优先级)
+HN_CATEGORY_KEYWORDS = [
+    ('AI/ML', ['ai', 'llm', 'gpt', 'claude', 'openai', 'anthropic', 'machine learning',
+               'neural', 'transformer', 'deep learning', 'chatgpt', 'gemini', 'model']),
+    ('Startup', ['startup', 'yc', 'funding', 'raise', 'acquired', 'ipo', 'series',
+                 'valuation', 'founder', 'launch']),
+    ('Tools', ['tool', 'cli', 'app', 'editor', 'ide', 'terminal', 'browser',
+               'vim', 'emacs', 'vscode', 'plugin']),
+    ('Programming', ['rust', 'python', 'javascript', 'typescript', 'go', 'golang',
+                     'java', 'c++', 'programming', 'code', 'compiler', 'language',
+                     'framework', 'library', 'api', 'database', 'sql']),
+    ('Science', ['research', 'paper', 'study', 'physics', 'math', 'science',
+                 'biology', 'chemistry', 'quantum', 'space', 'nasa']),
+]
+
+_HN_CLASSIFIER = KeywordClassifier(HN_CATEGORY_KEYWORDS)
+
+
+@lru_cache(maxsize=4096)
 def classify_hn_category(title: str, url: str) -> str:
     """
     分类 HN 故事
@@ -175,42 +213,12 @@ def classify_hn_category(title: str, url: str) -> str:
     Returns:
         分类: AI/ML, Startup, Tools, Programming, Science, Other
     """
-    title_lower = title.lower()
-    url_lower = url.lower() if url else ''
-
-    # AI/ML 关键词
-    ai_keywords = ['ai', 'llm', 'gpt', 'claude', 'openai', 'anthropic', 'machine learning',
-                   'neural', 'transformer', 'deep learning', 'chatgpt', 'gemini', 'model']
-    if any(kw in title_lower for kw in ai_keywords):
-        return 'AI/ML'
-
-    # Startup 关键词
-    startup_keywords = ['startup', 'yc', 'funding', 'raise', 'acquired', 'ipo', 'series',
-                        'valuation', 'founder', 'launch']
-    if any(kw in title_lower for kw in startup_keywords):
-        return 'Startup'
-
-    # Tools 关键词
-    tools_keywords = ['tool', 'cli', 'app', 'editor', 'ide', 'terminal', 'browser',
-                      'vim', 'emacs', 'vscode', 'plugin']
-    if any(kw in title_lower for kw in tools_keywords):
-        return 'Tools'
-
-    # Programming 关键词
-    prog_keywords = ['rust', 'python', 'javascript', 'typescript', 'go ', 'golang',
-                     'java', 'c++', 'programming', 'code', 'compiler', 'language',
-                     'framework', 'library', 'api', 'database', 'sql']
-    if any(kw in title_lower for kw in prog_keywords):
-        return 'Programming'
-
-    # Science 关键词
-    science_keywords = ['research', 'paper', 'study', 'physics', 'math', 'science',
-                        'biology', 'chemistry', 'quantum', 'space', 'nasa']
-    if any(kw in title_lower for kw in science_keywords):
-        return 'Science'
+    category = _HN_CLASSIFIER.classify(title)
+    if category is not None:
+        return category
 
     # GitHub 链接
-    if 'github.com' in url_lower:
+    if url and 'github.com' in url.lower():
         return 'Tools'
 
     return 'Other'
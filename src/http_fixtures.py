@@ -0,0 +1,279 @@
+"""HTTP 录制 / 回放 - 无网络环境下可复现地运行完整流程
+
+所有抓取模块都通过 requests 发起请求。录制模式下真实请求照常发出，
+每一次交换 (方法、URL、请求体摘要、状态码、响应头与响应体) 记入 fixture 包；
+回放模式下由本地替身按请求匹配返回录制的响应，可注入固定或录制时的延迟。
+
+拦截点是 requests.Session.get_adapter，因此 requests.get / requests.post
+以及自建 Session 都会经过替身，业务代码无需改动。
+
+写入 fixture 前会去除敏感信息：
+- 不保存请求头 (api-key / Authorization / Cookie 等)，响应头只保留少数无害字段
+- SECRET_ENV 中环境变量的值在 URL、请求体与响应体中替换为占位符
+  (回放时把这些环境变量设为同样的占位符，请求因此能够匹配)
+"""
+
+import base64
+import hashlib
+import http
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .fileio import atomic_write_text
+
+FIXTURE_VERSION = 1
+
+# 需要脱敏的环境变量 -> 占位符
+SECRET_ENV = {
+    'AZURE_OPENAI_ENDPOINT': 'https://azure-openai.invalid',
+    'AZURE_OPENAI_KEY': 'replay-azure-key',
+    'GITHUB_TOKEN': 'replay-github-token',
+}
+
+# 保存的响应头 (响应体已解压，content-encoding / content-length 不再适用)
+KEPT_RESPONSE_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'location')
+
+
+class ReplayMiss(requests.exceptions.ConnectionError):
+    """回放时 fixture 中没有匹配的请求 (按网络错误处理，与离线时的行为一致)"""
+
+
+@dataclass
+class HTTPExchange:
+    """一次录制的 HTTP 交换"""
+    method: str
+    url: str
+    body_sha1: str  # 请求体 (脱敏后) 摘要，无请求体为空串
+    status: int
+    headers: dict
+    body: str  # 响应体：文本或 base64
+    binary: bool
+    elapsed_ms: float
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.method, self.url, self.body_sha1
+
+
+def _secrets() -> list[tuple[str, str]]:
+    """当前环境中需要替换的 (真实值, 占位符)，长的优先"""
+    pairs = [(os.environ[name], placeholder) for name, placeholder in SECRET_ENV.items()
+             if os.environ.get(name) and os.environ[name] != placeholder]
+    return sorted(pairs, key=lambda pair: -len(pair[0]))
+
+
+def _redact(text: str, secrets: list[tuple[str, str]]) -> str:
+    for value, placeholder in secrets:
+        text = text.replace(value.rstrip('/'), placeholder)
+    return text
+
+
+def _request_key(request: requests.PreparedRequest, secrets) -> tuple[str, str, str]:
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    body = _redact(body.decode('utf-8', 'replace'), secrets).encode('utf-8') if body else b''
+    return request.method.upper(), _redact(request.url, secrets), hashlib.sha1(body).hexdigest() if body else ''
+
+
+class FixtureBundle:
+    """fixture 包：按 (方法, URL, 请求体摘要) 分组的交换列表"""
+
+    def __init__(self, exchanges: Optional[list[HTTPExchange]] = None, recorded_at: str = ''):
+        self.exchanges = list(exchanges or [])
+        self.recorded_at = recorded_at
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    @classmethod
+    def load(cls, path) -> 'FixtureBundle':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FIXTURE_VERSION:
+            raise ValueError(f'不支持的 fixture 版本: {path}')
+        return cls([HTTPExchange(**item) for item in data.get('exchanges', [])], data.get('recorded_at', ''))
+
+    def save(self, path) -> str:
+        # 按请求排序 (同一请求保持录制顺序)，并发抓取时输出也稳定
+        exchanges = sorted(self.exchanges, key=lambda e: e.key)
+        data = {
+            'version': FIXTURE_VERSION,
+            'recorded_at': self.recorded_at,
+            'exchanges': [asdict(e) for e in exchanges],
+        }
+        return atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=1))
+
+
+class RecordingAdapter(BaseAdapter):
+    """发出真实请求并记录交换"""
+
+    def __init__(self, bundle: FixtureBundle):
+        super().__init__()
+        self.bundle = bundle
+        self._real = HTTPAdapter()
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = self._real.send(request, **kwargs)
+        secrets = _secrets()
+        method, url, body_sha1 = _request_key(request, secrets)
+
+        content = response.content
+        try:
+            body, binary = _redact(content.decode('utf-8'), secrets), False
+        except UnicodeDecodeError:
+            body, binary = base64.b64encode(content).decode('ascii'), True
+
+        exchange = HTTPExchange(
+            method=method, url=url, body_sha1=body_sha1, status=response.status_code,
+            headers={k: response.headers[k] for k in KEPT_RESPONSE_HEADERS if k in response.headers},
+            body=body, binary=binary, elapsed_ms=round(response.elapsed.total_seconds() * 1000, 1),
+        )
+        with self._lock:
+            self.bundle.exchanges.append(exchange)
+        return response
+
+    def close(self):
+        self._real.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    本地替身：按请求匹配录制的响应
+
+    匹配顺序为 (方法, URL, 请求体摘要)，其次 (方法, URL)。同一请求录制了多次时
+    按顺序返回，用完后重复最后一次。
+
+    Args:
+        bundle: fixture 包
+        latency_ms: 每个响应注入的固定延迟 (毫秒)
+        jitter_ms: 延迟的随机抖动上限 (毫秒)
+        recorded_latency: 使用录制时的真实耗时代替固定延迟
+    """
+
+    def __init__(self, bundle: FixtureBundle, latency_ms: float = 0, jitter_ms: float = 0,
+                 recorded_latency: bool = False):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.recorded_latency = recorded_latency
+        self.misses: list[str] = []
+        self.served = 0
+        self._lock = threading.Lock()
+        self._exact: dict[tuple, deque] = defaultdict(deque)
+        self._loose: dict[tuple, deque] = defaultdict(deque)
+        for exchange in bundle.exchanges:
+            self._exact[exchange.key].append(exchange)
+            self._loose[exchange.key[:2]].append(exchange)
+
+    def _take(self, key) -> Optional[HTTPExchange]:
+        with self._lock:
+            for queues, k in ((self._exact, key), (self._loose, key[:2])):
+                queue = queues.get(k)
+                if queue:
+                    return queue.popleft() if len(queue) > 1 else queue[0]
+        return None
+
+    def send(self, request, **kwargs):
+        key = _request_key(request, _secrets())
+        exchange = self._take(key)
+        if exchange is None:
+            with self._lock:
+                self.misses.append(f'{key[0]} {key[1]}')
+            raise ReplayMiss(f'fixture 中没有该请求: {key[0]} {key[1]}', request=request)
+
+        delay = exchange.elapsed_ms if self.recorded_latency else self.latency_ms
+        if self.jitter_ms:
+            delay += random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        response = requests.Response()
+        response.status_code = exchange.status
+        try:
+            response.reason = http.HTTPStatus(exchange.status).phrase
+        except ValueError:
+            response.reason = ''
+        response.headers = CaseInsensitiveDict(exchange.headers)
+        response._content = base64.b64decode(exchange.body) if exchange.binary else exchange.body.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(milliseconds=delay)
+        with self._lock:
+            self.served += 1
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def _use_adapter(adapter: BaseAdapter) -> Iterator[BaseAdapter]:
+    original = requests.Session.get_adapter
+    requests.Session.get_adapter = lambda session, url: adapter
+    try:
+        yield adapter
+    finally:
+        requests.Session.get_adapter = original
+        adapter.close()
+
+
+@contextmanager
+def record_http(path) -> Iterator[FixtureBundle]:
+    """
+    录制期间的全部 HTTP 交换，退出时写入 fixture 包
+
+    Args:
+        path: fixture 文件路径 (JSON)
+    """
+    bundle = FixtureBundle(recorded_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    try:
+        with _use_adapter(RecordingAdapter(bundle)):
+            yield bundle
+    finally:
+        bundle.save(path)
+        print(f'📼 已录制 {len(bundle)} 个 HTTP 请求: {path}')
+
+
+@contextmanager
+def replay_http(path, latency_ms: float = 0, jitter_ms: float = 0,
+                recorded_latency: bool = False) -> Iterator[ReplayAdapter]:
+    """
+    从 fixture 包回放 HTTP 响应 (不访问网络)
+
+    期间把 SECRET_ENV 中的环境变量设为占位符，使依赖这些配置的请求照常发出并匹配录制内容。
+
+    Args:
+        path: fixture 文件路径
+        latency_ms: 每个响应注入的延迟 (毫秒)
+        jitter_ms: 随机抖动上限 (毫秒)
+        recorded_latency: 使用录制时的真实耗时
+    """
+    adapter = ReplayAdapter(FixtureBundle.load(path), latency_ms, jitter_ms, recorded_latency)
+    saved_env = {name: os.environ.get(name) for name in SECRET_ENV}
+    os.environ.update(SECRET_ENV)
+    try:
+        with _use_adapter(adapter):
+            yield adapter
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        print(f'📼 回放 {adapter.served} 个 HTTP 请求' +
+              (f'，{len(adapter.misses)} 个未命中' if adapter.misses else ''))
@@ -0,0 +1,96 @@
+"""
+界面文案 - 按语言加载的消息目录
+
+每种语言一个 JSON 文件 (config/locales/<lang>.json)，按页面区块分组 (sidebar、
+treemap、deep_dive、hn_dashboard ...)。目录在每个进程中只加载一次，缺少的键
+回退到英文目录；未知语言使用中文目录 (与原先 texts.get(lang, texts['zh']) 一致)。
+
+新增语言只需添加一个 JSON 文件，渲染时与其他语言共享同一个 RenderContext，
+额外开销只有字符串格式化。
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
+
+# 消息目录所在目录与环境变量 (逗号分隔的语言列表，如 zh,en,ja)
+LOCALES_DIR = Path(__file__).parent.parent / 'config' / 'locales'
+LOCALES_ENV = 'TRENDING_LOCALES'
+
+# 未知语言使用的目录、缺键时回退的目录
+DEFAULT_LOCALE = 'zh'
+FALLBACK_LOCALE = 'en'
+
+# 未配置时渲染的语言
+DEFAULT_LOCALES = ('zh', 'en')
+
+
+@lru_cache(maxsize=None)
+def _load_catalogs(path: Optional[str]) -> Mapping[str, Mapping[str, Mapping[str, str]]]:
+    directory = Path(path) if path else LOCALES_DIR
+    raw = {}
+    for file in sorted(directory.glob('*.json')):
+        with open(file, 'r', encoding='utf-8') as f:
+            raw[file.stem] = json.load(f)
+
+    fallback = raw.get(FALLBACK_LOCALE, {})
+    catalogs = {}
+    for lang, data in raw.items():
+        sections = {}
+        for section in {**fallback, **data}:
+            sections[section] = MappingProxyType({**fallback.get(section, {}), **data.get(section, {})})
+        catalogs[lang] = MappingProxyType(sections)
+    return MappingProxyType(catalogs)
+
+
+def available_locales(path: Optional[str] = None) -> tuple[str, ...]:
+    """已有消息目录的语言 (默认语言在前，其余按名称排序)"""
+    return tuple(sorted(_load_catalogs(path), key=lambda lang: (lang != DEFAULT_LOCALE, lang)))
+
+
+def catalog(lang: str, path: Optional[str] = None) -> Mapping[str, Mapping[str, str]]:
+    """某种语言的完整目录 (区块 -> 键 -> 文案)，只读"""
+    catalogs = _load_catalogs(path)
+    return catalogs.get(lang) or catalogs[DEFAULT_LOCALE]
+
+
+def texts(section: str, lang: str = DEFAULT_LOCALE) -> Mapping[str, str]:
+    """
+    获取某个区块的文案
+
+    Args:
+        section: 区块名 (如 'sidebar'、'deep_dive')
+        lang: 语言
+
+    Returns:
+        键 -> 文案 的只读映射
+    """
+    return catalog(lang)[section]
+
+
+def html_lang(lang: str) -> str:
+    """<html lang> 属性值"""
+    return texts('meta', lang)['html_lang']
+
+
+def configured_locales(value: Optional[str] = None, path: Optional[str] = None) -> tuple[str, ...]:
+    """
+    本次运行要渲染的语言
+
+    Args:
+        value: 逗号分隔的语言列表；为空时读取环境变量 TRENDING_LOCALES，再为空使用 DEFAULT_LOCALES
+        path: 消息目录所在目录
+
+    Raises:
+        ValueError: 语言没有对应的消息目录
+    """
+    value = value or os.getenv(LOCALES_ENV)
+    langs: Sequence[str] = [v.strip() for v in value.split(',') if v.strip()] if value else DEFAULT_LOCALES
+    available = available_locales(path)
+    unknown = [lang for lang in langs if lang not in available]
+    if unknown:
+        raise ValueError(f'未知语言: {", ".join(unknown)} (可用: {", ".join(available)})')
+    return tuple(dict.fromkeys(langs))
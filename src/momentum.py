@@ -0,0 +1,168 @@
+"""多日动量指标 - 基于近 N 天存档的 Star 速度、加速度、上榜天数与排名趋势"""
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import date as date_cls, datetime, timedelta
+from typing import Optional
+
+from .history import iter_ranking_history, parse_count
+
+# 默认回看天数 (不含当天)
+MOMENTUM_WINDOW = 7
+
+# 构建索引需要的排名字段
+MOMENTUM_FIELDS = ('name', 'rank', 'stars_today')
+
+
+@dataclass
+class Momentum:
+    """单个仓库的动量指标"""
+    star_velocity: float = 0.0  # 窗口内上榜日平均每日新增 Star
+    star_acceleration: float = 0.0  # 每日新增 Star 的线性斜率 (Star/天²)
+    days_on_list: int = 1  # 窗口内上榜天数 (含当天)
+    rank_trend: float = 0.0  # 排名每日上升名次 (正数为上升)
+
+
+def _slope(xs: list[int], ys: list[float]) -> float:
+    """最小二乘斜率，不足两个点时为 0"""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+def compute_momentum(offsets: list[int], stars: list[int],
+                     rank_offsets: list[int], ranks: list[int]) -> Momentum:
+    """
+    由窗口内的数据点计算动量指标
+
+    Args:
+        offsets, stars: 上榜日的相对天数与每日新增 Star (含当天)
+        rank_offsets, ranks: 有排名的相对天数与排名
+    """
+    return Momentum(
+        star_velocity=round(sum(stars) / len(stars), 2) if stars else 0.0,
+        star_acceleration=round(_slope(offsets, stars), 2) + 0.0,
+        days_on_list=len(offsets),
+        rank_trend=round(-_slope(rank_offsets, ranks), 2) + 0.0,
+    )
+
+
+class MomentumIndex:
+    """
+    滚动窗口历史索引
+
+    构建时只读取窗口内的每日文件，按仓库名保存 (相对天数, 排名, 今日新增) 序列；
+    查询为一次字典查找加固定长度 (≤ 窗口天数) 的计算，与存档总量无关。
+    """
+
+    __slots__ = ('today', 'window', 'days_loaded', '_series')
+
+    def __init__(self, today: datetime, window: int = MOMENTUM_WINDOW):
+        self.today = today
+        self.window = window
+        self.days_loaded = 0
+        # name -> (offsets, ranks, stars_today)，offset 为相对当天的天数 (负数)
+        self._series: dict[str, tuple[array, array, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    def add_day(self, offset: int, rankings: list[dict]) -> None:
+        """加入一天的排名 (需按日期升序调用)"""
+        for item in rankings:
+            series = self._series.get(item['name'])
+            if series is None:
+                series = self._series[item['name']] = (array('i'), array('i'), array('i'))
+            series[0].append(offset)
+            series[1].append(int(item.get('rank', 0)))
+            series[2].append(parse_count(item.get('stars_today')))
+        self.days_loaded += 1
+
+    def lookup(self, name: str, stars_today: int, rank: Optional[int] = None) -> Momentum:
+        """
+        计算仓库的动量指标 (历史窗口 + 当天数据)
+
+        Args:
+            name: 仓库名 owner/repo
+            stars_today: 当天新增 Star
+            rank: 当天排名；存档中的排名是评分排名，评分前未知时传 None，
+                  排名趋势只用历史数据计算
+        """
+        offsets, ranks, stars = self._series.get(name, ((), (), ()))
+        xs = list(offsets) + [0]
+        star_points = list(stars) + [stars_today]
+
+        rank_xs = list(offsets)
+        rank_points = list(ranks)
+        if rank is not None:
+            rank_xs.append(0)
+            rank_points.append(rank)
+
+        return compute_momentum(xs, star_points, rank_xs, rank_points)
+
+
+def build_momentum_index(base_dir: str = 'archives', today: Optional[datetime] = None,
+                         window: int = MOMENTUM_WINDOW) -> MomentumIndex:
+    """
+    读取当天之前 window 天的存档构建索引 (缺失的日期跳过)
+
+    Args:
+        base_dir: 存档目录
+        today: 当天日期，默认为现在
+        window: 回看天数
+    """
+    today = today or datetime.now()
+    index = MomentumIndex(today, window)
+
+    start = (today - timedelta(days=window)).date()
+    end = (today - timedelta(days=1)).date()
+    for date_str, rankings in iter_ranking_history(base_dir, start, end, fields=MOMENTUM_FIELDS):
+        offset = (date_cls.fromisoformat(date_str) - today.date()).days
+        index.add_day(offset, rankings)
+
+    return index
+
+
+def rolling_momenta(dates: list[str], offsets: list[int], names: list[str], ranks: list[int],
+                    stars_today: list[int], window: int = MOMENTUM_WINDOW) -> list[Momentum]:
+    """
+    对按日拼接的存档行一次性计算滚动窗口动量 (用于历史重评分)
+
+    每个仓库维护一个窗口内数据点的队列，逐日推进，整体 O(行数 × 窗口)。
+    与每日流程的 MomentumIndex.lookup(..., rank=None) 一致：评分前当天排名未知，
+    排名趋势只用之前几天的排名，保证重评分与当天发布的分数相同。
+
+    Args:
+        dates: 日期列表 (升序)
+        offsets: 第 i 天的行为 offsets[i]:offsets[i + 1]
+        names, ranks, stars_today: 各行数据
+        window: 回看天数
+    """
+    result: list[Momentum] = [Momentum()] * len(names)
+    # name -> deque[(日序号, 排名, 今日新增)]
+    recent: dict[str, deque] = {}
+
+    for i, date_str in enumerate(dates):
+        day = datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+        for k in range(offsets[i], offsets[i + 1]):
+            points = recent.get(names[k])
+            if points is None:
+                points = recent[names[k]] = deque()
+            while points and points[0][0] < day - window:
+                points.popleft()
+            points.append((day, ranks[k], stars_today[k]))
+
+            xs = [d - day for d, _, _ in points]
+            result[k] = compute_momentum(xs, [p[2] for p in points], xs[:-1], [p[1] for p in points][:-1])
+
+    return result
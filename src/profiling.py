@@ -0,0 +1,187 @@
+"""每日流程的分阶段性能剖析 (cProfile / tracemalloc)
+
+main() 在每个阶段开始处调用 profiler.begin('阶段名')，上一阶段随之结束；
+结束时为每个阶段写入:
+
+    <运行目录>/NN-阶段名.pstats       cProfile 数据 (可用 snakeviz / pstats 查看)
+    <运行目录>/NN-阶段名.memory.txt   本阶段新增内存最多的分配位置
+    <运行目录>/summary.json           各阶段耗时、峰值内存与热点函数
+
+并打印每个阶段的前 N 个热点函数。cProfile 只统计调用线程，线程池中的
+请求耗时体现在等待结果的调用上。
+"""
+
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .fileio import atomic_write_text
+
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_TOP_N = 10
+
+# tracemalloc 保存的调用栈深度
+TRACE_FRAMES = 1
+
+
+@dataclass
+class StageReport:
+    """单个阶段的剖析结果"""
+    index: int
+    name: str
+    wall_ms: float = 0.0
+    peak_kb: Optional[float] = None  # 阶段内峰值 (相对阶段开始)
+    allocated_kb: Optional[float] = None  # 阶段结束时净增内存
+    pstats_path: Optional[str] = None
+    memory_path: Optional[str] = None
+    hot_functions: list[dict] = field(default_factory=list)
+
+
+def _function_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return name  # 内置函数
+    parts = Path(filename).parts
+    return f'{"/".join(parts[-2:])}:{line}({name})'
+
+
+def hot_functions(stats: pstats.Stats, top_n: int = DEFAULT_TOP_N) -> list[dict]:
+    """按累计耗时排序的前 N 个函数"""
+    rows = []
+    for func, (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({'function': _function_label(func), 'calls': nc,
+                     'total_ms': round(tt * 1000, 2), 'cumulative_ms': round(ct * 1000, 2)})
+    rows.sort(key=lambda row: (-row['cumulative_ms'], row['function']))
+    return rows[:top_n]
+
+
+class StageProfiler:
+    """
+    分阶段剖析器
+
+    Args:
+        run_dir: 报告输出目录，默认 profiles/<时间戳>
+        profile: 是否启用 cProfile
+        trace_memory: 是否启用 tracemalloc
+        top_n: 每个阶段打印 / 记录的热点函数与内存分配条数
+    """
+
+    def __init__(self, run_dir: Optional[str] = None, profile: bool = True,
+                 trace_memory: bool = False, top_n: int = DEFAULT_TOP_N):
+        self.run_dir = Path(run_dir or Path(DEFAULT_PROFILE_DIR) / datetime.now().strftime('%Y%m%d-%H%M%S'))
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.reports: list[StageReport] = []
+
+        self._current: Optional[StageReport] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started = 0.0
+        self._snapshot = None
+        self._base_memory = 0
+        self._owns_tracing = False
+        self._summary_path: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile or self.trace_memory
+
+    def begin(self, name: str) -> None:
+        """结束当前阶段并开始新阶段"""
+        self._end()
+        if not self.enabled:
+            return
+
+        self._current = StageReport(index=len(self.reports) + 1, name=name)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                self._owns_tracing = True
+            tracemalloc.reset_peak()
+            self._base_memory = tracemalloc.get_traced_memory()[0]
+            self._snapshot = tracemalloc.take_snapshot()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+
+    def _end(self) -> None:
+        report = self._current
+        if report is None:
+            return
+        report.wall_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        self._current = None
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        stem = f'{report.index:02d}-{report.name}'
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            path = self.run_dir / f'{stem}.pstats'
+            self._profiler.dump_stats(path)
+            report.pstats_path = str(path)
+            report.hot_functions = hot_functions(pstats.Stats(self._profiler), self.top_n)
+            self._profiler = None
+
+        if self.trace_memory and self._snapshot is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            report.peak_kb = round((peak - self._base_memory) / 1024, 1)
+            report.allocated_kb = round((current - self._base_memory) / 1024, 1)
+            diff = tracemalloc.take_snapshot().compare_to(self._snapshot, 'lineno')
+            lines = [f'{report.name}: 峰值 +{report.peak_kb} KB，净增 {report.allocated_kb:+} KB', '']
+            lines += [str(stat) for stat in diff[:self.top_n]]
+            path = self.run_dir / f'{stem}.memory.txt'
+            atomic_write_text(path, '\n'.join(lines) + '\n')
+            report.memory_path = str(path)
+            self._snapshot = None
+
+        self.reports.append(report)
+        self._print_stage(report)
+
+    def _print_stage(self, report: StageReport) -> None:
+        memory = f'，峰值 +{report.peak_kb} KB' if report.peak_kb is not None else ''
+        print(f'⏱️ [{report.name}] {report.wall_ms:.1f} ms{memory}')
+        for row in report.hot_functions:
+            print(f'     {row["cumulative_ms"]:9.1f} ms {row["calls"]:>8}  {row["function"]}')
+
+    def finish(self) -> Optional[str]:
+        """
+        结束最后一个阶段并写入汇总
+
+        Returns:
+            summary.json 路径，未启用时返回 None (重复调用返回已写入的路径)
+        """
+        if self._summary_path and self._current is None:
+            return self._summary_path
+        self._end()
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        if not self.reports:
+            return None
+
+        summary = {
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'profile': self.profile,
+            'trace_memory': self.trace_memory,
+            'total_ms': round(sum(r.wall_ms for r in self.reports), 2),
+            'stages': [asdict(r) for r in self.reports],
+        }
+        path = self.run_dir / 'summary.json'
+        atomic_write_text(path, json.dumps(summary, ensure_ascii=False, indent=2))
+
+        print(f'\n📊 阶段耗时 (共 {summary["total_ms"] / 1000:.2f}s):')
+        for report in sorted(self.reports, key=lambda r: -r.wall_ms):
+            print(f'  {report.name:<16} {report.wall_ms:10.1f} ms')
+        print(f'💾 剖析报告已保存: {self.run_dir}')
+        self._summary_path = str(path)
+        return self._summary_path
+
+
+# 未启用剖析时使用，begin / finish 均为空操作
+NULL_PROFILER = StageProfiler(profile=False, trace_memory=False)
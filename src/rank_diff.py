@@ -0,0 +1,209 @@
+"""排名对比引擎 - 与最近可用日、近 N 天最佳排名或首次上榜时对比
+
+基于 name -> 排名序列 的索引，一次线性扫描完成全部仓库的对比；
+索引可逐日追加，用于一次性计算多天的排名变化。
+"""
+
+from array import array
+from datetime import date as date_cls, datetime, timedelta
+from typing import Iterator, Optional, Sequence, Union
+
+from .history import RankChange, RankingEntry, iter_ranking_history
+
+# 对比模式
+DIFF_PREVIOUS = 'previous'  # 最近一个有数据的日期 (昨天缺失时继续向前找)
+DIFF_BEST = 'best'  # 近 N 天内的最佳排名
+DIFF_FIRST_SEEN = 'first_seen'  # 首次上榜时的排名
+DIFF_MODES = (DIFF_PREVIOUS, DIFF_BEST, DIFF_FIRST_SEEN)
+
+# 默认回看天数 (previous 模式向前查找最近可用日的范围 / best 模式的窗口)
+DEFAULT_LOOKBACK_DAYS = 30
+DEFAULT_BEST_WINDOW = 7
+
+
+def _ordinal(date_str: str) -> int:
+    return date_cls.fromisoformat(date_str).toordinal()
+
+
+def _date_str(ordinal: int) -> str:
+    return date_cls.fromordinal(ordinal).isoformat()
+
+
+class RankIndex:
+    """
+    仓库排名序列索引
+
+    每个仓库保存按日期升序的 (日序号, 排名) 两列 array，
+    追加一天为 O(当日条数)，查询最近一天 / 首次上榜为 O(1)，
+    窗口内最佳排名为 O(窗口内上榜天数)。
+    """
+
+    __slots__ = ('_series', '_dates')
+
+    def __init__(self):
+        self._series: dict[str, tuple[array, array]] = {}
+        self._dates = array('i')  # 有数据的日期 (升序)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    @property
+    def last_date(self) -> Optional[str]:
+        """最近一个有数据的日期"""
+        return _date_str(self._dates[-1]) if self._dates else None
+
+    @property
+    def days(self) -> int:
+        return len(self._dates)
+
+    def add_day(self, date_str: str, rankings: Sequence) -> None:
+        """
+        追加一天的排名 (日期须晚于已有日期；同一天重复追加会被忽略)
+
+        Args:
+            date_str: 日期 YYYY-MM-DD
+            rankings: RankingEntry 或含 name / rank 的字典
+        """
+        day = _ordinal(date_str)
+        if self._dates and day <= self._dates[-1]:
+            return
+        self._dates.append(day)
+
+        for entry in rankings:
+            name, rank = (entry['name'], entry['rank']) if isinstance(entry, dict) else (entry.name, entry.rank)
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = (array('i'), array('i'))
+            series[0].append(day)
+            series[1].append(int(rank or 0))
+
+    def rank_on(self, name: str, date_str: str) -> Optional[int]:
+        """某仓库在某天的排名 (只检查该仓库最近一次上榜)"""
+        series = self._series.get(name)
+        if series is None or series[0][-1] != _ordinal(date_str):
+            return None
+        return series[1][-1]
+
+    def first_seen(self, name: str) -> Optional[tuple[str, int]]:
+        """首次上榜 (日期, 排名)"""
+        series = self._series.get(name)
+        if series is None:
+            return None
+        return _date_str(series[0][0]), series[1][0]
+
+    def best_since(self, name: str, since: str) -> Optional[tuple[str, int]]:
+        """since (含) 之后的最佳排名 (日期, 排名)，同名次取较近的日期"""
+        series = self._series.get(name)
+        if series is None:
+            return None
+        days, ranks = series
+        cutoff = _ordinal(since)
+        best = None
+        i = len(days) - 1
+        while i >= 0 and days[i] >= cutoff:
+            if ranks[i] and (best is None or ranks[i] < best[1]):
+                best = (_date_str(days[i]), ranks[i])
+            i -= 1
+        return best
+
+
+def build_rank_index(base_dir: str = 'archives', today: Optional[datetime] = None,
+                     lookback_days: Optional[int] = DEFAULT_LOOKBACK_DAYS) -> RankIndex:
+    """
+    读取当天之前的排名历史构建索引
+
+    Args:
+        base_dir: 存档目录
+        today: 当天 (不含)，默认为现在
+        lookback_days: 回看天数，None 表示全部历史 (first_seen 模式需要)
+    """
+    today = today or datetime.now()
+    end = (today - timedelta(days=1)).date()
+    start = (today - timedelta(days=lookback_days)).date() if lookback_days else None
+
+    index = RankIndex()
+    for date_str, rankings in iter_ranking_history(base_dir, start, end, fields=('name', 'rank')):
+        index.add_day(date_str, rankings)
+    return index
+
+
+def diff_rankings(current_entries: Sequence[Union[RankingEntry, dict]], index: RankIndex,
+                  mode: str = DIFF_PREVIOUS, today: Optional[datetime] = None,
+                  window: int = DEFAULT_BEST_WINDOW) -> list[RankChange]:
+    """
+    计算排名变化
+
+    Args:
+        current_entries: 当前排名 (RankingEntry 或含 name / rank 的字典)
+        index: 当天之前的排名索引
+        mode: previous / best / first_seen
+        today: 当天日期 (best 模式计算窗口起点)，默认为现在
+        window: best 模式的窗口天数 (不含当天)
+
+    Returns:
+        与 calculate_rank_changes 相同结构的 RankChange 列表；
+        reference_date 为对比所用的日期，first_seen 为首次上榜日期
+    """
+    if mode not in DIFF_MODES:
+        raise ValueError(f'未知对比模式: {mode} (可选: {", ".join(DIFF_MODES)})')
+
+    previous_date = index.last_date
+    since = ((today or datetime.now()) - timedelta(days=window)).strftime('%Y-%m-%d')
+
+    changes = []
+    for entry in current_entries:
+        name, rank = (entry['name'], entry['rank']) if isinstance(entry, dict) else (entry.name, entry.rank)
+
+        reference = None
+        if mode == DIFF_PREVIOUS and previous_date:
+            previous_rank = index.rank_on(name, previous_date)
+            if previous_rank is not None:
+                reference = (previous_date, previous_rank)
+        elif mode == DIFF_BEST:
+            reference = index.best_since(name, since)
+        elif mode == DIFF_FIRST_SEEN:
+            reference = index.first_seen(name)
+
+        first = index.first_seen(name)
+        if reference is None:
+            # 只有索引中从未出现过的仓库才算新上榜，重新上榜的显示为无变化
+            changes.append(RankChange(
+                name=name, current_rank=rank, previous_rank=None, change=None,
+                is_new=first is None, first_seen=first[0] if first else None,
+            ))
+        else:
+            changes.append(RankChange(
+                name=name, current_rank=rank, previous_rank=reference[1],
+                change=reference[1] - rank, is_new=False,
+                reference_date=reference[0], first_seen=first[0] if first else None,
+            ))
+
+    return changes
+
+
+def iter_rank_changes(base_dir: str = 'archives', mode: str = DIFF_PREVIOUS,
+                      start: Optional[str] = None, end: Optional[str] = None,
+                      window: int = DEFAULT_BEST_WINDOW) -> Iterator[tuple[str, list[RankChange]]]:
+    """
+    一次扫描计算多天的排名变化
+
+    从存档开头流式读取，每天先与之前的索引对比，再把当天追加进索引。
+
+    Args:
+        base_dir: 存档目录
+        mode: 对比模式
+        start, end: 输出的日期范围 (索引仍从最早的存档开始构建)
+        window: best 模式窗口天数
+
+    Yields:
+        (日期, RankChange 列表)
+    """
+    index = RankIndex()
+    for date_str, rankings in iter_ranking_history(base_dir, end=end, fields=('name', 'rank')):
+        if not start or date_str >= start:
+            today = datetime.strptime(date_str, '%Y-%m-%d')
+            yield date_str, diff_rankings(rankings, index, mode, today, window)
+        index.add_day(date_str, rankings)
@@ -0,0 +1,173 @@
+"""渲染上下文 - 每次运行构建一次、由各页面生成器共享的只读视图模型
+
+排名变化映射、owner/短名拆分、领域分类、语言颜色、数字解析等派生值在
+build_render_context 中对每个仓库只计算一次，保存为不可变的 RepoView。
+
+与语言无关的渲染片段 (Feed 列表、Treemap 布局、详情面板数据) 通过
+RenderContext.memo 缓存，其余语言的仪表板渲染时直接复用。上下文可以 pickle
+(不含缓存)，供 render_pool.py 的渲染子进程使用。
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Mapping, Optional
+
+from .analyzer import RepoAnalysis
+from .history import RankChange, parse_count
+
+# 仪表板 / 深度分析展示的项目数
+DEFAULT_TOP_N = 25
+
+
+@dataclass(frozen=True)
+class RepoView:
+    """单个仓库的视图模型 (按评分排序后的位置即 rank)"""
+    analysis: RepoAnalysis
+    rank: int
+    name: str
+    owner: str
+    short_name: str
+    description: str
+    url: str
+    language: str  # 原始语言，未知为空字符串
+    lang_color: str
+    stars: str
+    stars_display: str  # 1.2k 形式
+    stars_today: str
+    stars_today_count: int
+    forks: str
+    score: float
+    domain: str
+    rank_change: Optional[RankChange] = None
+    change_text: str = '-'
+    ai_summary: Any = None
+    hn_discussions: tuple = ()
+    # 历史 (见 timeline.py 索引条目)，没有记录时取当天的值
+    first_seen: str = ''
+    best_rank: int = 0
+    peak_stars_today: int = 0
+
+    @property
+    def is_new(self) -> bool:
+        return bool(self.rank_change and self.rank_change.is_new)
+
+    @property
+    def change(self) -> int:
+        """排名变化值 (新上榜或无变化为 0)"""
+        return self.rank_change.change if self.rank_change and self.rank_change.change else 0
+
+    @property
+    def avatar(self) -> str:
+        return f'https://github.com/{self.owner}.png?size=80'
+
+
+@dataclass(frozen=True)
+class RenderContext:
+    """
+    一次运行的渲染上下文
+
+    Args:
+        date: 报告日期
+        repos: 全部仓库视图，按评分降序
+        change_map: 仓库名 -> RankChange
+        top_n: 仪表板展示的项目数
+    """
+    date: datetime
+    repos: tuple[RepoView, ...]
+    change_map: Mapping[str, RankChange]
+    top_n: int = DEFAULT_TOP_N
+    _memo: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.change_map, MappingProxyType):
+            object.__setattr__(self, 'change_map', MappingProxyType(dict(self.change_map)))
+
+    def __reduce__(self):
+        # 传给渲染子进程时只序列化数据，不带缓存的派生结果
+        return RenderContext, (self.date, self.repos, dict(self.change_map), self.top_n)
+
+    @property
+    def top(self) -> tuple[RepoView, ...]:
+        """仪表板展示的前 top_n 个仓库"""
+        return self.repos[:self.top_n]
+
+    @cached_property
+    def by_name(self) -> Mapping[str, RepoView]:
+        return MappingProxyType({view.name: view for view in self.repos})
+
+    @property
+    def new_repos(self) -> tuple[RepoView, ...]:
+        """新上榜仓库 (按评分降序)"""
+        return tuple(view for view in self.repos if view.is_new)
+
+    def memo(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """按 key 缓存与语言无关的派生结果 (同一次运行内只计算一次)"""
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
+
+
+def build_render_context(analyses: list[RepoAnalysis], rank_changes: list[RankChange],
+                         date: datetime = None, ai_summaries: dict = None, hn_links: dict = None,
+                         top_n: int = DEFAULT_TOP_N, history: dict = None) -> RenderContext:
+    """
+    构建渲染上下文
+
+    Args:
+        analyses: 分析结果列表
+        rank_changes: 排名变化列表
+        date: 报告日期，默认现在
+        ai_summaries: 仓库名 -> AISummary
+        hn_links: 仓库名 -> HN 讨论列表 (见 cross_links.py)
+        top_n: 仪表板展示的项目数
+        history: 仓库名 -> 时间线索引条目 (first / best_rank / peak_stars_today，见 timeline.py)
+
+    Returns:
+        RenderContext
+    """
+    from .dashboard import classify_domain, format_stars_display, get_lang_color
+    from .history import format_rank_change
+
+    date = date or datetime.now()
+    ai_summaries = ai_summaries or {}
+    hn_links = hn_links or {}
+    history = history or {}
+    date_str = date.strftime('%Y-%m-%d')
+    change_map = MappingProxyType({c.name: c for c in rank_changes})
+
+    views = []
+    for rank, analysis in enumerate(sorted(analyses, key=lambda a: a.score, reverse=True), 1):
+        repo = analysis.repo
+        language = repo.language or ''
+        change = change_map.get(repo.name)
+        stars_today = parse_count(repo.stars_today)
+        past = history.get(repo.name, {})
+        views.append(RepoView(
+            analysis=analysis,
+            rank=rank,
+            name=repo.name,
+            owner=repo.name.split('/')[0],
+            short_name=repo.name.split('/')[-1],
+            description=repo.description,
+            url=repo.url,
+            language=language,
+            lang_color=get_lang_color(language or 'Unknown'),
+            stars=repo.stars,
+            stars_display=format_stars_display(repo.stars),
+            stars_today=repo.stars_today,
+            stars_today_count=stars_today,
+            forks=repo.forks,
+            score=analysis.score,
+            domain=classify_domain(repo.name, repo.description, language),
+            rank_change=change,
+            change_text=format_rank_change(change) if change else '-',
+            ai_summary=ai_summaries.get(repo.name),
+            hn_discussions=tuple(hn_links.get(repo.name, ())),
+            first_seen=min(past.get('first', date_str), date_str),
+            best_rank=min(past.get('best_rank', rank), rank),
+            peak_stars_today=max(past.get('peak_stars_today', 0), stars_today),
+        ))
+
+    return RenderContext(date=date, repos=tuple(views), change_map=change_map, top_n=top_n)
@@ -0,0 +1,201 @@
+"""并行渲染调度 - 在进程池中执行一组渲染任务
+
+每个任务 (RenderJob) 对应一类输出：Markdown 报告、全部语言的仪表板、单个深度分析
+页面或订阅源，都只依赖一个只读的 RenderContext。仪表板任务在同一进程内依次渲染
+所有语言，共享 context.memo，增加语言只增加文案替换的开销。任务在子进程中渲染
+并原子写入，结果按提交顺序返回，输出内容与进程数无关。
+
+回填多天时把所有日期的任务放进同一个进程池，吞吐随核数增长；多个任务写同一路径
+(index.html、同一仓库的深度分析页面) 时只保留最后提交的一个，避免写入顺序不确定。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from .fileio import atomic_write_text
+from .render_context import RenderContext
+
+# 任务类型
+JOB_MARKDOWN = 'markdown'
+JOB_DASHBOARD = 'dashboard'
+JOB_DEEP_DIVE = 'deep_dive'
+JOB_RSS = 'rss'
+
+# 任务数少于此值时在当前进程串行渲染 (进程池的启动开销大于收益)
+POOL_MIN_JOBS = 8
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """
+    单个渲染任务
+
+    Args:
+        kind: 任务类型 (JOB_*)
+        outputs: (语言, 输出路径) 序列；同一项中的多个路径内容相同
+        repo: 深度分析页面对应的仓库名
+        ai_summary: 深度分析页面使用的 AI 总结 (当天没有时为清单中沿用的总结)
+    """
+    kind: str
+    outputs: tuple[tuple[str, tuple[str, ...]], ...]
+    repo: str = ''
+    ai_summary: Any = None
+
+    @property
+    def langs(self) -> tuple[str, ...]:
+        return tuple(lang for lang, _ in self.outputs)
+
+    @property
+    def paths(self) -> tuple[str, ...]:
+        return tuple(path for _, paths in self.outputs for path in paths)
+
+
+@dataclass
+class RenderResult:
+    """渲染结果"""
+    job: RenderJob
+    date: str
+    size: int  # 字节数
+    seconds: float
+    pid: int
+
+
+def plan_jobs(context: RenderContext, base_dir: str, langs: Sequence[str] = None,
+              deep_dive_lang: str = 'zh', markdown: bool = True, rss: bool = False,
+              latest: bool = True, deep_dives=None) -> list[RenderJob]:
+    """
+    规划某一天的渲染任务
+
+    Args:
+        context: 渲染上下文
+        base_dir: 站点目录
+        langs: 仪表板语言，默认为 configured_locales()
+        deep_dive_lang: 深度分析页面语言
+        markdown: 是否生成 Markdown 报告
+        rss: 是否生成 RSS
+        latest: 是否为最新一天 (写 index.html 与 RSS 等固定文件名)
+        deep_dives: DeepDiveManifest，传入时只规划输入变化的深度分析页面 (渲染完成后由调用方 save)，
+            None 表示全部重新生成
+
+    Returns:
+        RenderJob 列表
+    """
+    from .dashboard import dashboard_path
+    from .deep_dive import deep_dive_path, deep_dive_targets
+    from .generator import report_path
+    from .i18n import configured_locales
+    from .rss import rss_path
+
+    date = context.date
+    jobs = []
+    if markdown:
+        jobs.append(RenderJob(JOB_MARKDOWN, (('zh', (str(report_path(base_dir, date)),)),)))
+    outputs = []
+    for lang in langs or configured_locales():
+        outputs.append((lang, (str(dashboard_path(base_dir, date, lang)),)))
+        if lang == 'zh' and latest:
+            # 首页位于站点根目录，站内链接不同，单独渲染
+            outputs.append((lang, (str(Path(base_dir) / 'index.html'),)))
+    if outputs:
+        jobs.append(RenderJob(JOB_DASHBOARD, tuple(outputs)))
+    targets = deep_dive_targets(context) if deep_dives is None else deep_dives.plan(context, deep_dive_lang)
+    for view in targets:
+        jobs.append(RenderJob(JOB_DEEP_DIVE, ((deep_dive_lang, (str(deep_dive_path(base_dir, view.name)),)),),
+                              repo=view.name, ai_summary=view.ai_summary))
+    if rss and latest:
+        jobs.append(RenderJob(JOB_RSS, (('zh', (str(rss_path(base_dir)),)),)))
+    return jobs
+
+
+def render_content(context: RenderContext, job: RenderJob, lang: str, path: str = '') -> str:
+    """渲染任务某种语言写到 path 的内容 (不写文件)"""
+    if job.kind == JOB_MARKDOWN:
+        from .generator import generate_markdown_with_changes
+        return generate_markdown_with_changes(None, None, None, context=context)
+    if job.kind == JOB_DASHBOARD:
+        from .dashboard import DASHBOARD_ROOT, INDEX_ROOT, generate_dashboard_html
+        root = INDEX_ROOT if Path(path).name == 'index.html' else DASHBOARD_ROOT
+        return generate_dashboard_html(None, None, lang=lang, context=context, root=root)
+    if job.kind == JOB_DEEP_DIVE:
+        from .deep_dive import deep_dive_data, generate_deep_dive_html
+        view = context.by_name[job.repo]
+        if job.ai_summary is not None:
+            view = replace(view, ai_summary=job.ai_summary)
+        return generate_deep_dive_html(deep_dive_data(view), context.date, lang)
+    raise ValueError(f'未知渲染任务: {job.kind}')
+
+
+def execute_job(context: RenderContext, job: RenderJob) -> RenderResult:
+    """依次渲染各语言并原子写入所有输出路径 (RSS 任务并入滚动状态后写出全部订阅源)"""
+    started = time.perf_counter()
+    size = 0
+    if job.kind == JOB_RSS:
+        from .rss import update_feeds
+        written = update_feeds(context, str(Path(job.paths[0]).parent))
+        size = sum(os.path.getsize(path) for path in written)
+    else:
+        for lang, paths in job.outputs:
+            content = render_content(context, job, lang, paths[0])
+            for path in paths:
+                atomic_write_text(path, content)
+            size += len(content.encode('utf-8'))
+    return RenderResult(job=job, date=context.date.strftime('%Y-%m-%d'), size=size,
+                        seconds=time.perf_counter() - started, pid=os.getpid())
+
+
+def dedupe_jobs(tasks: Sequence[tuple[RenderContext, RenderJob]]) -> list[tuple[RenderContext, RenderJob]]:
+    """同一路径只保留最后提交的任务写入 (其余任务去掉该路径，路径全部去掉则丢弃)"""
+    seen: set[str] = set()
+    kept = []
+    for context, job in reversed(tasks):
+        outputs = []
+        for lang, paths in job.outputs:
+            paths = tuple(p for p in paths if p not in seen)
+            if paths:
+                outputs.append((lang, paths))
+        outputs = tuple(outputs)
+        seen.update(job.paths)
+        if outputs:
+            kept.append((context, job if outputs == job.outputs else replace(job, outputs=outputs)))
+    kept.reverse()
+    return kept
+
+
+def resolve_workers(workers: int, job_count: int) -> int:
+    """
+    实际使用的进程数
+
+    Args:
+        workers: 指定的进程数，0 表示自动 (任务较少时串行，否则取 CPU 核数)
+        job_count: 任务数
+    """
+    if workers <= 0:
+        workers = 1 if job_count < POOL_MIN_JOBS else (os.cpu_count() or 1)
+    return max(1, min(workers, job_count))
+
+
+def run_jobs(tasks: Iterable[tuple[RenderContext, RenderJob]], workers: int = 0) -> list[RenderResult]:
+    """
+    执行渲染任务
+
+    Args:
+        tasks: (渲染上下文, 任务) 序列
+        workers: 进程数，0 表示自动，1 表示在当前进程串行
+
+    Returns:
+        按提交顺序排列的 RenderResult 列表
+    """
+    tasks = dedupe_jobs(list(tasks))
+    workers = resolve_workers(workers, len(tasks))
+    if workers == 1:
+        # 串行时同一天的各个任务共享 context.memo
+        return [execute_job(context, job) for context, job in tasks]
+
+    contexts = [context for context, _ in tasks]
+    jobs = [job for _, job in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(execute_job, contexts, jobs, chunksize=max(1, len(tasks) // (workers * 4))))
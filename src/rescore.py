@@ -0,0 +1,159 @@
+"""历史重评分 - 用指定评分模型一次性批量重算全部存档日的排名"""
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .history import iter_ranking_history
+from .momentum import rolling_momenta
+from .scoring import ScoreColumns, ScoringModel, get_model, list_models, parse_int
+
+# 重评分需要的排名字段 (flat 行的顺序)
+RESCORE_FIELDS = ('name', 'rank', 'stars', 'stars_today', 'description')
+
+
+@dataclass
+class HistoryColumns:
+    """按日拼接的存档列 (第 i 天的行为 offsets[i]:offsets[i + 1])"""
+    dates: list[str]
+    offsets: list[int]
+    names: list[str]
+    ranks: list[int]
+    columns: ScoreColumns
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def load_history_columns(base_dir: str = 'archives', start: Optional[str] = None,
+                         end: Optional[str] = None) -> HistoryColumns:
+    """
+    读取存档并拼接为评分列
+
+    存档只记录 stars / stars_today / description，forks、贡献者、topics、
+    license 缺失，按 0 处理 (对所有模型一视同仁)；动量指标由存档滚动计算。
+
+    Args:
+        base_dir: 存档目录
+        start, end: 日期范围 (YYYY-MM-DD，含两端)，为空不限
+    """
+    dates, offsets, names, ranks = [], [0], [], []
+    stars_today, stars, long_description = [], [], []
+
+    rows = iter_ranking_history(base_dir, start, end, fields=RESCORE_FIELDS, flat=True)
+    for date_str, name, rank, entry_stars, entry_stars_today, description in rows:
+        if not dates or dates[-1] != date_str:
+            if dates:
+                offsets.append(len(names))
+            dates.append(date_str)
+        names.append(name)
+        ranks.append(rank or len(names) - offsets[-1])
+        stars_today.append(parse_int(entry_stars_today))
+        stars.append(parse_int(entry_stars, expand_k=True))
+        long_description.append(bool(description and len(description) > 50))
+    if dates:
+        offsets.append(len(names))
+
+    zeros = [0] * len(names)
+    momenta = rolling_momenta(dates, offsets, names, ranks, stars_today)
+    columns = ScoreColumns(
+        stars_today=stars_today,
+        stars=stars,
+        forks=zeros,
+        contributors=zeros,
+        long_description=long_description,
+        topic_counts=zeros,
+        has_license=zeros,
+        star_velocity=[m.star_velocity for m in momenta],
+        star_acceleration=[m.star_acceleration for m in momenta],
+        days_on_list=[m.days_on_list for m in momenta],
+        rank_trend=[m.rank_trend for m in momenta],
+    )
+    return HistoryColumns(dates=dates, offsets=offsets, names=names, ranks=ranks, columns=columns)
+
+
+def rescore_history(base_dir: str = 'archives', model_names: Optional[Sequence[str]] = None,
+                    start: Optional[str] = None, end: Optional[str] = None,
+                    top_n: int = 10) -> dict:
+    """
+    用一个或多个模型重算历史排名
+
+    每个模型对全部存档行只做一次批量评分，再按日切片排序 (同分按原排名)。
+
+    Args:
+        base_dir: 存档目录
+        model_names: 模型名列表，默认全部已配置模型
+        start, end: 日期范围
+        top_n: 每日保留的前 N 名
+
+    Returns:
+        报告字典: 各模型的每日 top N、与原排名的 top N 重合率、平均名次变化
+    """
+    history = load_history_columns(base_dir, start, end)
+    models: list[ScoringModel] = (
+        [get_model(name) for name in model_names] if model_names else list(list_models().values())
+    )
+
+    report = {
+        'days': len(history.dates),
+        'rows': len(history),
+        'start': history.dates[0] if history.dates else None,
+        'end': history.dates[-1] if history.dates else None,
+        'top_n': top_n,
+        'models': {},
+    }
+
+    for model in models:
+        started = time.perf_counter()
+        scores = [int(s) for s in model.score_batch(history.columns).score] if len(history) else []
+
+        days = {}
+        overlap_total = 0.0
+        displacement_total = 0
+        for i, date_str in enumerate(history.dates):
+            lo, hi = history.offsets[i], history.offsets[i + 1]
+            if lo == hi:
+                continue
+            order = sorted(range(lo, hi), key=lambda k: (-scores[k], history.ranks[k]))
+            original = sorted(range(lo, hi), key=lambda k: history.ranks[k])
+            original_pos = {k: pos for pos, k in enumerate(original)}
+
+            top = order[:top_n]
+            days[date_str] = [
+                {'name': history.names[k], 'score': scores[k], 'rank': history.ranks[k]}
+                for k in top
+            ]
+            overlap_total += len(set(top) & set(original[:top_n])) / min(top_n, hi - lo)
+            displacement_total += sum(
+                abs(new_rank - original_pos[k]) for new_rank, k in enumerate(order)
+            )
+
+        elapsed = time.perf_counter() - started
+        report['models'][model.name] = {
+            'description': model.description,
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'top_overlap': round(overlap_total / len(days), 4) if days else 0.0,
+            'mean_displacement': round(displacement_total / len(history), 4) if len(history) else 0.0,
+            'days': days,
+        }
+
+    return report
+
+
+def save_rescore_report(report: dict, path: str) -> str:
+    """保存重评分报告 (JSON)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return str(path)
+
+
+def print_rescore_summary(report: dict) -> None:
+    """打印各模型对比摘要"""
+    print(f'📊 重评分 {report["days"]} 天 / {report["rows"]} 条记录 ({report["start"]} ~ {report["end"]})')
+    for name, result in report['models'].items():
+        print(f'  {name:<12} top{report["top_n"]} 重合 {result["top_overlap"]:.0%}  '
+              f'平均名次变化 {result["mean_displacement"]:.2f}  耗时 {result["elapsed_ms"]:.1f}ms')
@@ -0,0 +1,174 @@
+"""月度排名归档 (rollup) - 把一个月的每日 JSON 合并为一个压缩文件
+
+文件: archives/YYYY/MM/YYYY-MM.rollup (小端序)
+
+    头部   magic 'GTRR' | 版本 u8 | 年 u16 | 月 u8 | 天数 u8
+    索引   每天一项: 日 u8 | 偏移 u32 | 压缩长度 u32 | 原始长度 u32
+    数据   每天原始 JSON 文件内容的 zlib 压缩块
+
+保存的是每日 JSON 的原始字节，解压后与压缩前的文件完全一致。
+读取时 mmap 文件，按索引只解压需要的那一天。
+"""
+
+import json
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .fileio import atomic_write_bytes
+
+ROLLUP_MAGIC = b'GTRR'
+ROLLUP_VERSION = 1
+ROLLUP_SUFFIX = '.rollup'
+
+_HEADER = struct.Struct('<4sBHBB')
+_ENTRY = struct.Struct('<BIII')
+
+
+class RollupError(ValueError):
+    """归档文件损坏或版本不兼容"""
+
+
+def get_rollup_path(base_dir: str, year: int, month: int) -> Path:
+    """月度归档路径"""
+    return Path(base_dir) / f'{year:04d}' / f'{month:02d}' / f'{year:04d}-{month:02d}{ROLLUP_SUFFIX}'
+
+
+def encode_rollup(year: int, month: int, days: dict[int, bytes], level: int = 9) -> bytes:
+    """
+    编码月度归档
+
+    Args:
+        year, month: 年月
+        days: {日: 每日 JSON 文件的原始字节}
+        level: zlib 压缩级别
+
+    Returns:
+        归档文件内容
+    """
+    blobs = [(day, zlib.compress(days[day], level), len(days[day])) for day in sorted(days)]
+
+    offset = _HEADER.size + len(blobs) * _ENTRY.size
+    index = bytearray()
+    for day, blob, raw_size in blobs:
+        index += _ENTRY.pack(day, offset, len(blob), raw_size)
+        offset += len(blob)
+
+    header = _HEADER.pack(ROLLUP_MAGIC, ROLLUP_VERSION, year, month, len(blobs))
+    return b''.join([header, index, *(blob for _, blob, _ in blobs)])
+
+
+class MonthRollup:
+    """月度归档读取器 (mmap)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise RollupError(f'空归档文件: {self.path}')
+        try:
+            self._load_index()
+        except (struct.error, RollupError):
+            self.close()
+            raise
+
+    def _load_index(self):
+        buf = self._buffer
+        if len(buf) < _HEADER.size:
+            raise RollupError(f'归档文件过短: {self.path}')
+        magic, version, self.year, self.month, day_count = _HEADER.unpack_from(buf, 0)
+        if magic != ROLLUP_MAGIC or version != ROLLUP_VERSION:
+            raise RollupError(f'不支持的归档格式: {self.path}')
+
+        self._days: dict[int, tuple[int, int, int]] = {}
+        for i in range(day_count):
+            day, offset, length, raw_size = _ENTRY.unpack_from(buf, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(buf):
+                raise RollupError(f'归档索引越界: {self.path}')
+            self._days[day] = (offset, length, raw_size)
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def dates(self) -> list[str]:
+        """归档中包含的日期 (升序)"""
+        return [f'{self.year:04d}-{self.month:02d}-{day:02d}' for day in sorted(self._days)]
+
+    def __contains__(self, date_str: str) -> bool:
+        return self._day_of(date_str) in self._days
+
+    def _day_of(self, date_str: str) -> Optional[int]:
+        if date_str[:7] != f'{self.year:04d}-{self.month:02d}':
+            return None
+        return int(date_str[8:10])
+
+    def read_bytes(self, date_str: str) -> Optional[bytes]:
+        """某一天 JSON 文件的原始字节，不存在返回 None"""
+        location = self._days.get(self._day_of(date_str))
+        if location is None:
+            return None
+        offset, length, raw_size = location
+        data = zlib.decompress(self._buffer[offset:offset + length])
+        if len(data) != raw_size:
+            raise RollupError(f'归档数据长度不符: {self.path} {date_str}')
+        return data
+
+    def read_all(self) -> dict[int, bytes]:
+        """全部日期的原始字节 {日: bytes}"""
+        return {int(date_str[8:10]): self.read_bytes(date_str) for date_str in self.dates()}
+
+    def rankings(self, date_str: str, fields: Optional[Sequence[str]] = None) -> Optional[list[dict]]:
+        """
+        读取某一天的排名 (结构同每日 JSON 的 rankings)
+
+        Args:
+            date_str: 日期 YYYY-MM-DD
+            fields: 只保留这些字段，默认全部
+        """
+        data = self.read_bytes(date_str)
+        if data is None:
+            return None
+        try:
+            rankings = json.loads(data).get('rankings', [])
+        except (ValueError, AttributeError):
+            return None
+        if fields is None:
+            return rankings
+        return [{key: entry.get(key) for key in fields} for entry in rankings]
+
+
+def open_rollup(base_dir: str, year: int, month: int) -> Optional[MonthRollup]:
+    """打开某月归档，不存在或损坏返回 None"""
+    path = get_rollup_path(base_dir, year, month)
+    if not path.exists():
+        return None
+    try:
+        return MonthRollup(path)
+    except (RollupError, OSError):
+        return None
+
+
+def write_rollup(base_dir: str, year: int, month: int, days: dict[int, bytes]) -> str:
+    """
+    写入月度归档并校验可以完整读回
+
+    Returns:
+        归档文件路径
+    """
+    path = get_rollup_path(base_dir, year, month)
+    atomic_write_bytes(path, encode_rollup(year, month, days))
+
+    with MonthRollup(path) as rollup:
+        if rollup.read_all() != days:
+            raise RollupError(f'归档校验失败: {path}')
+    return str(path)
@@ -1,91 +1,283 @@
-"""RSS Feed 生成器"""
+"""RSS / Atom Feed 生成器
 
+订阅源保留最近 FEED_DAYS 天的条目：每天的条目以紧凑数组存入 feeds/state.json，
+当天运行只替换当天的条目 (同日重跑幂等)，然后在一次遍历中分组输出
+
+    rss.xml / atom.xml                 每天前 FEED_TOP_N 名
+    feeds/language/<slug>.xml          按编程语言
+    feeds/domain/<slug>.xml            按领域
+
+XML 逐条流式写出 (不构建 ElementTree)。条目 GUID 为 {url}#{date}，跨天保持不变，
+订阅端不会重复推送。
+"""
+
+import html
+import json
+import re
+from dataclasses import astuple, dataclass, fields
 from datetime import datetime
 from pathlib import Path
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from typing import Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
 from .analyzer import RepoAnalysis
+from .fileio import atomic_write_chunks, write_if_changed
+from .render_context import RenderContext, build_render_context
 
+# 订阅源目录、状态文件与格式版本
+FEEDS_DIR = 'feeds'
+STATE_NAME = 'state.json'
+STATE_FORMAT = 1
 
-def generate_rss(analyses: list[RepoAnalysis], date: datetime = None,
-                 base_url: str = "https://github.com/trending") -> str:
+# 保留天数、主 Feed 每天条目数 (原 Top 10)、每天存入状态的条目数 (语言 / 领域 Feed 使用)
+FEED_DAYS = 7
+FEED_TOP_N = 10
+FEED_STATE_ITEMS = 25
+
+BASE_URL = 'https://github.com/trending'
+FEED_TITLE = 'GitHub Trending 每日热榜'
+FEED_DESCRIPTION = '每日追踪 GitHub Trending 热门项目，AI 智能解读'
+
+
+@dataclass(frozen=True)
+class FeedItem:
+    """订阅源条目 (状态文件中按字段顺序存为数组)"""
+    rank: int
+    name: str
+    url: str
+    description: str
+    language: str
+    stars: str
+    stars_today: str
+    score: int
+    domain: str
+
+    def to_row(self) -> list:
+        return list(astuple(self))
+
+    @classmethod
+    def from_row(cls, row: list) -> 'FeedItem':
+        return cls(*row[:len(fields(cls))])
+
+
+@dataclass
+class FeedDay:
+    """某一天的条目"""
+    date: str  # YYYY-MM-DD
+    time: str  # HH:MM:SS，发布时间
+    items: list[FeedItem]
+
+    @property
+    def published(self) -> datetime:
+        return datetime.strptime(f'{self.date} {self.time}', '%Y-%m-%d %H:%M:%S')
+
+
+def feed_items(context: RenderContext, limit: int = FEED_STATE_ITEMS) -> list[FeedItem]:
+    """渲染上下文中按评分排序的前 limit 个条目"""
+    return [
+        FeedItem(rank=view.rank, name=view.name, url=view.url, description=view.description or '',
+                 language=view.language, stars=view.stars, stars_today=view.stars_today,
+                 score=view.score, domain=view.domain)
+        for view in context.repos[:limit]
+    ]
+
+
+class FeedState:
     """
-    生成 RSS 2.0 格式的 Feed
+    订阅源滚动状态 (feeds/state.json)
 
     Args:
-        analyses: 项目分析结果列表
-        date: 发布日期
-        base_url: 基础 URL
-
-    Returns:
-        RSS XML 字符串
+        days: 日期 -> FeedDay
     """
-    if date is None:
-        date = datetime.now()
 
-    date_str = date.strftime('%Y-%m-%d')
-    pub_date = date.strftime('%a, %d %b %Y %H:%M:%S +0000')
+    def __init__(self, days: dict[str, FeedDay] = None):
+        self.days = days if days is not None else {}
 
-    # 创建 RSS 根元素
-    rss = Element('rss', version='2.0')
-    rss.set('xmlns:atom', 'http://www.w3.org/2005/Atom')
+    @staticmethod
+    def path(base_dir: str) -> Path:
+        return Path(base_dir) / FEEDS_DIR / STATE_NAME
 
-    channel = SubElement(rss, 'channel')
+    @classmethod
+    def load(cls, base_dir: str) -> 'FeedState':
+        """读取状态，不存在、损坏或格式版本不同时返回空状态"""
+        try:
+            with open(cls.path(base_dir), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') != STATE_FORMAT:
+                return cls()
+            return cls({
+                date: FeedDay(date, day['time'], [FeedItem.from_row(row) for row in day['items']])
+                for date, day in data['days'].items()
+            })
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            return cls()
 
-    # Channel 元数据
-    title = SubElement(channel, 'title')
-    title.text = 'GitHub Trending 每日热榜'
+    def add_day(self, date: datetime, items: list[FeedItem], keep_days: int = FEED_DAYS) -> None:
+        """写入 (或替换) 某天的条目，只保留最近 keep_days 天 (至少 1 天)"""
+        if keep_days < 1:
+            raise ValueError(f'保留天数至少为 1: {keep_days}')
+        date_str = date.strftime('%Y-%m-%d')
+        self.days[date_str] = FeedDay(date_str, date.strftime('%H:%M:%S'), list(items))
+        for old in sorted(self.days)[:-keep_days]:
+            del self.days[old]
 
-    link = SubElement(channel, 'link')
-    link.text = base_url
+    def newest_first(self) -> list[FeedDay]:
+        return [self.days[date] for date in sorted(self.days, reverse=True)]
 
-    description = SubElement(channel, 'description')
-    description.text = '每日追踪 GitHub Trending 热门项目，AI 智能解读'
+    def save(self, base_dir: str) -> bool:
+        """写回状态 (紧凑 JSON，内容不变时不写)"""
+        data = {
+            'format': STATE_FORMAT,
+            'days': {
+                day.date: {'time': day.time, 'items': [item.to_row() for item in day.items]}
+                for day in sorted(self.days.values(), key=lambda d: d.date)
+            },
+        }
+        return write_if_changed(self.path(base_dir), json.dumps(data, ensure_ascii=False, separators=(',', ':')))
 
-    language = SubElement(channel, 'language')
-    language.text = 'zh-CN'
 
-    pub_date_elem = SubElement(channel, 'pubDate')
-    pub_date_elem.text = pub_date
+@dataclass
+class Feed:
+    """一个订阅源: 输出路径、频道信息与条目 (新的在前)"""
+    path: str  # 相对站点目录
+    title: str
+    entries: list[tuple[FeedDay, FeedItem]]
+    atom: bool = False
 
-    last_build = SubElement(channel, 'lastBuildDate')
-    last_build.text = pub_date
 
-    # 添加每个项目作为 item
-    for i, analysis in enumerate(analyses[:10], 1):  # Top 10
-        repo = analysis.repo
-        item = SubElement(channel, 'item')
+def feed_slug(name: str) -> str:
+    """语言 / 领域名转为文件名: 'C++' -> 'cpp'，'AI & ML' -> 'ai-ml'"""
+    name = name.lower().replace('+', 'p').replace('#', 'sharp')
+    return re.sub(r'[^a-z0-9]+', '-', name).strip('-') or 'other'
 
-        item_title = SubElement(item, 'title')
-        item_title.text = f"#{i} {repo.name} (+{repo.stars_today} stars)"
 
-        item_link = SubElement(item, 'link')
-        item_link.text = repo.url
+def build_feeds(days: list[FeedDay], top_n: int = FEED_TOP_N) -> list[Feed]:
+    """一次遍历全部条目，分组为主 Feed (RSS + Atom)、各语言与各领域 Feed"""
+    top, by_language, by_domain = [], {}, {}
+    for day in days:
+        for item in day.items:
+            entry = (day, item)
+            if item.rank <= top_n:
+                top.append(entry)
+            if item.language:
+                by_language.setdefault(item.language, []).append(entry)
+            by_domain.setdefault(item.domain, []).append(entry)
 
-        item_desc = SubElement(item, 'description')
-        desc_content = f"""
-<![CDATA[
-<p><strong>{repo.name}</strong></p>
-<p>{repo.description}</p>
-<p>⭐ {repo.stars} | +{repo.stars_today} today | 🔧 {repo.language or 'Unknown'}</p>
-<p>推荐指数: {analysis.score}/10</p>
-]]>
-"""
-        item_desc.text = desc_content
+    feeds = [Feed('rss.xml', FEED_TITLE, top), Feed('atom.xml', FEED_TITLE, top, atom=True)]
+    for group, grouped in (('language', by_language), ('domain', by_domain)):
+        for name in sorted(grouped):
+            feeds.append(Feed(f'{FEEDS_DIR}/{group}/{feed_slug(name)}.xml', f'{FEED_TITLE} · {name}',
+                              grouped[name]))
+    return feeds
+
+
+def _rfc822(moment: datetime) -> str:
+    return moment.strftime('%a, %d %b %Y %H:%M:%S +0000')
 
-        item_guid = SubElement(item, 'guid')
-        item_guid.text = f"{repo.url}#{date_str}"
-        item_guid.set('isPermaLink', 'false')
 
-        item_pub = SubElement(item, 'pubDate')
-        item_pub.text = pub_date
+def _item_html(item: FeedItem) -> str:
+    """条目正文 (HTML，写入 XML 时再整体转义)"""
+    return (f'<p><strong>{html.escape(item.name)}</strong></p>'
+            f'<p>{html.escape(item.description)}</p>'
+            f'<p>⭐ {html.escape(item.stars)} | +{html.escape(item.stars_today)} today | '
+            f'🔧 {html.escape(item.language or "Unknown")}</p>'
+            f'<p>推荐指数: {item.score}/10</p>')
+
+
+def iter_rss(feed: Feed, base_url: str = BASE_URL, built: Optional[datetime] = None) -> Iterator[str]:
+    """逐段生成 RSS 2.0 XML"""
+    built = built or (feed.entries[0][0].published if feed.entries else datetime.now())
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n<channel>\n'
+    yield (f'<title>{escape(feed.title)}</title>\n<link>{escape(base_url)}</link>\n'
+           f'<description>{escape(FEED_DESCRIPTION)}</description>\n<language>zh-CN</language>\n'
+           f'<pubDate>{_rfc822(built)}</pubDate>\n<lastBuildDate>{_rfc822(built)}</lastBuildDate>\n')
+    for day, item in feed.entries:
+        yield (f'<item>\n<title>{escape(f"#{item.rank} {item.name} (+{item.stars_today} stars)")}</title>\n'
+               f'<link>{escape(item.url)}</link>\n'
+               f'<description>{escape(_item_html(item))}</description>\n'
+               f'<category>{escape(item.domain)}</category>\n'
+               f'<guid isPermaLink="false">{escape(f"{item.url}#{day.date}")}</guid>\n'
+               f'<pubDate>{_rfc822(day.published)}</pubDate>\n</item>\n')
+    yield '</channel>\n</rss>\n'
+
+
+def iter_atom(feed: Feed, base_url: str = BASE_URL, built: Optional[datetime] = None) -> Iterator[str]:
+    """逐段生成 Atom 1.0 XML (条目 id 与 RSS 的 GUID 相同)"""
+    built = built or (feed.entries[0][0].published if feed.entries else datetime.now())
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="zh-CN">\n'
+    yield (f'<title>{escape(feed.title)}</title>\n<subtitle>{escape(FEED_DESCRIPTION)}</subtitle>\n'
+           f'<link href={quoteattr(base_url)}/>\n<id>{escape(base_url)}</id>\n'
+           f'<updated>{built.strftime("%Y-%m-%dT%H:%M:%SZ")}</updated>\n')
+    for day, item in feed.entries:
+        yield (f'<entry>\n<title>{escape(f"#{item.rank} {item.name} (+{item.stars_today} stars)")}</title>\n'
+               f'<link href={quoteattr(item.url)}/>\n'
+               f'<id>{escape(f"{item.url}#{day.date}")}</id>\n'
+               f'<updated>{day.published.strftime("%Y-%m-%dT%H:%M:%SZ")}</updated>\n'
+               f'<category term={quoteattr(item.domain)}/>\n'
+               f'<summary type="html">{escape(_item_html(item))}</summary>\n</entry>\n')
+    yield '</feed>\n'
+
+
+def update_feeds(context: RenderContext, base_dir: str, keep_days: int = FEED_DAYS,
+                 base_url: str = BASE_URL) -> list[str]:
+    """
+    把当天条目并入滚动状态，并写出全部订阅源
+
+    Args:
+        context: 当天的渲染上下文
+        base_dir: 站点目录
+        keep_days: 保留天数
+        base_url: 频道链接
+
+    Returns:
+        写入的订阅源路径 (rss.xml 在前)
+
+    Raises:
+        ValueError: keep_days 小于 1
+    """
+    state = FeedState.load(base_dir)
+    state.add_day(context.date, feed_items(context), keep_days)
+
+    written = []
+    for feed in build_feeds(state.newest_first()):
+        chunks = iter_atom(feed, base_url) if feed.atom else iter_rss(feed, base_url)
+        written.append(atomic_write_chunks(Path(base_dir) / feed.path, chunks))
+
+    # 删除已移出保留窗口的语言 / 领域订阅源
+    current = {Path(path) for path in written}
+    for group in ('language', 'domain'):
+        for stale in (Path(base_dir) / FEEDS_DIR / group).glob('*.xml'):
+            if stale not in current:
+                stale.unlink()
+
+    state.save(base_dir)
+    return written
+
+
+def generate_rss(analyses: list[RepoAnalysis], date: datetime = None,
+                 base_url: str = BASE_URL) -> str:
+    """
+    生成单日的 RSS 2.0 Feed (不读写滚动状态)
+
+    Args:
+        analyses: 项目分析结果列表
+        date: 发布日期
+        base_url: 基础 URL
+
+    Returns:
+        RSS XML 字符串
+    """
+    context = build_render_context(analyses, [], date)
+    day = FeedDay(context.date.strftime('%Y-%m-%d'), context.date.strftime('%H:%M:%S'),
+                  feed_items(context, FEED_TOP_N))
+    return ''.join(iter_rss(build_feeds([day])[0], base_url))
 
-    # 格式化 XML
-    xml_str = tostring(rss, encoding='unicode')
-    # 添加 XML 声明
-    xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_str
 
-    return xml_str
+def rss_path(base_dir: str) -> Path:
+    """RSS 路径 (固定文件名 rss.xml，便于订阅)"""
+    return Path(base_dir) / 'rss.xml'
 
 
 def save_rss(content: str, base_dir: str, date: datetime = None) -> str:
@@ -103,11 +295,10 @@ def save_rss(content: str, base_dir: str, date: datetime = None) -> str:
     if date is None:
         date = datetime.now()
 
-    base_path = Path(base_dir)
-    base_path.mkdir(parents=True, exist_ok=True)
+    Path(base_dir).mkdir(parents=True, exist_ok=True)
 
     # 保存为 rss.xml (固定文件名，便于订阅)
-    rss_path = base_path / 'rss.xml'
-    rss_path.write_text(content, encoding='utf-8')
+    path = rss_path(base_dir)
+    path.write_text(content, encoding='utf-8')
 
-    return str(rss_path)
+    return str(path)
@@ -0,0 +1,110 @@
+"""运行缓存 - 在子命令之间传递当天的中间结果
+
+每日流程拆分为 scrape / analyze / summarize / render / rss 等子命令后，
+前一步的结果写入 .cache/runs/YYYY-MM-DD/，后一步从这里读取，
+因此可以只重跑其中一步 (例如只重新渲染页面) 而不再访问网络。
+
+    repos.json       抓取结果 (TrendingRepo)
+    analysis.json    分析结果与排名变化 (RepoAnalysis / RankChange)
+    summaries.json   AI 总结 (AISummary)
+"""
+
+import json
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .fileio import atomic_write_text
+
+RUN_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'runs'
+
+
+class RunCache:
+    """
+    某一天的运行缓存
+
+    Args:
+        date: 日期
+        root: 缓存根目录，默认 .cache/runs
+    """
+
+    def __init__(self, date: datetime, root=RUN_CACHE_DIR):
+        self.date = date
+        self.dir = Path(root) / date.strftime('%Y-%m-%d')
+
+    def _write(self, name: str, data) -> str:
+        return atomic_write_text(self.dir / name, json.dumps(data, ensure_ascii=False, indent=1))
+
+    def _read(self, name: str):
+        try:
+            with open(self.dir / name, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_repos(self, repos: list) -> str:
+        """保存抓取结果"""
+        return self._write('repos.json', [asdict(r) for r in repos])
+
+    def load_repos(self) -> Optional[list]:
+        """读取抓取结果，不存在返回 None"""
+        from .scraper import Contributor, TrendingRepo
+
+        data = self._read('repos.json')
+        if data is None:
+            return None
+        return [TrendingRepo(**{**r, 'contributors': [Contributor(**c) for c in r['contributors']]}) for r in data]
+
+    def save_analysis(self, analyses: list, rank_changes: list) -> str:
+        """保存分析结果与排名变化"""
+        return self._write('analysis.json', {
+            'analyses': [asdict(a) for a in analyses],
+            'rank_changes': [asdict(c) for c in rank_changes],
+        })
+
+    def load_analysis(self) -> Optional[tuple[list, list]]:
+        """读取 (分析结果, 排名变化)，不存在返回 None"""
+        from .analyzer import RepoAnalysis
+        from .history import RankChange
+        from .scraper import Contributor, TrendingRepo
+
+        data = self._read('analysis.json')
+        if data is None:
+            return None
+        analyses = []
+        for a in data['analyses']:
+            repo = a['repo']
+            repo = TrendingRepo(**{**repo, 'contributors': [Contributor(**c) for c in repo['contributors']]})
+            analyses.append(RepoAnalysis(**{**a, 'repo': repo}))
+        return analyses, [RankChange(**c) for c in data['rank_changes']]
+
+    def save_summaries(self, summaries: dict) -> str:
+        """保存 AI 总结"""
+        return self._write('summaries.json', {name: asdict(s) for name, s in summaries.items()})
+
+    def load_summaries(self) -> dict:
+        """读取 AI 总结，不存在返回空字典"""
+        from .ai_summary import AISummary
+
+        data = self._read('summaries.json') or {}
+        return {name: AISummary(**s) for name, s in data.items()}
+
+
+def cached_dates(start: str = None, end: str = None, root=RUN_CACHE_DIR) -> list[str]:
+    """
+    有分析缓存的日期 (升序)
+
+    Args:
+        start: 起始日期 YYYY-MM-DD (含)
+        end: 结束日期 YYYY-MM-DD (含)
+        root: 缓存根目录
+
+    Returns:
+        日期字符串列表
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    dates = sorted(p.name for p in root.iterdir() if (p / 'analysis.json').is_file())
+    return [d for d in dates if (start is None or d >= start) and (end is None or d <= end)]
@@ -0,0 +1,376 @@
+"""评分模型与批量评分引擎
+
+评分模型在 config/scoring_models.json 中声明，每个维度的分数为
+"基础分 + 各阶梯命中的阈值个数" (上限 max)，总分为各维度加权和取整。
+模型加载后编译为阈值表 + 总分查找表：阈值分桶使用 numpy.searchsorted
+(未安装 numpy 时用 bisect)，总分通过预先枚举全部维度组合得到，
+因此批量结果与逐个计算逐位一致。
+"""
+
+import json
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """numpy 可选且按需导入 (首次向量化评分时)：未安装时返回 None，退化为纯 Python 实现"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# 模型配置文件与环境变量
+SCORING_CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'scoring_models.json'
+SCORING_MODEL_ENV = 'TRENDING_SCORING_MODEL'
+
+# 总分查找表最多枚举的组合数，超过时逐行计算
+MAX_TOTAL_TABLE_SIZE = 1_000_000
+
+# 行数少于该值时 numpy 的转换开销大于收益，默认走纯 Python
+NUMPY_MIN_ROWS = 64
+
+# 内置经典模型 (即 README 中的评分标准)，配置文件缺失时使用
+CLASSIC_MODEL = {
+    'description': 'Star 增长 35% / 项目热度 25% / 文档 20% / 社区 20%',
+    'weights': {
+        'star_growth': 0.35,
+        'popularity': 0.25,
+        'documentation': 0.20,
+        'community': 0.20,
+    },
+    'dimensions': {
+        'star_growth': {'base': 2, 'ladders': [
+            {'input': 'stars_today', 'thresholds': [10, 20, 30, 50, 100, 200, 300, 500]},
+        ]},
+        'popularity': {'base': 2, 'ladders': [
+            {'input': 'stars', 'thresholds': [100, 500, 1000, 2000, 5000, 10000, 20000, 50000]},
+        ]},
+        'documentation': {'base': 5, 'ladders': [
+            {'input': 'long_description', 'thresholds': [1]},
+            {'input': 'topic_counts', 'thresholds': [3, 3]},
+            {'input': 'has_license', 'thresholds': [1]},
+        ]},
+        'community': {'base': 4, 'ladders': [
+            {'input': 'forks', 'thresholds': [100, 500, 1000]},
+            {'input': 'contributors', 'thresholds': [3, 5]},
+        ]},
+    },
+}
+
+
+def weighted_total(scores: dict[str, int], weights: dict[str, float]) -> int:
+    """加权总分 (round(sum(...)) 与原 calculate_score 的求和表达式相同)"""
+    return round(sum(scores[k] * weights[k] for k in scores))
+
+
+def parse_int(text, expand_k: bool = False) -> int:
+    """与 calculate_score 相同的计数解析 (失败返回 0)"""
+    try:
+        cleaned = text.replace(',', '').replace(',', '')
+        if expand_k:
+            cleaned = cleaned.replace('k', '000')
+        return int(cleaned)
+    except (ValueError, AttributeError):
+        return 0
+
+
+@dataclass
+class ScoreColumns:
+    """列式评分输入 (模型阶梯的 input 引用这里的字段名)"""
+    stars_today: Sequence[int]
+    stars: Sequence[int]
+    forks: Sequence[int]
+    contributors: Sequence[int]  # 贡献者数量
+    long_description: Sequence[bool]  # 描述长度 > 50
+    topic_counts: Sequence[int]
+    has_license: Sequence[bool]
+    # 多日动量 (见 momentum.py)，缺省为单日数据对应的值
+    star_velocity: Optional[Sequence[float]] = None
+    star_acceleration: Optional[Sequence[float]] = None
+    days_on_list: Optional[Sequence[int]] = None
+    rank_trend: Optional[Sequence[float]] = None
+
+    def __post_init__(self):
+        n = len(self.stars_today)
+        if self.star_velocity is None:
+            self.star_velocity = self.stars_today
+        if self.star_acceleration is None:
+            self.star_acceleration = [0.0] * n
+        if self.days_on_list is None:
+            self.days_on_list = [1] * n
+        if self.rank_trend is None:
+            self.rank_trend = [0.0] * n
+
+    def __len__(self) -> int:
+        return len(self.stars_today)
+
+
+SCORE_INPUTS = {f.name for f in fields(ScoreColumns)}
+
+
+@dataclass
+class BatchScores:
+    """批量评分结果 (numpy 可用时为 ndarray，否则为 list)"""
+    score: Sequence[int]
+    dimensions: dict[str, Sequence[int]]
+
+    def details(self, i: int) -> dict[str, int]:
+        """第 i 行的各维度评分 (与 calculate_score 返回的字典一致)"""
+        return {name: int(values[i]) for name, values in self.dimensions.items()}
+
+
+@dataclass
+class Ladder:
+    """阈值阶梯: 输入值每达到一个阈值加 1 分"""
+    input: str
+    thresholds: tuple
+
+
+@dataclass
+class Dimension:
+    """评分维度"""
+    name: str
+    base: int
+    max: int
+    ladders: list[Ladder]
+
+    @property
+    def values(self) -> range:
+        """该维度可能的取值"""
+        top = min(self.base + sum(len(l.thresholds) for l in self.ladders), self.max)
+        return range(self.base, top + 1)
+
+
+@dataclass
+class ScoringModel:
+    """编译后的评分模型"""
+    name: str
+    description: str
+    weights: dict[str, float]
+    dimensions: list[Dimension]
+    total_table: Optional[list[int]] = field(default=None, repr=False)
+    _total_array: object = field(default=None, repr=False)
+
+    @classmethod
+    def from_config(cls, name: str, config: dict) -> 'ScoringModel':
+        """从配置字典构建并编译模型"""
+        weights = {k: float(v) for k, v in config['weights'].items()}
+        dimensions = []
+        for dim_name, spec in config['dimensions'].items():
+            ladders = []
+            for ladder in spec.get('ladders', []):
+                if ladder['input'] not in SCORE_INPUTS:
+                    raise ValueError(f'评分模型 {name}: 未知输入 {ladder["input"]}')
+                ladders.append(Ladder(ladder['input'], tuple(sorted(ladder['thresholds']))))
+            dimensions.append(Dimension(dim_name, int(spec.get('base', 0)), int(spec.get('max', 10)), ladders))
+
+        missing = set(weights) - {d.name for d in dimensions}
+        if missing:
+            raise ValueError(f'评分模型 {name}: 权重引用了未定义的维度 {sorted(missing)}')
+
+        model = cls(name=name, description=config.get('description', ''), weights=weights, dimensions=dimensions)
+        model.compile()
+        return model
+
+    def compile(self) -> None:
+        """预计算所有维度组合的加权总分"""
+        size = 1
+        for dim in self.dimensions:
+            size *= len(dim.values)
+
+        if size > MAX_TOTAL_TABLE_SIZE:
+            self.total_table = None
+            self._total_array = None
+            return
+
+        self.total_table = [
+            self._total(combo)
+            for combo in product(*(dim.values for dim in self.dimensions))
+        ]
+        # numpy 查找表在首次向量化评分时生成
+        self._total_array = None
+
+    def _total(self, combo: Sequence[int]) -> int:
+        """单个维度组合的加权总分 (未加权的维度不参与求和)"""
+        scores = {dim.name: value for dim, value in zip(self.dimensions, combo) if dim.name in self.weights}
+        return weighted_total(scores, self.weights)
+
+    def _dimension_python(self, dim: Dimension, columns: ScoreColumns) -> list[int]:
+        values = [dim.base] * len(columns)
+        for ladder in dim.ladders:
+            thresholds = ladder.thresholds
+            values = [v + bisect_right(thresholds, x) for v, x in zip(values, getattr(columns, ladder.input))]
+        return [min(v, dim.max) for v in values]
+
+    def _dimension_numpy(self, dim: Dimension, columns: ScoreColumns):
+        np = _numpy()
+        values = np.full(len(columns), dim.base, dtype=np.int64)
+        for ladder in dim.ladders:
+            data = np.asarray(getattr(columns, ladder.input), dtype=np.float64)
+            values += np.searchsorted(np.asarray(ladder.thresholds, dtype=np.float64), data, side='right')
+        return np.minimum(values, dim.max)
+
+    def score_batch(self, columns: ScoreColumns, use_numpy: Optional[bool] = None) -> BatchScores:
+        """
+        批量计算推荐评分
+
+        Args:
+            columns: 列式输入
+            use_numpy: 是否使用 numpy，默认已安装且行数足够时使用
+
+        Returns:
+            BatchScores，各数组与输入行一一对应
+        """
+        if use_numpy is None:
+            use_numpy = len(columns) >= NUMPY_MIN_ROWS and _numpy() is not None
+        np = _numpy() if use_numpy else None
+        if use_numpy and np is None:
+            raise ImportError('numpy 未安装，无法使用向量化评分')
+
+        if use_numpy:
+            dims = {dim.name: self._dimension_numpy(dim, columns) for dim in self.dimensions}
+        else:
+            dims = {dim.name: self._dimension_python(dim, columns) for dim in self.dimensions}
+
+        if self.total_table is None:
+            rows = zip(*(dims[dim.name] for dim in self.dimensions))
+            score = [self._total([int(v) for v in combo]) for combo in rows]
+            if use_numpy:
+                score = np.asarray(score, dtype=np.int64)
+            return BatchScores(score=score, dimensions=dims)
+
+        # 混合进制索引: 每个维度减去最小值后按取值个数进位
+        if use_numpy:
+            index = np.zeros(len(columns), dtype=np.int64)
+            for dim in self.dimensions:
+                index = index * len(dim.values) + (dims[dim.name] - dim.base)
+            if self._total_array is None:
+                self._total_array = np.asarray(self.total_table, dtype=np.int64)
+            score = self._total_array[index]
+        else:
+            index = [0] * len(columns)
+            for dim in self.dimensions:
+                radix = len(dim.values)
+                index = [i * radix + (v - dim.base) for i, v in zip(index, dims[dim.name])]
+            table = self.total_table
+            score = [table[i] for i in index]
+
+        return BatchScores(score=score, dimensions=dims)
+
+    def score_one(self, columns: ScoreColumns) -> tuple[int, dict[str, int]]:
+        """单行评分 (纯 Python)"""
+        result = self.score_batch(columns, use_numpy=False)
+        return int(result.score[0]), result.details(0)
+
+
+def load_model_configs(path: Optional[Path] = None) -> dict:
+    """
+    读取模型配置文件
+
+    Returns:
+        {'default': name, 'models': {name: config}}；文件不存在时只含内置经典模型
+    """
+    path = Path(path) if path else SCORING_CONFIG_PATH
+    configs = {'default': 'classic', 'models': {'classic': CLASSIC_MODEL}}
+    if not path.exists():
+        return configs
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    configs['models'].update(data.get('models', {}))
+    configs['default'] = data.get('default', configs['default'])
+    return configs
+
+
+@lru_cache(maxsize=None)
+def _load_models(path: Optional[str]) -> tuple[str, dict[str, ScoringModel]]:
+    configs = load_model_configs(Path(path) if path else None)
+    models = {name: ScoringModel.from_config(name, config) for name, config in configs['models'].items()}
+    return configs['default'], models
+
+
+def list_models(path: Optional[str] = None) -> dict[str, ScoringModel]:
+    """全部已编译模型 (每个进程只编译一次)"""
+    return _load_models(path)[1]
+
+
+def get_model(name: Optional[str] = None, path: Optional[str] = None) -> ScoringModel:
+    """
+    获取评分模型
+
+    Args:
+        name: 模型名；为空时依次使用环境变量 TRENDING_SCORING_MODEL、配置中的 default
+        path: 配置文件路径
+
+    Raises:
+        KeyError: 模型不存在
+    """
+    default, models = _load_models(path)
+    name = name or os.getenv(SCORING_MODEL_ENV) or default
+    if name not in models:
+        raise KeyError(f'未知评分模型: {name} (可选: {", ".join(sorted(models))})')
+    return models[name]
+
+
+def build_score_columns(repos: Sequence, details_list: Optional[Sequence[dict]] = None,
+                        momenta: Optional[Sequence] = None) -> ScoreColumns:
+    """
+    从 TrendingRepo 列表提取评分所需的列
+
+    Args:
+        repos: TrendingRepo 列表
+        details_list: 与 repos 对应的详情字典 (topics / license)，缺省为空
+        momenta: 与 repos 对应的 Momentum，缺省按单日数据计算
+    """
+    if details_list is None:
+        details_list = [{}] * len(repos)
+
+    momentum_columns = {}
+    if momenta is not None:
+        momentum_columns = {
+            'star_velocity': [m.star_velocity for m in momenta],
+            'star_acceleration': [m.star_acceleration for m in momenta],
+            'days_on_list': [m.days_on_list for m in momenta],
+            'rank_trend': [m.rank_trend for m in momenta],
+        }
+
+    return ScoreColumns(
+        stars_today=[parse_int(r.stars_today) for r in repos],
+        stars=[parse_int(r.stars, expand_k=True) for r in repos],
+        forks=[parse_int(r.forks) for r in repos],
+        contributors=[len(r.contributors) for r in repos],
+        long_description=[bool(r.description and len(r.description) > 50) for r in repos],
+        topic_counts=[len(d.get('topics') or []) for d in details_list],
+        has_license=[bool(d.get('license')) for d in details_list],
+        **momentum_columns,
+    )
+
+
+def score_batch(columns: ScoreColumns, use_numpy: Optional[bool] = None,
+                model: Optional[ScoringModel] = None) -> BatchScores:
+    """使用指定模型 (默认当前选中模型) 批量评分"""
+    return (model or get_model()).score_batch(columns, use_numpy)
+
+
+def score_repos(repos: Sequence, details_list: Optional[Sequence[dict]] = None,
+                model: Optional[ScoringModel] = None,
+                momenta: Optional[Sequence] = None) -> list[tuple[int, dict[str, int]]]:
+    """
+    批量版 calculate_score
+
+    Returns:
+        [(总分, 各维度评分字典)]
+    """
+    if not repos:
+        return []
+    result = score_batch(build_score_columns(repos, details_list, momenta), model=model)
+    return [(int(result.score[i]), result.details(i)) for i in range(len(repos))]
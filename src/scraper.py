@@ -1,7 +1,5 @@
 """GitHub Trending 爬虫模块"""
 
-import requests
-from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from typing import Optional
 
@@ -42,6 +40,8 @@ def scrape_trending(language: str = '', since: str = 'daily') -> list[TrendingRe
     Returns:
         TrendingRepo 列表
     """
+    import requests  # 按需导入，其他命令只用到数据结构
+
     url = 'https://github.com/trending'
     if language:
         url += f'/{language}'
@@ -57,7 +57,22 @@ def scrape_trending(language: str = '', since: str = 'daily') -> list[TrendingRe
     response = requests.get(url, params=params, headers=headers, timeout=30)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, 'lxml')
+    return parse_trending_html(response.text)
+
+
+def parse_trending_html(html: str) -> list[TrendingRepo]:
+    """
+    解析 GitHub Trending 页面 HTML
+
+    Args:
+        html: 页面内容
+
+    Returns:
+        TrendingRepo 列表
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
     repos = []
 
     # 查找所有仓库条目
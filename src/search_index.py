@@ -0,0 +1,431 @@
+"""全站搜索索引 - 构建期预计算的分片倒排索引，供前端按需加载"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from .fileio import write_if_changed
+from .history import iter_ranking_history
+from .i18n import texts
+
+# 索引目录 (相对存档根目录)
+SEARCH_DIR_NAME = 'search'
+
+# ASCII 词项按前 N 个字符分片
+SHARD_PREFIX_LEN = 2
+
+# 每个文档分块包含的文档数
+DOC_BLOCK_SIZE = 256
+
+# 描述截断长度 (控制索引体积)
+MAX_DESCRIPTION_LENGTH = 160
+
+# 构建索引需要的排名字段
+SEARCH_FIELDS = ('name', 'rank', 'language', 'description')
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'the', 'this', 'to', 'with', 'your', 'you',
+}
+
+_ASCII_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_UNSAFE_KEY_RE = re.compile(r'[^a-z0-9]')
+_CJK_RUN_RE = re.compile('[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+')
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    分词: ASCII 按字母数字切分，CJK 文本按二元组切分
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        去重前的词项列表
+    """
+    if not text:
+        return []
+
+    text = text.lower()
+    tokens = [t for t in _ASCII_TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+
+    return tokens
+
+
+def shard_key(term: str) -> str:
+    """
+    词项所在分片 (前端 JS 中有相同实现)
+
+    ASCII 词项取前缀 (非字母数字替换为 "_"，保证可作为 URL 文件名)；
+    非 ASCII 词项按首字符码位分 256 桶
+    """
+    first = term[0]
+    if ord(first) < 128:
+        return _UNSAFE_KEY_RE.sub('_', term[:SHARD_PREFIX_LEN])
+    return f'x{ord(first) % 256:02x}'
+
+
+def repo_terms(doc: dict) -> set[str]:
+    """提取单个仓库文档的全部词项"""
+    name = doc['n']
+    parts = [
+        name,
+        name.replace('/', ' ').replace('-', ' ').replace('_', ' '),
+        doc.get('d', ''),
+        doc.get('l') or '',
+        ' '.join(doc.get('t') or []),
+        doc.get('s') or '',
+    ]
+    terms = set()
+    for part in parts:
+        terms.update(tokenize(part))
+    # 完整仓库名 (不含 owner) 作为整体词项，便于精确匹配 "pi-mono" 之类
+    terms.add(name.split('/')[-1].lower())
+    return terms
+
+
+def load_search_docs(base_dir: str = 'archives') -> dict[str, dict]:
+    """
+    加载上次构建的文档存储 (保留仅当天可得的 topics / AI 总结)
+
+    Returns:
+        {repo_name: doc} 字典
+    """
+    docs_dir = Path(base_dir) / SEARCH_DIR_NAME / 'docs'
+    docs = {}
+    if not docs_dir.exists():
+        return docs
+
+    for block_path in sorted(docs_dir.glob('*.json')):
+        try:
+            with open(block_path, 'r', encoding='utf-8') as f:
+                for doc in json.load(f):
+                    docs[doc['n']] = doc
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+
+    return docs
+
+
+def collect_search_docs(base_dir: str = 'archives', extras: Optional[dict[str, dict]] = None) -> list[dict]:
+    """
+    扫描全部历史排名，合并为每个仓库一条文档
+
+    Args:
+        base_dir: 存档基础目录
+        extras: {repo_name: {'topics': [...], 'summary': str}} 当日额外字段
+
+    Returns:
+        按首次上榜日期排序的文档列表 (列表下标即文档 ID，历史只追加，ID 稳定)
+    """
+    previous = load_search_docs(base_dir)
+    docs: dict[str, dict] = {}
+
+    for date_str, rankings in iter_ranking_history(base_dir, fields=SEARCH_FIELDS):
+        for entry in rankings:
+            name = entry.get('name')
+            if not name:
+                continue
+
+            doc = docs.get(name)
+            if doc is None:
+                old = previous.get(name, {})
+                doc = docs[name] = {
+                    'n': name,
+                    'f': date_str,
+                    'b': entry.get('rank', 0),
+                    'c': 0,
+                    't': old.get('t', []),
+                    's': old.get('s', ''),
+                }
+
+            description = entry.get('description') or ''
+            doc['d'] = description[:MAX_DESCRIPTION_LENGTH]
+            doc['l'] = entry.get('language') or ''
+            doc['r'] = date_str
+            doc['c'] += 1
+            rank = entry.get('rank', 0)
+            if rank and (not doc['b'] or rank < doc['b']):
+                doc['b'] = rank
+
+    for name, extra in (extras or {}).items():
+        doc = docs.get(name)
+        if doc is None:
+            continue
+        if extra.get('topics'):
+            doc['t'] = list(extra['topics'])
+        if extra.get('summary'):
+            doc['s'] = extra['summary']
+
+    return sorted(docs.values(), key=lambda d: (d['f'], d['n']))
+
+
+def build_search_index(base_dir: str = 'archives', extras: Optional[dict[str, dict]] = None) -> dict:
+    """
+    构建分片倒排索引并写入 archives/search/
+
+    输出结构:
+        search/meta.json         分片列表与统计
+        search/terms/<key>.json  {term: [doc_id, ...]}
+        search/docs/<n>.json     文档分块 (doc_id // DOC_BLOCK_SIZE)
+
+    Args:
+        base_dir: 存档基础目录
+        extras: 当日 topics / AI 总结
+
+    Returns:
+        meta 字典
+    """
+    docs = collect_search_docs(base_dir, extras)
+    search_dir = Path(base_dir) / SEARCH_DIR_NAME
+
+    shards: dict[str, dict[str, list[int]]] = {}
+    for doc_id, doc in enumerate(docs):
+        for term in repo_terms(doc):
+            shards.setdefault(shard_key(term), {}).setdefault(term, []).append(doc_id)
+
+    written = 0
+    for key, postings in shards.items():
+        content = json.dumps(dict(sorted(postings.items())), ensure_ascii=False, separators=(',', ':'))
+        written += write_if_changed(search_dir / 'terms' / f'{key}.json', content)
+
+    # 删除已不存在的分片
+    terms_dir = search_dir / 'terms'
+    for stale in terms_dir.glob('*.json'):
+        if stale.stem not in shards:
+            stale.unlink()
+
+    for block_start in range(0, len(docs), DOC_BLOCK_SIZE):
+        block = docs[block_start:block_start + DOC_BLOCK_SIZE]
+        content = json.dumps(block, ensure_ascii=False, separators=(',', ':'))
+        written += write_if_changed(search_dir / 'docs' / f'{block_start // DOC_BLOCK_SIZE}.json', content)
+
+    meta = {
+        'version': 1,
+        'docs': len(docs),
+        'terms': sum(len(p) for p in shards.values()),
+        'block_size': DOC_BLOCK_SIZE,
+        'prefix_len': SHARD_PREFIX_LEN,
+        'shards': sorted(shards),
+        'last_date': max((d['r'] for d in docs), default=None),
+    }
+    write_if_changed(search_dir / 'meta.json', json.dumps(meta, separators=(',', ':')))
+    meta['written'] = written
+    return meta
+
+
+def search(base_dir: str, query: str, limit: int = 20) -> list[dict]:
+    """
+    在已构建的索引上查询 (与前端逻辑一致，供调试和测试使用)
+
+    所有查询词都需命中，最后一个词按前缀匹配
+    """
+    search_dir = Path(base_dir) / SEARCH_DIR_NAME
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    result: Optional[set[int]] = None
+    for i, term in enumerate(terms):
+        shard_path = search_dir / 'terms' / f'{shard_key(term)}.json'
+        if not shard_path.exists():
+            return []
+        with open(shard_path, 'r', encoding='utf-8') as f:
+            postings = json.load(f)
+
+        if i == len(terms) - 1 and len(term) >= SHARD_PREFIX_LEN:
+            ids = set()
+            for candidate, doc_ids in postings.items():
+                if candidate.startswith(term):
+                    ids.update(doc_ids)
+        else:
+            ids = set(postings.get(term, []))
+
+        result = ids if result is None else result & ids
+        if not result:
+            return []
+
+    hits = []
+    blocks: dict[int, list] = {}
+    for doc_id in sorted(result):
+        block_no = doc_id // DOC_BLOCK_SIZE
+        if block_no not in blocks:
+            with open(search_dir / 'docs' / f'{block_no}.json', 'r', encoding='utf-8') as f:
+                blocks[block_no] = json.load(f)
+        hits.append(blocks[block_no][doc_id % DOC_BLOCK_SIZE])
+
+    # 最近上榜的排在前面
+    hits.sort(key=lambda d: (d['r'], -d['b']), reverse=True)
+    return hits[:limit]
+
+
+def generate_history_search_html(lang: str = 'zh', index_base: str = '../../search/') -> str:
+    """
+    生成历史搜索结果容器与按需加载脚本
+
+    Args:
+        lang: 语言
+        index_base: 页面到 search/ 目录的相对路径
+    """
+    t = texts('history_search', lang)
+
+    return f'''
+    <div id="history-results" class="hidden mt-6">
+        <div class="flex items-center gap-3 mb-3">
+            <span class="material-symbols-outlined text-glow-amber">history</span>
+            <h2 class="text-lg font-bold text-white">{t['title']}</h2>
+            <span id="history-results-count" class="px-2 py-0.5 rounded text-[10px] font-mono bg-synapse-border text-text-muted"></span>
+        </div>
+        <div id="history-results-list" class="space-y-2"></div>
+    </div>
+
+    <script>
+    (function() {{
+        var BASE = {json.dumps(index_base)};
+        var TEXTS = {json.dumps(dict(t), ensure_ascii=False)};
+        var PREFIX_LEN = {SHARD_PREFIX_LEN};
+        var STOPWORDS = {json.dumps(sorted(STOPWORDS))};
+        var meta = null, shardCache = {{}}, blockCache = {{}}, timer = null, seq = 0;
+
+        function fetchJSON(url, cache, key) {{
+            if (!cache[key]) {{
+                cache[key] = fetch(url).then(function(r) {{
+                    if (!r.ok) throw new Error(r.status);
+                    return r.json();
+                }});
+            }}
+            return cache[key];
+        }}
+
+        function loadMeta() {{
+            if (!meta) meta = fetchJSON(BASE + 'meta.json', {{}}, 'meta');
+            return meta;
+        }}
+
+        function tokenize(text) {{
+            text = text.toLowerCase();
+            var tokens = (text.match(/[a-z0-9][a-z0-9+#]*/g) || []).filter(function(t) {{
+                return STOPWORDS.indexOf(t) === -1;
+            }});
+            (text.match(/[\\u3040-\\u30ff\\u3400-\\u4dbf\\u4e00-\\u9fff\\uac00-\\ud7af]+/g) || []).forEach(function(run) {{
+                if (run.length === 1) {{ tokens.push(run); return; }}
+                for (var i = 0; i < run.length - 1; i++) tokens.push(run.slice(i, i + 2));
+            }});
+            return tokens;
+        }}
+
+        function shardKey(term) {{
+            var code = term.charCodeAt(0);
+            if (code < 128) return term.slice(0, PREFIX_LEN).replace(/[^a-z0-9]/g, '_');
+            var bucket = (code % 256).toString(16);
+            return 'x' + (bucket.length < 2 ? '0' + bucket : bucket);
+        }}
+
+        function lookup(term, isLast, shards) {{
+            var key = shardKey(term);
+            if (shards.indexOf(key) === -1) return Promise.resolve([]);
+            return fetchJSON(BASE + 'terms/' + key + '.json', shardCache, key).then(function(postings) {{
+                if (!isLast || term.length < PREFIX_LEN) return postings[term] || [];
+                var ids = [];
+                Object.keys(postings).forEach(function(candidate) {{
+                    if (candidate.indexOf(term) === 0) ids = ids.concat(postings[candidate]);
+                }});
+                return ids;
+            }});
+        }}
+
+        function render(docs, mySeq) {{
+            if (mySeq !== seq) return;
+            var panel = document.getElementById('history-results');
+            var list = document.getElementById('history-results-list');
+            list.innerHTML = '';
+            document.getElementById('history-results-count').textContent = docs.length;
+            if (!docs.length) {{
+                list.innerHTML = '<p class="text-sm text-text-muted">' + TEXTS.empty + '</p>';
+            }}
+            docs.forEach(function(doc) {{
+                var item = document.createElement('a');
+                var parts = doc.r.split('-');
+                item.href = BASE + '../' + parts[0] + '/' + parts[1] + '/' + doc.r + '.html';
+                item.className = 'history-result block p-3 rounded-lg border border-synapse-border bg-synapse-card/40 hover:border-electric-cyan/30 transition-colors';
+                var title = document.createElement('div');
+                title.className = 'text-sm font-mono font-bold text-white';
+                title.textContent = doc.n;
+                var desc = document.createElement('p');
+                desc.className = 'text-xs text-text-muted line-clamp-1';
+                desc.textContent = doc.s || doc.d;
+                var info = document.createElement('div');
+                info.className = 'text-[10px] text-text-muted font-mono mt-1';
+                info.textContent = (doc.l || 'Unknown') + ' · ' + TEXTS.last_seen + ' ' + doc.r +
+                    ' · ' + TEXTS.best_rank + ' #' + doc.b + ' · ' + TEXTS.days + ' ' + doc.c;
+                item.appendChild(title);
+                item.appendChild(desc);
+                item.appendChild(info);
+                list.appendChild(item);
+            }});
+            panel.classList.remove('hidden');
+        }}
+
+        function run(query, mySeq) {{
+            var terms = tokenize(query);
+            if (!terms.length) {{
+                document.getElementById('history-results').classList.add('hidden');
+                return;
+            }}
+            loadMeta().then(function(m) {{
+                return Promise.all(terms.map(function(term, i) {{
+                    return lookup(term, i === terms.length - 1, m.shards);
+                }})).then(function(lists) {{
+                    var result = lists.reduce(function(acc, ids) {{
+                        var set = {{}};
+                        ids.forEach(function(id) {{ set[id] = true; }});
+                        return acc === null ? Object.keys(set).map(Number) : acc.filter(function(id) {{ return set[id]; }});
+                    }}, null) || [];
+                    var blocks = {{}};
+                    result.forEach(function(id) {{ blocks[Math.floor(id / m.block_size)] = true; }});
+                    return Promise.all(Object.keys(blocks).map(function(b) {{
+                        return fetchJSON(BASE + 'docs/' + b + '.json', blockCache, b);
+                    }})).then(function() {{
+                        return Promise.all(result.map(function(id) {{
+                            return blockCache[Math.floor(id / m.block_size)].then(function(block) {{
+                                return block[id % m.block_size];
+                            }});
+                        }}));
+                    }});
+                }});
+            }}).then(function(docs) {{
+                if (!docs) return;
+                docs.sort(function(a, b) {{ return a.r < b.r ? 1 : a.r > b.r ? -1 : a.b - b.b; }});
+                render(docs.slice(0, 20), mySeq);
+            }}).catch(function() {{
+                // file:// 打开或索引缺失时静默降级为当日过滤
+                document.getElementById('history-results').classList.add('hidden');
+            }});
+        }}
+
+        window.searchHistory = function(query) {{
+            clearTimeout(timer);
+            var mySeq = ++seq;
+            timer = setTimeout(function() {{ run(query, mySeq); }}, 150);
+        }};
+    }})();
+    </script>
+    '''
+
+
+def save_search_index(base_dir: str = 'archives', extras: Optional[dict[str, dict]] = None) -> dict:
+    """构建索引并打印统计 (供 main.py 调用)"""
+    started = time.perf_counter()
+    meta = build_search_index(base_dir, extras)
+    elapsed = time.perf_counter() - started
+    print(f'  索引: {meta["docs"]} 个项目, {meta["terms"]} 个词项, {len(meta["shards"])} 个分片 '
+          f'({meta["written"]} 个文件更新, {elapsed:.2f}s)')
+    return meta
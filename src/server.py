@@ -0,0 +1,491 @@
+"""本地静态预览服务器 - 基于 asyncio，支持 ETag、304、Range 与预压缩变体协商"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import time
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import unquote, urlsplit
+
+# 各类资源的缓存策略 (HTML/Markdown 每次校验，数据文件短缓存，静态资源长缓存)
+CACHE_RULES = {
+    '.html': 'no-cache',
+    '.md': 'no-cache',
+    '.json': 'public, max-age=300',
+    '.xml': 'public, max-age=3600',
+    '.css': 'public, max-age=86400',
+    '.js': 'public, max-age=86400',
+    '.png': 'public, max-age=604800',
+    '.jpg': 'public, max-age=604800',
+    '.jpeg': 'public, max-age=604800',
+    '.gif': 'public, max-age=604800',
+    '.svg': 'public, max-age=604800',
+    '.webp': 'public, max-age=604800',
+    '.ico': 'public, max-age=604800',
+}
+DEFAULT_CACHE_CONTROL = 'public, max-age=600'
+
+# 预压缩变体 (按优先级排列): (Content-Encoding, 文件后缀)
+PRECOMPRESSED_VARIANTS = [('br', '.br'), ('gzip', '.gz')]
+
+# 值得压缩的文本类型后缀
+COMPRESSIBLE_SUFFIXES = {'.html', '.md', '.json', '.xml', '.css', '.js', '.svg', '.txt'}
+
+MAX_HEADER_BYTES = 64 * 1024
+READ_CHUNK_SIZE = 256 * 1024
+
+STATUS_REASONS = {
+    200: 'OK',
+    206: 'Partial Content',
+    301: 'Moved Permanently',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    416: 'Range Not Satisfiable',
+}
+
+mimetypes.add_type('text/markdown', '.md')
+mimetypes.add_type('application/json', '.json')
+mimetypes.add_type('application/xml', '.xml')
+
+
+class RangeNotSatisfiable(ValueError):
+    """Range 请求无法满足 (416)"""
+
+
+@dataclass
+class FileInfo:
+    """静态文件元数据 (按 mtime/size 缓存)"""
+    path: Path
+    size: int
+    mtime_ns: int
+    etag: str
+
+
+@dataclass
+class Request:
+    """解析后的 HTTP 请求"""
+    method: str
+    target: str
+    version: str
+    headers: dict[str, str]
+
+
+def compute_etag(path: Path) -> str:
+    """根据文件内容计算强 ETag"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def get_cache_control(path: Path) -> str:
+    """按资源类型返回 Cache-Control"""
+    return CACHE_RULES.get(path.suffix.lower(), DEFAULT_CACHE_CONTROL)
+
+
+def get_content_type(path: Path) -> str:
+    """获取 Content-Type，文本类型附带 charset"""
+    content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/json', 'application/xml',
+                                                              'application/javascript'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """
+    解析 Accept-Encoding
+
+    Returns:
+        {encoding: q} 字典，如 {'gzip': 1.0, 'br': 0.8}
+    """
+    accepted = {}
+    for part in header.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    解析单段 Range 请求
+
+    Args:
+        header: Range 头，如 "bytes=0-99", "bytes=-500", "bytes=100-"
+        size: 资源大小
+
+    Returns:
+        (start, end) 闭区间；多段或格式错误返回 None (按完整内容响应)
+
+    Raises:
+        RangeNotSatisfiable: 范围超出资源大小
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    start_text, sep, end_text = spec.strip().partition('-')
+    if not sep:
+        return None
+
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # 后缀范围: 最后 N 个字节
+        if end is None:
+            return None
+        if end <= 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - end, 0), size - 1
+
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 弱比较"""
+    if header.strip() == '*':
+        return True
+    candidates = [c.strip() for c in header.split(',')]
+    return any(c.removeprefix('W/') == etag for c in candidates)
+
+
+def precompress_site(root: str = 'archives', min_size: int = 1024) -> list[str]:
+    """
+    为文本资源生成 .gz 预压缩变体 (已存在且较新的变体跳过)
+
+    Args:
+        root: 站点根目录
+        min_size: 小于该字节数的文件不压缩
+
+    Returns:
+        新生成的变体文件路径列表
+    """
+    written = []
+    for path in sorted(Path(root).rglob('*')):
+        if not path.is_file() or path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+            continue
+        stat = path.stat()
+        if stat.st_size < min_size:
+            continue
+
+        variant = path.with_name(path.name + '.gz')
+        if variant.exists() and variant.stat().st_mtime_ns >= stat.st_mtime_ns:
+            continue
+
+        # mtime=0 保证相同内容生成相同字节，ETag 稳定
+        variant.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+        written.append(str(variant))
+
+    return written
+
+
+class StaticSiteServer:
+    """基于 asyncio 的静态站点服务器"""
+
+    def __init__(self, root: str = 'archives', host: str = '127.0.0.1', port: int = 8000,
+                 access_log: Optional[Callable[[str], None]] = print):
+        self.root = Path(root).resolve()
+        self.host = host
+        self.port = port
+        self.access_log = access_log
+        self._file_cache: dict[Path, FileInfo] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """启动监听 (port=0 时自动分配端口)"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """启动并持续服务"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """停止服务"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def get_file_info(self, path: Path) -> Optional[FileInfo]:
+        """获取文件元数据，内容未变时复用已计算的 ETag"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        cached = self._file_cache.get(path)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+
+        info = FileInfo(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, etag=compute_etag(path))
+        self._file_cache[path] = info
+        return info
+
+    def resolve_path(self, url_path: str) -> tuple[Optional[Path], Optional[str]]:
+        """
+        将 URL 路径映射到站点内文件
+
+        Returns:
+            (文件路径, 重定向地址)，二者至多一个非 None
+        """
+        relative = unquote(url_path).lstrip('/')
+        try:
+            candidate = (self.root / relative).resolve()
+        except (ValueError, OSError):
+            # 路径中含 NUL 等非法字符
+            return None, None
+
+        if candidate != self.root and self.root not in candidate.parents:
+            return None, None
+
+        if candidate.is_dir():
+            if not url_path.endswith('/'):
+                return None, url_path + '/'
+            candidate = candidate / 'index.html'
+
+        if not candidate.is_file():
+            return None, None
+
+        return candidate, None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理单个连接 (支持 keep-alive)"""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+
+                started = time.perf_counter()
+                status, sent = await self._respond(request, writer)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+                if self.access_log:
+                    self.access_log(f'{request.method} {request.target} {status} {sent}B {elapsed_ms:.2f}ms')
+
+                if not self._keep_alive(request):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        """读取并解析请求头"""
+        try:
+            raw = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+
+        if len(raw) > MAX_HEADER_BYTES:
+            return None
+
+        lines = raw.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        if len(parts) != 3:
+            return None
+
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        return Request(method=parts[0].upper(), target=parts[1], version=parts[2].upper(), headers=headers)
+
+    @staticmethod
+    def _keep_alive(request: Request) -> bool:
+        """判断连接是否保持"""
+        connection = request.headers.get('connection', '').lower()
+        if request.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    async def _respond(self, request: Request, writer: asyncio.StreamWriter) -> tuple[int, int]:
+        """
+        生成并发送响应
+
+        Returns:
+            (状态码, 发送的 body 字节数)
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return await self._send(writer, request, 405, {'Allow': 'GET, HEAD'}, b'Method Not Allowed')
+
+        url_path = urlsplit(request.target).path or '/'
+        path, redirect = self.resolve_path(url_path)
+
+        if redirect:
+            return await self._send(writer, request, 301, {'Location': redirect}, b'')
+        if path is None:
+            return await self._send(writer, request, 404, {}, b'Not Found')
+
+        # 预压缩变体协商
+        accepted = parse_accept_encoding(request.headers.get('accept-encoding', ''))
+        info = self.get_file_info(path)
+        headers = {
+            'Content-Type': get_content_type(path),
+            'Cache-Control': get_cache_control(path),
+            'Accept-Ranges': 'bytes',
+        }
+
+        # 早于源文件的变体已过期 (页面重新生成后未再预压缩)，不使用
+        has_variant = False
+        source_mtime_ns = info.mtime_ns
+        for encoding, suffix in PRECOMPRESSED_VARIANTS:
+            variant_info = self.get_file_info(path.with_name(path.name + suffix))
+            if variant_info is None or variant_info.mtime_ns < source_mtime_ns:
+                continue
+            has_variant = True
+            if accepted.get(encoding, 0) > 0:
+                info = variant_info
+                headers['Content-Encoding'] = encoding
+                break
+
+        if has_variant:
+            headers['Vary'] = 'Accept-Encoding'
+
+        headers['ETag'] = info.etag
+        headers['Last-Modified'] = formatdate(info.mtime_ns / 1e9, usegmt=True)
+
+        # 条件请求
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            if etag_matches(if_none_match, info.etag):
+                return await self._send(writer, request, 304, headers, b'', omit_length=True)
+        elif 'if-modified-since' in request.headers:
+            try:
+                since = parsedate_to_datetime(request.headers['if-modified-since']).timestamp()
+                if int(info.mtime_ns / 1e9) <= since:
+                    return await self._send(writer, request, 304, headers, b'', omit_length=True)
+            except (TypeError, ValueError):
+                pass
+
+        # Range 请求 (If-Range 不匹配时返回完整内容)
+        start, end = 0, info.size - 1
+        status = 200
+        range_header = request.headers.get('range')
+        if_range = request.headers.get('if-range')
+        if range_header and (if_range is None or if_range == info.etag):
+            try:
+                byte_range = parse_range(range_header, info.size)
+            except RangeNotSatisfiable:
+                headers['Content-Range'] = f'bytes */{info.size}'
+                return await self._send(writer, request, 416, headers, b'')
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                headers['Content-Range'] = f'bytes {start}-{end}/{info.size}'
+
+        length = max(end - start + 1, 0)
+        headers['Content-Length'] = str(length)
+        self._write_head(writer, request, status, headers)
+
+        if request.method == 'HEAD' or length == 0:
+            await writer.drain()
+            return status, 0
+
+        loop = asyncio.get_running_loop()
+        with open(info.path, 'rb') as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await loop.run_in_executor(None, f.read, min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                writer.write(chunk)
+                remaining -= len(chunk)
+                await writer.drain()
+
+        return status, length - remaining
+
+    def _write_head(self, writer: asyncio.StreamWriter, request: Request, status: int, headers: dict) -> None:
+        """写入状态行与响应头"""
+        lines = [f'HTTP/1.1 {status} {STATUS_REASONS.get(status, "")}']
+        base = {
+            'Date': formatdate(usegmt=True),
+            'Server': 'trending-preview',
+            'Connection': 'keep-alive' if self._keep_alive(request) else 'close',
+        }
+        for name, value in {**base, **headers}.items():
+            lines.append(f'{name}: {value}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+    async def _send(self, writer: asyncio.StreamWriter, request: Request, status: int,
+                    headers: dict, body: bytes, omit_length: bool = False) -> tuple[int, int]:
+        """发送小型完整响应"""
+        headers = dict(headers)
+        if not omit_length:
+            headers['Content-Length'] = str(len(body))
+        self._write_head(writer, request, status, headers)
+        if request.method != 'HEAD' and body:
+            writer.write(body)
+        await writer.drain()
+        return status, 0 if request.method == 'HEAD' else len(body)
+
+
+def serve(root: str = 'archives', host: str = '127.0.0.1', port: int = 8000,
+          precompress: bool = False) -> None:
+    """
+    启动本地预览服务器 (阻塞直到 Ctrl+C)
+
+    Args:
+        root: 站点根目录
+        host: 监听地址
+        port: 监听端口
+        precompress: 启动前生成 .gz 预压缩变体
+    """
+    if precompress:
+        written = precompress_site(root)
+        print(f'🗜️ 已生成 {len(written)} 个 .gz 预压缩文件')
+
+    server = StaticSiteServer(root, host, port)
+
+    async def run():
+        await server.start()
+        print(f'🌐 预览服务器已启动: http://{host}:{server.port}/ (目录: {server.root})')
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print('\n👋 预览服务器已停止')
+
+
+if __name__ == '__main__':
+    serve()
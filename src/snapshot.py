@@ -0,0 +1,316 @@
+"""月度二进制排名快照 - 与每日 JSON 并存的紧凑格式
+
+文件: archives/YYYY/MM/YYYY-MM.rank (小端序)
+
+    头部     magic 'GTRS' | 版本 u8 | 年 u16 | 月 u8 | 天数 u8 | 字符串数 u32 | 字符串表偏移 u32
+    日索引   每天一项: 日 u8 | 行数 u16 | 起始行 u32
+    行       仓库名 u32 | 排名 u16 | stars i32 | stars_today i32 | 语言 u32 | 描述 u32
+    字符串表 (字符串数 + 1) 个 u32 偏移，随后是 UTF-8 数据
+
+仓库名、语言与描述在整个月内只存一次 (字符串驻留)。stars / stars_today
+能按千分位格式还原的存为整数，否则存为 -(字符串 ID + 1)。读取时 mmap
+文件，按日索引只解码所需的那一天。
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from .fileio import atomic_write_bytes
+from .history import HISTORY_FILE_PATTERN
+from .rollup import open_rollup
+
+SNAPSHOT_MAGIC = b'GTRS'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.rank'
+
+_HEADER = struct.Struct('<4sBHBBII')
+_DAY = struct.Struct('<BHI')
+_ROW = struct.Struct('<IHiiII')
+_OFFSET = struct.Struct('<I')
+
+# 语言 / 描述缺失
+NONE_ID = 0xFFFFFFFF
+
+ENTRY_FIELDS = ('name', 'rank', 'stars', 'stars_today', 'language', 'description')
+
+
+class SnapshotError(ValueError):
+    """快照文件损坏或版本不兼容"""
+
+
+def get_snapshot_path(base_dir: str, year: int, month: int) -> Path:
+    """月度快照路径"""
+    return Path(base_dir) / f'{year:04d}' / f'{month:02d}' / f'{year:04d}-{month:02d}{SNAPSHOT_SUFFIX}'
+
+
+class _StringPool:
+    """写入时的字符串驻留表"""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE_ID
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+    def encode_count(self, text) -> int:
+        """计数文本 -> 整数 (无法无损还原时存为负的字符串 ID)"""
+        text = '' if text is None else str(text)
+        try:
+            value = int(text.replace(',', ''))
+        except ValueError:
+            value = -1
+        if 0 <= value < 2 ** 31 and f'{value:,}' == text:
+            return value
+        return -(self.intern(text) + 1)
+
+
+def encode_month(year: int, month: int, days: dict[int, list[dict]]) -> bytes:
+    """
+    编码一个月的排名
+
+    Args:
+        year, month: 年月
+        days: {日: 排名字典列表}
+
+    Returns:
+        快照文件内容
+    """
+    pool = _StringPool()
+    day_index = bytearray()
+    rows = bytearray()
+    row_count = 0
+
+    for day in sorted(days):
+        rankings = days[day]
+        day_index += _DAY.pack(day, len(rankings), row_count)
+        for entry in rankings:
+            rows += _ROW.pack(
+                pool.intern(entry['name']),
+                int(entry.get('rank') or 0),
+                pool.encode_count(entry.get('stars')),
+                pool.encode_count(entry.get('stars_today')),
+                pool.intern(entry.get('language')),
+                pool.intern(entry.get('description')),
+            )
+        row_count += len(rankings)
+
+    encoded = [s.encode('utf-8') for s in pool.strings]
+    offsets = bytearray()
+    position = 0
+    for data in encoded:
+        offsets += _OFFSET.pack(position)
+        position += len(data)
+    offsets += _OFFSET.pack(position)
+
+    strings_offset = _HEADER.size + len(day_index) + len(rows)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, year, month, len(days),
+                          len(encoded), strings_offset)
+    return b''.join([header, day_index, rows, offsets, *encoded])
+
+
+class MonthSnapshot:
+    """
+    月度快照读取器 (mmap)
+
+    打开时只解析头部与日索引；rankings() 只解码请求的那一天，
+    字符串按需解码并缓存。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f'空快照文件: {self.path}')
+        try:
+            self._load_header()
+        except (struct.error, SnapshotError):
+            self.close()
+            raise
+
+    def _load_header(self):
+        buf = self._buffer
+        if len(buf) < _HEADER.size:
+            raise SnapshotError(f'快照文件过短: {self.path}')
+        magic, version, self.year, self.month, day_count, self._string_count, self._strings_offset = \
+            _HEADER.unpack_from(buf, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotError(f'不支持的快照格式: {self.path}')
+
+        self._days: dict[int, tuple[int, int]] = {}
+        for i in range(day_count):
+            day, count, start = _DAY.unpack_from(buf, _HEADER.size + i * _DAY.size)
+            self._days[day] = (start, count)
+        self._rows_offset = _HEADER.size + day_count * _DAY.size
+        self._blob_offset = self._strings_offset + (self._string_count + 1) * _OFFSET.size
+        self._cache: dict[int, str] = {}
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def dates(self) -> list[str]:
+        """快照中包含的日期 (升序)"""
+        return [f'{self.year:04d}-{self.month:02d}-{day:02d}' for day in sorted(self._days)]
+
+    def __contains__(self, date_str: str) -> bool:
+        return self._day_of(date_str) in self._days
+
+    def _day_of(self, date_str: str) -> Optional[int]:
+        if date_str[:7] != f'{self.year:04d}-{self.month:02d}':
+            return None
+        return int(date_str[8:10])
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == NONE_ID:
+            return None
+        text = self._cache.get(sid)
+        if text is None:
+            if sid >= self._string_count:
+                raise SnapshotError(f'字符串 ID 越界: {sid}')
+            position = self._strings_offset + sid * _OFFSET.size
+            start = _OFFSET.unpack_from(self._buffer, position)[0]
+            end = _OFFSET.unpack_from(self._buffer, position + _OFFSET.size)[0]
+            text = self._cache[sid] = self._buffer[self._blob_offset + start:self._blob_offset + end].decode('utf-8')
+        return text
+
+    def _count(self, value: int) -> str:
+        return f'{value:,}' if value >= 0 else self._string(-value - 1)
+
+    def rankings(self, date_str: str, fields: Optional[Sequence[str]] = None) -> Optional[list[dict]]:
+        """
+        读取某一天的排名
+
+        Args:
+            date_str: 日期 YYYY-MM-DD
+            fields: 只解码这些字段，默认全部
+
+        Returns:
+            与每日 JSON 中 rankings 相同结构的字典列表，该日不存在返回 None
+        """
+        location = self._days.get(self._day_of(date_str))
+        if location is None:
+            return None
+        start, count = location
+        fields = fields or ENTRY_FIELDS
+
+        decoders = {
+            'name': lambda row: self._string(row[0]),
+            'rank': lambda row: row[1],
+            'stars': lambda row: self._count(row[2]),
+            'stars_today': lambda row: self._count(row[3]),
+            'language': lambda row: self._string(row[4]),
+            'description': lambda row: self._string(row[5]),
+        }
+        # 快照中没有的字段与 JSON 读取一致，取值为 None
+        selected = [(key, decoders.get(key, lambda row: None)) for key in fields]
+
+        begin = self._rows_offset + start * _ROW.size
+        with memoryview(self._buffer) as buffer, buffer[begin:begin + count * _ROW.size] as view:
+            return [{key: decode(row) for key, decode in selected} for row in _ROW.iter_unpack(view)]
+
+    def iter_days(self, start: Optional[str] = None, end: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[tuple[str, list[dict]]]:
+        """按日期顺序产出 (日期, 排名)"""
+        for date_str in self.dates():
+            if (start and date_str < start) or (end and date_str > end):
+                continue
+            yield date_str, self.rankings(date_str, fields)
+
+
+def read_month(path) -> dict[int, list[dict]]:
+    """读取整个快照为 {日: 排名} (用于合并更新)"""
+    with MonthSnapshot(path) as snapshot:
+        return {int(date_str[8:10]): snapshot.rankings(date_str) for date_str in snapshot.dates()}
+
+
+def update_month_snapshot(base_dir: str, date_str: str, rankings: list[dict]) -> str:
+    """
+    写入 (或替换) 某一天到所在月份的快照
+
+    Args:
+        base_dir: 存档基础目录
+        date_str: 日期 YYYY-MM-DD
+        rankings: 当天排名字典列表
+
+    Returns:
+        快照文件路径
+    """
+    year, month, day = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])
+    path = get_snapshot_path(base_dir, year, month)
+
+    if path.exists():
+        try:
+            days = read_month(path)
+        except (SnapshotError, struct.error, UnicodeDecodeError, OSError):
+            # 损坏的快照从 JSON 重建
+            days = _load_month_json(path.parent)
+    else:
+        # 快照缺失时以当月已有的每日 JSON (及月度归档) 为基础，不只保留当天
+        days = _load_month_json(path.parent)
+    days[day] = rankings
+
+    atomic_write_bytes(path, encode_month(year, month, days))
+    return str(path)
+
+
+def _load_month_json(month_dir: Path) -> dict[int, list[dict]]:
+    """读取某月的全部每日排名 (月度归档 + 每日 JSON，JSON 优先)"""
+    days = {}
+    rollup = open_rollup(str(month_dir.parent.parent), int(month_dir.parent.name), int(month_dir.name))
+    if rollup is not None:
+        with rollup:
+            for date_str in rollup.dates():
+                rankings = rollup.rankings(date_str)
+                if rankings is not None:
+                    days[int(date_str[8:10])] = rankings
+
+    for file_path in sorted(month_dir.glob('*.json')):
+        match = HISTORY_FILE_PATTERN.match(file_path.name)
+        if not match:
+            continue
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                days[int(match.group(3))] = json.load(f).get('rankings', [])
+        except (OSError, ValueError, AttributeError):
+            continue
+    return days
+
+
+def build_snapshots(base_dir: str = 'archives') -> list[str]:
+    """
+    从每日 JSON 重建全部月度快照
+
+    Returns:
+        写入的快照路径列表
+    """
+    written = []
+    base_path = Path(base_dir)
+    if not base_path.exists():
+        return written
+
+    for year_dir in sorted(p for p in base_path.iterdir() if p.is_dir() and p.name.isdigit()):
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+            days = _load_month_json(month_dir)
+            if not days:
+                continue
+            path = get_snapshot_path(base_dir, int(year_dir.name), int(month_dir.name))
+            atomic_write_bytes(path, encode_month(int(year_dir.name), int(month_dir.name), days))
+            written.append(str(path))
+    return written
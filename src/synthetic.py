@@ -0,0 +1,340 @@
+"""合成存档生成器 - 为性能测试生成可复现的大规模排名历史
+
+每个仓库有一条 logistic 增长曲线 (上榜日期、爆发宽度、总增长)，某一天的
+今日 Star = 曲线导数 × 随机扰动，当天排名取增长最多的前 M 个。因此：
+
+- 上榜 / 掉榜 / 重新上榜自然产生 (churn)，爆发宽的仓库形成连续上榜 (streak)
+- 总 Star 为基础值 + 曲线积分，随时间单调增长
+- 每一天只依赖种子与日期，可以按天并行生成，输出与进程数无关、逐字节一致
+
+可选同时生成 AI 总结与 HN 故事 fixture，用于测试渲染与交叉链接路径。
+"""
+
+import html
+import json
+import math
+import random
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date as date_cls, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from .fileio import atomic_write_text
+
+# 默认规模
+DEFAULT_SEED = 42
+DEFAULT_REPOS_PER_DAY = 25
+DEFAULT_HN_PER_DAY = 30
+
+# 每天平均新出现的仓库数 / 每日榜单大小 (越大换榜越快)
+CHURN_RATIO = 0.4
+
+# 长期霸榜仓库占比 (爆发宽度很大，形成长连续上榜)
+EVERGREEN_RATIO = 0.03
+
+# 曲线在 ±WINDOW_WIDTHS 个宽度之外视为不活跃
+WINDOW_WIDTHS = 4.0
+
+# 一次提交给工作进程的天数
+DAYS_PER_TASK = 16
+
+FIXTURES_DIR = 'fixtures'
+
+LANGUAGES = [
+    ('Python', 24), ('TypeScript', 20), ('JavaScript', 10), ('Go', 9), ('Rust', 9),
+    ('C++', 5), ('Java', 5), ('C', 3), ('Shell', 3), ('Swift', 2), ('Kotlin', 2),
+    ('Jupyter Notebook', 3), ('Ruby', 1), ('PHP', 1), ('Zig', 1), (None, 4),
+]
+
+_OWNERS = ['open', 'deep', 'meta', 'micro', 'hyper', 'astral', 'nova', 'quantum', 'lobe', 'vector',
+           'cloud', 'neural', 'data', 'rapid', 'tiny', 'super', 'mono', 'poly', 'zen', 'arc']
+_OWNER_SUFFIXES = ['ai', 'labs', 'hq', 'dev', 'soft', 'io', 'team', 'works', 'org', 'hub']
+_REPO_WORDS = ['agent', 'chat', 'code', 'stack', 'flow', 'graph', 'vision', 'voice', 'search', 'mem',
+               'infer', 'bench', 'kit', 'cli', 'ui', 'db', 'cache', 'proxy', 'shell', 'notes',
+               'rag', 'llm', 'edge', 'mesh', 'sync', 'lens', 'forge', 'pilot', 'bot', 'studio']
+_TOPICS = ['AI agents', 'LLM inference', 'web apps', 'terminal workflows', 'vector search',
+           'speech recognition', 'data pipelines', 'browser automation', 'local-first sync',
+           'observability', 'code review', 'image generation', 'note taking', 'game engines']
+_KINDS = ['A fast', 'A minimal', 'An open-source', 'A self-hosted', 'A production-ready',
+          'A lightweight', 'The modern', 'A batteries-included']
+_THINGS = ['framework', 'toolkit', 'library', 'CLI', 'platform', 'runtime', 'server', 'SDK']
+
+_HN_TEMPLATES = [
+    'Show HN: {name} – {desc}', '{desc}', 'Ask HN: How do you handle {topic}?',
+    'Why {topic} is harder than it looks', 'Launch HN: {name} (YC W26) – {desc}',
+    'The state of {topic} in {year}', '{name} {major}.0 released',
+]
+_HN_DOMAINS = ['blog.example.com', 'arxiv.org', 'www.nytimes.com', 'lwn.net', 'www.theverge.com',
+               'engineering.example.org', 'news.example.net']
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """合成存档参数"""
+    start: date_cls
+    days: int
+    repos_per_day: int = DEFAULT_REPOS_PER_DAY
+    seed: int = DEFAULT_SEED
+    summaries: bool = False
+    hn: bool = False
+    hn_per_day: int = DEFAULT_HN_PER_DAY
+
+
+@dataclass(frozen=True)
+class SyntheticRepo:
+    """合成仓库及其增长曲线"""
+    name: str
+    language: Optional[str]
+    description: str
+    base_stars: int
+    peak: float  # 爆发中心 (相对起始日的天数)
+    width: float  # 爆发宽度 (天)
+    gain: float  # 曲线总增长 (Star)
+
+    def stars_on(self, day: int) -> int:
+        """截至某天结束的总 Star"""
+        return self.base_stars + int(self.gain / (1 + math.exp(-(day - self.peak) / self.width)))
+
+    def rate_on(self, day: int) -> float:
+        """某天的期望新增 Star (曲线导数)"""
+        s = 1 / (1 + math.exp(-(day - self.peak) / self.width))
+        return self.gain * s * (1 - s) / self.width
+
+
+def _rng(*key) -> random.Random:
+    """按键派生独立的随机数发生器 (字符串种子在不同进程间稳定)"""
+    return random.Random(':'.join(map(str, key)))
+
+
+def _weighted_language(rng: random.Random) -> Optional[str]:
+    languages, weights = zip(*LANGUAGES)
+    return rng.choices(languages, weights)[0]
+
+
+def _make_repo(seed: int, index: int, span: int) -> SyntheticRepo:
+    rng = _rng(seed, 'repo', index)
+    owner = rng.choice(_OWNERS) + rng.choice(_OWNER_SUFFIXES)
+    name = f'{owner}/{rng.choice(_REPO_WORDS)}-{rng.choice(_REPO_WORDS)}{index}'
+    description = f'{rng.choice(_KINDS)} {rng.choice(_THINGS)} for {rng.choice(_TOPICS)}'
+
+    if rng.random() < EVERGREEN_RATIO:
+        width = rng.uniform(30, 120)
+        gain = rng.uniform(50_000, 200_000)
+    else:
+        width = rng.lognormvariate(0.7, 0.6)
+        gain = rng.paretovariate(1.3) * 800 * width
+
+    return SyntheticRepo(
+        name=name,
+        language=_weighted_language(rng),
+        description=description,
+        base_stars=int(rng.paretovariate(0.9) * 200),
+        peak=rng.uniform(-10, span + 10),
+        width=width,
+        gain=gain,
+    )
+
+
+class SyntheticUniverse:
+    """全部合成仓库，按活跃区间索引以便逐日只评估候选仓库"""
+
+    def __init__(self, config: SyntheticConfig):
+        self.config = config
+        span = config.days
+        count = max(config.repos_per_day * 4, int((span + 20) * config.repos_per_day * CHURN_RATIO))
+        self.repos = [_make_repo(config.seed, i, span) for i in range(count)]
+
+        # 按活跃区间起点排序，最大窗口用于截断二分查找
+        windows = sorted(
+            (repo.peak - WINDOW_WIDTHS * repo.width, repo.peak + WINDOW_WIDTHS * repo.width, i)
+            for i, repo in enumerate(self.repos)
+        )
+        self._starts = [w[0] for w in windows]
+        self._windows = windows
+        self._max_span = max((w[1] - w[0] for w in windows), default=0)
+
+    def candidates(self, day: int) -> list[int]:
+        """某天处于活跃区间内的仓库下标"""
+        lo = bisect_left(self._starts, day - self._max_span)
+        hi = bisect_right(self._starts, day)
+        return [i for _, end, i in self._windows[lo:hi] if end >= day]
+
+    def rankings(self, day: int) -> list[dict]:
+        """某天的排名 (与每日 JSON 的 rankings 结构一致)"""
+        # 每天一个发生器，候选顺序固定，因此结果只取决于种子与日期
+        rng = _rng(self.config.seed, 'day', day)
+        scored = []
+        for i in self.candidates(day):
+            today = int(self.repos[i].rate_on(day) * rng.lognormvariate(0, 0.35))
+            if today > 0:
+                scored.append((today, i))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {
+                'name': self.repos[i].name,
+                'rank': rank,
+                'stars': f'{self.repos[i].stars_on(day):,}',
+                'stars_today': f'{today:,}',
+                'language': self.repos[i].language,
+                'description': self.repos[i].description,
+            }
+            for rank, (today, i) in enumerate(scored[:self.config.repos_per_day], 1)
+        ]
+
+    def hn_stories(self, day: int, date: date_cls, trending: list[dict]) -> list[dict]:
+        """某天的 HN 故事 (结构同 HNStory.to_dict，部分链接指向当天上榜仓库)"""
+        rng = _rng(self.config.seed, 'hn', day)
+        midnight = int(datetime(date.year, date.month, date.day, tzinfo=timezone.utc).timestamp())
+
+        stories = []
+        for n in range(self.config.hn_per_day):
+            story_id = 40_000_000 + day * 1000 + n
+            repo = rng.choice(trending) if trending and rng.random() < 0.2 else None
+            title = rng.choice(_HN_TEMPLATES).format(
+                name=(repo['name'].split('/')[1] if repo else rng.choice(_REPO_WORDS).title()),
+                desc=(repo['description'] if repo else f'{rng.choice(_KINDS)} {rng.choice(_THINGS)}'),
+                topic=rng.choice(_TOPICS), year=date.year, major=rng.randint(1, 9),
+            )
+            if repo:
+                url = f'https://github.com/{repo["name"]}' + rng.choice(['', '/', '#readme', '?tab=readme'])
+            elif rng.random() < 0.1:
+                url = ''  # Ask HN
+            else:
+                url = f'https://{rng.choice(_HN_DOMAINS)}/{date.year}/{story_id}'
+            stories.append({
+                'id': story_id,
+                'title': title,
+                'title_zh': '',
+                'url': url,
+                'score': int(rng.paretovariate(1.1) * 40),
+                'author': f'user{rng.randint(1, 5000)}',
+                'time': midnight + rng.randint(0, 86399),
+                'comments': int(rng.paretovariate(1.3) * 10),
+                'hn_url': f'https://news.ycombinator.com/item?id={story_id}',
+            })
+        stories.sort(key=lambda s: (-s['score'], s['id']))
+        return stories
+
+
+@lru_cache(maxsize=1)
+def _universe(config: SyntheticConfig) -> SyntheticUniverse:
+    # 每个工作进程只构建一次
+    return SyntheticUniverse(config)
+
+
+def _day_payload(date: date_cls, rankings: list[dict]) -> str:
+    data = {
+        'date': date.isoformat(),
+        # 固定时间戳使输出可复现
+        'updated_at': f'{date.isoformat()} 09:00:00',
+        'count': len(rankings),
+        'rankings': rankings,
+    }
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _write_days(config: SyntheticConfig, base_dir: str, days: range) -> tuple[int, int, set[str]]:
+    """生成并写入一段日期，返回 (天数, 行数, 出现过的仓库名)"""
+    universe = _universe(config)
+    rows = 0
+    names = set()
+    for day in days:
+        date = config.start + timedelta(days=day)
+        rankings = universe.rankings(day)
+        rows += len(rankings)
+        names.update(entry['name'] for entry in rankings)
+
+        path = Path(base_dir) / f'{date.year:04d}' / f'{date.month:02d}' / f'{date.isoformat()}.json'
+        atomic_write_text(path, _day_payload(date, rankings))
+
+        if config.hn:
+            hn_path = Path(base_dir) / FIXTURES_DIR / 'hn' / f'{date.isoformat()}.json'
+            stories = universe.hn_stories(day, date, rankings)
+            atomic_write_text(hn_path, json.dumps({'date': date.isoformat(), 'stories': stories},
+                                                  ensure_ascii=False, indent=2))
+    return len(days), rows, names
+
+
+def _summary_fixture(config: SyntheticConfig, repo: SyntheticRepo) -> dict:
+    rng = _rng(config.seed, 'summary', repo.name)
+    topic = repo.description.split(' for ', 1)[-1]
+    return {
+        'repo_name': repo.name,
+        'summary': f'面向{topic}的{rng.choice(["开源", "轻量", "高性能", "自托管"])}工具',
+        'highlights': rng.sample(['上手简单', '性能出色', '插件丰富', '文档完善', '社区活跃', '跨平台'], 2),
+        'use_cases': f'适合需要{topic}能力的开发者',
+    }
+
+
+def trending_html(rankings: list[dict], forks_ratio: float = 0.1) -> str:
+    """
+    把一天的排名渲染为 GitHub Trending 页面结构的 HTML (解析基准与测试的 fixture)
+
+    Args:
+        rankings: 排名字典列表 (每日 JSON 的 rankings)
+        forks_ratio: Fork 数相对 Star 数的比例
+    """
+    articles = []
+    for entry in rankings:
+        name = html.escape(entry['name'])
+        stars = int(entry['stars'].replace(',', ''))
+        language = (f'<span itemprop="programmingLanguage">{html.escape(entry["language"])}</span>'
+                    if entry.get('language') else '')
+        avatars = ''.join(
+            f'<a class="d-inline-block" data-hovercard-type="user" href="/u{n}">'
+            f'<img class="avatar mb-1" src="https://avatars.githubusercontent.com/u/{n}?s=40" alt="@u{n}"></a>'
+            for n in range(entry['rank'] % 5 + 1)
+        )
+        articles.append(f'''<article class="Box-row">
+  <h2 class="h3 lh-condensed"><a href="/{name}" class="Link">{name.replace('/', ' / ')}</a></h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">{html.escape(entry.get('description') or '')}</p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3">{language}</span>
+    <a class="Link Link--muted d-inline-block mr-3" href="/{name}/stargazers">{entry['stars']}</a>
+    <a class="Link Link--muted d-inline-block mr-3" href="/{name}/forks">{int(stars * forks_ratio):,}</a>
+    <span class="d-inline-block mr-3">Built by {avatars}</span>
+    <span class="d-inline-block float-sm-right">{entry['stars_today']} stars today</span>
+  </div>
+</article>''')
+    return ('<!DOCTYPE html><html><head><title>Trending repositories on GitHub today</title></head>'
+            '<body><div class="Box">' + '\n'.join(articles) + '</div></body></html>')
+
+
+def generate_archive(base_dir: str, config: SyntheticConfig, workers: int = 0) -> dict:
+    """
+    生成合成存档
+
+    Args:
+        base_dir: 输出目录 (结构同 archives/: YYYY/MM/YYYY-MM-DD.json)
+        config: 合成参数
+        workers: 并行进程数，0 表示按 CPU 数，1 表示在当前进程生成
+
+    Returns:
+        统计信息 {days, rows, repos, elapsed_s}
+    """
+    started = datetime.now()
+    chunks = [range(i, min(i + DAYS_PER_TASK, config.days)) for i in range(0, config.days, DAYS_PER_TASK)]
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_write_days(config, base_dir, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            results = list(pool.map(_write_days, [config] * len(chunks), [base_dir] * len(chunks), chunks))
+
+    names = set().union(*(r[2] for r in results)) if results else set()
+    if config.summaries:
+        universe = _universe(config)
+        summaries = {repo.name: _summary_fixture(config, repo) for repo in universe.repos if repo.name in names}
+        atomic_write_text(Path(base_dir) / FIXTURES_DIR / 'ai_summaries.json',
+                          json.dumps(dict(sorted(summaries.items())), ensure_ascii=False, indent=2))
+
+    return {
+        'days': sum(r[0] for r in results),
+        'rows': sum(r[1] for r in results),
+        'repos': len(names),
+        'elapsed_s': round((datetime.now() - started).total_seconds(), 3),
+    }
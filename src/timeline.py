@@ -0,0 +1,372 @@
+"""仓库时间线生成器 - 单次遍历全部历史，输出每个仓库的排名/Star 走势"""
+
+import json
+import time
+from array import array
+from datetime import date as date_cls
+from pathlib import Path
+from typing import Callable, Optional
+
+from .fileio import atomic_write_text, write_if_changed
+from .history import iter_ranking_history, parse_count
+
+# 时间线目录 (相对存档根目录)
+TIMELINE_DIR_NAME = 'timeline'
+
+
+class RepoSeries:
+    """单个仓库的时间序列 (紧凑 int 数组，日期以 ordinal 存储)"""
+
+    __slots__ = ('name', 'language', 'description', 'days', 'ranks', 'stars', 'stars_today')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.language = ''
+        self.description = ''
+        self.days = array('i')
+        self.ranks = array('i')
+        self.stars = array('i')
+        self.stars_today = array('i')
+
+    def append(self, day: int, rank: int, stars: int, stars_today: int) -> None:
+        """追加一天的数据"""
+        self.days.append(day)
+        self.ranks.append(rank)
+        self.stars.append(stars)
+        self.stars_today.append(stars_today)
+
+    def truncate_from(self, day: int) -> None:
+        """删除 day (含) 之后的数据，用于同一天重跑时覆盖"""
+        keep = len(self.days)
+        while keep and self.days[keep - 1] >= day:
+            keep -= 1
+        for column in (self.days, self.ranks, self.stars, self.stars_today):
+            del column[keep:]
+
+    def to_dict(self) -> dict:
+        """输出为时间线 JSON"""
+        return {
+            'name': self.name,
+            'language': self.language,
+            'description': self.description,
+            'dates': [date_cls.fromordinal(d).isoformat() for d in self.days],
+            'rank': self.ranks.tolist(),
+            'stars': self.stars.tolist(),
+            'stars_today': self.stars_today.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RepoSeries':
+        """从时间线 JSON 恢复"""
+        series = cls(data['name'])
+        series.language = data.get('language', '')
+        series.description = data.get('description', '')
+        series.days = array('i', (date_cls.fromisoformat(d).toordinal() for d in data.get('dates', [])))
+        series.ranks = array('i', data.get('rank', []))
+        series.stars = array('i', data.get('stars', []))
+        series.stars_today = array('i', data.get('stars_today', []))
+        return series
+
+    def summary(self) -> dict:
+        """索引条目"""
+        return {
+            'name': self.name,
+            'language': self.language,
+            'first': date_cls.fromordinal(self.days[0]).isoformat(),
+            'last': date_cls.fromordinal(self.days[-1]).isoformat(),
+            'days': len(self.days),
+            'best_rank': min(self.ranks),
+            'peak_stars_today': max(self.stars_today),
+            'stars': self.stars[-1],
+        }
+
+
+def get_series_path(base_dir: str, repo_name: str) -> Path:
+    """单个仓库时间线 JSON 路径: timeline/repos/<owner>/<repo>.json"""
+    return Path(base_dir) / TIMELINE_DIR_NAME / 'repos' / f'{repo_name}.json'
+
+
+def read_timeline_index(base_dir: str = 'archives') -> Optional[dict]:
+    """读取时间线索引，不存在或损坏时返回 None"""
+    index_path = Path(base_dir) / TIMELINE_DIR_NAME / 'index.json'
+    if not index_path.exists():
+        return None
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def load_timeline_summaries(base_dir: str = 'archives', names=None) -> dict[str, dict]:
+    """
+    读取时间线索引中的仓库条目
+
+    Args:
+        base_dir: 存档目录
+        names: 只保留这些仓库，None 表示全部
+
+    Returns:
+        仓库名 -> 索引条目 (first / last / days / best_rank / peak_stars_today / stars)
+    """
+    index = read_timeline_index(base_dir) or {}
+    wanted = set(names) if names is not None else None
+    return {r['name']: r for r in index.get('repos', []) if wanted is None or r['name'] in wanted}
+
+
+def collect_series(base_dir: str = 'archives', since: Optional[str] = None,
+                   series: Optional[dict[str, RepoSeries]] = None,
+                   load_existing: Optional[Callable[[str], Optional[RepoSeries]]] = None
+                   ) -> tuple[dict[str, RepoSeries], set[str], Optional[str]]:
+    """
+    单次遍历历史文件，把每天的排名追加到各仓库序列中
+
+    Args:
+        base_dir: 存档基础目录
+        since: 仅处理该日期 (含) 之后的文件
+        series: 已有序列 (增量模式)
+        load_existing: 遇到不在 series 中的仓库时调用，返回其已有序列 (增量模式)
+
+    Returns:
+        (序列字典, 本次涉及的仓库名集合, 最后处理的日期)
+    """
+    if series is None:
+        series = {}
+
+    touched = set()
+    last_date = None
+
+    for date_str, rankings in iter_ranking_history(base_dir, start=since):
+        day = date_cls.fromisoformat(date_str).toordinal()
+        last_date = date_str
+
+        for entry in rankings:
+            name = entry.get('name')
+            if not name:
+                continue
+            repo_series = series.get(name)
+            if repo_series is None:
+                repo_series = load_existing(name) if load_existing else None
+                series[name] = repo_series = repo_series or RepoSeries(name)
+            repo_series.append(day, entry.get('rank', 0), parse_count(entry.get('stars')),
+                               parse_count(entry.get('stars_today')))
+            repo_series.language = entry.get('language') or ''
+            repo_series.description = entry.get('description') or ''
+            touched.add(name)
+
+    return series, touched, last_date
+
+
+def write_timelines(base_dir: str, series: dict[str, RepoSeries], names, last_date: Optional[str],
+                    summaries: Optional[dict[str, dict]] = None) -> int:
+    """
+    写出指定仓库的时间线 JSON 以及索引和页面
+
+    Returns:
+        实际写入的仓库文件数
+    """
+    if summaries is None:
+        summaries = {}
+
+    written = 0
+    for name in names:
+        repo_series = series[name]
+        if not len(repo_series.days):
+            # 同日重跑后不再上榜且无其他记录
+            summaries.pop(name, None)
+            get_series_path(base_dir, name).unlink(missing_ok=True)
+            continue
+        content = json.dumps(repo_series.to_dict(), ensure_ascii=False, separators=(',', ':'))
+        written += write_if_changed(get_series_path(base_dir, name), content)
+        summaries[name] = repo_series.summary()
+
+    # 最近上榜在前，同日按名称排序
+    repos = sorted(summaries.values(), key=lambda r: r['name'])
+    repos.sort(key=lambda r: r['last'], reverse=True)
+    index = {'last_date': last_date, 'count': len(repos), 'repos': repos}
+
+    timeline_dir = Path(base_dir) / TIMELINE_DIR_NAME
+    atomic_write_text(timeline_dir / 'index.json', json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+    write_if_changed(timeline_dir / 'index.html', generate_timeline_index_html())
+    return written
+
+
+def build_timelines(base_dir: str = 'archives') -> dict:
+    """
+    全量构建: 遍历全部历史一次，输出所有仓库时间线
+
+    Returns:
+        统计信息
+    """
+    series, touched, last_date = collect_series(base_dir)
+    written = write_timelines(base_dir, series, touched, last_date)
+    return {'repos': len(series), 'updated': len(touched), 'written': written, 'last_date': last_date}
+
+
+def update_timelines(base_dir: str = 'archives') -> dict:
+    """
+    增量更新: 只读取索引 last_date 之后 (含当天，支持重跑) 的历史文件，
+    只重写涉及的仓库文件；没有索引或数据损坏时退化为全量构建
+
+    Returns:
+        统计信息
+    """
+    index = read_timeline_index(base_dir)
+    if not index or not index.get('last_date'):
+        return build_timelines(base_dir)
+
+    cutoff = index['last_date']
+    cutoff_day = date_cls.fromisoformat(cutoff).toordinal()
+    summaries = {r['name']: r for r in index.get('repos', [])}
+
+    def load_series(name: str) -> Optional[RepoSeries]:
+        if name not in summaries:
+            return None
+        with open(get_series_path(base_dir, name), 'r', encoding='utf-8') as f:
+            return RepoSeries.from_dict(json.load(f))
+
+    try:
+        # 最后一天出现过的仓库先截断，以便同日重跑覆盖旧数据
+        series: dict[str, RepoSeries] = {}
+        for name, summary in summaries.items():
+            if summary['last'] >= cutoff:
+                series[name] = load_series(name)
+                series[name].truncate_from(cutoff_day)
+
+        series, touched, last_date = collect_series(base_dir, since=cutoff, series=series,
+                                                    load_existing=load_series)
+    except (json.JSONDecodeError, OSError, KeyError, ValueError):
+        return build_timelines(base_dir)
+
+    last_date = last_date or cutoff
+    written = write_timelines(base_dir, series, set(series), last_date, summaries)
+    return {'repos': len(summaries), 'updated': len(touched), 'written': written, 'last_date': last_date}
+
+
+def save_timelines(base_dir: str = 'archives', full: bool = False) -> dict:
+    """更新时间线并打印统计 (供 main.py 调用)"""
+    started = time.perf_counter()
+    stats = build_timelines(base_dir) if full else update_timelines(base_dir)
+    elapsed = time.perf_counter() - started
+    print(f'  时间线: {stats["repos"]} 个仓库, 本次涉及 {stats["updated"]} 个, '
+          f'写入 {stats["written"]} 个文件 ({elapsed:.2f}s)')
+    return stats
+
+
+def generate_timeline_index_html() -> str:
+    """生成时间线索引页 (加载 index.json，点击仓库后按需加载其时间线 JSON)"""
+    return '''<!DOCTYPE html>
+<html lang="zh-CN" class="dark">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>GitHub Trending - Timeline</title>
+    <link rel="icon" href="https://github.githubassets.com/favicons/favicon.svg" type="image/svg+xml">
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500;700&display=swap" rel="stylesheet">
+    <script src="https://cdn.tailwindcss.com"></script>
+    <script src="https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js"></script>
+    <style>
+        body { background-color: #0D1117; color: #C9D1D9; font-family: Inter, sans-serif; }
+        .repo-row { cursor: pointer; }
+        .repo-row:hover, .repo-row.selected { background: rgba(0, 229, 255, 0.08); }
+    </style>
+</head>
+<body class="min-h-screen">
+    <header class="border-b border-[#30363D] px-6 py-4 flex items-center justify-between">
+        <div>
+            <h1 class="text-xl font-bold text-white">Trending <span class="text-[#00E5FF]">Timeline</span></h1>
+            <p id="summary" class="text-xs text-[#8B949E] font-mono"></p>
+        </div>
+        <div class="flex items-center gap-4">
+            <input id="filter" type="text" placeholder="owner/repo" class="bg-[#161B22] border border-[#30363D] rounded-lg px-3 py-1.5 text-sm text-white">
+            <a href="../index.html" class="text-sm text-[#8B949E] hover:text-white">← Trending</a>
+        </div>
+    </header>
+    <main class="grid grid-cols-1 lg:grid-cols-5 gap-6 p-6">
+        <section class="lg:col-span-2 max-h-[80vh] overflow-y-auto border border-[#30363D] rounded-xl">
+            <table class="w-full text-sm">
+                <thead class="sticky top-0 bg-[#161B22] text-[#8B949E] text-xs">
+                    <tr>
+                        <th class="text-left px-3 py-2">Repo</th>
+                        <th class="px-2 py-2" data-sort="days">Days</th>
+                        <th class="px-2 py-2" data-sort="best_rank">Best</th>
+                        <th class="px-2 py-2" data-sort="peak_stars_today">Peak/day</th>
+                        <th class="px-2 py-2" data-sort="last">Last</th>
+                    </tr>
+                </thead>
+                <tbody id="repo-table"></tbody>
+            </table>
+        </section>
+        <section class="lg:col-span-3 border border-[#30363D] rounded-xl p-4">
+            <h2 id="repo-title" class="text-lg font-mono font-bold text-white mb-1"></h2>
+            <p id="repo-desc" class="text-sm text-[#8B949E] mb-4"></p>
+            <div id="chart" style="height: 420px;"></div>
+        </section>
+    </main>
+    <script>
+    (function() {
+        var repos = [], sortKey = 'last', chart = echarts.init(document.getElementById('chart'), 'dark');
+
+        function renderTable() {
+            var query = document.getElementById('filter').value.toLowerCase();
+            var rows = repos.filter(function(r) { return r.name.toLowerCase().indexOf(query) !== -1; });
+            rows.sort(function(a, b) {
+                if (sortKey === 'best_rank') return a.best_rank - b.best_rank;
+                if (sortKey === 'last') return a.last < b.last ? 1 : a.last > b.last ? -1 : 0;
+                return b[sortKey] - a[sortKey];
+            });
+            document.getElementById('repo-table').innerHTML = rows.slice(0, 500).map(function(r) {
+                return '<tr class="repo-row border-t border-[#30363D]" data-name="' + r.name + '">' +
+                    '<td class="px-3 py-1.5 font-mono text-white truncate">' + r.name + '</td>' +
+                    '<td class="text-center">' + r.days + '</td>' +
+                    '<td class="text-center">#' + r.best_rank + '</td>' +
+                    '<td class="text-center">+' + r.peak_stars_today + '</td>' +
+                    '<td class="text-center font-mono text-xs">' + r.last + '</td></tr>';
+            }).join('');
+        }
+
+        function showRepo(name) {
+            fetch('repos/' + name + '.json').then(function(r) { return r.json(); }).then(function(data) {
+                document.getElementById('repo-title').textContent = data.name;
+                document.getElementById('repo-desc').textContent = data.description;
+                chart.setOption({
+                    backgroundColor: 'transparent',
+                    tooltip: { trigger: 'axis' },
+                    legend: { data: ['rank', 'stars', 'stars_today'] },
+                    xAxis: { type: 'category', data: data.dates },
+                    yAxis: [
+                        { type: 'value', name: 'rank', inverse: true, minInterval: 1 },
+                        { type: 'value', name: 'stars' }
+                    ],
+                    series: [
+                        { name: 'rank', type: 'line', step: 'middle', data: data.rank },
+                        { name: 'stars', type: 'line', yAxisIndex: 1, data: data.stars },
+                        { name: 'stars_today', type: 'bar', yAxisIndex: 1, data: data.stars_today }
+                    ]
+                }, true);
+                location.hash = name;
+            });
+        }
+
+        document.getElementById('repo-table').addEventListener('click', function(e) {
+            var row = e.target.closest('.repo-row');
+            if (row) showRepo(row.dataset.name);
+        });
+        document.getElementById('filter').addEventListener('input', renderTable);
+        document.querySelectorAll('th[data-sort]').forEach(function(th) {
+            th.style.cursor = 'pointer';
+            th.addEventListener('click', function() { sortKey = th.dataset.sort; renderTable(); });
+        });
+
+        fetch('index.json').then(function(r) { return r.json(); }).then(function(index) {
+            repos = index.repos;
+            document.getElementById('summary').textContent = index.count + ' repos · ' + index.last_date;
+            renderTable();
+            var initial = location.hash.slice(1) || (repos[0] && repos[0].name);
+            if (initial) showRepo(decodeURIComponent(initial));
+        });
+    })();
+    </script>
+</body>
+</html>
+'''
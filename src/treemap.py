@@ -0,0 +1,142 @@
+"""Squarified Treemap 布局 - 构建期计算面积与 starsToday 成正比的矩形"""
+
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+
+@dataclass
+class Rect:
+    """布局结果矩形 (与输入容器同单位)"""
+    index: int  # 对应输入序列中的下标
+    x: float
+    y: float
+    w: float
+    h: float
+
+    @property
+    def area(self) -> float:
+        return self.w * self.h
+
+    @property
+    def aspect(self) -> float:
+        """长宽比 (>= 1，越接近 1 越方正)"""
+        if self.w <= 0 or self.h <= 0:
+            return float('inf')
+        return max(self.w / self.h, self.h / self.w)
+
+
+def _worst_aspect(row_sum: float, row_min: float, row_max: float, side: float) -> float:
+    """一行内最差长宽比 (Bruls et al. 公式，O(1))"""
+    side_sq = side * side
+    sum_sq = row_sum * row_sum
+    return max(side_sq * row_max / sum_sq, sum_sq / (side_sq * row_min))
+
+
+def squarify(values: Sequence[float], x: float = 0.0, y: float = 0.0,
+             width: float = 100.0, height: float = 100.0) -> list[Rect]:
+    """
+    Squarified Treemap 布局
+
+    先按值降序排序 (O(n log n))，再贪心地逐行放置：新元素加入当前行不会使
+    最差长宽比变差就加入，否则把当前行沿短边铺开并开始新的一行 (O(n))。
+
+    Args:
+        values: 非负数值 (面积与之成正比)，值为 0 的项得到零面积矩形
+        x, y: 容器左上角
+        width, height: 容器尺寸
+
+    Returns:
+        与输入顺序一致的 Rect 列表
+    """
+    n = len(values)
+    rects: list[Rect] = [Rect(i, x, y, 0.0, 0.0) for i in range(n)]
+
+    total = float(sum(v for v in values if v > 0))
+    if n == 0 or total <= 0 or width <= 0 or height <= 0:
+        return rects
+
+    scale = width * height / total
+    order = sorted((i for i in range(n) if values[i] > 0), key=lambda i: values[i], reverse=True)
+    areas = [values[i] * scale for i in order]
+
+    start = 0
+    count = len(order)
+    while start < count:
+        side = min(width, height)
+
+        # 贪心扩展当前行
+        row_sum = row_max = row_min = areas[start]
+        worst = _worst_aspect(row_sum, row_min, row_max, side)
+        end = start + 1
+        while end < count:
+            area = areas[end]
+            candidate = _worst_aspect(row_sum + area, min(row_min, area), row_max, side)
+            if candidate > worst:
+                break
+            row_sum += area
+            row_min = min(row_min, area)
+            worst = candidate
+            end += 1
+
+        # 沿短边铺开该行
+        if width >= height:
+            # 竖直一列，占据左侧
+            col_w = row_sum / height if end < count else width
+            offset = y
+            for k in range(start, end):
+                h = areas[k] / row_sum * height
+                rects[order[k]] = Rect(order[k], x, offset, col_w, h)
+                offset += h
+            x += col_w
+            width -= col_w
+        else:
+            # 水平一行，占据顶部
+            row_h = row_sum / width if end < count else height
+            offset = x
+            for k in range(start, end):
+                w = areas[k] / row_sum * width
+                rects[order[k]] = Rect(order[k], offset, y, w, row_h)
+                offset += w
+            y += row_h
+            height -= row_h
+
+        start = end
+
+    return rects
+
+
+def layout_treemap(items: Sequence, value: Callable[[object], float],
+                   width: float = 100.0, height: float = 100.0,
+                   min_share: float = 0.0) -> list[tuple[object, Rect]]:
+    """
+    对任意对象序列做 treemap 布局
+
+    Args:
+        items: 待布局对象
+        value: 取值函数
+        width, height: 容器尺寸
+        min_share: 每项最少占总量的比例 (保证 0 增长的项目也可见)
+
+    Returns:
+        [(item, rect)]，顺序与输入一致
+    """
+    values = [max(float(value(item)), 0.0) for item in items]
+    if min_share > 0 and values:
+        floor = max(sum(values), 1.0) * min_share
+        values = [max(v, floor) for v in values]
+    rects = squarify(values, 0.0, 0.0, width, height)
+    return list(zip(items, rects))
+
+
+def size_class(rect: Rect, width: float = 100.0, height: float = 100.0) -> str:
+    """按占容器面积比例给出内容密度等级 (huge/large/medium/small/tiny)"""
+    share = rect.area / (width * height) if width > 0 and height > 0 else 0.0
+    if share >= 0.30:
+        return 'huge'
+    if share >= 0.16:
+        return 'large'
+    if share >= 0.08:
+        return 'medium'
+    if share >= 0.035:
+        return 'small'
+    return 'tiny'
@@ -0,0 +1,53 @@
+"""关键词分类器测试"""
+
+from src.classifier import KeywordClassifier, trie_pattern
+from src.dashboard import classify_domain
+from src.hn_scraper import classify_hn_category
+
+
+def test_word_boundaries():
+    clf = KeywordClassifier([('AI', ['ai', 'agent', 'llama', 'machine learning']), ('CLI', ['cli'])])
+    assert clf.classify('Send mail from the terminal') is None
+    assert clf.classify('HTTP client library') is None
+    assert clf.classify('Open-source AI agents') == 'AI'
+    assert clf.classify('agentic workflows') == 'AI'
+    assert clf.classify('run llama3 locally') == 'AI'
+    assert clf.classify('Machine\n  Learning basics') == 'AI'
+    assert clf.classify('A CLI for gpt-4o') == 'CLI'
+    assert clf.classify('') is None
+
+
+def test_priority_order():
+    clf = KeywordClassifier([('A', ['alpha']), ('B', ['beta']), ('C', ['gamma'])])
+    # 后出现的高优先级关键词仍然胜出
+    assert clf.classify('gamma beta') == 'B'
+    assert clf.classify('gamma beta alpha') == 'A'
+    # 重复关键词归属靠前的类别
+    assert KeywordClassifier([('A', ['x-ray']), ('B', ['x-ray', 'xylophone'])]).classify('x-ray') == 'A'
+
+
+def test_trie_prefers_longest_keyword():
+    clf = KeywordClassifier([('Short', ['gpt']), ('Long', ['gpts-store'])])
+    assert clf.classify('gpts-store') == 'Long'
+    assert clf.classify('GPTs') == 'Short'
+    assert trie_pattern([]) == ''
+
+
+def test_classify_domain():
+    assert classify_domain('acme/agents', 'Build LLM apps', 'Go') == 'AI & ML'
+    assert classify_domain('acme/mailer', 'Email client', 'Go') == 'System'  # 语言兜底
+    assert classify_domain('acme/mailer', 'Email client', 'Haskell') == 'Other'
+    assert classify_domain('acme/ui', 'React components', 'Python') == 'Frontend'
+
+    classify_domain.cache_clear()
+    classify_domain('acme/ui', 'React components', 'Python')
+    classify_domain('acme/ui', 'React components', 'Python')
+    assert classify_domain.cache_info().hits == 1
+
+
+def test_classify_hn_category():
+    assert classify_hn_category('Show HN: my new app', '') == 'Tools'
+    assert classify_hn_category('Why C++ templates are hard', '') == 'Programming'
+    assert classify_hn_category('Going to the mountains', '') == 'Other'
+    assert classify_hn_category('Go 1.24 released', '') == 'Programming'
+    assert classify_hn_category('Hello world', 'https://github.com/acme/hello') == 'Tools'
@@ -0,0 +1,62 @@
+"""CLI 按需导入与运行缓存测试"""
+
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from src.ai_summary import AISummary
+from src.analyzer import RepoAnalysis
+from src.history import RankChange
+from src.run_cache import RunCache
+from src.scraper import Contributor, TrendingRepo
+
+ROOT = Path(__file__).parent.parent
+
+
+def loaded_heavy_modules(*imports):
+    """在新进程中执行导入，返回已加载的重型依赖"""
+    code = '; '.join(['import sys', *imports,
+                      "print(__import__('json').dumps([m for m in ('requests', 'bs4', 'numpy') if m in sys.modules]))"])
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True, cwd=ROOT).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_main_import_is_light():
+    assert loaded_heavy_modules('import main', 'main.parse_args(["render"])') == []
+
+
+def test_render_modules_skip_network_and_numpy():
+    assert loaded_heavy_modules('import main', 'import src.dashboard, src.deep_dive, src.generator, src.rss',
+                                'import src.analyzer, src.scoring, src.run_cache') == []
+
+
+def test_step_subcommands_parse():
+    import main
+
+    args = main.parse_args(['--rank-diff', 'best', 'analyze', '--date', '2026-02-07'])
+    assert args.command == 'analyze' and args.date == '2026-02-07' and args.rank_diff == 'best'
+    assert main.parse_args([]).command is None
+
+
+def test_run_cache_round_trip(tmp_path):
+    cache = RunCache(datetime(2026, 2, 7), root=tmp_path)
+    repo = TrendingRepo(name='owner/repo', url='https://github.com/owner/repo', description='示例',
+                        language='Python', stars='1,234', stars_today='56', forks='7',
+                        contributors=[Contributor(username='alice', avatar_url='https://avatars/alice')])
+    analysis = RepoAnalysis(repo=repo, language_stats={'Python': 100.0}, topics=['cli'], license='MIT',
+                            readme_summary='', tech_stack=['Python'], score=8, score_details={'growth': 7},
+                            star_velocity=12.5)
+    change = RankChange(name='owner/repo', current_rank=1, previous_rank=3, change=2, is_new=False)
+    summary = AISummary(repo_name='owner/repo', summary='一句话', highlights=['快'], use_cases='脚本')
+
+    assert cache.load_repos() is None and cache.load_analysis() is None and cache.load_summaries() == {}
+    cache.save_repos([repo])
+    cache.save_analysis([analysis], [change])
+    cache.save_summaries({'owner/repo': summary})
+
+    assert (tmp_path / '2026-02-07' / 'repos.json').exists()
+    assert cache.load_repos() == [repo]
+    assert cache.load_analysis() == ([analysis], [change])
+    assert cache.load_summaries() == {'owner/repo': summary}
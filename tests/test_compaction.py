@@ -0,0 +1,70 @@
+"""存档压缩测试"""
+
+import gzip
+import json
+from datetime import datetime
+
+from src.compaction import STUB_MARKER, compact_archives, read_manifest
+from src.history import iter_ranking_history, load_ranking_history
+from src.rollup import MonthRollup, get_rollup_path
+
+
+def write_day(base, date_str, names):
+    month_dir = base / date_str[:4] / date_str[5:7]
+    month_dir.mkdir(parents=True, exist_ok=True)
+    rankings = [{'name': n, 'rank': i, 'stars': '1,000', 'stars_today': '10', 'language': None,
+                 'description': ''} for i, n in enumerate(names, 1)]
+    content = json.dumps({'date': date_str, 'rankings': rankings}, indent=2)
+    (month_dir / f'{date_str}.json').write_text(content, encoding='utf-8')
+    (month_dir / f'{date_str}.html').write_text(f'<html>{date_str} zh</html>', encoding='utf-8')
+    (month_dir / f'{date_str}_en.html').write_text(f'<html>{date_str} en</html>', encoding='utf-8')
+    (month_dir / f'{date_str}.md').write_text(f'# {date_str}', encoding='utf-8')
+    return content
+
+
+def test_compact_finished_months(tmp_path):
+    originals = {d: write_day(tmp_path, d, ['a/x', 'b/y']) for d in ('2026-01-30', '2026-01-31')}
+    write_day(tmp_path, '2026-02-01', ['c/z'])
+    before = list(iter_ranking_history(str(tmp_path)))
+
+    results = compact_archives(str(tmp_path), html_pages=True, today=datetime(2026, 2, 1))
+    assert [(r.month, r.json_removed, r.pages) for r in results] == [('2026-01', 2, 4)]
+
+    jan = tmp_path / '2026' / '01'
+    assert sorted(p.name for p in jan.glob('*.json')) == ['2026-01.bundle.json']
+    assert (tmp_path / '2026' / '02' / '2026-02-01.json').exists()
+    assert (jan / '2026-01-30.md').exists()
+
+    # 原始字节完整保留，读取接口透明回退
+    with MonthRollup(get_rollup_path(str(tmp_path), 2026, 1)) as rollup:
+        assert rollup.dates() == ['2026-01-30', '2026-01-31']
+        assert rollup.read_bytes('2026-01-30').decode('utf-8') == originals['2026-01-30']
+    assert list(iter_ranking_history(str(tmp_path))) == before
+    assert [e.name for e in load_ranking_history(str(tmp_path), datetime(2026, 1, 31))] == ['a/x', 'b/y']
+
+    # 页面替换为跳转页，可从页面包还原
+    assert STUB_MARKER in (jan / '2026-01-30.html').read_text(encoding='utf-8')
+    manifest = read_manifest(jan, 2026, 1)
+    bundle = (jan / '2026-01.html.bundle').read_bytes()
+    offset, length, size = manifest['2026-01-31_en.html']
+    assert gzip.decompress(bundle[offset:offset + length]) == b'<html>2026-01-31 en</html>'
+    index = (jan / 'index.html').read_text(encoding='utf-8')
+    assert '2026-01.html.bundle' in index and '#2026-01-31_en.html' in index
+
+
+def test_compact_is_incremental(tmp_path):
+    """重复运行不改动已压缩的内容；后补的每日文件并入已有归档"""
+    write_day(tmp_path, '2026-01-30', ['a/x'])
+    compact_archives(str(tmp_path), html_pages=True, today=datetime(2026, 3, 1))
+    rollup_bytes = get_rollup_path(str(tmp_path), 2026, 1).read_bytes()
+
+    results = compact_archives(str(tmp_path), html_pages=True, today=datetime(2026, 3, 1))
+    assert results[0].json_removed == 0 and results[0].pages == 0
+    assert get_rollup_path(str(tmp_path), 2026, 1).read_bytes() == rollup_bytes
+
+    write_day(tmp_path, '2026-01-31', ['b/y'])
+    compact_archives(str(tmp_path), html_pages=True, today=datetime(2026, 3, 1))
+    assert [d for d, _ in iter_ranking_history(str(tmp_path))] == ['2026-01-30', '2026-01-31']
+    assert sorted(read_manifest(tmp_path / '2026' / '01', 2026, 1)) == [
+        '2026-01-30.html', '2026-01-30_en.html', '2026-01-31.html', '2026-01-31_en.html',
+    ]
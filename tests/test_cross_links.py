@@ -0,0 +1,84 @@
+"""HN ↔ GitHub 交叉关联测试"""
+
+from datetime import datetime
+
+import pytest
+
+from src.cross_links import (
+    TrendingRef, build_trending_index, discussions_by_repo, load_hn_discussions, match_stories,
+    normalize_repo_url,
+)
+from src.analyzer import RepoAnalysis
+from src.dashboard import generate_dashboard_html
+from src.history import RankingEntry, save_ranking_history
+from src.hn_dashboard import generate_hn_dashboard_html
+from src.hn_history import record_snapshot
+from src.hn_scraper import HNStory
+from src.scraper import TrendingRepo
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://github.com/Owner/Repo', 'owner/repo'),
+    ('http://www.github.com/owner/repo.git', 'owner/repo'),
+    ('https://github.com/owner/repo/tree/main/docs?tab=readme#usage', 'owner/repo'),
+    ('https://github.com/owner/repo/', 'owner/repo'),
+    ('https://github.com/owner', None),
+    ('https://github.com/topics/rust', None),
+    ('https://gist.github.com/owner/abc', None),
+    ('https://example.com/owner/repo', None),
+    ('', None),
+])
+def test_normalize_repo_url(url, expected):
+    assert normalize_repo_url(url) == expected
+
+
+def story(story_id, url, score=100, comments=10):
+    return HNStory(id=story_id, title=f'Show HN: {story_id}', url=url, score=score, author='pg',
+                   time=0, comments=comments, hn_url=f'https://news.ycombinator.com/item?id={story_id}')
+
+
+def entry(name, rank):
+    return RankingEntry(name=name, rank=rank, stars='1,000', stars_today='10', language='Rust', description='')
+
+
+def test_trending_index_and_matching(tmp_path):
+    base_dir = str(tmp_path)
+    save_ranking_history([entry('Acme/Engine', 5), entry('x/y', 1)], base_dir, datetime(2026, 2, 1))
+    save_ranking_history([entry('Acme/Engine', 2)], base_dir, datetime(2026, 2, 3))
+    save_ranking_history([entry('old/repo', 1)], base_dir, datetime(2025, 6, 1))
+
+    index = build_trending_index(base_dir, datetime(2026, 2, 4))
+    assert set(index) == {'acme/engine', 'x/y'}
+    ref = index['acme/engine']
+    assert (ref.name, ref.best_rank, ref.days, ref.last_seen) == ('Acme/Engine', 2, 2, '2026-02-03')
+    assert 'old/repo' in build_trending_index(base_dir, datetime(2026, 2, 4), lookback_days=None)
+
+    stories = [story(1, 'https://github.com/acme/engine#readme'), story(2, 'https://example.com'),
+               story(3, 'https://github.com/X/Y/issues/1')]
+    assert [(s.id, r.name) for s, r in match_stories(stories, index)] == [(1, 'Acme/Engine'), (3, 'x/y')]
+
+
+def test_discussions_and_dashboards(tmp_path):
+    stories = [story(1, 'https://github.com/acme/engine', score=50), story(2, 'https://github.com/Acme/Engine/',
+               score=300, comments=120), story(3, 'https://github.com/other/thing')]
+    links = discussions_by_repo(stories, ['Acme/Engine', 'nobody/else'])
+    assert list(links) == ['Acme/Engine']
+    assert [d.story_id for d in links['Acme/Engine']] == [2, 1]
+
+    # 从 HN 历史存档读取
+    record_snapshot(str(tmp_path), stories, datetime(2026, 2, 4, 9).timestamp())
+    from_history = load_hn_discussions(str(tmp_path), ['Acme/Engine'], datetime(2026, 2, 4, 20))
+    assert [d.score for d in from_history['Acme/Engine']] == [300, 50]
+
+    repo = TrendingRepo(name='Acme/Engine', url='https://github.com/Acme/Engine', description='engine',
+                        language='Rust', stars='1,000', stars_today='10', forks='1', contributors=[])
+    analysis = RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                            tech_stack=[], score=7, score_details={})
+    page = generate_dashboard_html([analysis], [], datetime(2026, 2, 4), hn_links=links)
+    assert 'https://news.ycombinator.com/item?id=2' in page and '"hnDiscussions"' in page
+
+    assert build_trending_index(str(tmp_path)) == {}  # 没有 Trending 存档
+    ref = TrendingRef(name='Acme/Engine', last_seen='2026-02-04', best_rank=3, days=1)
+    trending = {s.id: r for s, r in match_stories(stories, {'acme/engine': ref})}
+    hn_page = generate_hn_dashboard_html(stories, date='2026-02-04', trending=trending)
+    assert hn_page.count('Trending 最高第 3 名') == 2
@@ -0,0 +1,112 @@
+"""深度分析页面增量生成测试"""
+
+import json
+from datetime import datetime
+
+from src.ai_summary import AISummary
+from src.analyzer import RepoAnalysis
+from src.deep_dive import (
+    DEEP_DIVE_FORMAT, DeepDiveManifest, deep_dive_data, deep_dive_path, generate_deep_dive_pages,
+)
+from src.history import RankChange
+from src.render_context import build_render_context
+from src.scraper import TrendingRepo
+
+DATE = datetime(2026, 2, 4, 9, 0)
+
+
+def analysis(name, score, stars='1,234', stars_today='10'):
+    repo = TrendingRepo(name=name, url=f'https://github.com/{name}', description='tool', language='Rust',
+                        stars=stars, stars_today=stars_today, forks='1', contributors=[])
+    return RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                        tech_stack=[], score=score, score_details={})
+
+
+def render(base_dir, analyses, day=DATE, **kwargs):
+    context = build_render_context(analyses, [], day, **kwargs)
+    files = generate_deep_dive_pages(None, None, base_dir=str(base_dir), context=context)
+    return sorted(p.split('deep-dive/')[-1] for p in files)
+
+
+def test_pages_keyed_by_owner(tmp_path):
+    assert deep_dive_path('site', 'Acme/Tool') != deep_dive_path('site', 'other/tool')
+    assert render(tmp_path, [analysis('acme/tool', 9), analysis('other/tool', 5)]) == \
+        ['acme/tool.html', 'other/tool.html']
+
+    index = (tmp_path / 'deep-dive/index.html').read_text(encoding='utf-8')
+    assert 'href="acme/tool.html"' in index and 'href="other/tool.html"' in index
+    page = (tmp_path / 'deep-dive/acme/tool.html').read_text(encoding='utf-8')
+    assert 'href="../../index.html"' in page and 'href="../../deep-dive/index.html"' in page
+
+
+def test_only_changed_pages_regenerate(tmp_path):
+    repos = [analysis('acme/tool', 9), analysis('acme/lib', 5)]
+    assert len(render(tmp_path, repos)) == 2
+    next_day = datetime(2026, 2, 5, 9, 0)
+    history = {name: {'first': '2026-02-04', 'best_rank': rank, 'peak_stars_today': 10}
+               for rank, name in enumerate(('acme/tool', 'acme/lib'), 1)}
+
+    # Star 小幅增长在展示精度内，不重新生成
+    assert render(tmp_path, [analysis('acme/tool', 9, '1,240'), analysis('acme/lib', 5)], next_day,
+                  history=history) == []
+
+    summaries = {'acme/lib': AISummary('acme/lib', 'A library', ['fast'], 'CLI')}
+    assert render(tmp_path, repos, next_day, ai_summaries=summaries, history=history) == ['acme/lib.html']
+
+    # 历史最高排名变化
+    history['acme/lib']['best_rank'] = 1
+    assert render(tmp_path, repos, next_day, ai_summaries=summaries, history=history) == ['acme/lib.html']
+    assert render(tmp_path, repos, next_day, ai_summaries=summaries, history=history) == []
+
+    manifest = json.loads((tmp_path / 'deep-dive/manifest.json').read_text(encoding='utf-8'))
+    assert manifest['format'] == DEEP_DIVE_FORMAT
+    assert manifest['pages']['acme/tool']['updated'] == '2026-02-04'
+    assert manifest['pages']['acme/lib']['updated'] == '2026-02-05'
+
+    # 页面被删除或模板版本变化时重新生成
+    (tmp_path / 'deep-dive/acme/lib.html').unlink()
+    assert render(tmp_path, repos, next_day, ai_summaries=summaries, history=history) == ['acme/lib.html']
+    manifest['format'] = DEEP_DIVE_FORMAT - 1
+    (tmp_path / 'deep-dive/manifest.json').write_text(json.dumps(manifest), encoding='utf-8')
+    assert DeepDiveManifest.load(str(tmp_path)).pages == {}
+
+
+def test_backfill_keeps_newer_pages(tmp_path):
+    summaries = {'acme/tool': AISummary('acme/tool', 'Newer summary', ['fast'], 'CLI')}
+    assert render(tmp_path, [analysis('acme/tool', 9)], datetime(2026, 2, 6, 9), ai_summaries=summaries) == \
+        ['acme/tool.html']
+    page = (tmp_path / 'deep-dive/acme/tool.html').read_text(encoding='utf-8')
+
+    # 回填更早的日期: 已有页面不被旧数据覆盖，新上榜的仓库照常生成
+    assert render(tmp_path, [analysis('acme/tool', 9), analysis('acme/lib', 5)], DATE) == ['acme/lib.html']
+    assert (tmp_path / 'deep-dive/acme/tool.html').read_text(encoding='utf-8') == page
+    manifest = DeepDiveManifest.load(str(tmp_path))
+    assert manifest.pages['acme/tool']['updated'] == '2026-02-06'
+    assert manifest.pages['acme/lib']['updated'] == '2026-02-04'
+
+
+def test_ai_summary_kept_after_leaving_top_10(tmp_path):
+    repos = [analysis('acme/tool', 9), analysis('acme/lib', 5)]
+    summaries = {'acme/lib': AISummary('acme/lib', 'A library', ['fast startup'], 'CLI tools')}
+    assert render(tmp_path, repos, ai_summaries=summaries) == ['acme/lib.html', 'acme/tool.html']
+
+    # 次日跌出前 10，当天没有 AI 总结: 沿用清单中的总结
+    history = {'acme/lib': {'first': '2026-02-04', 'best_rank': 2, 'peak_stars_today': 10}}
+    render(tmp_path, [analysis('acme/tool', 9), analysis('acme/lib', 5, stars_today='40')],
+           datetime(2026, 2, 5, 9), history=history)
+    page = (tmp_path / 'deep-dive/acme/lib.html').read_text(encoding='utf-8')
+    assert 'A library' in page and 'fast startup' in page and 'CLI tools' in page
+    assert DeepDiveManifest.load(str(tmp_path)).last_summary('acme/lib').summary == 'A library'
+
+
+def test_history_in_view():
+    history = {'acme/tool': {'first': '2026-01-01', 'best_rank': 3, 'peak_stars_today': 900}}
+    context = build_render_context([analysis('acme/tool', 9, stars_today='50'), analysis('acme/new', 5)], [],
+                                   DATE, history=history)
+    tool, new = (deep_dive_data(view) for view in context.repos)
+    assert (tool.first_seen, tool.best_rank, tool.peak_stars_today) == ('2026-01-01', 1, '900')
+    assert (new.first_seen, new.best_rank, new.peak_stars_today) == ('2026-02-04', 2, '10')
+    assert tool.stars == '1.2k' and not tool.is_new
+
+    context = build_render_context([analysis('acme/new', 5)], [RankChange('acme/new', 1, None, None, True)], DATE)
+    assert deep_dive_data(context.repos[0]).is_new
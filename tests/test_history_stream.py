@@ -0,0 +1,61 @@
+"""排名历史流式读取测试"""
+
+import json
+from datetime import date
+
+import pytest
+
+from src.history import iter_ranking_history
+
+
+def write_day(base, date_str, names):
+    path = base / date_str[:4] / date_str[5:7] / f'{date_str}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rankings = [
+        {'name': name, 'rank': i, 'stars': '1,000', 'stars_today': '10',
+         'language': 'Python', 'description': f'{name} desc'}
+        for i, name in enumerate(names, 1)
+    ]
+    path.write_text(json.dumps({'date': date_str, 'rankings': rankings}), encoding='utf-8')
+
+
+@pytest.fixture
+def archive(tmp_path):
+    write_day(tmp_path, '2025-12-31', ['a/x'])
+    for day in range(1, 21):
+        write_day(tmp_path, f'2026-01-{day:02d}', [f'r/{day}', 'a/x'])
+    (tmp_path / '2026' / '01' / '2026-01-05.json').write_text('{broken', encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 4])
+def test_days_in_order(archive, prefetch):
+    days = list(iter_ranking_history(str(archive), prefetch=prefetch))
+    dates = [d for d, _ in days]
+    assert dates == sorted(dates)
+    assert len(dates) == 20  # 损坏的 01-05 被跳过
+    assert days[0] == ('2025-12-31', [{'name': 'a/x', 'rank': 1, 'stars': '1,000', 'stars_today': '10',
+                                       'language': 'Python', 'description': 'a/x desc'}])
+
+
+def test_range_and_projection(archive):
+    days = list(iter_ranking_history(str(archive), start=date(2026, 1, 2), end='2026-01-04',
+                                     fields=('name', 'rank')))
+    assert [d for d, _ in days] == ['2026-01-02', '2026-01-03', '2026-01-04']
+    assert days[0][1] == [{'name': 'r/2', 'rank': 1}, {'name': 'a/x', 'rank': 2}]
+
+
+def test_flat_rows(archive):
+    rows = list(iter_ranking_history(str(archive), end='2026-01-01', fields=('name', 'stars'), flat=True))
+    assert rows == [('2025-12-31', 'a/x', '1,000'), ('2026-01-01', 'r/1', '1,000'), ('2026-01-01', 'a/x', '1,000')]
+
+    full = next(iter_ranking_history(str(archive), flat=True))
+    assert full == ('2025-12-31', 'a/x', 1, '1,000', '10', 'Python', 'a/x desc')
+
+
+def test_early_close(archive):
+    """提前结束迭代不会阻塞"""
+    stream = iter_ranking_history(str(archive), prefetch=3)
+    assert next(stream)[0] == '2025-12-31'
+    stream.close()
+    assert list(iter_ranking_history(str(archive / 'missing'))) == []
@@ -0,0 +1,83 @@
+"""HN 历史快照与 Best of 页面测试"""
+
+import json
+from datetime import datetime
+
+from src.compaction import compact_archives
+from src.hn_history import (
+    DEFAULT_INTERVAL_SECONDS, MAX_GAP_SECONDS, best_of, get_hn_archive_dir, load_tracks, record_snapshot,
+    update_best_of_pages,
+)
+from src.hn_scraper import HNStory
+
+# 2026-02-04 (周三) 本地时间 08:00
+T0 = int(datetime(2026, 2, 4, 8, 0).timestamp())
+
+
+def story(story_id, score, comments=0, title=None):
+    return HNStory(id=story_id, title=title or f'Story {story_id}', url=f'https://example.com/{story_id}',
+                   score=score, author='pg', time=T0 - 600, comments=comments,
+                   hn_url=f'https://news.ycombinator.com/item?id={story_id}')
+
+
+def record_day(base_dir):
+    record_snapshot(base_dir, [story(1, 100), story(2, 50)], T0)
+    record_snapshot(base_dir, [story(2, 150, 10), story(1, 120, 4)], T0 + 1800)
+    # 刷新停摆 3 小时后 1 已掉出首页
+    return record_snapshot(base_dir, [story(2, 350, 30, title='Story 2 (updated)'), story(3, 20)],
+                           T0 + 1800 + 3 * 3600)
+
+
+def test_snapshots_and_tracks(tmp_path):
+    path = record_day(str(tmp_path))
+    data = json.loads(open(path, encoding='utf-8').read())
+    assert path.endswith('hn/2026/02/2026-02-04.json')
+    assert data['snapshots'] == 3 and data['count'] == 6
+    # 元信息只在首次出现 / 变化时保存
+    assert [row['id'] for row in data['rankings'] if 'title' in row] == [1, 2, 2, 3]
+
+    tracks = load_tracks(str(tmp_path), '2026-02-04', '2026-02-04')
+    first, second = tracks[1], tracks[2]
+    assert second.title == 'Story 2 (updated)' and second.best_rank == 1 and second.peak_score == 350
+    assert first.score_velocity == 40.0  # 30 分钟 +20
+    assert second.score_velocity == round(300 / 3.5, 1)
+    assert tracks[3].score_velocity == 0.0
+    # 1: 30 分钟 + 上限 1 小时；2: 同上再加最后一次的默认间隔
+    assert first.front_page_seconds == 1800 + MAX_GAP_SECONDS
+    assert second.front_page_seconds == 1800 + MAX_GAP_SECONDS + DEFAULT_INTERVAL_SECONDS
+    assert [t.id for t in best_of(tracks, limit=2)] == [2, 1]
+
+
+def test_tracks_survive_compaction(tmp_path):
+    record_day(str(tmp_path))
+    before = load_tracks(str(tmp_path))
+    results = compact_archives(str(get_hn_archive_dir(str(tmp_path))), today=datetime(2026, 3, 1))
+    assert results[0].json_removed == 1
+    assert load_tracks(str(tmp_path)) == before
+
+
+def test_best_of_pages_incremental(tmp_path):
+    base_dir = str(tmp_path)
+    record_day(base_dir)
+    hn_dir = get_hn_archive_dir(base_dir)
+
+    written = update_best_of_pages(base_dir)
+    assert sorted(written) == sorted(str(p) for p in (hn_dir / '2026/02/2026-02-04.html',
+                                                      hn_dir / 'weekly/2026-W06.html', hn_dir / 'index.html'))
+    page = (hn_dir / '2026/02/2026-02-04.html').read_text(encoding='utf-8')
+    assert 'HN 每日精选 2026-02-04' in page and 'href="../../../hn.html"' in page
+    assert page.index('Story 2 (updated)') < page.index('Story 1')
+    assert '最高第 1 名' in page
+    assert 'weekly/2026-W06.html' in (hn_dir / 'index.html').read_text(encoding='utf-8')
+
+    # 没有新快照时不重新生成
+    assert update_best_of_pages(base_dir) == []
+
+    # 次日的快照只生成次日页面与所在周
+    record_snapshot(base_dir, [story(4, 80)], T0 + 86400)
+    written = update_best_of_pages(base_dir)
+    assert any(p.endswith('2026-02-05.html') for p in written)
+    assert not any(p.endswith('2026-02-04.html') for p in written)
+
+    # 全量重建
+    assert len(update_best_of_pages(base_dir, full=True)) >= 3
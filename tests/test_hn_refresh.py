@@ -0,0 +1,97 @@
+"""HN 独立刷新测试 (替换网络请求函数)"""
+
+import os
+import time
+
+import pytest
+
+from src import hn_refresh
+from src.hn_refresh import RefreshLocked, refresh_hn, refresh_lock
+from src.hn_scraper import HNStory
+
+
+class FakeHN:
+    """模拟 HN API：记录请求过的条目与翻译过的标题"""
+
+    def __init__(self, ids):
+        self.ids = list(ids)
+        self.scores = {i: 10 * i for i in self.ids}
+        self.updated = set()
+        self.detail_calls = []
+        self.translated = []
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(hn_refresh, 'fetch_story_ids', lambda story_type='top': list(self.ids))
+        monkeypatch.setattr(hn_refresh, 'fetch_updated_ids', lambda: set(self.updated))
+        monkeypatch.setattr(hn_refresh, 'fetch_story_detail', self.detail)
+        monkeypatch.setattr(hn_refresh, 'batch_translate_titles', self.translate)
+
+    def detail(self, story_id):
+        self.detail_calls.append(story_id)
+        return HNStory(id=story_id, title=f'Story {story_id}', url=f'https://example.com/{story_id}',
+                       score=self.scores[story_id], author='pg', time=1700000000, comments=1,
+                       hn_url=f'https://news.ycombinator.com/item?id={story_id}')
+
+    def translate(self, stories):
+        for story in stories:
+            self.translated.append(story.title)
+            story.title_zh = f'故事 {story.id}'
+        return stories
+
+
+def test_incremental_refresh(tmp_path, monkeypatch):
+    fake = FakeHN([1, 2, 3])
+    fake.install(monkeypatch)
+    site, cache = tmp_path / 'site', tmp_path / 'cache'
+
+    first = refresh_hn(str(site), cache_dir=cache)
+    assert [s.id for s in first.stories] == [1, 2, 3]
+    assert first.fetched == 3 and first.translated == 3 and first.written
+    assert '故事 2' in (site / 'hn.html').read_text(encoding='utf-8')
+    # 榜单同时记入历史存档
+    assert first.archive_path.startswith(str(site / 'hn')) and first.best_of_pages
+
+    # 无变化：不请求条目、不翻译、不改写页面
+    fake.detail_calls.clear()
+    second = refresh_hn(str(site), cache_dir=cache)
+    assert second.fetched == 0 and second.reused == 3 and not second.written
+    assert fake.detail_calls == [] and fake.translated == ['Story 1', 'Story 2', 'Story 3']
+
+    # 新上榜 4、2 的分数有更新：只请求这两条，只翻译新标题
+    fake.ids = [4, 2, 1]
+    fake.scores[4] = 5
+    fake.scores[2] = 999
+    fake.updated = {2}
+    third = refresh_hn(str(site), cache_dir=cache)
+    assert sorted(fake.detail_calls) == [2, 4]
+    assert third.translated == 1 and fake.translated[-1] == 'Story 4'
+    assert [(s.id, s.score, s.title_zh) for s in third.stories][:2] == [(4, 5, '故事 4'), (2, 999, '故事 2')]
+    assert third.written and not list(site.glob('*.tmp'))
+
+    # 超过有效期的条目重新获取
+    fake.detail_calls.clear()
+    refresh_hn(str(site), cache_dir=cache, ttl=0)
+    assert sorted(fake.detail_calls) == [1, 2, 4]
+
+
+def test_empty_list_keeps_page(tmp_path, monkeypatch):
+    fake = FakeHN([])
+    fake.install(monkeypatch)
+    result = refresh_hn(str(tmp_path), cache_dir=tmp_path / 'cache')
+    assert result.stories == [] and not (tmp_path / 'hn.html').exists()
+
+
+def test_lock_blocks_overlapping_runs(tmp_path):
+    lock = tmp_path / 'refresh.lock'
+    with refresh_lock(lock):
+        with pytest.raises(RefreshLocked):
+            with refresh_lock(lock):
+                pass
+    assert not lock.exists()
+
+    # 遗留的过期锁被接管
+    lock.write_text('12345\n')
+    old = time.time() - 3600
+    os.utime(lock, (old, old))
+    with refresh_lock(lock, stale_seconds=60):
+        assert lock.read_text().strip() == str(os.getpid())
@@ -0,0 +1,101 @@
+"""HTTP 录制 / 回放测试"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.http_fixtures import ReplayMiss, record_http, replay_http
+
+SECRET_KEY = 'sk-very-secret'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/binary':
+            self._send(200, b'\x89PNG\x00\xff', 'image/png')
+        else:
+            self._send(200, json.dumps({'path': self.path}).encode(), 'application/json')
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self._send(200, json.dumps({'echo': body['q'], 'key': self.headers.get('api-key')}).encode(),
+                   'application/json')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Set-Cookie', 'session=abc')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def call_api(q):
+    """模拟从环境变量读取端点与密钥的业务代码"""
+    url = f"{os.environ['AZURE_OPENAI_ENDPOINT'].rstrip('/')}/chat"
+    return requests.post(url, json={'q': q}, headers={'api-key': os.environ['AZURE_OPENAI_KEY']}, timeout=5)
+
+
+def test_record_then_replay_offline(origin, tmp_path, monkeypatch):
+    # 以另一个主机名访问同一服务器，模拟独立的 API 端点
+    monkeypatch.setenv('AZURE_OPENAI_ENDPOINT', origin.replace('127.0.0.1', 'localhost') + '/')
+    monkeypatch.setenv('AZURE_OPENAI_KEY', SECRET_KEY)
+    path = tmp_path / 'run.json'
+
+    with record_http(path):
+        live_json = requests.get(f'{origin}/hn/top.json', timeout=5).json()
+        live_binary = requests.get(f'{origin}/binary', timeout=5).content
+        live_post = call_api('hello').json()
+
+    saved = path.read_text(encoding='utf-8')
+    assert SECRET_KEY not in saved and 'session=abc' not in saved
+    assert 'https://azure-openai.invalid/chat' in saved
+
+    with replay_http(path) as adapter:
+        # 源站已关闭，仍可得到相同的响应
+        assert requests.get(f'{origin}/hn/top.json', timeout=5).json() == live_json
+        assert requests.get(f'{origin}/binary', timeout=5).content == live_binary
+        replayed = call_api('hello').json()
+        assert replayed['echo'] == live_post['echo'] == 'hello'
+        # 响应体中的密钥同样被替换
+        assert replayed['key'] == 'replay-azure-key'
+
+        with pytest.raises(requests.exceptions.RequestException):
+            requests.get(f'{origin}/missing', timeout=5)
+    assert adapter.served == 3 and adapter.misses == [f'GET {origin}/missing']
+
+    # 回放结束后恢复原环境变量
+    assert os.environ['AZURE_OPENAI_KEY'] == SECRET_KEY
+
+
+def test_injected_latency(origin, tmp_path):
+    path = tmp_path / 'run.json'
+    with record_http(path):
+        requests.get(f'{origin}/a', timeout=5)
+
+    with replay_http(path, latency_ms=50):
+        started = time.perf_counter()
+        requests.get(f'{origin}/a', timeout=5)
+        assert time.perf_counter() - started >= 0.05
+
+
+def test_replay_miss_is_connection_error():
+    assert issubclass(ReplayMiss, requests.exceptions.ConnectionError)
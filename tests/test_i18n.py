@@ -0,0 +1,73 @@
+"""界面文案目录测试"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src import dashboard
+from src.analyzer import RepoAnalysis
+from src.history import RankChange
+from src.i18n import (
+    DEFAULT_LOCALES, LOCALES_DIR, LOCALES_ENV, available_locales, catalog, configured_locales, html_lang, texts,
+)
+from src.render_context import build_render_context
+from src.scraper import TrendingRepo
+
+DATE = datetime(2026, 2, 4, 9, 0)
+
+
+def analysis(name, score, stars_today='10', language='Rust', description='engine'):
+    repo = TrendingRepo(name=name, url=f'https://github.com/{name}', description=description, language=language,
+                        stars='1,234', stars_today=stars_today, forks='1', contributors=[])
+    return RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                        tech_stack=[], score=score, score_details={})
+
+
+def test_catalogs_complete():
+    assert available_locales()[:1] == ('zh',) and {'en', 'ja', 'ko'} <= set(available_locales())
+    reference = catalog('en')
+    for lang in available_locales():
+        data = json.loads((LOCALES_DIR / f'{lang}.json').read_text(encoding='utf-8'))
+        # 内置目录不依赖回退，键与英文目录一致
+        assert {s: set(keys) for s, keys in data.items()} == {s: set(keys) for s, keys in reference.items()}, lang
+    assert html_lang('zh') == 'zh-CN' and html_lang('ja') == 'ja'
+    assert texts('deep_dive', 'ko')['title'].format(name='x') == 'x - 심층 분석'
+
+
+def test_fallback(tmp_path):
+    (tmp_path / 'zh.json').write_text(json.dumps({'sidebar': {'all': '全部'}}), encoding='utf-8')
+    (tmp_path / 'en.json').write_text(json.dumps({'sidebar': {'all': 'All', 'rising': 'Rising'}}), encoding='utf-8')
+    (tmp_path / 'fr.json').write_text(json.dumps({'sidebar': {'all': 'Tout'}}), encoding='utf-8')
+    path = str(tmp_path)
+    assert dict(catalog('fr', path)['sidebar']) == {'all': 'Tout', 'rising': 'Rising'}
+    assert catalog('xx', path)['sidebar']['all'] == '全部'
+    with pytest.raises(TypeError):
+        catalog('fr', path)['sidebar']['all'] = 'x'
+
+
+def test_configured_locales(monkeypatch):
+    monkeypatch.delenv(LOCALES_ENV, raising=False)
+    assert configured_locales() == DEFAULT_LOCALES
+    monkeypatch.setenv(LOCALES_ENV, 'zh, ja,zh')
+    assert configured_locales() == ('zh', 'ja')
+    assert configured_locales('ko') == ('ko',)
+    with pytest.raises(ValueError):
+        configured_locales('zh,xx')
+
+
+def test_all_locales_from_one_context(monkeypatch):
+    analyses = [analysis('acme/engine', 6), analysis('acme/agents', 9, '1,500', 'Python', 'LLM agents')]
+    changes = [RankChange('acme/agents', 1, None, None, True)]
+    calls = []
+    layout = dashboard.treemap_domain_data
+    monkeypatch.setattr(dashboard, 'treemap_domain_data', lambda context: calls.append(1) or layout(context))
+
+    context = build_render_context(analyses, changes, DATE)
+    pages = dashboard.generate_dashboards(context, available_locales())
+    assert list(pages) == list(available_locales()) and len(calls) == 1
+    for lang in ('zh', 'en'):
+        assert pages[lang] == dashboard.generate_dashboard_html(analyses, changes, DATE, lang=lang)
+    assert '<html lang="ja"' in pages['ja'] and texts('dashboard', 'ja')['all_projects'] in pages['ja']
+    assert texts('domains', 'ko')['AI & ML'] in pages['ko']
+    assert dashboard.dashboard_path('site', DATE, 'ko').name == '2026-02-04_ko.html'
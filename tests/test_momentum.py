@@ -0,0 +1,98 @@
+"""多日动量指标测试"""
+
+import json
+from datetime import datetime
+
+from src.analyzer import analyze_repos
+from src.momentum import Momentum, build_momentum_index, rolling_momenta
+from src.rescore import load_history_columns
+from src.scoring import get_model
+from src.scraper import TrendingRepo
+
+
+def write_day(base, date, rankings):
+    path = base / date[:4] / date[5:7] / f'{date}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'date': date, 'rankings': rankings}), encoding='utf-8')
+
+
+def entry(name, rank, stars_today):
+    return {'name': name, 'rank': rank, 'stars': '1,000', 'stars_today': stars_today}
+
+
+def make_archive(base):
+    # 01-02 缺失；01-01 超出 7 天窗口
+    write_day(base, '2026-01-01', [entry('a/steady', 9, '999')])
+    write_day(base, '2026-01-03', [entry('a/steady', 5, '100')])
+    write_day(base, '2026-01-05', [entry('a/steady', 3, '200'), entry('b/spike', 1, '2,000')])
+    write_day(base, '2026-01-07', [entry('a/steady', 1, '300')])
+
+
+def test_index_lookup(tmp_path):
+    make_archive(tmp_path)
+    index = build_momentum_index(str(tmp_path), datetime(2026, 1, 9), window=7)
+    assert index.days_loaded == 3
+    assert 'a/steady' in index and len(index) == 2
+
+    steady = index.lookup('a/steady', 400)
+    assert steady.days_on_list == 4
+    assert steady.star_velocity == 250.0
+    assert steady.star_acceleration == 50.0  # 每两天 +100
+    assert steady.rank_trend == 1.0  # 每两天上升 2 名
+
+    # 未上榜过的仓库: 单日数据
+    assert index.lookup('c/new', 42) == Momentum(star_velocity=42.0, days_on_list=1)
+
+
+def test_rolling_matches_index(tmp_path):
+    """历史滚动计算与索引查询一致"""
+    make_archive(tmp_path)
+    dates = ['2026-01-01', '2026-01-03', '2026-01-05', '2026-01-07', '2026-01-09']
+    offsets = [0, 1, 2, 4, 5, 6]
+    names = ['a/steady', 'a/steady', 'a/steady', 'b/spike', 'a/steady', 'a/steady']
+    ranks = [9, 5, 3, 1, 1, 2]
+    stars = [999, 100, 200, 2000, 300, 400]
+    momenta = rolling_momenta(dates, offsets, names, ranks, stars, window=7)
+
+    assert momenta[0].days_on_list == 1
+    for k, day in [(4, 7), (5, 9)]:
+        index = build_momentum_index(str(tmp_path), datetime(2026, 1, day), window=7)
+        assert momenta[k] == index.lookup('a/steady', stars[k])
+
+
+def test_rescored_matches_live(tmp_path):
+    """重评分的动量列与当天发布时 (评分前排名未知) 的动量相同"""
+    make_archive(tmp_path)
+    history = load_history_columns(str(tmp_path))
+    day = history.dates.index('2026-01-07')
+    index = build_momentum_index(str(tmp_path), datetime(2026, 1, 7))
+    columns = history.columns
+    for k in range(history.offsets[day], history.offsets[day + 1]):
+        live = index.lookup(history.names[k], columns.stars_today[k])
+        assert live.rank_trend != 0.0
+        assert (columns.star_velocity[k], columns.star_acceleration[k], columns.days_on_list[k],
+                columns.rank_trend[k]) == (live.star_velocity, live.star_acceleration,
+                                           live.days_on_list, live.rank_trend)
+
+
+def test_analyze_repos_with_momentum(tmp_path):
+    make_archive(tmp_path)
+    index = build_momentum_index(str(tmp_path), datetime(2026, 1, 9), window=7)
+    repos = [
+        TrendingRepo(name='b/spike', url='', description='', language=None,
+                     stars='1,000', stars_today='400', forks='0', contributors=[]),
+        TrendingRepo(name='a/steady', url='', description='', language=None,
+                     stars='1,000', stars_today='400', forks='0', contributors=[]),
+    ]
+
+    classic = analyze_repos(repos, model=get_model('classic'), momentum_index=index)
+    assert {a.repo.name: a.days_on_list for a in classic} == {'a/steady': 4, 'b/spike': 2}
+    assert classic[0].score == classic[1].score  # 经典模型只看单日
+
+    momentum = analyze_repos(repos, model=get_model('momentum'), momentum_index=index)
+    by_name = {a.repo.name: a for a in momentum}
+    assert by_name['a/steady'].score_details['momentum'] > by_name['b/spike'].score_details['momentum']
+
+    # 不提供索引时字段为默认值
+    plain = analyze_repos(repos, model=get_model('classic'))
+    assert plain[0].star_velocity == 0.0 and plain[0].days_on_list == 1
@@ -0,0 +1,52 @@
+"""分阶段剖析测试"""
+
+import json
+
+from src.profiling import NULL_PROFILER, StageProfiler
+
+
+def build_strings(n):
+    return ['x' * 100 + str(i) for i in range(n)]
+
+
+def test_stage_reports(tmp_path, capsys):
+    profiler = StageProfiler(str(tmp_path), profile=True, trace_memory=True, top_n=3)
+    profiler.begin('parse')
+    kept = build_strings(20000)
+    profiler.begin('render')
+    sum(range(1000))
+    summary_path = profiler.finish()
+
+    summary = json.loads((tmp_path / 'summary.json').read_text(encoding='utf-8'))
+    assert summary_path == str(tmp_path / 'summary.json')
+    assert [s['name'] for s in summary['stages']] == ['parse', 'render']
+
+    parse = summary['stages'][0]
+    assert (tmp_path / '01-parse.pstats').exists() and (tmp_path / '02-render.memory.txt').exists()
+    assert any('build_strings' in row['function'] for row in parse['hot_functions'])
+    assert len(parse['hot_functions']) <= 3
+    # 保留下来的字符串约 2.4MB
+    assert parse['allocated_kb'] > 1000 and parse['peak_kb'] >= parse['allocated_kb']
+    assert 'test_profiling.py' in (tmp_path / '01-parse.memory.txt').read_text(encoding='utf-8')
+
+    # 重复 finish 不再输出
+    capsys.readouterr()
+    assert profiler.finish() == summary_path
+    assert capsys.readouterr().out == ''
+    del kept
+
+
+def test_profile_without_memory(tmp_path):
+    profiler = StageProfiler(str(tmp_path), profile=True, trace_memory=False)
+    profiler.begin('only')
+    profiler.finish()
+    stage = json.loads((tmp_path / 'summary.json').read_text(encoding='utf-8'))['stages'][0]
+    assert stage['peak_kb'] is None and stage['pstats_path']
+    assert not list(tmp_path.glob('*.memory.txt'))
+
+
+def test_null_profiler_is_noop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    NULL_PROFILER.begin('scrape')
+    assert NULL_PROFILER.finish() is None
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,97 @@
+"""排名对比引擎测试"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.history import RankingEntry, calculate_rank_changes
+from src.rank_diff import (
+    DIFF_BEST, DIFF_FIRST_SEEN, DIFF_PREVIOUS, RankIndex, build_rank_index, diff_rankings, iter_rank_changes,
+)
+
+
+def write_day(base, date, ranks):
+    rankings = [{'name': name, 'rank': rank, 'stars': '1', 'stars_today': '1'} for name, rank in ranks.items()]
+    path = base / date[:4] / date[5:7] / f'{date}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'date': date, 'rankings': rankings}), encoding='utf-8')
+
+
+def current(ranks):
+    return [RankingEntry(name=name, rank=rank, stars='1', stars_today='1', language=None, description=None)
+            for name, rank in ranks.items()]
+
+
+def make_archive(base):
+    # 01-04 缺失 (抓取失败)
+    write_day(base, '2026-01-01', {'a/old': 1, 'b/gone': 2})
+    write_day(base, '2026-01-02', {'a/old': 4, 'c/mid': 2})
+    write_day(base, '2026-01-03', {'a/old': 3, 'c/mid': 5})
+
+
+def by_name(changes):
+    return {c.name: c for c in changes}
+
+
+def test_previous_falls_back_to_latest_day(tmp_path):
+    make_archive(tmp_path)
+    today = datetime(2026, 1, 5)
+    index = build_rank_index(str(tmp_path), today)
+    assert index.last_date == '2026-01-03' and index.days == 3
+
+    changes = by_name(diff_rankings(current({'a/old': 1, 'b/gone': 3, 'd/new': 2}), index, DIFF_PREVIOUS, today))
+    assert changes['a/old'].change == 2 and changes['a/old'].reference_date == '2026-01-03'
+    # 昨天缺失不会把所有项目标为新上榜；曾经上榜的仓库重新上榜也不算新
+    assert not changes['b/gone'].is_new and changes['b/gone'].change is None
+    assert changes['b/gone'].first_seen == '2026-01-01'
+    assert changes['d/new'].is_new
+
+
+def test_best_and_first_seen(tmp_path):
+    make_archive(tmp_path)
+    today = datetime(2026, 1, 5)
+    index = build_rank_index(str(tmp_path), today, lookback_days=None)
+    entries = current({'a/old': 2, 'c/mid': 3})
+
+    best = by_name(diff_rankings(entries, index, DIFF_BEST, today, window=3))
+    assert (best['a/old'].previous_rank, best['a/old'].reference_date) == (3, '2026-01-03')
+    assert (best['c/mid'].previous_rank, best['c/mid'].change) == (2, -1)
+
+    first = by_name(diff_rankings(entries, index, DIFF_FIRST_SEEN, today))
+    assert (first['a/old'].reference_date, first['a/old'].change) == ('2026-01-01', -1)
+    assert first['c/mid'].reference_date == '2026-01-02'
+
+
+def test_lookback_limits_index(tmp_path):
+    make_archive(tmp_path)
+    index = build_rank_index(str(tmp_path), datetime(2026, 1, 5), lookback_days=3)
+    assert 'b/gone' not in index and index.days == 2
+
+
+def test_iter_matches_previous_day_diff(tmp_path):
+    make_archive(tmp_path)
+    days = dict(iter_rank_changes(str(tmp_path), DIFF_PREVIOUS, start='2026-01-02'))
+    assert list(days) == ['2026-01-02', '2026-01-03']
+
+    # 连续日期下与原有的逐日对比结果一致
+    def load(date):
+        rankings = json.loads((tmp_path / '2026' / '01' / f'{date}.json').read_text())['rankings']
+        return current({r['name']: r['rank'] for r in rankings})
+
+    for date, previous in (('2026-01-02', '2026-01-01'), ('2026-01-03', '2026-01-02')):
+        expected = calculate_rank_changes(load(date), load(previous))
+        assert [(c.name, c.change, c.is_new) for c in days[date]] == \
+            [(c.name, c.change, c.is_new) for c in expected]
+
+
+def test_index_ignores_out_of_order_days():
+    index = RankIndex()
+    index.add_day('2026-01-02', [{'name': 'a', 'rank': 1}])
+    index.add_day('2026-01-01', [{'name': 'a', 'rank': 9}])
+    assert index.days == 1 and index.first_seen('a') == ('2026-01-02', 1)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        diff_rankings([], RankIndex(), 'worst')
@@ -0,0 +1,62 @@
+"""渲染上下文测试"""
+
+import dataclasses
+from datetime import datetime
+
+import pytest
+
+from src.analyzer import RepoAnalysis
+from src.dashboard import generate_dashboard_html
+from src.deep_dive import generate_deep_dive_pages
+from src.generator import generate_markdown_with_changes
+from src.history import RankChange, parse_count
+from src.render_context import build_render_context
+from src.scraper import TrendingRepo
+
+DATE = datetime(2026, 2, 4, 9, 0)
+
+
+def analysis(name, score, stars_today='10', language='Rust', description='engine'):
+    repo = TrendingRepo(name=name, url=f'https://github.com/{name}', description=description, language=language,
+                        stars='1,234', stars_today=stars_today, forks='1', contributors=[])
+    return RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                        tech_stack=[], score=score, score_details={})
+
+
+@pytest.fixture
+def inputs():
+    analyses = [analysis('acme/engine', 6), analysis('acme/agents', 9, '1,500', 'Python', 'LLM agents'),
+                analysis('solo', 3, 'n/a', None, '')]
+    changes = [RankChange('acme/agents', 1, None, None, True), RankChange('acme/engine', 2, 5, 3, False)]
+    return analyses, changes
+
+
+def test_views(inputs):
+    context = build_render_context(*inputs, DATE)
+    assert [v.name for v in context.repos] == ['acme/agents', 'acme/engine', 'solo']
+    agents, engine, solo = context.repos
+    assert (agents.rank, agents.owner, agents.short_name, agents.domain) == (1, 'acme', 'agents', 'AI & ML')
+    assert agents.is_new and agents.change == 0 and agents.stars_today_count == 1500
+    assert (engine.change, engine.domain, engine.stars_display) == (3, 'System', '1.2k')
+    assert (solo.owner, solo.short_name, solo.language, solo.stars_today_count) == ('solo', 'solo', '', 0)
+    assert context.by_name['solo'] is solo and context.new_repos == (agents,)
+    assert parse_count('2,000') == 2000 and parse_count(None) == 0
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        agents.rank = 5
+
+
+def test_shared_context_matches_standalone_render(inputs, tmp_path):
+    analyses, changes = inputs
+    context = build_render_context(analyses, changes, DATE)
+    for lang in ('zh', 'en'):
+        assert generate_dashboard_html(analyses, changes, DATE, lang=lang) == \
+            generate_dashboard_html(None, None, lang=lang, context=context)
+    # 中英文共用与语言无关的片段
+    assert {'feed_items', 'treemap', 'stats_bar', 'repo_data'} <= set(context._memo)
+
+    assert generate_markdown_with_changes(analyses, changes, DATE) == \
+        generate_markdown_with_changes(None, None, None, context=context)
+
+    files = generate_deep_dive_pages(None, None, base_dir=str(tmp_path), context=context)
+    assert [p.split('deep-dive/')[-1] for p in files] == ['acme/agents.html', 'acme/engine.html', 'solo/solo.html']
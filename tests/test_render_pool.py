@@ -0,0 +1,114 @@
+"""并行渲染调度测试"""
+
+import pickle
+from datetime import datetime
+
+from src.ai_summary import AISummary
+from src.analyzer import RepoAnalysis
+from src.deep_dive import DeepDiveManifest
+from src.history import RankChange
+from src.render_context import build_render_context
+from src.render_pool import (
+    JOB_DASHBOARD, JOB_DEEP_DIVE, JOB_MARKDOWN, JOB_RSS, POOL_MIN_JOBS, RenderJob, dedupe_jobs, plan_jobs,
+    resolve_workers, run_jobs,
+)
+from src.scraper import TrendingRepo
+
+
+def analysis(name, score, stars_today='10', language='Rust', description='engine'):
+    repo = TrendingRepo(name=name, url=f'https://github.com/{name}', description=description, language=language,
+                        stars='1,234', stars_today=stars_today, forks='1', contributors=[])
+    return RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                        tech_stack=[], score=score, score_details={})
+
+
+def context_for(day, new=('acme/agents',)):
+    analyses = [analysis('acme/engine', 6), analysis('acme/agents', 9, '1,500', 'Python', 'LLM agents')]
+    changes = [RankChange(name, 1, None, None, True) for name in new]
+    return build_render_context(analyses, changes, datetime(2026, 2, day, 9))
+
+
+def read_tree(root):
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.rglob('*')) if p.is_file()}
+
+
+def test_plan_jobs(tmp_path):
+    jobs = plan_jobs(context_for(4), str(tmp_path), langs=('zh', 'en'), rss=True)
+    assert [(j.kind, j.langs) for j in jobs] == [(JOB_MARKDOWN, ('zh',)), (JOB_DASHBOARD, ('zh', 'zh', 'en')),
+                                                 (JOB_DEEP_DIVE, ('zh',)), (JOB_DEEP_DIVE, ('zh',)), (JOB_RSS, ('zh',))]
+    # 各语言的仪表板在同一个任务中渲染，首页的站内链接不同，单独一项
+    assert jobs[1].outputs == (('zh', (str(tmp_path / '2026/02/2026-02-04.html'),)),
+                               ('zh', (str(tmp_path / 'index.html'),)),
+                               ('en', (str(tmp_path / '2026/02/2026-02-04_en.html'),)))
+    assert jobs[2].paths == (str(tmp_path / 'deep-dive/acme/agents.html'),) and jobs[2].repo == 'acme/agents'
+
+    # 非最新一天不写 index.html 与 RSS
+    older = plan_jobs(context_for(3), str(tmp_path), langs=('zh', 'en'), rss=True, latest=False)
+    assert str(tmp_path / 'index.html') not in {p for j in older for p in j.paths}
+    assert JOB_RSS not in {j.kind for j in older}
+
+
+def test_dedupe_keeps_last_writer():
+    a, b = context_for(3), context_for(4)
+    tasks = [(a, RenderJob(JOB_DEEP_DIVE, (('zh', ('x.html',)),))),
+             (a, RenderJob(JOB_DASHBOARD, (('zh', ('a.html', 'index.html')), ('en', ('a_en.html',))))),
+             (b, RenderJob(JOB_DASHBOARD, (('zh', ('b.html', 'index.html')),))),
+             (b, RenderJob(JOB_DEEP_DIVE, (('zh', ('x.html',)),)))]
+    kept = dedupe_jobs(tasks)
+    assert [(c is b, j.outputs) for c, j in kept] == [(False, (('zh', ('a.html',)), ('en', ('a_en.html',)))),
+                                                    (True, (('zh', ('b.html', 'index.html')),)),
+                                                    (True, (('zh', ('x.html',)),))]
+
+
+def test_pool_output_matches_serial(tmp_path):
+    contexts = [context_for(3, new=('acme/engine', 'acme/agents')), context_for(4)]
+    trees = []
+    for workers in (1, 2):
+        out = tmp_path / str(workers)
+        tasks = [(c, job) for i, c in enumerate(contexts)
+                 for job in plan_jobs(c, str(out), langs=('zh', 'en'), rss=True, latest=i == 1)]
+        results = run_jobs(tasks, workers)
+        assert [r.job.kind for r in results][:2] == [JOB_MARKDOWN, JOB_DASHBOARD]
+        assert [r.date for r in results] == sorted(r.date for r in results)
+        trees.append(read_tree(out))
+    assert trees[0] == trees[1]
+    assert set(trees[0]) == {'2026/02/2026-02-03.md', '2026/02/2026-02-03.html', '2026/02/2026-02-03_en.html',
+                             '2026/02/2026-02-04.md', '2026/02/2026-02-04.html', '2026/02/2026-02-04_en.html',
+                             'deep-dive/acme/engine.html', 'deep-dive/acme/agents.html', 'index.html', 'rss.xml',
+                             'atom.xml', 'feeds/state.json', 'feeds/language/python.xml', 'feeds/language/rust.xml',
+                             'feeds/domain/ai-ml.xml', 'feeds/domain/system.xml'}
+    # 首页与当天仪表板只有站内链接的相对路径不同
+    index, dated = trees[0]['index.html'].decode('utf-8'), trees[0]['2026/02/2026-02-04.html'].decode('utf-8')
+    assert '"search/"' in index and 'href="hn.html"' in index and '../../' not in index
+    assert index.replace('"search/"', '"../../search/"').replace('href="hn.html"', 'href="../../hn.html"') == dated
+    assert not list(tmp_path.rglob('*.tmp'))
+
+
+def test_deep_dive_keeps_summary_in_pool(tmp_path):
+    summaries = {'acme/engine': AISummary('acme/engine', 'Fast engine', ['zero copy'], 'games')}
+    days = [build_render_context([analysis('acme/engine', 6, stars_today)], [], datetime(2026, 2, day, 9),
+                                 ai_summaries=summaries if day == 3 else None)
+            for day, stars_today in ((3, '10'), (4, '90'))]
+    for context in days:
+        manifest = DeepDiveManifest.load(str(tmp_path))
+        jobs = [job for job in plan_jobs(context, str(tmp_path), markdown=False, deep_dives=manifest)
+                if job.kind == JOB_DEEP_DIVE]
+        assert len(run_jobs([(context, job) for job in jobs], 2)) == 1
+        manifest.save()
+    page = (tmp_path / 'deep-dive/acme/engine.html').read_text(encoding='utf-8')
+    assert 'Fast engine' in page and '+90' in page
+
+
+def test_context_pickles_without_memo():
+    context = context_for(4)
+    context.memo('feed_items', lambda: 'cached')
+    restored = pickle.loads(pickle.dumps(context))
+    assert restored.repos == context.repos and dict(restored.change_map) == dict(context.change_map)
+    assert restored._memo == {}
+
+
+def test_resolve_workers():
+    assert resolve_workers(0, POOL_MIN_JOBS - 1) == 1
+    assert resolve_workers(4, 2) == 2
+    assert resolve_workers(1, 100) == 1
+    assert resolve_workers(0, 0) == 1
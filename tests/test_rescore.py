@@ -0,0 +1,48 @@
+"""历史重评分测试"""
+
+import json
+
+from src.rescore import load_history_columns, rescore_history
+
+
+def write_day(base, date, rankings):
+    path = base / date[:4] / date[5:7] / f'{date}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'date': date, 'rankings': rankings}), encoding='utf-8')
+
+
+def entry(name, rank, stars, stars_today, description=''):
+    return {'name': name, 'rank': rank, 'stars': stars, 'stars_today': stars_today,
+            'language': None, 'description': description}
+
+
+def test_rescore_history(tmp_path):
+    """验证按日切片、日期过滤与排序"""
+    write_day(tmp_path, '2026-01-01', [
+        entry('a/old', 1, '90,000', '5'),
+        entry('b/new', 2, '300', '800'),
+    ])
+    write_day(tmp_path, '2026-01-02', [entry('c/only', 1, '1k', '12', 'x' * 60)])
+
+    history = load_history_columns(str(tmp_path))
+    assert history.dates == ['2026-01-01', '2026-01-02']
+    assert history.offsets == [0, 2, 3]
+    assert history.columns.stars == [90000, 300, 1000]
+    assert history.columns.long_description == [False, False, True]
+
+    report = rescore_history(str(tmp_path), ['rising', 'established'], top_n=5)
+    assert report['days'] == 2 and report['rows'] == 3
+    rising = report['models']['rising']['days']['2026-01-01']
+    assert [r['name'] for r in rising] == ['b/new', 'a/old']
+    established = report['models']['established']['days']['2026-01-01']
+    assert [r['name'] for r in established] == ['a/old', 'b/new']
+    assert report['models']['established']['top_overlap'] == 1.0
+
+    filtered = rescore_history(str(tmp_path), ['classic'], start='2026-01-02')
+    assert list(filtered['models']['classic']['days']) == ['2026-01-02']
+
+
+def test_rescore_empty(tmp_path):
+    report = rescore_history(str(tmp_path), ['classic'])
+    assert report['days'] == 0
+    assert report['models']['classic']['days'] == {}
@@ -0,0 +1,92 @@
+"""RSS / Atom 订阅源测试"""
+
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import pytest
+
+from src.analyzer import RepoAnalysis
+from src.render_context import build_render_context
+from src.rss import FEEDS_DIR, STATE_NAME, FeedState, feed_slug, generate_rss, update_feeds
+from src.scraper import TrendingRepo
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+def analysis(name, score, language='Rust', description='engine'):
+    repo = TrendingRepo(name=name, url=f'https://github.com/{name}', description=description, language=language,
+                        stars='1,234', stars_today='10', forks='1', contributors=[])
+    return RepoAnalysis(repo=repo, language_stats={}, topics=[], license=None, readme_summary='',
+                        tech_stack=[], score=score, score_details={})
+
+
+def publish(base_dir, day, names, **kwargs):
+    analyses = [analysis(name, 10 - i, language) for i, (name, language) in enumerate(names)]
+    context = build_render_context(analyses, [], datetime(2026, 2, day, 9))
+    return update_feeds(context, str(base_dir), **kwargs)
+
+
+def guids(path):
+    return [guid.text for guid in ET.parse(path).getroot().iter('guid')]
+
+
+def test_feed_keeps_previous_days(tmp_path):
+    publish(tmp_path, 3, [('acme/engine', 'Rust')])
+    publish(tmp_path, 4, [('acme/agents', 'Python'), ('acme/engine', 'Rust')])
+
+    assert guids(tmp_path / 'rss.xml') == ['https://github.com/acme/agents#2026-02-04',
+                                           'https://github.com/acme/engine#2026-02-04',
+                                           'https://github.com/acme/engine#2026-02-03']
+    assert guids(tmp_path / FEEDS_DIR / 'language/rust.xml') == ['https://github.com/acme/engine#2026-02-04',
+                                                                  'https://github.com/acme/engine#2026-02-03']
+    assert guids(tmp_path / FEEDS_DIR / 'language/python.xml') == ['https://github.com/acme/agents#2026-02-04']
+
+    atom = ET.parse(tmp_path / 'atom.xml').getroot()
+    assert [e.findtext(f'{ATOM}id') for e in atom.iter(f'{ATOM}entry')] == guids(tmp_path / 'rss.xml')
+    assert atom.findtext(f'{ATOM}updated') == '2026-02-04T09:00:00Z'
+
+
+def test_same_day_rerun_is_idempotent(tmp_path):
+    publish(tmp_path, 3, [('acme/engine', 'Rust')])
+    first = publish(tmp_path, 4, [('acme/agents', 'Python')])
+    before = {path: open(path, 'rb').read() for path in first}
+    second = publish(tmp_path, 4, [('acme/agents', 'Python')])
+    assert second == first and {path: open(path, 'rb').read() for path in second} == before
+
+
+def test_old_days_pruned(tmp_path):
+    for day in range(1, 6):
+        publish(tmp_path, day, [('acme/engine', 'Rust')], keep_days=3)
+    state = json.loads((tmp_path / FEEDS_DIR / STATE_NAME).read_text(encoding='utf-8'))
+    assert sorted(state['days']) == ['2026-02-03', '2026-02-04', '2026-02-05']
+    assert len(guids(tmp_path / 'rss.xml')) == 3
+
+    with pytest.raises(ValueError):
+        publish(tmp_path, 6, [('acme/engine', 'Rust')], keep_days=0)
+
+    (tmp_path / FEEDS_DIR / STATE_NAME).write_text('{"format": 0}', encoding='utf-8')
+    assert FeedState.load(str(tmp_path)).days == {}
+
+
+def test_stale_group_feeds_removed(tmp_path):
+    publish(tmp_path, 3, [('acme/engine', 'Rust')], keep_days=2)
+    publish(tmp_path, 4, [('acme/agents', 'Python')], keep_days=2)
+    assert (tmp_path / FEEDS_DIR / 'language/rust.xml').exists()
+
+    # Rust 移出两天的窗口后，其订阅源被删除
+    publish(tmp_path, 5, [('acme/agents', 'Python')], keep_days=2)
+    assert sorted(p.name for p in (tmp_path / FEEDS_DIR / 'language').iterdir()) == ['python.xml']
+    assert (tmp_path / 'rss.xml').exists() and (tmp_path / FEEDS_DIR / STATE_NAME).exists()
+
+
+def test_escaping_and_slugs(tmp_path):
+    publish(tmp_path, 3, [('acme/engine', 'C++')])
+    root = ET.parse(tmp_path / FEEDS_DIR / 'language/cpp.xml').getroot()
+    assert root.find('channel/item/title').text == '#1 acme/engine (+10 stars)'
+    assert feed_slug('AI & ML') == 'ai-ml' and feed_slug('C#') == 'csharp'
+
+    rss = generate_rss([analysis('acme/tool', 9, description='fast <&> safe')], datetime(2026, 2, 3, 9))
+    item = ET.fromstring(rss).find('channel/item')
+    assert '&lt;&amp;&gt;' in item.find('description').text
+    assert item.find('guid').text == 'https://github.com/acme/tool#2026-02-03'
@@ -0,0 +1,223 @@
+"""评分模型与批量评分引擎测试"""
+
+import json
+import random
+
+import pytest
+
+from src.analyzer import calculate_score
+from src.scoring import (
+    CLASSIC_MODEL, ScoringModel, _numpy, build_score_columns, get_model, load_model_configs,
+    score_batch, score_repos,
+)
+from src.scraper import Contributor, TrendingRepo
+
+
+def legacy_calculate_score(repo, details):
+    """
+    原硬编码的 calculate_score (经典模型的参考实现)
+
+    评分维度:
+    - star_growth: Star 增长速度 (今日新增)
+    - popularity: 项目热度 (总 Star 数)
+    - documentation: 文档完整度 (基于 topics 和描述)
+    - community: 社区参与度 (贡献者数、forks)
+
+    Returns:
+        (总分, 各维度评分字典)
+    """
+    scores = {}
+
+    # Star 增长速度 (1-10)
+    try:
+        stars_today = int(repo.stars_today.replace(',', '').replace(',', ''))
+    except (ValueError, AttributeError):
+        stars_today = 0
+
+    if stars_today >= 500:
+        scores['star_growth'] = 10
+    elif stars_today >= 300:
+        scores['star_growth'] = 9
+    elif stars_today >= 200:
+        scores['star_growth'] = 8
+    elif stars_today >= 100:
+        scores['star_growth'] = 7
+    elif stars_today >= 50:
+        scores['star_growth'] = 6
+    elif stars_today >= 30:
+        scores['star_growth'] = 5
+    elif stars_today >= 20:
+        scores['star_growth'] = 4
+    elif stars_today >= 10:
+        scores['star_growth'] = 3
+    else:
+        scores['star_growth'] = 2
+
+    # 项目热度 (1-10)
+    try:
+        total_stars = int(repo.stars.replace(',', '').replace(',', '').replace('k', '000'))
+    except (ValueError, AttributeError):
+        total_stars = 0
+
+    if total_stars >= 50000:
+        scores['popularity'] = 10
+    elif total_stars >= 20000:
+        scores['popularity'] = 9
+    elif total_stars >= 10000:
+        scores['popularity'] = 8
+    elif total_stars >= 5000:
+        scores['popularity'] = 7
+    elif total_stars >= 2000:
+        scores['popularity'] = 6
+    elif total_stars >= 1000:
+        scores['popularity'] = 5
+    elif total_stars >= 500:
+        scores['popularity'] = 4
+    elif total_stars >= 100:
+        scores['popularity'] = 3
+    else:
+        scores['popularity'] = 2
+
+    # 文档完整度 (1-10)
+    doc_score = 5  # 基础分
+    if repo.description and len(repo.description) > 50:
+        doc_score += 1
+    if details.get('topics') and len(details['topics']) >= 3:
+        doc_score += 2
+    if details.get('license'):
+        doc_score += 1
+    scores['documentation'] = min(doc_score, 10)
+
+    # 社区参与度 (1-10)
+    try:
+        forks = int(repo.forks.replace(',', '').replace(',', ''))
+    except (ValueError, AttributeError):
+        forks = 0
+
+    contrib_count = len(repo.contributors)
+
+    community_score = 4  # 基础分
+    if forks >= 1000:
+        community_score += 3
+    elif forks >= 500:
+        community_score += 2
+    elif forks >= 100:
+        community_score += 1
+
+    if contrib_count >= 5:
+        community_score += 2
+    elif contrib_count >= 3:
+        community_score += 1
+
+    scores['community'] = min(community_score, 10)
+
+    # 计算总分 (加权平均)
+    weights = {
+        'star_growth': 0.35,
+        'popularity': 0.25,
+        'documentation': 0.20,
+        'community': 0.20
+    }
+
+    total = sum(scores[k] * weights[k] for k in scores)
+    final_score = round(total)
+
+    return final_score, scores
+
+
+
+def make_repos(n, seed=7):
+    rng = random.Random(seed)
+    repos, details = [], []
+    for i in range(n):
+        stars = rng.choice([0, 99, 100, 4999, 5000, 50000, 123456])
+        repos.append(TrendingRepo(
+            name=f'owner/repo{i}',
+            url=f'https://github.com/owner/repo{i}',
+            description='x' * rng.choice([0, 50, 51, 120]),
+            language='Python',
+            stars=rng.choice([f'{stars:,}', str(stars), '1.2k', '', 'n/a']),
+            stars_today=rng.choice([str(rng.randint(0, 1200)), '9', '10', '500', '1,024']),
+            forks=rng.choice([str(rng.randint(0, 3000)), '1,000', '99', '']),
+            contributors=[Contributor(f'u{j}', '') for j in range(rng.randint(0, 5))],
+        ))
+        details.append({'topics': ['t'] * rng.randint(0, 4), 'license': rng.choice([None, 'MIT'])})
+    return repos, details
+
+
+@pytest.mark.parametrize('use_numpy', [False] + ([True] if _numpy() is not None else []))
+def test_batch_identical_to_legacy(use_numpy):
+    """验证经典模型批量评分与原硬编码实现逐位一致"""
+    repos, details = make_repos(2000)
+    model = get_model('classic')
+    result = score_batch(build_score_columns(repos, details), use_numpy=use_numpy, model=model)
+    for i, (repo, detail) in enumerate(zip(repos, details)):
+        score, score_details = legacy_calculate_score(repo, detail)
+        assert int(result.score[i]) == score
+        assert result.details(i) == score_details
+        assert calculate_score(repo, detail, model) == (score, score_details)
+
+
+def test_score_repos_defaults():
+    """验证缺省详情时的结果"""
+    repos, _ = make_repos(50, seed=3)
+    expected = [legacy_calculate_score(r, {}) for r in repos]
+    assert score_repos(repos, model=get_model('classic')) == expected
+    assert score_repos([]) == []
+
+
+def test_config_classic_matches_builtin():
+    """配置文件中的 classic 与内置模型一致"""
+    assert load_model_configs()['models']['classic'] == json.loads(json.dumps(CLASSIC_MODEL))
+
+
+def test_model_selection(monkeypatch, tmp_path):
+    """验证按名称 / 环境变量选择模型"""
+    assert get_model('rising').name == 'rising'
+    monkeypatch.setenv('TRENDING_SCORING_MODEL', 'established')
+    assert get_model().name == 'established'
+    with pytest.raises(KeyError):
+        get_model('missing')
+
+    # 配置文件缺失时只有内置经典模型
+    with pytest.raises(KeyError):
+        get_model(path=str(tmp_path / 'none.json'))
+    monkeypatch.delenv('TRENDING_SCORING_MODEL')
+    assert get_model(path=str(tmp_path / 'none.json')).name == 'classic'
+
+
+@pytest.mark.parametrize('use_numpy', [False] + ([True] if _numpy() is not None else []))
+def test_custom_model_without_table(monkeypatch, use_numpy):
+    """组合数超限时逐行计算，结果与查表一致"""
+    config = {
+        'weights': {'growth': 0.6, 'stars': 0.4},
+        'dimensions': {
+            'growth': {'base': 0, 'ladders': [{'input': 'stars_today', 'thresholds': [5, 50, 500]}]},
+            'stars': {'base': 1, 'max': 3, 'ladders': [{'input': 'stars', 'thresholds': [10, 100, 1000]}]},
+            'unweighted': {'base': 0, 'ladders': [{'input': 'forks', 'thresholds': [1]}]},
+        },
+    }
+    repos, details = make_repos(300, seed=11)
+    columns = build_score_columns(repos, details)
+    tabled = ScoringModel.from_config('custom', config)
+    assert tabled.total_table is not None
+
+    monkeypatch.setattr('src.scoring.MAX_TOTAL_TABLE_SIZE', 1)
+    untabled = ScoringModel.from_config('custom', config)
+    assert untabled.total_table is None
+
+    a = tabled.score_batch(columns, use_numpy=use_numpy)
+    b = untabled.score_batch(columns, use_numpy=use_numpy)
+    assert list(map(int, a.score)) == list(map(int, b.score))
+    assert max(int(v) for v in a.dimensions['stars']) <= 3
+
+
+def test_invalid_model_config():
+    """未知输入或缺失维度时报错"""
+    with pytest.raises(ValueError):
+        ScoringModel.from_config('bad', {
+            'weights': {'x': 1.0},
+            'dimensions': {'x': {'ladders': [{'input': 'nope', 'thresholds': [1]}]}},
+        })
+    with pytest.raises(ValueError):
+        ScoringModel.from_config('bad', {'weights': {'x': 1.0}, 'dimensions': {}})
@@ -0,0 +1,25 @@
+"""Trending 页面解析测试"""
+
+from datetime import date
+
+from src.scraper import parse_trending_html
+from src.synthetic import SyntheticConfig, SyntheticUniverse, trending_html
+
+
+def test_parse_synthetic_page():
+    rankings = SyntheticUniverse(SyntheticConfig(start=date(2026, 1, 1), days=30, repos_per_day=15)).rankings(10)
+    repos = parse_trending_html(trending_html(rankings))
+
+    assert [r.name for r in repos] == [e['name'] for e in rankings]
+    for repo, entry in zip(repos, rankings):
+        assert repo.url == f'https://github.com/{entry["name"]}'
+        assert (repo.stars, repo.stars_today) == (entry['stars'], entry['stars_today'])
+        assert (repo.language, repo.description) == (entry['language'], entry['description'])
+        assert 1 <= len(repo.contributors) <= 5 and repo.contributors[0].username == 'u0'
+
+
+def test_parse_skips_malformed_rows():
+    html = '<article class="Box-row"><p>no link</p></article><article class="Box-row"><h2><a href="/a/b"></a></h2></article>'
+    repos = parse_trending_html(html)
+    assert len(repos) == 1
+    assert (repos[0].name, repos[0].stars, repos[0].stars_today, repos[0].language) == ('a/b', '0', '0', None)
@@ -0,0 +1,59 @@
+"""全站搜索索引测试"""
+
+import json
+
+from src.history import RankingEntry, save_ranking_history
+from src.search_index import build_search_index, search, shard_key, tokenize
+from datetime import datetime
+
+
+def make_entry(name, rank, description, language='Python'):
+    return RankingEntry(name=name, rank=rank, stars='1,000', stars_today='100',
+                        language=language, description=description)
+
+
+def build_archive(base_dir):
+    save_ranking_history([
+        make_entry('openai/codex', 1, 'Lightweight coding agent that runs in your terminal'),
+        make_entry('astral-sh/uv', 2, 'An extremely fast Python package installer', 'Rust'),
+    ], str(base_dir), datetime(2026, 1, 30))
+    save_ranking_history([
+        make_entry('astral-sh/uv', 1, 'An extremely fast Python package installer', 'Rust'),
+        make_entry('badlogic/pi-mono', 2, 'AI agent toolkit: coding agent CLI', 'TypeScript'),
+    ], str(base_dir), datetime(2026, 2, 1))
+
+
+def test_tokenize_mixed_text():
+    """验证中英文分词"""
+    assert tokenize('The Rust CLI') == ['rust', 'cli']
+    assert tokenize('智能助手') == ['智能', '能助', '助手']
+    assert shard_key('c#') == 'c_'
+
+
+def test_search_across_days(tmp_path):
+    """验证跨日期检索与前缀匹配"""
+    build_archive(tmp_path)
+    build_search_index(str(tmp_path), {'openai/codex': {'summary': '终端编程助手', 'topics': ['cli']}})
+
+    names = [d['n'] for d in search(str(tmp_path), 'coding agent')]
+    assert names == ['badlogic/pi-mono', 'openai/codex']
+
+    uv = search(str(tmp_path), 'instal')[0]
+    assert uv['n'] == 'astral-sh/uv'
+    assert (uv['f'], uv['r'], uv['b'], uv['c']) == ('2026-01-30', '2026-02-01', 1, 2)
+
+    assert [d['n'] for d in search(str(tmp_path), '编程')] == ['openai/codex']
+    assert search(str(tmp_path), 'xyzabc123impossible') == []
+
+
+def test_rebuild_keeps_extras_and_is_stable(tmp_path):
+    """验证重建时保留 AI 总结且未变化的分片不重写"""
+    build_archive(tmp_path)
+    build_search_index(str(tmp_path), {'openai/codex': {'summary': '终端编程助手'}})
+    meta = build_search_index(str(tmp_path))
+
+    assert meta['written'] == 0
+    assert [d['n'] for d in search(str(tmp_path), '助手')] == ['openai/codex']
+
+    stored = json.loads((tmp_path / 'search' / 'meta.json').read_text(encoding='utf-8'))
+    assert stored['docs'] == 3
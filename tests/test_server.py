@@ -0,0 +1,121 @@
+"""本地预览服务器测试"""
+
+import asyncio
+import gzip
+import http.client
+import os
+import threading
+
+import pytest
+
+from src.server import StaticSiteServer, parse_range, RangeNotSatisfiable
+
+
+@pytest.fixture
+def site(tmp_path):
+    """启动指向临时目录的预览服务器"""
+    body = ('<html>' + 'trending ' * 500 + '</html>').encode('utf-8')
+    (tmp_path / 'index.html').write_bytes(body)
+    (tmp_path / 'index.html.gz').write_bytes(gzip.compress(body, mtime=0))
+    (tmp_path / 'rss.xml').write_text('<rss/>', encoding='utf-8')
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'index.html').write_text('docs', encoding='utf-8')
+
+    # 在事件循环自己的线程中启动 (主线程可能已有运行中的事件循环，如 Playwright 测试)
+    loop = asyncio.new_event_loop()
+    server = StaticSiteServer(str(tmp_path), port=0, access_log=None)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+
+    yield server, body
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def request(server, path, headers=None, method='GET'):
+    conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=5)
+    conn.request(method, path, headers=headers or {})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def test_parse_range():
+    """验证 Range 解析"""
+    assert parse_range('bytes=0-9', 100) == (0, 9)
+    assert parse_range('bytes=90-', 100) == (90, 99)
+    assert parse_range('bytes=-10', 100) == (90, 99)
+    assert parse_range('bytes=0-999', 100) == (0, 99)
+    assert parse_range('bytes=0-1,5-6', 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range('bytes=100-', 100)
+
+
+def test_etag_and_not_modified(site):
+    """验证强 ETag 与 304"""
+    server, body = site
+    response, data = request(server, '/')
+    assert response.status == 200
+    assert data == body
+    assert response.getheader('Cache-Control') == 'no-cache'
+    etag = response.getheader('ETag')
+    assert etag.startswith('"')
+
+    response, data = request(server, '/index.html', {'If-None-Match': etag})
+    assert response.status == 304
+    assert data == b''
+
+
+def test_precompressed_variant(site):
+    """验证预压缩变体协商"""
+    server, body = site
+    plain, _ = request(server, '/index.html')
+    response, data = request(server, '/index.html', {'Accept-Encoding': 'br;q=0, gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('Vary') == 'Accept-Encoding'
+    assert gzip.decompress(data) == body
+    assert response.getheader('ETag') != plain.getheader('ETag')
+
+
+def test_stale_variant_ignored(site):
+    """源文件比预压缩变体新时返回原始内容"""
+    server, body = site
+    source = server.root / 'index.html'
+    variant_mtime = (server.root / 'index.html.gz').stat().st_mtime_ns
+    os.utime(source, ns=(variant_mtime + 10**9, variant_mtime + 10**9))
+    response, data = request(server, '/index.html', {'Accept-Encoding': 'gzip'})
+    assert response.getheader('Content-Encoding') is None
+    assert data == body
+
+
+def test_range_requests(site):
+    """验证 Range / If-Range / 416"""
+    server, body = site
+    response, data = request(server, '/index.html', {'Range': 'bytes=0-5'})
+    assert response.status == 206
+    assert data == body[:6]
+    assert response.getheader('Content-Range') == f'bytes 0-5/{len(body)}'
+
+    response, data = request(server, '/index.html', {'Range': 'bytes=0-5', 'If-Range': '"stale"'})
+    assert response.status == 200
+    assert data == body
+
+    response, _ = request(server, '/index.html', {'Range': f'bytes={len(body)}-'})
+    assert response.status == 416
+
+
+def test_redirect_and_errors(site):
+    """验证目录重定向、404 与路径穿越"""
+    server, _ = site
+    response, _ = request(server, '/docs')
+    assert response.status == 301
+    assert response.getheader('Location') == '/docs/'
+    assert request(server, '/missing.html')[0].status == 404
+    assert request(server, '/../etc/passwd')[0].status == 404
+    assert request(server, '/%00')[0].status == 404
+    assert request(server, '/rss.xml', method='POST')[0].status == 405
@@ -0,0 +1,96 @@
+"""月度二进制快照测试"""
+
+import json
+
+import pytest
+
+from src.history import RankingEntry, iter_ranking_history, save_ranking_history
+from src.snapshot import (
+    MonthSnapshot, SnapshotError, build_snapshots, encode_month, get_snapshot_path, read_month,
+    update_month_snapshot,
+)
+
+DAY_ONE = [
+    {'name': 'a/x', 'rank': 1, 'stars': '27,139', 'stars_today': '573',
+     'language': 'TypeScript', 'description': '多模态 Agent'},
+    {'name': 'b/y', 'rank': 2, 'stars': '1.2k', 'stars_today': '',
+     'language': None, 'description': None},
+]
+DAY_TWO = [
+    {'name': 'b/y', 'rank': 1, 'stars': '1200', 'stars_today': '1,024',
+     'language': None, 'description': None},
+]
+
+
+def test_roundtrip(tmp_path):
+    """非千分位格式的计数与 None 也能原样还原"""
+    path = tmp_path / 'm.rank'
+    path.write_bytes(encode_month(2026, 2, {7: DAY_ONE, 9: DAY_TWO}))
+
+    with MonthSnapshot(path) as snapshot:
+        assert snapshot.dates() == ['2026-02-07', '2026-02-09']
+        assert snapshot.rankings('2026-02-07') == DAY_ONE
+        assert snapshot.rankings('2026-02-09') == DAY_TWO
+        assert snapshot.rankings('2026-02-08') is None
+        assert snapshot.rankings('2026-03-07') is None
+        assert snapshot.rankings('2026-02-07', fields=('name', 'stars', 'topics')) == [
+            {'name': 'a/x', 'stars': '27,139', 'topics': None},
+            {'name': 'b/y', 'stars': '1.2k', 'topics': None},
+        ]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / 'bad.rank'
+    path.write_bytes(b'NOPE' + b'\0' * 32)
+    with pytest.raises(SnapshotError):
+        MonthSnapshot(path)
+
+
+def test_save_updates_snapshot(tmp_path):
+    """保存每日 JSON 时同步更新快照，重复保存同一天会替换"""
+    from datetime import datetime
+
+    entries = [RankingEntry(**{**e, 'description': e['description'] or ''}) for e in DAY_ONE]
+    save_ranking_history(entries, str(tmp_path), datetime(2026, 2, 7))
+    save_ranking_history(entries[:1], str(tmp_path), datetime(2026, 2, 8))
+    save_ranking_history(entries[1:], str(tmp_path), datetime(2026, 2, 8))
+
+    with MonthSnapshot(get_snapshot_path(str(tmp_path), 2026, 2)) as snapshot:
+        assert snapshot.dates() == ['2026-02-07', '2026-02-08']
+        assert [e['name'] for e in snapshot.rankings('2026-02-08')] == ['b/y']
+
+    assert list(iter_ranking_history(str(tmp_path), binary=True)) == list(iter_ranking_history(str(tmp_path)))
+
+
+def test_build_and_fallback(tmp_path):
+    """快照缺少的日期回退到 JSON；损坏的快照从 JSON 重建"""
+    month_dir = tmp_path / '2026' / '02'
+    month_dir.mkdir(parents=True)
+    for day, rankings in ((7, DAY_ONE), (9, DAY_TWO)):
+        (month_dir / f'2026-02-{day:02d}.json').write_text(
+            json.dumps({'date': f'2026-02-{day:02d}', 'rankings': rankings}), encoding='utf-8')
+
+    assert build_snapshots(str(tmp_path)) == [str(get_snapshot_path(str(tmp_path), 2026, 2))]
+
+    (month_dir / '2026-02-10.json').write_text(
+        json.dumps({'date': '2026-02-10', 'rankings': DAY_TWO}), encoding='utf-8')
+    days = list(iter_ranking_history(str(tmp_path), binary=True, fields=('name',)))
+    assert [d for d, _ in days] == ['2026-02-07', '2026-02-09', '2026-02-10']
+
+    get_snapshot_path(str(tmp_path), 2026, 2).write_bytes(b'garbage')
+    update_month_snapshot(str(tmp_path), '2026-02-11', DAY_ONE)
+    with MonthSnapshot(get_snapshot_path(str(tmp_path), 2026, 2)) as snapshot:
+        assert snapshot.dates() == ['2026-02-07', '2026-02-09', '2026-02-10', '2026-02-11']
+
+
+def test_missing_snapshot_seeded_from_json(tmp_path):
+    """快照不存在而当月已有每日 JSON 时，新快照包含全部日期"""
+    month_dir = tmp_path / '2026' / '02'
+    month_dir.mkdir(parents=True)
+    for day, rankings in ((7, DAY_ONE), (9, DAY_TWO)):
+        (month_dir / f'2026-02-{day:02d}.json').write_text(
+            json.dumps({'date': f'2026-02-{day:02d}', 'rankings': rankings}), encoding='utf-8')
+
+    update_month_snapshot(str(tmp_path), '2026-02-10', DAY_TWO)
+    days = read_month(get_snapshot_path(str(tmp_path), 2026, 2))
+    assert sorted(days) == [7, 9, 10] and days[7] == DAY_ONE
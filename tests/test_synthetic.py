@@ -0,0 +1,66 @@
+"""合成存档生成器测试"""
+
+import json
+from datetime import date
+
+from src.history import iter_ranking_history
+from src.synthetic import SyntheticConfig, generate_archive
+
+
+def read_tree(base):
+    return {str(p.relative_to(base)): p.read_bytes() for p in sorted(base.rglob('*')) if p.is_file()}
+
+
+def test_deterministic_across_workers(tmp_path):
+    config = SyntheticConfig(start=date(2025, 12, 20), days=40, repos_per_day=10, seed=7, summaries=True, hn=True)
+    serial = generate_archive(str(tmp_path / 'a'), config, workers=1)
+    parallel = generate_archive(str(tmp_path / 'b'), config, workers=2)
+
+    assert serial['days'] == parallel['days'] == 40
+    assert read_tree(tmp_path / 'a') == read_tree(tmp_path / 'b')
+
+    other = SyntheticConfig(start=date(2025, 12, 20), days=40, repos_per_day=10, seed=8)
+    generate_archive(str(tmp_path / 'c'), other, workers=1)
+    first = '2025/12/2025-12-20.json'
+    assert read_tree(tmp_path / 'a')[first] != read_tree(tmp_path / 'c')[first]
+
+
+def test_archive_shape(tmp_path):
+    config = SyntheticConfig(start=date(2026, 1, 1), days=90, repos_per_day=20)
+    generate_archive(str(tmp_path), config, workers=1)
+
+    days = list(iter_ranking_history(str(tmp_path)))
+    assert [d for d, _ in days][:2] == ['2026-01-01', '2026-01-02'] and len(days) == 90
+
+    previous, entered, streaks, stars = set(), 0, {}, {}
+    for _, rankings in days:
+        assert [e['rank'] for e in rankings] == list(range(1, 21))
+        today = [int(e['stars_today'].replace(',', '')) for e in rankings]
+        assert today == sorted(today, reverse=True)
+
+        names = {e['name'] for e in rankings}
+        entered += len(names - previous)
+        for e in rankings:
+            streaks[e['name']] = streaks.get(e['name'], 0) + 1 if e['name'] in previous else 1
+            total = int(e['stars'].replace(',', ''))
+            assert total >= stars.get(e['name'], 0)  # 总 Star 单调增长
+            stars[e['name']] = total
+        previous = names
+
+    # 有换榜，也有连续多天上榜的仓库
+    assert 90 < entered < 90 * 20
+    assert max(streaks.values()) >= 5
+
+
+def test_fixtures(tmp_path):
+    config = SyntheticConfig(start=date(2026, 1, 1), days=3, repos_per_day=5, summaries=True, hn=True, hn_per_day=50)
+    generate_archive(str(tmp_path), config, workers=1)
+
+    summaries = json.loads((tmp_path / 'fixtures' / 'ai_summaries.json').read_text(encoding='utf-8'))
+    day = json.loads((tmp_path / '2026' / '01' / '2026-01-01.json').read_text(encoding='utf-8'))
+    assert {e['name'] for e in day['rankings']} <= set(summaries)
+    assert set(summaries[day['rankings'][0]['name']]) == {'repo_name', 'summary', 'highlights', 'use_cases'}
+
+    stories = json.loads((tmp_path / 'fixtures' / 'hn' / '2026-01-01.json').read_text(encoding='utf-8'))['stories']
+    assert len(stories) == 50 and len({s['id'] for s in stories}) == 50
+    assert any(s['url'].startswith('https://github.com/') for s in stories)
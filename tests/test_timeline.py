@@ -0,0 +1,58 @@
+"""仓库时间线测试"""
+
+import json
+from datetime import datetime
+
+from src.history import RankingEntry, save_ranking_history
+from src.timeline import build_timelines, update_timelines, get_series_path
+
+
+def save_day(base_dir, day, names):
+    entries = [
+        RankingEntry(name=name, rank=i, stars=f'{1000 * i + day:,}', stars_today=str(10 * i),
+                     language='Python', description=f'{name} project')
+        for i, name in enumerate(names, 1)
+    ]
+    save_ranking_history(entries, str(base_dir), datetime(2026, 1, day))
+
+
+def read_series(base_dir, name):
+    return json.loads(get_series_path(str(base_dir), name).read_text(encoding='utf-8'))
+
+
+def test_full_build(tmp_path):
+    """验证单次遍历生成每个仓库的时间线"""
+    save_day(tmp_path, 1, ['a/x', 'b/y'])
+    save_day(tmp_path, 2, ['b/y', 'a/x'])
+    stats = build_timelines(str(tmp_path))
+
+    assert stats['repos'] == 2
+    series = read_series(tmp_path, 'a/x')
+    assert series['dates'] == ['2026-01-01', '2026-01-02']
+    assert series['rank'] == [1, 2]
+    assert series['stars'] == [1001, 2002]
+
+    index = json.loads((tmp_path / 'timeline' / 'index.json').read_text(encoding='utf-8'))
+    assert index['last_date'] == '2026-01-02'
+    assert {r['name']: r['best_rank'] for r in index['repos']} == {'a/x': 1, 'b/y': 1}
+
+
+def test_incremental_matches_full(tmp_path):
+    """验证增量更新 (含同日重跑) 与全量构建结果一致"""
+    save_day(tmp_path, 1, ['a/x', 'b/y'])
+    save_day(tmp_path, 2, ['b/y', 'c/z'])
+    build_timelines(str(tmp_path))
+
+    # 同日重跑: c/z 掉榜，a/x 回归
+    save_day(tmp_path, 2, ['b/y', 'a/x'])
+    save_day(tmp_path, 3, ['c/z'])
+    stats = update_timelines(str(tmp_path))
+    assert stats['last_date'] == '2026-01-03'
+
+    incremental = {n: read_series(tmp_path, n) for n in ('a/x', 'b/y', 'c/z')}
+    incremental_index = (tmp_path / 'timeline' / 'index.json').read_text(encoding='utf-8')
+
+    build_timelines(str(tmp_path))
+    assert incremental == {n: read_series(tmp_path, n) for n in ('a/x', 'b/y', 'c/z')}
+    assert incremental_index == (tmp_path / 'timeline' / 'index.json').read_text(encoding='utf-8')
+    assert incremental['c/z']['dates'] == ['2026-01-03']
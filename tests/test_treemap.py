@@ -112,11 +112,13 @@ def test_treemap_item_clickable(page: Page, main_page_url: str):
     # item.click()  # 会打开新窗口，跳过实际点击
 
 
-def test_treemap_items_have_size_classes(page: Page, main_page_url: str):
-    """验证 Treemap 项目有尺寸类"""
+def test_treemap_items_absolutely_positioned(page: Page, main_page_url: str):
+    """验证 Treemap 项目按 squarified 布局绝对定位"""
     page.goto(main_page_url)
     item = page.locator('.treemap-item').first
     class_attr = item.get_attribute('class')
-    # 应该包含 col-span 和 row-span
-    assert 'col-span' in class_attr, f"项目应该有 col-span 类: {class_attr}"
-    assert 'row-span' in class_attr, f"项目应该有 row-span 类: {class_attr}"
+    style = item.get_attribute('style') or ''
+    assert 'absolute' in class_attr, f"项目应该绝对定位: {class_attr}"
+    assert 'col-span' not in class_attr and 'row-span' not in class_attr, f"不应再使用 grid 尺寸类: {class_attr}"
+    for prop in ('left:', 'top:', 'width:', 'height:'):
+        assert prop in style, f"项目应该有 {prop} 样式: {style}"
@@ -0,0 +1,50 @@
+"""Squarified Treemap 布局测试"""
+
+import pytest
+
+from src.treemap import squarify, layout_treemap, size_class
+
+
+def overlaps(a, b):
+    eps = 1e-9
+    return (a.x + eps < b.x + b.w and b.x + eps < a.x + a.w and
+            a.y + eps < b.y + b.h and b.y + eps < a.y + a.h)
+
+
+def test_areas_proportional_and_inside():
+    """验证面积与数值成正比且不越界"""
+    values = [600, 300, 100, 50, 30, 20, 6, 4]
+    rects = squarify(values, 0, 0, 400, 300)
+    total = sum(values)
+    for value, rect in zip(values, rects):
+        assert rect.area == pytest.approx(400 * 300 * value / total)
+        assert rect.x >= -1e-9 and rect.y >= -1e-9
+        assert rect.x + rect.w <= 400 + 1e-9 and rect.y + rect.h <= 300 + 1e-9
+    assert sum(r.area for r in rects) == pytest.approx(400 * 300)
+
+
+def test_no_overlap_and_input_order():
+    """验证矩形互不重叠且按输入顺序返回"""
+    values = [3, 50, 7, 12, 1, 30, 2, 9, 5]
+    rects = squarify(values, 0, 0, 100, 100)
+    assert [r.index for r in rects] == list(range(len(values)))
+    for i in range(len(rects)):
+        for j in range(i + 1, len(rects)):
+            assert not overlaps(rects[i], rects[j])
+
+
+def test_aspect_quality():
+    """验证等值项目布局接近正方形"""
+    rects = squarify([1] * 16, 0, 0, 100, 100)
+    assert max(r.aspect for r in rects) < 1.5
+
+
+def test_zero_values_and_min_share():
+    """验证零值处理与最小占比"""
+    rects = squarify([0, 10, 0], 0, 0, 10, 10)
+    assert rects[0].area == 0 and rects[2].area == 0
+    assert rects[1].area == pytest.approx(100)
+
+    placed = layout_treemap([{'s': 0}, {'s': 100}], lambda r: r['s'], 4, 3, min_share=0.05)
+    assert placed[0][1].area > 0
+    assert size_class(placed[1][1], 4, 3) == 'huge'